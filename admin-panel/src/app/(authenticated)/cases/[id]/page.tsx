@@ -250,7 +250,7 @@ export default function CaseDetailPage() {
       onClick={() => handleImageClick(image)}
     >
       <Image
-        src={image.url}
+        src={image.thumbnail_url ?? image.url}
         alt={image.display_name}
         fill
         className="object-cover"
@@ -845,7 +845,7 @@ export default function CaseDetailPage() {
             <div className="space-y-4">
               <div className="relative aspect-video bg-muted rounded-lg overflow-hidden">
                 <Image
-                  src={selectedImage.url}
+                  src={selectedImage.preview_url ?? selectedImage.url}
                   alt={selectedImage.display_name}
                   fill
                   className="object-contain"
@@ -1162,6 +1162,8 @@ export interface CaseImage {
   is_valid: boolean | null;
   validation_notes: string | null;
   url: string;
+  thumbnail_url: string | null;
+  preview_url: string | null;
   created_at: string;
 }
 
@@ -39,13 +39,13 @@ def should_continue_to_agent(state: ConversationState) -> str:
     Decide whether to continue to conversational agent or end early.
 
     If agent is disabled (panic button), skip directly to END.
-    Otherwise, continue to conversational_agent node.
+    Otherwise, continue to fast_path node (which may hand off to the LLM).
 
     Args:
         state: Current conversation state
 
     Returns:
-        Node name to route to: "conversational_agent" or END
+        Node name to route to: "fast_path" or END
     """
     if state.get("agent_disabled"):
         logger.info(
@@ -53,6 +53,21 @@ def should_continue_to_agent(state: ConversationState) -> str:
             extra={"conversation_id": state.get("conversation_id")},
         )
         return END
+    return "fast_path"
+
+
+def should_continue_after_fast_path(state: ConversationState) -> str:
+    """
+    Decide whether the fast path already answered the message.
+
+    Args:
+        state: Current conversation state
+
+    Returns:
+        Node name to route to: "conversational_agent" or END
+    """
+    if state.get("fast_path_handled"):
+        return END
     return "conversational_agent"
 
 
@@ -64,9 +79,11 @@ def create_conversation_graph(
 
     This graph has a conditional flow:
     1. process_incoming_message - Add user message to history (or auto-respond if agent disabled)
-    2. [conditional] If agent_disabled: END, else continue to conversational_agent
-    3. conversational_agent - Generate AI response
-    4. END
+    2. [conditional] If agent_disabled: END, else continue to fast_path
+    3. fast_path - Rule-based reply for trivially-classifiable messages
+    4. [conditional] If fast_path_handled: END, else continue to conversational_agent
+    5. conversational_agent - Generate AI response
+    6. END
 
     Args:
         checkpointer: Optional Redis checkpointer for state persistence
@@ -75,6 +92,7 @@ def create_conversation_graph(
         Compiled StateGraph ready for invocation
     """
     from agent.nodes.conversational_agent import conversational_agent_node
+    from agent.nodes.fast_path import fast_path_node
     from agent.nodes.process_message import process_incoming_message_node
 
     # Create StateGraph with ConversationState schema
@@ -82,6 +100,7 @@ def create_conversation_graph(
 
     # Add nodes
     graph.add_node("process_incoming_message", process_incoming_message_node)
+    graph.add_node("fast_path", fast_path_node)
     graph.add_node("conversational_agent", conversational_agent_node)
 
     # Define edges with conditional routing
@@ -91,6 +110,16 @@ def create_conversation_graph(
     graph.add_conditional_edges(
         "process_incoming_message",
         should_continue_to_agent,
+        {
+            "fast_path": "fast_path",
+            END: END,
+        }
+    )
+
+    # Conditional edge: skip the LLM if fast_path already replied
+    graph.add_conditional_edges(
+        "fast_path",
+        should_continue_after_fast_path,
         {
             "conversational_agent": "conversational_agent",
             END: END,
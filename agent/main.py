@@ -20,24 +20,42 @@ from sqlalchemy.orm import selectinload
 from agent.graphs.conversation_flow import create_conversation_graph
 from agent.state.checkpointer import get_redis_checkpointer, initialize_redis_indexes
 from agent.fsm.case_collection import CollectionStep, get_case_fsm_state, get_current_element_code
+from agent.services.catalogue_snapshot import CATALOGUE_CHANGED_CHANNEL, get_catalogue_snapshot
+from agent.services.constraint_service import (
+    CONSTRAINTS_CHANGED_CHANNEL,
+    CONSTRAINTS_VERSION_KEY,
+    set_listened_version,
+)
+from agent.services.outbound_scheduler import OutboundMessage, OutboundScheduler
+from agent.services.token_tracking import flush_token_usage
+from agent.utils.text_utils import is_completion_message
 from api.services.chatwoot_image_service import get_chatwoot_image_service
 from database.connection import get_async_session
 from database.models import User, Case, CaseImage
-from shared.chatwoot_client import ChatwootClient
+from shared.chatwoot_client import ChatwootClient, close_chatwoot_http_client
 from shared.config import get_settings
+from shared.image_derivatives import enqueue_derivatives, generate_derivatives, mark_derivatives_processed
+from shared.llm_metrics_flusher import LLMMetricsFlusher, set_llm_metrics_flusher
 from shared.logging_config import configure_logging
 from shared.text_utils import strip_markdown_for_whatsapp
 from shared.redis_client import (
     get_redis_client,
     publish_to_channel,
+    publish_outgoing_message,
     create_consumer_group,
     read_from_stream,
+    claim_stale_messages,
+    refresh_pending_messages,
     acknowledge_message,
     move_to_dead_letter,
     RedisServiceError,
     INCOMING_STREAM,
+    OUTGOING_STREAM,
     CONSUMER_GROUP,
+    OUTGOING_CONSUMER_GROUP,
+    OUTGOING_CHANNEL,
 )
+from shared.redis_keys import RedisKeys
 
 # Configure structured JSON logging
 configure_logging()
@@ -56,7 +74,10 @@ MAX_CONSECUTIVE_ERRORS = 5
 IMAGE_BATCH_TIMEOUT_SECONDS = 15  # Wait this long after last image before confirming
 IMAGE_BATCH_KEY_PREFIX = "image_batch:"  # Redis key prefix for batch tracking
 IMAGE_BATCH_FINAL_PREFIX = "image_batch_final:"  # Stores confirmed count for "listo" reconciliation
-COMPLETION_PHRASES = ["listo", "terminado", "ya está", "ya esta", "hecho", "fin", "ya", "eso es todo", "nada más", "nada mas"]
+IMAGE_BATCH_DEADLINES_KEY = "image_batch_deadlines"  # ZSET: conversation_id -> confirmation due time
+IMAGE_BATCH_MAX_IDLE_SECONDS = 3  # Longest the confirmation worker sleeps with nothing due
+IMAGE_BATCH_RETRY_BASE_SECONDS = 5  # First retry of a failed confirmation (doubles per attempt)
+IMAGE_BATCH_RETRY_MAX_SECONDS = 300
 
 # Per-conversation locks to prevent race conditions during graph invocations
 _conversation_locks: dict[str, asyncio.Lock] = {}
@@ -248,29 +269,6 @@ def is_image_attachment(attachment: dict) -> bool:
     return file_type == "image"
 
 
-def is_completion_message(message_text: str | None) -> bool:
-    """
-    Check if message text indicates user wants to finish sending images.
-
-    Args:
-        message_text: The user's message text
-
-    Returns:
-        True if message contains a completion phrase
-    """
-    if not message_text:
-        return False
-
-    text_lower = message_text.lower().strip()
-
-    # Exact match or starts with completion phrase
-    for phrase in COMPLETION_PHRASES:
-        if text_lower == phrase or text_lower.startswith(phrase + " "):
-            return True
-
-    return False
-
-
 async def get_case_image_count(case_id: str) -> int:
     """
     Get the count of existing images for a case.
@@ -303,6 +301,10 @@ async def save_images_silently(
     """
     Save images from attachments to disk and database without sending a response.
 
+    Attachments are downloaded concurrently (bounded by
+    CASE_IMAGES_DOWNLOAD_CONCURRENCY) and all CaseImage rows are inserted
+    in one transaction, numbered in the order the user sent them.
+
     Args:
         case_id: UUID of the case to attach images to
         conversation_id: For logging
@@ -315,8 +317,6 @@ async def save_images_silently(
         Tuple of (saved_count, failed_count)
     """
     image_service = get_chatwoot_image_service()
-    saved_count = 0
-    failed_count = 0
 
     # Filter to only image attachments
     image_attachments = [a for a in attachments if is_image_attachment(a)]
@@ -343,67 +343,94 @@ async def save_images_silently(
 
     # Use case short ID for naming: case_4df65b1a_image_1
     case_short_id = case_id[:8]
+    semaphore = asyncio.Semaphore(get_settings().CASE_IMAGES_DOWNLOAD_CONCURRENCY)
 
-    for i, attachment in enumerate(image_attachments):
+    async def download(index: int, attachment: dict) -> dict | None:
         data_url = attachment.get("data_url")
         if not data_url:
             logger.warning(f"Attachment missing data_url: {attachment}")
-            failed_count += 1
-            continue
+            return None
 
         try:
-            display_name = f"case_{case_short_id}_image_{existing_count + saved_count + 1}"
-            download_result = await image_service.download_image(
-                data_url=data_url,
-                display_name=display_name,
-                element_code=element_code,
+            async with semaphore:
+                download_result = await image_service.download_image(
+                    data_url=data_url,
+                    display_name=f"case_{case_short_id}_image_{existing_count + index + 1}",
+                    element_code=element_code,
+                )
+        except Exception as e:
+            logger.error(
+                f"Error downloading image: {e}",
+                extra={"conversation_id": conversation_id, "case_id": case_id},
+                exc_info=True,
             )
+            return None
 
-            if not download_result:
-                failed_count += 1
-                logger.error(
-                    f"Failed to download image | url={data_url} | case_id={case_id}",
-                    extra={"conversation_id": conversation_id, "case_id": case_id, "url": data_url},
-                )
-                continue
+        if not download_result:
+            logger.error(
+                f"Failed to download image | url={data_url} | case_id={case_id}",
+                extra={"conversation_id": conversation_id, "case_id": case_id, "url": data_url},
+            )
+        return download_result
 
-            # Save to database
-            async with get_async_session() as session:
-                case_image = CaseImage(
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(download(i, attachment) for i, attachment in enumerate(image_attachments))
+    )
+    downloaded = [result for result in results if result]
+    failed_count = len(results) - len(downloaded)
+
+    if not downloaded:
+        return 0, failed_count
+
+    # Number in attachment order (not completion order) so names match
+    # the order the user sent the photos, without gaps for failures
+    try:
+        async with get_async_session() as session:
+            for position, download_result in enumerate(downloaded, start=1):
+                download_result["display_name"] = f"case_{case_short_id}_image_{existing_count + position}"
+                session.add(CaseImage(
                     case_id=case_id,
                     stored_filename=download_result["stored_filename"],
                     original_filename=download_result.get("original_filename"),
                     mime_type=download_result["mime_type"],
                     file_size=download_result.get("file_size"),
-                    display_name=display_name,
+                    display_name=download_result["display_name"],
                     description="Imagen enviada por usuario via WhatsApp",
                     element_code=element_code,
                     image_type="user_upload",
                     chatwoot_message_id=chatwoot_message_id,
                     is_valid=None,
-                )
-                session.add(case_image)
-                await session.commit()
+                ))
+            await session.commit()
+    except Exception as e:
+        logger.error(
+            f"Error saving images: {e}",
+            extra={"conversation_id": conversation_id, "case_id": case_id},
+            exc_info=True,
+        )
+        # Nothing was recorded, don't leave orphan files behind
+        for download_result in downloaded:
+            image_service.delete_image(download_result["stored_filename"])
+        return 0, len(results)
 
-                logger.info(
-                    f"Image saved to database | "
-                    f"case_id={case_id} | display_name={display_name} | "
-                    f"filename={download_result['stored_filename']}",
-                    extra={
-                        "conversation_id": conversation_id,
-                        "case_id": case_id,
-                        "stored_filename": download_result["stored_filename"],
-                    },
-                )
-                saved_count += 1
+    await enqueue_derivatives([result["stored_filename"] for result in downloaded])
 
-        except Exception as e:
-            failed_count += 1
-            logger.error(
-                f"Error saving image: {e}",
-                extra={"conversation_id": conversation_id, "case_id": case_id},
-                exc_info=True,
-            )
+    saved_count = len(downloaded)
+    duration = time.monotonic() - started
+    logger.info(
+        f"Images saved to database | case_id={case_id} | saved={saved_count} | "
+        f"failed={failed_count} | duration={duration:.2f}s",
+        extra={
+            "metric_type": "case_images_saved",
+            "conversation_id": conversation_id,
+            "case_id": case_id,
+            "saved_count": saved_count,
+            "failed_count": failed_count,
+            "duration_ms": int(duration * 1000),
+            "stored_filenames": [result["stored_filename"] for result in downloaded],
+        },
+    )
 
     return saved_count, failed_count
 
@@ -539,6 +566,7 @@ async def reconcile_conversation_images(
                     session.add(case_image)
                     await session.commit()
 
+                await enqueue_derivatives([download_result["stored_filename"]])
                 reconciled += 1
                 logger.info(
                     f"Reconciliation: image recovered | msg_id={msg_id} | "
@@ -626,6 +654,7 @@ async def update_batch_counter(
         await redis_client.hset(key, mapping=mapping)
         # Set TTL of 1 hour to auto-cleanup stale batches
         await redis_client.expire(key, 3600)
+        await schedule_batch_confirmation(redis_client, conversation_id, float(mapping["last_update"]))
 
         logger.debug(
             f"Batch counter updated: {current_count} -> {new_count} (failed: {existing_failed + failed_count}) | "
@@ -642,6 +671,7 @@ async def reset_batch_counter(redis_client, conversation_id: str) -> None:
     key = f"{IMAGE_BATCH_KEY_PREFIX}{conversation_id}"
     try:
         await redis_client.delete(key)
+        await redis_client.zrem(IMAGE_BATCH_DEADLINES_KEY, conversation_id)
         logger.debug(f"Batch counter reset | conversation_id={conversation_id}")
     except Exception as e:
         logger.warning(f"Failed to reset batch counter: {e}")
@@ -926,8 +956,7 @@ async def subscribe_to_incoming_messages():
                 "Lo siento, tuve un problema técnico. "
                 "¿Puedes intentarlo de nuevo?"
             )
-            await publish_to_channel(
-                "outgoing_messages",
+            await publish_outgoing_message(
                 {
                     "conversation_id": conversation_id,
                     "customer_phone": user_phone,  # Keep as customer_phone for outgoing compatibility
@@ -961,8 +990,7 @@ async def subscribe_to_incoming_messages():
                 "¿Puedes intentarlo de nuevo?"
             )
             try:
-                await publish_to_channel(
-                    "outgoing_messages",
+                await publish_outgoing_message(
                     {
                         "conversation_id": conversation_id,
                         "customer_phone": user_phone,
@@ -1053,10 +1081,10 @@ async def subscribe_to_incoming_messages():
                 },
             )
 
-        # Publish to outgoing_messages channel
+        # Queue for delivery (outgoing stream or outgoing_messages channel)
         # Fix #2: Protect publish with Chatwoot direct fallback
         try:
-            await publish_to_channel("outgoing_messages", outgoing_payload)
+            await publish_outgoing_message(outgoing_payload)
             logger.info(
                 f"Message published to outgoing_messages: conversation_id={conversation_id}",
                 extra={"conversation_id": conversation_id},
@@ -1577,12 +1605,164 @@ async def subscribe_to_incoming_messages():
             raise
 
 
+# Outgoing stream messages handed to the scheduler but not yet acknowledged
+OUTGOING_MAX_IN_FLIGHT = 200
+OUTGOING_CLAIM_INTERVAL_SECONDS = 60
+
+
+async def consume_outgoing_stream():
+    """
+    Deliver replies from OUTGOING_STREAM via Chatwoot (USE_REDIS_STREAMS).
+
+    Messages stay pending in the consumer group until the OutboundScheduler
+    reports them delivered (XACK) or failed after its redelivery attempts
+    (moved to the dead letter stream). Messages left pending by a sender
+    that died are taken over after OUTBOUND_STREAM_CLAIM_IDLE_SECONDS, so
+    several agent processes can send in parallel without losing replies.
+    Messages still being delivered here have their idle time refreshed, so
+    slow deliveries are not taken over (and sent twice) by another sender.
+
+    Delivery is at-least-once: a sender dying between the Chatwoot 200
+    and the XACK means the reply is sent again by whoever claims it.
+    """
+    settings = get_settings()
+    consumer_name = f"sender-{os.getpid()}"
+    in_flight: set[str] = set()
+
+    async def on_delivered(outbound: OutboundMessage) -> None:
+        in_flight.discard(outbound.stream_msg_id)
+        await acknowledge_message(OUTGOING_STREAM, OUTGOING_CONSUMER_GROUP, outbound.stream_msg_id)
+
+    async def on_failed(outbound: OutboundMessage, error: str) -> None:
+        in_flight.discard(outbound.stream_msg_id)
+        await move_to_dead_letter(
+            OUTGOING_STREAM, OUTGOING_CONSUMER_GROUP, outbound.stream_msg_id, outbound.payload, error
+        )
+
+    scheduler = OutboundScheduler(
+        ChatwootClient(),
+        resolve_url=make_absolute_url,
+        on_delivered=on_delivered,
+        on_failed=on_failed,
+    )
+
+    logger.info(
+        f"Initializing outgoing stream consumer | stream={OUTGOING_STREAM} | "
+        f"group={OUTGOING_CONSUMER_GROUP} | consumer={consumer_name}"
+    )
+    await create_consumer_group(OUTGOING_STREAM, OUTGOING_CONSUMER_GROUP)
+
+    consecutive_errors = 0
+    last_claim = 0.0
+    last_refresh = time.monotonic()
+    # Well below the idle time after which other senders take messages over
+    refresh_interval = min(OUTGOING_CLAIM_INTERVAL_SECONDS, settings.OUTBOUND_STREAM_CLAIM_IDLE_SECONDS / 3)
+
+    try:
+        while not shutdown_event.is_set():
+            try:
+                if time.monotonic() - last_refresh >= refresh_interval:
+                    await refresh_pending_messages(
+                        OUTGOING_STREAM, OUTGOING_CONSUMER_GROUP, consumer_name, list(in_flight)
+                    )
+                    last_refresh = time.monotonic()
+
+                if len(in_flight) >= OUTGOING_MAX_IN_FLIGHT:
+                    # Let the scheduler catch up before reading more
+                    await asyncio.sleep(0.5)
+                    continue
+
+                entries: list[tuple[str, dict]] = []
+                if time.monotonic() - last_claim >= OUTGOING_CLAIM_INTERVAL_SECONDS:
+                    entries = await claim_stale_messages(
+                        OUTGOING_STREAM,
+                        OUTGOING_CONSUMER_GROUP,
+                        consumer_name,
+                        min_idle_ms=settings.OUTBOUND_STREAM_CLAIM_IDLE_SECONDS * 1000,
+                    )
+                    last_claim = time.monotonic()
+
+                entries += await read_from_stream(
+                    OUTGOING_STREAM,
+                    OUTGOING_CONSUMER_GROUP,
+                    consumer_name,
+                    count=20,
+                    block_ms=5000,
+                )
+
+                if consecutive_errors > 0:
+                    logger.info(f"Outgoing stream consumer recovered after {consecutive_errors} errors")
+                    consecutive_errors = 0
+
+                for stream_msg_id, data in entries:
+                    if stream_msg_id in in_flight:
+                        # Our own slow delivery, claimed back by the idle check
+                        continue
+
+                    if data.get("_parse_error"):
+                        await move_to_dead_letter(
+                            OUTGOING_STREAM, OUTGOING_CONSUMER_GROUP, stream_msg_id, data, "Invalid JSON"
+                        )
+                        continue
+
+                    outbound = OutboundMessage.from_payload(data, stream_msg_id=stream_msg_id)
+                    outbound.message = strip_markdown_for_whatsapp(outbound.message)
+
+                    logger.info(
+                        f"Outgoing message received: conversation_id={outbound.conversation_id}",
+                        extra={
+                            "conversation_id": outbound.conversation_id,
+                            "customer_phone": outbound.customer_phone,
+                            "has_images": len(outbound.images) > 0,
+                            "stream_msg_id": stream_msg_id,
+                        },
+                    )
+
+                    in_flight.add(stream_msg_id)
+                    scheduler.submit(outbound)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                consecutive_errors += 1
+                retry_delay = min(
+                    MAX_RETRY_DELAY,
+                    INIT_BASE_DELAY ** min(consecutive_errors, MAX_CONSECUTIVE_ERRORS)
+                )
+                logger.error(
+                    f"Outgoing stream consumer error (attempt {consecutive_errors}): {e}",
+                    exc_info=consecutive_errors == 1,
+                )
+                logger.warning(f"Outgoing stream consumer retrying in {retry_delay:.1f}s...")
+
+                if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                    redis_ready = await wait_for_redis_ready(get_redis_client(), max_wait=60)
+                    if not redis_ready:
+                        logger.error("Redis not available after 60s wait")
+
+                await asyncio.sleep(retry_delay)
+
+    except asyncio.CancelledError:
+        logger.info("Outgoing stream consumer cancelled")
+        raise
+
+    finally:
+        # Unacknowledged messages stay pending and are claimed after restart
+        await scheduler.close()
+        logger.info("Outgoing stream consumer stopped")
+
+
 async def subscribe_to_outgoing_messages():
     """
     Subscribe to outgoing_messages Redis channel and send via Chatwoot.
 
-    This worker listens for messages published by the conversation graph,
-    and sends them to customers via the Chatwoot API.
+    With USE_REDIS_STREAMS, replies are read from OUTGOING_STREAM instead
+    (see consume_outgoing_stream()).
+
+    This worker listens for messages published by the conversation graph
+    and hands them to an OutboundScheduler, which delivers each conversation
+    from its own queue (see agent/services/outbound_scheduler.py), so image
+    pacing for one customer never delays replies to another.
 
     Includes retry logic with exponential backoff for Redis connection failures.
 
@@ -1594,7 +1774,13 @@ async def subscribe_to_outgoing_messages():
             "pending_images": {"images": [...], "follow_up_message": "..."}
         }
     """
-    chatwoot = ChatwootClient()
+    if get_settings().USE_REDIS_STREAMS:
+        await consume_outgoing_stream()
+        return
+
+    # Pub/sub has no acknowledgement: failed messages are not redelivered
+    # after their in-process attempts
+    scheduler = OutboundScheduler(ChatwootClient(), resolve_url=make_absolute_url)
     consecutive_errors = 0
     pubsub = None
 
@@ -1607,7 +1793,7 @@ async def subscribe_to_outgoing_messages():
 
             # Create new pubsub connection
             pubsub = client.pubsub()
-            await pubsub.subscribe("outgoing_messages")
+            await pubsub.subscribe(OUTGOING_CHANNEL)
 
             logger.info("Subscribed to 'outgoing_messages' channel")
 
@@ -1623,199 +1809,23 @@ async def subscribe_to_outgoing_messages():
 
                 try:
                     data = json.loads(message["data"])
-                    customer_phone = data.get("customer_phone")
-                    message_text = data.get("message")
-                    conversation_id = data.get("conversation_id")
-
-                    # Handle both old format (list) and new format (dict with images/follow_up)
-                    pending_images = data.get("pending_images", data.get("images", []))
-                    images = []
-                    follow_up_message = None
-
-                    if isinstance(pending_images, dict):
-                        images = pending_images.get("images", [])
-                        follow_up_message = pending_images.get("follow_up_message")
-                    elif isinstance(pending_images, list):
-                        images = pending_images
+                    outbound = OutboundMessage.from_payload(data)
 
                     # Strip markdown for WhatsApp compatibility
-                    message_text = strip_markdown_for_whatsapp(message_text)
+                    outbound.message = strip_markdown_for_whatsapp(outbound.message)
 
                     logger.info(
-                        f"Outgoing message received: conversation_id={conversation_id}",
+                        f"Outgoing message received: conversation_id={outbound.conversation_id}",
                         extra={
-                            "conversation_id": conversation_id,
-                            "customer_phone": customer_phone,
-                            "has_images": len(images) > 0,
+                            "conversation_id": outbound.conversation_id,
+                            "customer_phone": outbound.customer_phone,
+                            "has_images": len(outbound.images) > 0,
                         },
                     )
 
-                    # Send text message via Chatwoot
-                    success = await chatwoot.send_message(
-                        customer_phone=customer_phone,
-                        message=message_text,
-                        conversation_id=conversation_id,
-                    )
-
-                    if success:
-                        logger.info(
-                            f"Message sent to {customer_phone}: success=True",
-                            extra={
-                                "conversation_id": conversation_id,
-                                "customer_phone": customer_phone,
-                            },
-                        )
-                    else:
-                        logger.error(
-                            f"Message sent to {customer_phone}: success=False",
-                            extra={
-                                "conversation_id": conversation_id,
-                                "customer_phone": customer_phone,
-                            },
-                        )
-
-                    # Send images if present (each with its own caption)
-                    if images and conversation_id:
-                        # Separate images by type (keep full metadata)
-                        base_images: list[dict] = []
-                        elemento_images: list[dict] = []
-
-                        for img in images:
-                            if isinstance(img, str):
-                                # Old format: just URL, treat as general/elemento
-                                elemento_images.append({
-                                    "url": img,
-                                    "tipo": "elemento",
-                                    "descripcion": "Documentación específica",
-                                })
-                            elif isinstance(img, dict):
-                                # New format: keep full metadata
-                                tipo = img.get("tipo", "general")
-                                # Accept both "base" and "base_documentation" for backward compatibility
-                                if tipo in ("base", "base_documentation"):
-                                    base_images.append(img)
-                                else:
-                                    elemento_images.append(img)
-
-                        total_images = len(base_images) + len(elemento_images)
-                        logger.info(
-                            f"Sending {total_images} images to conversation "
-                            f"{conversation_id} (base: {len(base_images)}, "
-                            f"elementos: {len(elemento_images)})",
-                            extra={
-                                "conversation_id": conversation_id,
-                                "base_images": len(base_images),
-                                "elemento_images": len(elemento_images),
-                            },
-                        )
-
-                        sent_count = 0
-                        image_counter = 0
-
-                        # Combine all images in order for sequential numbered sending
-                        all_images_ordered = base_images + elemento_images
-
-                        for img_data in all_images_ordered:
-                            url = img_data.get("url")
-                            descripcion = img_data.get("descripcion", "")
-                            tipo = img_data.get("tipo", "base" if img_data in base_images else "elemento")
-
-                            if not url:
-                                continue
-
-                            image_counter += 1
-
-                            logger.debug(
-                                f"Processing image {image_counter}/{total_images} | tipo={tipo}, url={url}",
-                                extra={"tipo": tipo, "url": url, "conversation_id": conversation_id}
-                            )
-
-                            absolute_url = make_absolute_url(url)
-                            if not absolute_url:
-                                logger.warning(
-                                    f"Failed to make absolute URL | url={url}",
-                                    extra={"url": url, "conversation_id": conversation_id}
-                                )
-                                continue
-
-                            # Add numbering to caption for ordering visibility
-                            numbered_caption = f"({image_counter}/{total_images}) {descripcion}" if descripcion else f"({image_counter}/{total_images})"
-
-                            try:
-                                message_id = await chatwoot.send_image(
-                                    conversation_id=int(conversation_id),
-                                    image_url=absolute_url,
-                                    caption=numbered_caption,
-                                )
-                                if message_id:
-                                    logger.info(
-                                        f"Image {image_counter}/{total_images} sent | "
-                                        f"tipo={tipo}, message_id={message_id}",
-                                        extra={
-                                            "tipo": tipo,
-                                            "url": absolute_url,
-                                            "message_id": message_id,
-                                            "image_number": image_counter,
-                                            "total_images": total_images,
-                                        }
-                                    )
-                                    sent_count += 1
-
-                                    # Fixed delay between images for WhatsApp ordering.
-                                    # Chatwoot adds a 2s Sidekiq wait before dispatching
-                                    # attachments to WhatsApp, so we need a large gap to
-                                    # ensure each image is fully dispatched before the next
-                                    # one arrives. 10s gives ~8s real gap between dispatches.
-                                    if image_counter < total_images:
-                                        await asyncio.sleep(5.0)
-                                else:
-                                    logger.warning(
-                                        f"Failed to send image {image_counter}/{total_images} | "
-                                        f"tipo={tipo}, url={absolute_url}",
-                                        extra={"tipo": tipo, "url": absolute_url}
-                                    )
-                            except Exception as e:
-                                logger.error(
-                                    f"Failed to send image {image_counter}/{total_images}: {e}",
-                                    extra={"conversation_id": conversation_id},
-                                )
-
-                        logger.info(
-                            f"Images sent to conversation {conversation_id}: "
-                            f"{sent_count}/{total_images}",
-                            extra={
-                                "conversation_id": conversation_id,
-                                "sent_count": sent_count,
-                                "total_images": total_images,
-                            },
-                        )
-
-                        # Send follow_up message after all images
-                        if follow_up_message and sent_count > 0:
-                            # Fixed delay before follow-up. Text messages have NO
-                            # Sidekiq wait in Chatwoot (unlike images which have 2s),
-                            # so we need extra gap to prevent the text from overtaking
-                            # the last image in WhatsApp's delivery queue.
-                            await asyncio.sleep(5.0)
-
-                            success = await chatwoot.send_message(
-                                customer_phone=customer_phone,
-                                message=follow_up_message,
-                                conversation_id=conversation_id,
-                            )
-                            if success:
-                                logger.info(
-                                    f"Follow-up message sent | conversation_id={conversation_id}",
-                                    extra={
-                                        "conversation_id": conversation_id,
-                                        "follow_up_message": follow_up_message[:50] + "..." if len(follow_up_message) > 50 else follow_up_message,
-                                    },
-                                )
-                            else:
-                                logger.warning(
-                                    f"Failed to send follow-up message | conversation_id={conversation_id}",
-                                    extra={"conversation_id": conversation_id},
-                                )
+                    # Delivery (and image pacing) runs in the conversation's
+                    # own queue; the listener goes straight back to Redis
+                    scheduler.submit(outbound)
 
                 except json.JSONDecodeError as e:
                     logger.error(f"Invalid JSON in outgoing message: {e}")
@@ -1832,10 +1842,11 @@ async def subscribe_to_outgoing_messages():
             logger.info("Outgoing message subscriber cancelled")
             if pubsub:
                 try:
-                    await pubsub.unsubscribe("outgoing_messages")
+                    await pubsub.unsubscribe(OUTGOING_CHANNEL)
                     await pubsub.aclose()
                 except Exception:
                     pass
+            await scheduler.close()
             raise
 
         except Exception as e:
@@ -1855,7 +1866,7 @@ async def subscribe_to_outgoing_messages():
             # Cleanup old pubsub connection
             if pubsub:
                 try:
-                    await pubsub.unsubscribe("outgoing_messages")
+                    await pubsub.unsubscribe(OUTGOING_CHANNEL)
                     await pubsub.aclose()
                 except Exception:
                     pass
@@ -1877,253 +1888,604 @@ async def subscribe_to_outgoing_messages():
             await asyncio.sleep(retry_delay)
 
     # Cleanup on exit
+    await scheduler.close()
     logger.info("Outgoing message subscriber stopped")
 
 
+async def schedule_batch_confirmation(
+    redis_client,
+    conversation_id: str,
+    last_update: float | None = None,
+    delay: float = IMAGE_BATCH_TIMEOUT_SECONDS,
+) -> None:
+    """
+    (Re)schedule the batch confirmation for a conversation.
+
+    The deadline (last image + IMAGE_BATCH_TIMEOUT_SECONDS, or `delay`
+    from now for retries) is kept in the IMAGE_BATCH_DEADLINES_KEY sorted
+    set, so the confirmation worker only looks at batches that are due
+    instead of scanning the keyspace. A later deadline is never moved
+    earlier.
+    """
+    deadline = (last_update if last_update is not None else time.time()) + delay
+    await redis_client.zadd(IMAGE_BATCH_DEADLINES_KEY, {conversation_id: deadline}, gt=True)
+
+
+async def confirm_image_batch(redis_client, chatwoot: ChatwootClient, conversation_id: str) -> None:
+    """
+    Reconcile and confirm one due image batch.
+
+    Runs as its own task (reconciliation can wait 15s for Chatwoot), so a
+    slow batch never delays the others.
+
+    Args:
+        redis_client: Redis client
+        chatwoot: Chatwoot client for the confirmation message
+        conversation_id: Conversation whose batch deadline passed
+    """
+    key = f"{IMAGE_BATCH_KEY_PREFIX}{conversation_id}"
+    claimed_at = time.time()
+
+    try:
+        data = await redis_client.hgetall(key)
+        if not data:
+            return  # Batch reset ("listo") or expired
+
+        # Handle both bytes and string keys (depends on Redis client config)
+        count = int(data.get(b"count", data.get("count", 0)))
+        failed = int(data.get(b"failed", data.get("failed", 0)))
+        last_update = float(data.get(b"last_update", data.get("last_update", 0)))
+        user_phone = (
+            data.get(b"user_phone", data.get("user_phone", b""))
+        )
+        if isinstance(user_phone, bytes):
+            user_phone = user_phone.decode("utf-8")
+
+        # More images arrived after the deadline was claimed
+        elapsed = time.time() - last_update
+        if elapsed < IMAGE_BATCH_TIMEOUT_SECONDS:
+            await schedule_batch_confirmation(redis_client, conversation_id, last_update)
+            return
+
+        if count <= 0 and failed <= 0:
+            # No images at all, just clean up
+            await redis_client.delete(key)
+            return
+
+        logger.info(
+            f"Sending batch confirmation | "
+            f"conversation_id={conversation_id} | count={count} | failed={failed}",
+            extra={
+                "conversation_id": conversation_id,
+                "batch_count": count,
+                "batch_failed": failed,
+            },
+        )
+
+        # Get case_id: first try from batch hash, fallback to FSM state
+        case_id_raw = data.get(b"case_id", data.get("case_id", b""))
+        if isinstance(case_id_raw, bytes):
+            case_id_raw = case_id_raw.decode("utf-8")
+        case_id = case_id_raw or None
+
+        if not case_id:
+            # Fallback: get from FSM state
+            checkpointer = get_redis_checkpointer()
+            fsm_state = await get_fsm_state_from_checkpoint(
+                checkpointer, conversation_id
+            )
+            case_fsm = get_case_fsm_state(fsm_state) if fsm_state else {}
+            case_id = case_fsm.get("case_id")
+
+        # RECONCILIATION: Before confirming, check Chatwoot
+        # for any images whose webhooks were dropped
+        if case_id:
+            case_created_at = None
+            try:
+                async with get_async_session() as session:
+                    case_obj = await session.get(Case, uuid_mod.UUID(case_id))
+                    if case_obj and case_obj.created_at:
+                        case_created_at = case_obj.created_at.timestamp()
+            except Exception as e:
+                logger.warning(f"Could not get case created_at: {e}")
+
+            reconciled, recon_failed = await reconcile_conversation_images(
+                conversation_id=conversation_id,
+                case_id=case_id,
+                case_created_at=case_created_at,
+            )
+
+            if reconciled > 0:
+                count += reconciled
+            if recon_failed > 0:
+                failed += recon_failed
+
+            # Retry reconciliation if first pass recovered images
+            # (indicates Chatwoot is still processing, more may appear)
+            if reconciled > 0:
+                logger.info(
+                    f"Reconciliation recovered {reconciled} images, "
+                    f"retrying after 15s to catch remaining | "
+                    f"conversation_id={conversation_id}",
+                    extra={"conversation_id": conversation_id},
+                )
+                await asyncio.sleep(15)
+                retry_reconciled, retry_failed = await reconcile_conversation_images(
+                    conversation_id=conversation_id,
+                    case_id=case_id,
+                    case_created_at=case_created_at,
+                )
+                if retry_reconciled > 0:
+                    count += retry_reconciled
+                    logger.info(
+                        f"Reconciliation retry recovered {retry_reconciled} more | "
+                        f"conversation_id={conversation_id}",
+                        extra={"conversation_id": conversation_id},
+                    )
+                if retry_failed > 0:
+                    failed += retry_failed
+
+        # Get total images from DB (after reconciliation)
+        total_images = 0
+        if case_id:
+            total_images = await get_total_case_images(case_id)
+
+        # Build confirmation message
+        if failed > 0 and count == 0:
+            # All images failed
+            message = (
+                f"No se pudieron descargar {failed} imagen(es). "
+                f"Intenta enviarlas de nuevo.\n\n"
+                f"Cuando hayas enviado todas las fotos, escribe 'listo'."
+            )
+        elif failed > 0:
+            if total_images > count:
+                message = (
+                    f"He recibido {count} imagen(es) nueva(s). "
+                    f"{failed} no se pudieron descargar, intenta enviarlas de nuevo.\n"
+                    f"Total en el expediente: {total_images}.\n\n"
+                    f"Cuando hayas enviado todas las fotos, escribe 'listo'."
+                )
+            else:
+                message = (
+                    f"He recibido {count} imagen(es). "
+                    f"{failed} no se pudieron descargar, intenta enviarlas de nuevo.\n\n"
+                    f"Cuando hayas enviado todas las fotos, escribe 'listo'."
+                )
+        elif total_images > count:
+            message = (
+                f"He recibido {count} imagen(es) nueva(s). "
+                f"Total en el expediente: {total_images}.\n\n"
+                f"Cuando hayas enviado todas las fotos, escribe 'listo'."
+            )
+        else:
+            message = (
+                f"He recibido {count} imagen(es).\n\n"
+                f"Cuando hayas enviado todas las fotos, escribe 'listo'."
+            )
+
+        # Send confirmation via Chatwoot
+        # Convert conversation_id to int if it's numeric
+        conv_id_for_chatwoot = None
+        try:
+            conv_id_for_chatwoot = int(conversation_id)
+        except (ValueError, TypeError):
+            pass
+
+        success = await chatwoot.send_message(
+            customer_phone=user_phone,
+            message=message,
+            conversation_id=conv_id_for_chatwoot,
+        )
+
+        if success:
+            logger.info(
+                f"Batch confirmation sent | conversation_id={conversation_id}",
+                extra={"conversation_id": conversation_id},
+            )
+        else:
+            logger.warning(
+                f"Failed to send batch confirmation | "
+                f"conversation_id={conversation_id}",
+                extra={"conversation_id": conversation_id},
+            )
+
+        # Store confirmed count for "listo" reconciliation (Fix 3)
+        final_key = f"{IMAGE_BATCH_FINAL_PREFIX}{conversation_id}"
+        try:
+            await redis_client.hset(final_key, mapping={
+                "confirmed_count": str(count),
+                "total_images": str(total_images),
+                "case_id": case_id or "",
+                "conversation_id": conversation_id,
+            })
+            await redis_client.expire(final_key, 7200)  # 2h TTL
+            logger.debug(
+                f"Stored batch final info | conversation_id={conversation_id} | "
+                f"confirmed_count={count} | total_images={total_images}",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store batch final info: {e}")
+
+        # Reset the batch counter
+        await redis_client.delete(key)
+
+        confirmed_at = time.time()
+        logger.info(
+            f"Batch confirmation done | conversation_id={conversation_id} | "
+            f"delay={confirmed_at - last_update:.1f}s",
+            extra={
+                "metric_type": "image_batch_confirmation",
+                "conversation_id": conversation_id,
+                # Last image → confirmation sent (timeout + reconciliation)
+                "confirmation_delay_ms": int((confirmed_at - last_update) * 1000),
+                # Deadline → claimed by the scheduler
+                "scheduler_lag_ms": int(max(claimed_at - (last_update + IMAGE_BATCH_TIMEOUT_SECONDS), 0) * 1000),
+                "batch_count": count,
+                "batch_failed": failed,
+            },
+        )
+
+
+    except Exception as e:
+        logger.error(
+            f"Error processing batch key {key}: {e}",
+            exc_info=True,
+        )
+        await _retry_batch_confirmation(redis_client, conversation_id)
+
+
+async def _retry_batch_confirmation(redis_client, conversation_id: str) -> None:
+    """
+    Reschedule a batch whose confirmation failed, with exponential backoff.
+
+    The worker claimed the deadline (ZREM) before confirming, so without
+    this the batch would never be confirmed. Retries stop when the batch
+    key expires (1h TTL) or is reset.
+    """
+    key = f"{IMAGE_BATCH_KEY_PREFIX}{conversation_id}"
+    try:
+        if not await redis_client.exists(key):
+            return
+        attempt = await redis_client.hincrby(key, "retries", 1)
+        delay = min(IMAGE_BATCH_RETRY_BASE_SECONDS * 2 ** (attempt - 1), IMAGE_BATCH_RETRY_MAX_SECONDS)
+        await schedule_batch_confirmation(redis_client, conversation_id, delay=delay)
+        logger.warning(
+            f"Batch confirmation rescheduled in {delay}s | conversation_id={conversation_id} | attempt={attempt}",
+            extra={"conversation_id": conversation_id, "retry_attempt": attempt},
+        )
+    except Exception as e:
+        # Picked up again by backfill_batch_deadlines() on the next worker start
+        logger.error(f"Failed to reschedule batch confirmation | conversation_id={conversation_id}: {e}")
+
+
+async def backfill_batch_deadlines(redis_client) -> int:
+    """
+    Schedule batches that were started before deadlines were tracked.
+
+    One SCAN at worker startup; afterwards update_batch_counter() keeps
+    the sorted set current.
+
+    Returns:
+        Number of batches scheduled
+    """
+    scheduled = 0
+    cursor = 0
+    while True:
+        cursor, keys = await redis_client.scan(
+            cursor=cursor,
+            match=f"{IMAGE_BATCH_KEY_PREFIX}*",
+            count=100,
+        )
+        for key in keys:
+            key_str = key.decode("utf-8") if isinstance(key, bytes) else key
+            conversation_id = key_str.replace(IMAGE_BATCH_KEY_PREFIX, "")
+            _, last_update = await get_batch_info(redis_client, conversation_id)
+            # nx: never move a deadline that is already tracked
+            await redis_client.zadd(
+                IMAGE_BATCH_DEADLINES_KEY,
+                {conversation_id: last_update + IMAGE_BATCH_TIMEOUT_SECONDS},
+                nx=True,
+            )
+            scheduled += 1
+        if cursor == 0:
+            return scheduled
+
+
 async def image_batch_confirmation_worker():
     """
     Background worker that sends batch confirmation messages after timeout.
 
-    This worker periodically checks Redis for image batches that have been
-    idle for IMAGE_BATCH_TIMEOUT_SECONDS and sends a confirmation message
-    to the user.
+    Batches become due IMAGE_BATCH_TIMEOUT_SECONDS after their last image
+    (deadlines in the IMAGE_BATCH_DEADLINES_KEY sorted set). The worker
+    sleeps until the earliest deadline, claims due batches with ZREM (so
+    several agent processes never confirm the same batch twice) and
+    confirms each one in its own task.
 
     The confirmation tells the user how many images were received and
     prompts them to say "listo" when done.
     """
     chatwoot = ChatwootClient()
-    check_interval = 3  # Check every 3 seconds
+    running: dict[str, asyncio.Task] = {}
 
     logger.info(
         f"Image batch confirmation worker started | "
-        f"timeout={IMAGE_BATCH_TIMEOUT_SECONDS}s | check_interval={check_interval}s"
+        f"timeout={IMAGE_BATCH_TIMEOUT_SECONDS}s | max_idle={IMAGE_BATCH_MAX_IDLE_SECONDS}s"
     )
 
+    try:
+        backfilled = await backfill_batch_deadlines(get_redis_client())
+        if backfilled:
+            logger.info(f"Scheduled {backfilled} pending image batches")
+    except Exception as e:
+        logger.warning(f"Image batch deadline backfill failed: {e}")
+
+    try:
+        while not shutdown_event.is_set():
+            try:
+                client = get_redis_client()
+                now = time.time()
+
+                due = await client.zrangebyscore(
+                    IMAGE_BATCH_DEADLINES_KEY, "-inf", now, start=0, num=50
+                )
+                for member in due:
+                    conversation_id = member.decode("utf-8") if isinstance(member, bytes) else member
+
+                    if conversation_id in running:
+                        # Previous confirmation still reconciling; check again shortly
+                        await client.zadd(IMAGE_BATCH_DEADLINES_KEY, {conversation_id: now + 1})
+                        continue
+
+                    if not await client.zrem(IMAGE_BATCH_DEADLINES_KEY, conversation_id):
+                        continue  # Claimed by another worker
+
+                    task = asyncio.create_task(
+                        confirm_image_batch(client, chatwoot, conversation_id)
+                    )
+                    running[conversation_id] = task
+                    task.add_done_callback(lambda _, cid=conversation_id: running.pop(cid, None))
+
+                # Sleep until the next deadline (new batches are always due
+                # later than existing ones, so nothing can become due sooner)
+                next_due = await client.zrange(IMAGE_BATCH_DEADLINES_KEY, 0, 0, withscores=True)
+                wait = IMAGE_BATCH_MAX_IDLE_SECONDS
+                if next_due:
+                    wait = min(max(next_due[0][1] - time.time(), 0.1), IMAGE_BATCH_MAX_IDLE_SECONDS)
+                if len(due) == 50:
+                    wait = 0  # More due batches than one read returned
+                await asyncio.sleep(wait)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.error(
+                    f"Error in image batch confirmation worker: {e}",
+                    exc_info=True,
+                )
+                await asyncio.sleep(IMAGE_BATCH_MAX_IDLE_SECONDS)
+
+    except asyncio.CancelledError:
+        logger.info("Image batch confirmation worker cancelled")
+        raise
+
+    finally:
+        if running:
+            await asyncio.gather(*running.values(), return_exceptions=True)
+
+    logger.info("Image batch confirmation worker stopped")
+
+
+async def token_usage_flush_worker():
+    """
+    Background worker that persists accumulated token usage.
+
+    record_token_usage() only increments Redis counters; this worker moves
+    them into the monthly TokenUsage row every TOKEN_USAGE_FLUSH_INTERVAL_SECONDS.
+    """
+    settings = get_settings()
+    flush_interval = settings.TOKEN_USAGE_FLUSH_INTERVAL_SECONDS
+
+    logger.info(f"Token usage flush worker started | interval={flush_interval}s")
+
+    while not shutdown_event.is_set():
+        try:
+            await flush_token_usage()
+            await asyncio.sleep(flush_interval)
+
+        except asyncio.CancelledError:
+            logger.info("Token usage flush worker cancelled")
+            raise
+
+        except Exception as e:
+            logger.error(f"Error in token usage flush worker: {e}", exc_info=True)
+            await asyncio.sleep(flush_interval)
+
+    logger.info("Token usage flush worker stopped")
+
+
+async def image_derivatives_worker():
+    """
+    Background worker that creates gallery thumbnails/previews of case images.
+
+    Images are queued by enqueue_derivatives() once saved; decoding runs in a
+    thread, one image at a time, so ingestion never waits for it.
+    """
+    queue_key = RedisKeys.case_image_derivatives_queue()
+    logger.info("Image derivatives worker started")
+
     while not shutdown_event.is_set():
         try:
             client = get_redis_client()
+            item = await client.blpop([queue_key], timeout=5)
+            if not item:
+                continue
 
-            # Scan for all batch keys
-            cursor = 0
-            while True:
-                cursor, keys = await client.scan(
-                    cursor=cursor,
-                    match=f"{IMAGE_BATCH_KEY_PREFIX}*",
-                    count=100,
-                )
+            _, stored_filename = item
+            started = time.monotonic()
+            names = await asyncio.to_thread(generate_derivatives, stored_filename)
+            await mark_derivatives_processed(stored_filename)
+            duration = time.monotonic() - started
+            logger.debug(
+                f"Image derivatives {'ready' if names else 'skipped'} | {stored_filename} | {duration:.2f}s",
+                extra={
+                    "metric_type": "image_derivatives",
+                    "stored_filename": stored_filename,
+                    "generated": bool(names),
+                    "duration_ms": int(duration * 1000),
+                },
+            )
 
-                for key in keys:
-                    try:
-                        # Get batch data
-                        data = await client.hgetall(key)
-                        if not data:
-                            continue
+        except asyncio.CancelledError:
+            logger.info("Image derivatives worker cancelled")
+            raise
 
-                        # Handle both bytes and string keys (depends on Redis client config)
-                        count = int(data.get(b"count", data.get("count", 0)))
-                        failed = int(data.get(b"failed", data.get("failed", 0)))
-                        last_update = float(data.get(b"last_update", data.get("last_update", 0)))
-                        user_phone = (
-                            data.get(b"user_phone", data.get("user_phone", b""))
-                        )
-                        if isinstance(user_phone, bytes):
-                            user_phone = user_phone.decode("utf-8")
+        except Exception as e:
+            logger.error(f"Error in image derivatives worker: {e}", exc_info=True)
+            await asyncio.sleep(5)
 
-                        # Check if batch is ready for confirmation
-                        elapsed = time.time() - last_update
-                        if elapsed < IMAGE_BATCH_TIMEOUT_SECONDS:
-                            continue  # Still waiting for more images
+    logger.info("Image derivatives worker stopped")
 
-                        # Extract conversation_id from key
-                        key_str = key.decode("utf-8") if isinstance(key, bytes) else key
-                        conversation_id = key_str.replace(IMAGE_BATCH_KEY_PREFIX, "")
 
-                        if count <= 0 and failed <= 0:
-                            # No images at all, just clean up
-                            await client.delete(key)
-                            continue
+async def catalogue_invalidation_worker():
+    """
+    Keep the in-process catalogue snapshot in sync with admin changes.
 
-                        logger.info(
-                            f"Sending batch confirmation | "
-                            f"conversation_id={conversation_id} | count={count} | failed={failed}",
-                            extra={
-                                "conversation_id": conversation_id,
-                                "batch_count": count,
-                                "batch_failed": failed,
-                            },
-                        )
+    The snapshot only serves reads while this worker is subscribed to
+    CATALOGUE_CHANGED_CHANNEL; every message (or reconnect) drops it.
+    """
+    snapshot = get_catalogue_snapshot()
+    consecutive_errors = 0
+    pubsub = None
 
-                        # Get case_id: first try from batch hash, fallback to FSM state
-                        case_id_raw = data.get(b"case_id", data.get("case_id", b""))
-                        if isinstance(case_id_raw, bytes):
-                            case_id_raw = case_id_raw.decode("utf-8")
-                        case_id = case_id_raw or None
+    logger.info(f"Starting catalogue invalidation subscriber on '{CATALOGUE_CHANGED_CHANNEL}'...")
 
-                        if not case_id:
-                            # Fallback: get from FSM state
-                            checkpointer = get_redis_checkpointer()
-                            fsm_state = await get_fsm_state_from_checkpoint(
-                                checkpointer, conversation_id
-                            )
-                            case_fsm = get_case_fsm_state(fsm_state) if fsm_state else {}
-                            case_id = case_fsm.get("case_id")
+    while not shutdown_event.is_set():
+        try:
+            client = get_redis_client()
+            pubsub = client.pubsub()
+            await pubsub.subscribe(CATALOGUE_CHANGED_CHANNEL)
 
-                        # RECONCILIATION: Before confirming, check Chatwoot
-                        # for any images whose webhooks were dropped
-                        if case_id:
-                            case_created_at = None
-                            try:
-                                async with get_async_session() as session:
-                                    case_obj = await session.get(Case, uuid_mod.UUID(case_id))
-                                    if case_obj and case_obj.created_at:
-                                        case_created_at = case_obj.created_at.timestamp()
-                            except Exception as e:
-                                logger.warning(f"Could not get case created_at: {e}")
-
-                            reconciled, recon_failed = await reconcile_conversation_images(
-                                conversation_id=conversation_id,
-                                case_id=case_id,
-                                case_created_at=case_created_at,
-                            )
+            # Changes published while we were not subscribed were missed
+            snapshot.set_subscribed(True)
+            logger.info(f"Subscribed to '{CATALOGUE_CHANGED_CHANNEL}' channel")
+            consecutive_errors = 0
 
-                            if reconciled > 0:
-                                count += reconciled
-                            if recon_failed > 0:
-                                failed += recon_failed
-
-                            # Retry reconciliation if first pass recovered images
-                            # (indicates Chatwoot is still processing, more may appear)
-                            if reconciled > 0:
-                                logger.info(
-                                    f"Reconciliation recovered {reconciled} images, "
-                                    f"retrying after 15s to catch remaining | "
-                                    f"conversation_id={conversation_id}",
-                                    extra={"conversation_id": conversation_id},
-                                )
-                                await asyncio.sleep(15)
-                                retry_reconciled, retry_failed = await reconcile_conversation_images(
-                                    conversation_id=conversation_id,
-                                    case_id=case_id,
-                                    case_created_at=case_created_at,
-                                )
-                                if retry_reconciled > 0:
-                                    count += retry_reconciled
-                                    logger.info(
-                                        f"Reconciliation retry recovered {retry_reconciled} more | "
-                                        f"conversation_id={conversation_id}",
-                                        extra={"conversation_id": conversation_id},
-                                    )
-                                if retry_failed > 0:
-                                    failed += retry_failed
-
-                        # Get total images from DB (after reconciliation)
-                        total_images = 0
-                        if case_id:
-                            total_images = await get_total_case_images(case_id)
-
-                        # Build confirmation message
-                        if failed > 0 and count == 0:
-                            # All images failed
-                            message = (
-                                f"No se pudieron descargar {failed} imagen(es). "
-                                f"Intenta enviarlas de nuevo.\n\n"
-                                f"Cuando hayas enviado todas las fotos, escribe 'listo'."
-                            )
-                        elif failed > 0:
-                            if total_images > count:
-                                message = (
-                                    f"He recibido {count} imagen(es) nueva(s). "
-                                    f"{failed} no se pudieron descargar, intenta enviarlas de nuevo.\n"
-                                    f"Total en el expediente: {total_images}.\n\n"
-                                    f"Cuando hayas enviado todas las fotos, escribe 'listo'."
-                                )
-                            else:
-                                message = (
-                                    f"He recibido {count} imagen(es). "
-                                    f"{failed} no se pudieron descargar, intenta enviarlas de nuevo.\n\n"
-                                    f"Cuando hayas enviado todas las fotos, escribe 'listo'."
-                                )
-                        elif total_images > count:
-                            message = (
-                                f"He recibido {count} imagen(es) nueva(s). "
-                                f"Total en el expediente: {total_images}.\n\n"
-                                f"Cuando hayas enviado todas las fotos, escribe 'listo'."
-                            )
-                        else:
-                            message = (
-                                f"He recibido {count} imagen(es).\n\n"
-                                f"Cuando hayas enviado todas las fotos, escribe 'listo'."
-                            )
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
 
-                        # Send confirmation via Chatwoot
-                        # Convert conversation_id to int if it's numeric
-                        conv_id_for_chatwoot = None
-                        try:
-                            conv_id_for_chatwoot = int(conversation_id)
-                        except (ValueError, TypeError):
-                            pass
-
-                        success = await chatwoot.send_message(
-                            customer_phone=user_phone,
-                            message=message,
-                            conversation_id=conv_id_for_chatwoot,
-                        )
+                try:
+                    scope = json.loads(message["data"]).get("scope", "unknown")
+                except (TypeError, ValueError):
+                    scope = "unknown"
+                snapshot.invalidate_all(reason=scope)
 
-                        if success:
-                            logger.info(
-                                f"Batch confirmation sent | conversation_id={conversation_id}",
-                                extra={"conversation_id": conversation_id},
-                            )
-                        else:
-                            logger.warning(
-                                f"Failed to send batch confirmation | "
-                                f"conversation_id={conversation_id}",
-                                extra={"conversation_id": conversation_id},
-                            )
+        except asyncio.CancelledError:
+            logger.info("Catalogue invalidation subscriber cancelled")
+            snapshot.set_subscribed(False)
+            if pubsub:
+                try:
+                    await pubsub.unsubscribe(CATALOGUE_CHANGED_CHANNEL)
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            raise
 
-                        # Store confirmed count for "listo" reconciliation (Fix 3)
-                        final_key = f"{IMAGE_BATCH_FINAL_PREFIX}{conversation_id}"
-                        try:
-                            await client.hset(final_key, mapping={
-                                "confirmed_count": str(count),
-                                "total_images": str(total_images),
-                                "case_id": case_id or "",
-                                "conversation_id": conversation_id,
-                            })
-                            await client.expire(final_key, 7200)  # 2h TTL
-                            logger.debug(
-                                f"Stored batch final info | conversation_id={conversation_id} | "
-                                f"confirmed_count={count} | total_images={total_images}",
-                            )
-                        except Exception as e:
-                            logger.warning(f"Failed to store batch final info: {e}")
+        except Exception as e:
+            # Stop serving from memory until we are subscribed again
+            snapshot.set_subscribed(False)
+            consecutive_errors += 1
+            retry_delay = min(
+                MAX_RETRY_DELAY,
+                INIT_BASE_DELAY ** min(consecutive_errors, MAX_CONSECUTIVE_ERRORS)
+            )
+            logger.error(
+                f"Catalogue invalidation subscriber error (attempt {consecutive_errors}): {e}",
+                exc_info=consecutive_errors == 1,
+            )
+            if pubsub:
+                try:
+                    await pubsub.unsubscribe(CATALOGUE_CHANGED_CHANNEL)
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+                pubsub = None
+            await asyncio.sleep(retry_delay)
 
-                        # Reset the batch counter
-                        await client.delete(key)
+    snapshot.set_subscribed(False)
+    logger.info("Catalogue invalidation subscriber stopped")
 
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing batch key {key}: {e}",
-                            exc_info=True,
-                        )
 
-                if cursor == 0:
-                    break  # Scan complete
+async def constraints_invalidation_worker():
+    """
+    Push constraint version changes into this process.
+
+    While subscribed to CONSTRAINTS_CHANGED_CHANNEL, constraint reads need
+    no Redis round trip to know their cached set is current; every change
+    (or reconnect) drops the in-process sets.
+    """
+    consecutive_errors = 0
+    pubsub = None
+
+    logger.info(f"Starting constraints invalidation subscriber on '{CONSTRAINTS_CHANGED_CHANNEL}'...")
+
+    while not shutdown_event.is_set():
+        try:
+            client = get_redis_client()
+            pubsub = client.pubsub()
+            await pubsub.subscribe(CONSTRAINTS_CHANGED_CHANNEL)
+
+            # Read the version after subscribing so no bump is missed
+            set_listened_version(int(await client.get(CONSTRAINTS_VERSION_KEY) or 0))
+            logger.info(f"Subscribed to '{CONSTRAINTS_CHANGED_CHANNEL}' channel")
+            consecutive_errors = 0
+
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
 
-            await asyncio.sleep(check_interval)
+                try:
+                    version = int(json.loads(message["data"])["version"])
+                except (TypeError, ValueError, KeyError):
+                    version = int(await client.get(CONSTRAINTS_VERSION_KEY) or 0)
+                set_listened_version(version)
 
         except asyncio.CancelledError:
-            logger.info("Image batch confirmation worker cancelled")
+            logger.info("Constraints invalidation subscriber cancelled")
+            set_listened_version(None)
+            if pubsub:
+                try:
+                    await pubsub.unsubscribe(CONSTRAINTS_CHANGED_CHANNEL)
+                    await pubsub.aclose()
+                except Exception:
+                    pass
             raise
 
         except Exception as e:
+            # Fall back to reading the version from Redis on each lookup
+            set_listened_version(None)
+            consecutive_errors += 1
+            retry_delay = min(
+                MAX_RETRY_DELAY,
+                INIT_BASE_DELAY ** min(consecutive_errors, MAX_CONSECUTIVE_ERRORS)
+            )
             logger.error(
-                f"Error in image batch confirmation worker: {e}",
-                exc_info=True,
+                f"Constraints invalidation subscriber error (attempt {consecutive_errors}): {e}",
+                exc_info=consecutive_errors == 1,
             )
-            await asyncio.sleep(check_interval)
+            if pubsub:
+                try:
+                    await pubsub.unsubscribe(CONSTRAINTS_CHANGED_CHANNEL)
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+                pubsub = None
+            await asyncio.sleep(retry_delay)
 
-    logger.info("Image batch confirmation worker stopped")
+    set_listened_version(None)
+    logger.info("Constraints invalidation subscriber stopped")
 
 
 async def main():
@@ -2145,12 +2507,22 @@ async def main():
     except NotImplementedError:
         logger.warning("Signal handlers not supported on this platform")
 
+    # Persist LLM usage metrics in the background (batched)
+    llm_metrics_flusher = LLMMetricsFlusher()
+    await llm_metrics_flusher.start()
+    set_llm_metrics_flusher(llm_metrics_flusher)
+
     # Start all workers concurrently with supervisor
     workers = {
         "incoming": asyncio.create_task(subscribe_to_incoming_messages()),
         "outgoing": asyncio.create_task(subscribe_to_outgoing_messages()),
         "image_batch": asyncio.create_task(image_batch_confirmation_worker()),
+        "token_usage": asyncio.create_task(token_usage_flush_worker()),
+        "constraints": asyncio.create_task(constraints_invalidation_worker()),
+        "image_derivatives": asyncio.create_task(image_derivatives_worker()),
     }
+    if get_settings().ENABLE_CATALOGUE_SNAPSHOT:
+        workers["catalogue"] = asyncio.create_task(catalogue_invalidation_worker())
 
     async def supervisor():
         """Monitor workers and restart them if they die unexpectedly."""
@@ -2179,6 +2551,14 @@ async def main():
                         workers[name] = asyncio.create_task(subscribe_to_outgoing_messages())
                     elif name == "image_batch":
                         workers[name] = asyncio.create_task(image_batch_confirmation_worker())
+                    elif name == "token_usage":
+                        workers[name] = asyncio.create_task(token_usage_flush_worker())
+                    elif name == "constraints":
+                        workers[name] = asyncio.create_task(constraints_invalidation_worker())
+                    elif name == "catalogue":
+                        workers[name] = asyncio.create_task(catalogue_invalidation_worker())
+                    elif name == "image_derivatives":
+                        workers[name] = asyncio.create_task(image_derivatives_worker())
                     logger.info(f"Worker '{name}' restarted")
 
             await asyncio.sleep(5)  # Check every 5 seconds
@@ -2202,6 +2582,21 @@ async def main():
             )
         except asyncio.CancelledError:
             pass
+        # Persist accumulated token usage and buffered LLM metrics after
+        # workers stop producing them
+        try:
+            await flush_token_usage()
+        except Exception as e:
+            logger.error(f"Error flushing token usage on shutdown: {e}")
+        try:
+            await llm_metrics_flusher.stop()
+            set_llm_metrics_flusher(None)
+        except Exception as e:
+            logger.error(f"Error stopping LLM metrics flusher: {e}")
+        try:
+            await close_chatwoot_http_client()
+        except Exception as e:
+            logger.error(f"Error closing Chatwoot HTTP client: {e}")
         logger.info("Agent service stopped")
 
 
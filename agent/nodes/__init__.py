@@ -5,9 +5,11 @@ Contains LangGraph node implementations.
 """
 
 from agent.nodes.conversational_agent import conversational_agent_node
+from agent.nodes.fast_path import fast_path_node
 from agent.nodes.process_message import process_incoming_message_node
 
 __all__ = [
     "conversational_agent_node",
+    "fast_path_node",
     "process_incoming_message_node",
 ]
@@ -28,22 +28,33 @@ from agent.graphs.conversation_flow import wrap_with_security_delimiters
 from agent.prompts.loader import assemble_system_prompt, get_prompt_stats
 from agent.prompts.state_summary import generate_state_summary_v2
 from agent.services.constraint_service import get_constraints_for_category, validate_response
+from agent.services.element_required_fields_service import begin_collection_turn
 from agent.services.token_tracking import record_token_usage
 from agent.services.tool_logging_service import log_tool_call, classify_result
 from agent.state.helpers import (
     add_message,
     format_messages_for_llm,
+    get_history_token_budget,
     set_current_state,
     clear_current_state,
 )
 from agent.state.schemas import ConversationState
 from agent.tools import get_all_tools
+from agent.utils.similarity import LevenshteinMatcher, levenshtein_distance  # noqa: F401 (re-exported)
 from agent.tools.image_tools import (
     set_current_state_for_image_tools,
     get_pending_images_result,
     clear_image_tools_state,
 )
 from shared.config import get_settings
+from shared.llm_router import (
+    LLMMetrics,
+    LLMRouter,
+    ModelTier,
+    Provider,
+    TaskType,
+    get_llm_router,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -93,43 +104,8 @@ UNCERTAINTY_CONTEXT_WORDS = [
 CONFIRMATION_EMOJIS = ['👍', '✅', '👌', '✓', '☑️', '💯', '🆗']
 REJECTION_EMOJIS = ['👎', '❌', '🚫', '⛔', '✖️', '❎']
 
-
-def levenshtein_distance(s1: str, s2: str) -> int:
-    """
-    Calculate Levenshtein distance between two strings.
-    
-    This is the minimum number of single-character edits (insertions, deletions,
-    or substitutions) required to change one string into the other.
-    
-    Args:
-        s1: First string
-        s2: Second string
-    
-    Returns:
-        Levenshtein distance as integer
-    
-    Example:
-        >>> levenshtein_distance("dale", "dlae")
-        2
-        >>> levenshtein_distance("si", "sii")
-        1
-    """
-    if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
-    
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-    return previous_row[-1]
-
+# Precompiled for typo matching against CONFIRMATION_BASE_WORDS
+_CONFIRMATION_WORD_MATCHER = LevenshteinMatcher(CONFIRMATION_BASE_WORDS)
 
 def check_user_confirmation(user_message: str) -> str:
     """
@@ -219,9 +195,9 @@ def check_user_confirmation(user_message: str) -> str:
             # Skip very short words (likely particles like "a", "y", etc.)
             if len(word) < 2:
                 continue
-            for confirm_word in CONFIRMATION_BASE_WORDS:
-                # Calculate distance
-                distance = levenshtein_distance(word, confirm_word)
+            # Distances to all confirmation words in one pass (precompiled)
+            distances = _CONFIRMATION_WORD_MATCHER.distances(word)
+            for confirm_word, distance in zip(CONFIRMATION_BASE_WORDS, distances):
                 # Allow distance proportional to word length, capped at MAX_TYPO_DISTANCE
                 max_distance = min(MAX_TYPO_DISTANCE, len(confirm_word) // 2)
                 if distance <= max_distance and distance > 0:
@@ -442,6 +418,7 @@ async def execute_tool_call(
         identificar_y_resolver_elementos,
         seleccionar_variante_por_respuesta,
         calcular_tarifa_con_elementos,
+        comparar_tarifas_elementos,
         obtener_documentacion_elemento,
         # Case tools
         # NOTE: procesar_imagen* tools removed - images handled by main.py batching
@@ -481,6 +458,7 @@ async def execute_tool_call(
         "identificar_y_resolver_elementos": identificar_y_resolver_elementos,
         "seleccionar_variante_por_respuesta": seleccionar_variante_por_respuesta,
         "calcular_tarifa_con_elementos": calcular_tarifa_con_elementos,
+        "comparar_tarifas_elementos": comparar_tarifas_elementos,
         "obtener_documentacion_elemento": obtener_documentacion_elemento,
         # Case tools (procesar_imagen* removed - handled by main.py batching)
         "iniciar_expediente": iniciar_expediente,
@@ -660,6 +638,10 @@ async def conversational_agent_node(state: ConversationState) -> dict[str, Any]:
         
         # Get LLM instance with contextual tools (reduced token usage)
         llm = get_llm(with_tools=True, tools=contextual_tools)
+        settings = get_settings()
+        llm_router = get_llm_router()
+        primary_llm_key = LLMRouter.provider_key(Provider.OPENROUTER, settings.LLM_MODEL)
+        backup_llm_key = LLMRouter.provider_key(Provider.OLLAMA, settings.LOCAL_CAPABLE_MODEL)
 
         # =================================================================
         # Get supported categories dynamically for this client type (cached)
@@ -786,9 +768,13 @@ async def conversational_agent_node(state: ConversationState) -> dict[str, Any]:
             },
         )
 
-        # Format messages for LLM
+        # Format messages for LLM (history windowed by per-phase token budget)
         llm_messages = [{"role": "system", "content": system_content}]
-        llm_messages.extend(format_messages_for_llm(messages))
+        llm_messages.extend(format_messages_for_llm(
+            messages,
+            token_budget=get_history_token_budget(current_phase.value),
+            conversation_id=conversation_id,
+        ))
 
         # =================================================================
         # PENDING ACTION DETECTION: Check if user confirmed a pending action
@@ -947,6 +933,9 @@ async def conversational_agent_node(state: ConversationState) -> dict[str, Any]:
         MAX_VALIDATION_RETRIES = 2
         validation_retries = 0
 
+        # Element tools share case fields/data loaded once for this turn
+        begin_collection_turn()
+
         # Tool call loop
         iteration = 0
         tool_call_history: list[tuple[str, str]] = []  # Track (tool_name, args_hash) tuples
@@ -954,46 +943,37 @@ async def conversational_agent_node(state: ConversationState) -> dict[str, Any]:
         while iteration < MAX_TOOL_ITERATIONS:
             iteration += 1
 
-            # Call LLM with automatic fallback to Ollama on transient errors
+            # Call LLM, hedged with a local Ollama request when OpenRouter is
+            # slower than its p95 or failing (circuit state shared across requests)
+            llm_start_time = time_module.time()
             try:
-                response = await llm.ainvoke(llm_messages)
+                response, served_by = await llm_router.hedged_call(
+                    primary=lambda: llm.ainvoke(llm_messages),
+                    primary_key=primary_llm_key,
+                    backup=(
+                        (lambda: get_ollama_fallback_llm(tools=contextual_tools).ainvoke(llm_messages))
+                        if OLLAMA_AVAILABLE else None
+                    ),
+                    backup_key=backup_llm_key,
+                )
             except (RateLimitError, APIConnectionError, APITimeoutError, APIStatusError) as llm_error:
-                # Cloud LLM failed (rate limit, timeout, connection, 5xx) - try local Ollama
-                error_type_name = type(llm_error).__name__
+                # Cloud LLM failed and the Ollama backup was unavailable or failed too
                 logger.warning(
-                    f"Cloud LLM error ({error_type_name}), attempting Ollama fallback | "
+                    f"Cloud LLM error ({type(llm_error).__name__}), no backup succeeded | "
                     f"conversation_id={conversation_id}",
                     extra={
                         "conversation_id": conversation_id,
-                        "error_type": error_type_name,
+                        "error_type": type(llm_error).__name__,
                         "error": str(llm_error)[:200],
                     },
                 )
-                
-                try:
-                    # Create Ollama fallback LLM with same tools
-                    ollama_llm = get_ollama_fallback_llm(tools=contextual_tools)
-                    response = await ollama_llm.ainvoke(llm_messages)
-                    logger.info(
-                        f"Ollama fallback succeeded | conversation_id={conversation_id}",
-                        extra={"conversation_id": conversation_id, "model": "llama3:8b"},
-                    )
-                except Exception as ollama_error:
-                    ollama_error_type = type(ollama_error).__name__
-                    if "ConnectError" in ollama_error_type or "ConnectionRefused" in str(ollama_error):
-                        logger.info(
-                            f"Ollama not available (expected if GPU unavailable), continuing with rate-limited OpenRouter | "
-                            f"conversation_id={conversation_id}",
-                            extra={"conversation_id": conversation_id},
-                        )
-                    else:
-                        logger.warning(
-                            f"Ollama fallback failed: {ollama_error} | "
-                            f"conversation_id={conversation_id}",
-                            extra={"conversation_id": conversation_id},
-                        )
-                    # Re-raise original error to trigger normal error handling
-                    raise llm_error
+                raise
+
+            if served_by == backup_llm_key:
+                logger.info(
+                    f"Ollama backup served the response | conversation_id={conversation_id}",
+                    extra={"conversation_id": conversation_id, "model": settings.LOCAL_CAPABLE_MODEL},
+                )
 
             # Track token usage (non-blocking, errors are logged but don't break flow)
             usage_metadata = getattr(response, "usage_metadata", None)
@@ -1003,6 +983,22 @@ async def conversational_agent_node(state: ConversationState) -> dict[str, Any]:
                     output_tokens=usage_metadata.get("output_tokens", 0),
                 )
 
+            # Buffered per-call metrics (persisted in batches by LLMMetricsFlusher)
+            used_backup = served_by == backup_llm_key
+            llm_router.record_metrics(LLMMetrics(
+                task_type=TaskType.TOOL_CALLING,
+                tier=ModelTier.LOCAL_CAPABLE if used_backup else ModelTier.CLOUD_STANDARD,
+                provider=Provider.OLLAMA if used_backup else Provider.OPENROUTER,
+                model=settings.LOCAL_CAPABLE_MODEL if used_backup else settings.LLM_MODEL,
+                latency_ms=int((time_module.time() - llm_start_time) * 1000),
+                input_tokens=usage_metadata.get("input_tokens") if usage_metadata else None,
+                output_tokens=usage_metadata.get("output_tokens") if usage_metadata else None,
+                success=True,
+                fallback_used=used_backup,
+                original_tier=ModelTier.CLOUD_STANDARD if used_backup else None,
+                conversation_id=conversation_id,
+            ))
+
             # Check for tool calls
             tool_calls = getattr(response, "tool_calls", None)
 
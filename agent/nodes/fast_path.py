@@ -0,0 +1,337 @@
+"""
+MSI Automotive - Fast-path node.
+
+Handles trivially-classifiable user messages (greetings, thanks, "listo"
+after photos, rejection of a pending action) with deterministic rules and
+templated replies, skipping the LLM call entirely.
+
+Only high-confidence, phase-appropriate intents are handled here. Anything
+else falls through to conversational_agent unchanged.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime, UTC
+from typing import Any
+
+from agent.fsm.case_collection import (
+    CollectionStep,
+    get_case_fsm_state,
+    get_current_step,
+    get_element_phase,
+)
+from agent.state.helpers import add_message
+from agent.state.schemas import ConversationState
+from agent.utils.text_utils import COMPLETION_PHRASES, normalize_text
+from shared.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Fast-path intents
+INTENT_GREETING = "greeting"
+INTENT_GRATITUDE = "gratitude"
+INTENT_REJECT_PENDING_ACTION = "reject_pending_action"
+INTENT_PHOTOS_DONE = "photos_done"
+
+# Max words for a message to be considered trivially classifiable
+MAX_FAST_PATH_WORDS = 4
+
+# Exact greetings (normalized, no punctuation)
+GREETING_PHRASES = {
+    "hola", "holaa", "holaaa", "buenas", "hola buenas", "buenos dias",
+    "buenas tardes", "buenas noches", "hola buenos dias", "hola buenas tardes",
+    "hola buenas noches", "hey", "hello", "saludos",
+}
+
+# Exact thanks/closing messages (normalized, no punctuation)
+GRATITUDE_PHRASES = {
+    "gracias", "muchas gracias", "mil gracias", "gracias a ti", "ok gracias",
+    "vale gracias", "perfecto gracias", "genial gracias", "muy amable",
+    "gracias por todo", "muchisimas gracias",
+}
+
+# Only exact completion phrases: is_completion_message() also accepts
+# prefixes ("ya voy..."), which is too loose to skip the LLM
+PHOTOS_DONE_PHRASES = {normalize_text(p) for p in COMPLETION_PHRASES} | {
+    "listo ya", "ya estan", "ya las he enviado", "ya te las he enviado",
+}
+
+# Templated replies
+GREETING_TEMPLATE = (
+    "¡Hola{name}! Soy el asistente con IA de MSI Automotive. "
+    "¿Qué modificaciones quieres homologar o con qué consulta te puedo ayudar?"
+)
+GRATITUDE_TEMPLATE = "¡De nada! Si necesitas cualquier otra cosa, aquí estoy."
+REJECT_PENDING_ACTION_TEMPLATE = (
+    "De acuerdo, no abro el expediente por ahora. "
+    "Si cambias de opinión o necesitas otro presupuesto, escríbeme."
+)
+
+# In-process hit-rate counters (also emitted as structured logs)
+_fast_path_stats: dict[str, Any] = {"hits": 0, "misses": 0, "by_intent": {}}
+
+
+def _normalize_message(message: str) -> str:
+    """Lowercase, remove accents, punctuation and emojis, and collapse spaces."""
+    cleaned = re.sub(r"[^\w\s]", " ", normalize_text(message))
+    return " ".join(cleaned.split())
+
+
+def classify_fast_path_intent(state: ConversationState) -> str | None:
+    """
+    Classify the incoming message into a fast-path intent.
+
+    Pure function: no I/O, only the current state is inspected. Returns
+    None whenever the message is not a high-confidence match for the
+    current phase, so the LLM handles it.
+
+    Args:
+        state: Current conversation state
+
+    Returns:
+        Intent name or None if the LLM should handle the message
+    """
+    from agent.nodes.conversational_agent import check_user_confirmation
+
+    user_message = (state.get("user_message") or "").strip()
+    if not user_message or state.get("incoming_attachments"):
+        return None
+    if "?" in user_message or len(user_message.split()) > MAX_FAST_PATH_WORDS:
+        return None
+
+    normalized = _normalize_message(user_message)
+    fsm_state = state.get("fsm_state")
+    step = get_current_step(fsm_state)
+    pending_action = state.get("pending_action")
+
+    if step == CollectionStep.COLLECT_ELEMENT_DATA:
+        case_state = get_case_fsm_state(fsm_state)
+        if get_element_phase(case_state) == "photos" and normalized in PHOTOS_DONE_PHRASES:
+            return INTENT_PHOTOS_DONE
+        return None
+
+    if step not in (CollectionStep.IDLE, CollectionStep.COMPLETED):
+        return None
+
+    if pending_action:
+        if (
+            pending_action == "iniciar_expediente"
+            and check_user_confirmation(user_message) == "rejected"
+        ):
+            return INTENT_REJECT_PENDING_ACTION
+        return None
+
+    if state.get("pending_variants"):
+        return None
+
+    if normalized in GREETING_PHRASES:
+        return INTENT_GREETING
+    if normalized in GRATITUDE_PHRASES:
+        return INTENT_GRATITUDE
+
+    return None
+
+
+def _record_fast_path(conversation_id: str, intent: str | None, handled: bool) -> None:
+    """Update hit-rate counters and emit a structured metric log."""
+    if handled and intent:
+        _fast_path_stats["hits"] += 1
+        by_intent = _fast_path_stats["by_intent"]
+        by_intent[intent] = by_intent.get(intent, 0) + 1
+    else:
+        _fast_path_stats["misses"] += 1
+
+    total = _fast_path_stats["hits"] + _fast_path_stats["misses"]
+    logger.info(
+        f"Fast path {'hit' if handled else 'miss'} | intent={intent} | "
+        f"conversation_id={conversation_id}",
+        extra={
+            "metric_type": "fast_path",
+            "conversation_id": conversation_id,
+            "intent": intent,
+            "handled": handled,
+            "hit_rate": round(_fast_path_stats["hits"] / total, 4) if total else 0.0,
+        },
+    )
+
+
+def get_fast_path_stats() -> dict[str, Any]:
+    """
+    Get fast-path hit-rate counters for this process.
+
+    Returns:
+        Dict with hits, misses, hit_rate and per-intent hit counts
+    """
+    total = _fast_path_stats["hits"] + _fast_path_stats["misses"]
+    return {
+        "hits": _fast_path_stats["hits"],
+        "misses": _fast_path_stats["misses"],
+        "hit_rate": _fast_path_stats["hits"] / total if total else 0.0,
+        "by_intent": dict(_fast_path_stats["by_intent"]),
+    }
+
+
+def _format_field_question(field: dict[str, Any]) -> str:
+    """Format a single required field as a user-facing question."""
+    question = field.get("instruction") or f"¿Me indicas {field.get('field_label', 'el dato')}?"
+    if field.get("options"):
+        question += f" (opciones: {', '.join(field['options'])})"
+    elif field.get("example"):
+        question += f" (ej: {field['example']})"
+    return question
+
+
+async def _handle_photos_done(state: ConversationState) -> dict[str, Any] | None:
+    """
+    Run confirmar_fotos_elemento and build a templated reply from its result.
+
+    Returns:
+        Dict with "reply" and "fsm_state", or None to fall back to the LLM
+        (tool error or idempotent repeat, both leave the FSM untouched)
+    """
+    from agent.nodes.conversational_agent import execute_tool_call
+
+    result = await execute_tool_call({"name": "confirmar_fotos_elemento", "args": {}}, state)
+    if not isinstance(result, dict) or not result.get("success") or result.get("already_confirmed"):
+        return None
+
+    fsm_state_update = result.get("fsm_state_update")
+    element_name = result.get("element_name")
+    intro = f"¡Perfecto! Fotos de {element_name} recibidas." if element_name else "¡Perfecto! Fotos recibidas."
+
+    if result.get("has_required_fields"):
+        current_field = result.get("current_field")
+        fields = result.get("fields") or []
+        if current_field:
+            reply = f"{intro} Ahora necesito algunos datos.\n\n{_format_field_question(current_field)}"
+        elif fields:
+            lines = [f"• {_format_field_question(f)}" for f in fields]
+            reply = f"{intro} Ahora necesito estos datos:\n" + "\n".join(lines)
+        else:
+            return None
+    elif result.get("all_elements_complete"):
+        reply = (
+            "¡Perfecto! Fotos recibidas. Ya tengo todo lo necesario de los elementos.\n\n"
+            "Ahora necesito la documentación base del vehículo: la ficha técnica y el "
+            "permiso de circulación. Envíame las fotos y escribe 'listo' cuando termines."
+        )
+    elif result.get("element_complete"):
+        next_name = await _get_element_name(state, result.get("next_element"))
+        next_text = f"del siguiente elemento ({next_name})" if next_name else "del siguiente elemento"
+        reply = (
+            "¡Perfecto! Fotos recibidas.\n\n"
+            f"Ahora envíame las fotos {next_text} y escribe 'listo' cuando termines."
+        )
+    else:
+        return None
+
+    return {"reply": reply, "fsm_state": fsm_state_update}
+
+
+async def _get_element_name(state: ConversationState, element_code: str | None) -> str | None:
+    """Resolve a readable element name (element codes are never shown to users)."""
+    if not element_code:
+        return None
+    try:
+        from agent.tools.element_data_tools import _get_element_by_code
+
+        category_id = get_case_fsm_state(state.get("fsm_state")).get("category_id")
+        if not category_id:
+            return None
+        element = await _get_element_by_code(element_code, category_id)
+        return element.name if element else None
+    except Exception as e:
+        logger.warning(f"Fast path: failed to resolve element name: {e}")
+        return None
+
+
+async def _get_display_name(state: ConversationState) -> str | None:
+    """DB name takes priority over WhatsApp name (same rule as conversational_agent)."""
+    from agent.nodes.conversational_agent import get_user_existing_data
+
+    user_data = await get_user_existing_data(state.get("user_id"))
+    if user_data:
+        db_name = f"{user_data.get('first_name') or ''} {user_data.get('last_name') or ''}".strip()
+        if db_name:
+            return db_name
+    return state.get("user_name")
+
+
+async def fast_path_node(state: ConversationState) -> dict[str, Any]:
+    """
+    Handle trivially-classifiable messages without calling the LLM.
+
+    Sets "fast_path_handled" so the graph can route to END (handled) or to
+    conversational_agent (not handled).
+
+    Args:
+        state: Current conversation state
+
+    Returns:
+        State updates dict
+    """
+    conversation_id = state.get("conversation_id", "unknown")
+
+    if not get_settings().ENABLE_FAST_PATH or state.get("escalation_triggered"):
+        return {"fast_path_handled": False, "last_node": "fast_path"}
+
+    intent = classify_fast_path_intent(state)
+    if not intent:
+        _record_fast_path(conversation_id, None, handled=False)
+        return {"fast_path_handled": False, "last_node": "fast_path"}
+
+    result: dict[str, Any] = {}
+    reply: str | None = None
+
+    try:
+        if intent == INTENT_GREETING:
+            name = await _get_display_name(state)
+            reply = GREETING_TEMPLATE.format(name=f" {name}" if name else "")
+        elif intent == INTENT_GRATITUDE:
+            reply = GRATITUDE_TEMPLATE
+        elif intent == INTENT_REJECT_PENDING_ACTION:
+            reply = REJECT_PENDING_ACTION_TEMPLATE
+            result["pending_action"] = None
+            result["pending_action_context"] = None
+        elif intent == INTENT_PHOTOS_DONE:
+            photos_result = await _handle_photos_done(state)
+            if photos_result:
+                reply = photos_result["reply"]
+                if photos_result.get("fsm_state"):
+                    result["fsm_state"] = photos_result["fsm_state"]
+    except Exception as e:
+        logger.error(
+            f"Fast path error, falling back to LLM: {e}",
+            extra={"conversation_id": conversation_id, "intent": intent},
+            exc_info=True,
+        )
+        reply = None
+
+    if not reply:
+        _record_fast_path(conversation_id, intent, handled=False)
+        return {"fast_path_handled": False, "last_node": "fast_path"}
+
+    _record_fast_path(conversation_id, intent, handled=True)
+
+    # Persist assistant message (fire-and-forget, same as conversational_agent)
+    from api.services.message_persistence_service import save_assistant_message
+
+    asyncio.create_task(
+        save_assistant_message(
+            conversation_id=conversation_id,
+            content=reply,
+            has_images=False,
+            image_count=0,
+        )
+    )
+
+    result.update({
+        "messages": add_message(state.get("messages", []), "assistant", reply),
+        "total_message_count": state.get("total_message_count", 0) + 1,
+        "error_count": 0,
+        "fast_path_handled": True,
+        "updated_at": datetime.now(UTC),
+        "last_node": "fast_path",
+    })
+    return result
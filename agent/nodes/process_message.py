@@ -235,7 +235,7 @@ async def handle_panic_button(
         State updates dict for panic button response
     """
     from shared.settings_cache import get_cached_setting
-    from shared.redis_client import publish_to_channel
+    from shared.redis_client import publish_outgoing_message
 
     logger.warning(
         f"Agent disabled - auto-responding | conversation_id={conversation_id}",
@@ -254,8 +254,7 @@ async def handle_panic_button(
         )
 
     # Publish auto-response
-    await publish_to_channel(
-        "outgoing_messages",
+    await publish_outgoing_message(
         {
             "conversation_id": conversation_id,
             "customer_phone": state.get("user_phone"),
@@ -0,0 +1,165 @@
+"""
+MSI Automotive - In-process catalogue snapshot.
+
+ElementService and TarifaService read the same category/element/tier data
+(from Redis, as JSON) on almost every tool call, while the catalogue only
+changes a few times a week from the admin panel.
+
+CatalogueSnapshot keeps the already-parsed values in memory, keyed by the
+same cache keys the services use in Redis. Entries are invalidated:
+- Instantly, when the API publishes on CATALOGUE_CHANGED_CHANNEL
+  (see api/services/cache_service.CacheService.publish_catalogue_changed)
+- After CATALOGUE_SNAPSHOT_TTL_SECONDS as a safety net
+
+The snapshot only serves reads while a subscriber is attached to the
+channel (agent worker). Processes that never subscribe (API, scripts,
+tests) keep reading from Redis exactly as before, so they can never serve
+a change they were not told about.
+
+Values are shared between callers and must be treated as read-only.
+"""
+
+import logging
+import time
+from typing import Any
+
+from shared.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_CHANGED_CHANNEL = "catalogue_changed"
+
+
+class SnapshotEntry:
+    """Immutable snapshot record (value + catalogue version it was loaded at)."""
+
+    __slots__ = ("value", "version", "expires_at")
+
+    def __init__(self, value: Any, version: int, expires_at: float):
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "expires_at", expires_at)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("SnapshotEntry is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("SnapshotEntry is immutable")
+
+
+class CatalogueSnapshot:
+    """
+    Versioned in-process cache of catalogue reads.
+
+    Every invalidation bumps `version`. A loader takes the version before
+    reading Redis/DB and passes it to put(); if the catalogue changed in
+    the meantime the (possibly stale) value is not stored.
+    """
+
+    def __init__(self, ttl_seconds: float | None = None):
+        """
+        Initialize an empty snapshot.
+
+        Args:
+            ttl_seconds: Safety TTL per entry (defaults to CATALOGUE_SNAPSHOT_TTL_SECONDS)
+        """
+        settings = get_settings()
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.CATALOGUE_SNAPSHOT_TTL_SECONDS
+        )
+        self.version = 0
+        self._entries: dict[str, SnapshotEntry] = {}
+        self._subscribed = False
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether the snapshot serves reads (a change listener is attached)."""
+        return self._subscribed
+
+    def set_subscribed(self, subscribed: bool) -> None:
+        """
+        Mark whether invalidation messages are being received.
+
+        Any change of state drops all entries: messages published while
+        disconnected are lost, so nothing loaded before can be trusted.
+        """
+        if subscribed != self._subscribed:
+            self._subscribed = subscribed
+            self.invalidate_all(reason="subscribed" if subscribed else "unsubscribed")
+
+    def get(self, key: str) -> SnapshotEntry | None:
+        """
+        Get a live entry for a cache key.
+
+        Returns:
+            SnapshotEntry, or None if missing, expired or the snapshot is inactive
+        """
+        if not self._subscribed:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, value: Any, version: int) -> bool:
+        """
+        Store a value loaded while the catalogue was at `version`.
+
+        Args:
+            key: Cache key (same as the Redis key)
+            value: Parsed value (shared, read-only)
+            version: Snapshot version read before loading the value
+
+        Returns:
+            True if stored, False if inactive or the catalogue changed meanwhile
+        """
+        if not self._subscribed or version != self.version:
+            return False
+
+        self._entries[key] = SnapshotEntry(
+            value=value,
+            version=version,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        return True
+
+    def invalidate_all(self, reason: str = "catalogue_changed") -> None:
+        """Drop every entry and bump the version."""
+        dropped = len(self._entries)
+        self._entries = {}
+        self.version += 1
+        self.invalidations += 1
+        logger.debug(
+            f"Catalogue snapshot invalidated | reason={reason} dropped={dropped} version={self.version}",
+            extra={"metric_type": "catalogue_snapshot", "reason": reason, "dropped": dropped},
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Snapshot counters for monitoring."""
+        return {
+            "active": self._subscribed,
+            "version": self.version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+# Singleton instance
+_catalogue_snapshot: CatalogueSnapshot | None = None
+
+
+def get_catalogue_snapshot() -> CatalogueSnapshot:
+    """Get or create the CatalogueSnapshot singleton."""
+    global _catalogue_snapshot
+    if _catalogue_snapshot is None:
+        _catalogue_snapshot = CatalogueSnapshot()
+    return _catalogue_snapshot
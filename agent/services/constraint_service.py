@@ -5,111 +5,308 @@ Provides database-driven validation of LLM responses to prevent hallucinations.
 Loads constraints from PostgreSQL and checks agent responses against them.
 Constraints define regex patterns that detect potential violations and the
 tools that must have been called to produce that information legitimately.
+
+Patterns are compiled once when constraints are loaded into the cache;
+validate_response only runs precompiled regexes against the response.
+
+Constraint sets are shared between processes through Redis under a
+version number. Admin changes bump the version and announce it on
+CONSTRAINTS_CHANGED_CHANNEL, so agent workers drop their copy immediately.
 """
 
+import json
 import logging
 import re
 import time
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Iterator
 
 from sqlalchemy import select
 
 from database.connection import get_async_session
 from database.models import ResponseConstraint
+from shared.redis_client import get_redis_client, publish_to_channel
 
 logger = logging.getLogger(__name__)
 
 
-# In-memory cache for constraints (per category)
-_constraints_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
-_CACHE_TTL_SECONDS = 300  # 5 minutes
+CONSTRAINTS_CHANGED_CHANNEL = "constraints_changed"
+CONSTRAINTS_VERSION_KEY = "constraints:version"
+# Safety TTL for versioned sets (Redis and in-process): bounds staleness if
+# a version bump is ever lost; old versions are never read again anyway
+_SHARED_CACHE_TTL_SECONDS = 3600
+
+# In-memory cache for compiled constraints (per category), with the
+# constraint version they were loaded at (None if Redis was unavailable)
+_constraints_cache: dict[str, tuple[float, int | None, "ConstraintSet"]] = {}
+_CACHE_TTL_SECONDS = 300  # Only used when the version can't be read from Redis
+
+# Version pushed by the agent's change listener; None when not listening
+_listened_version: int | None = None
+
+# Numbered/named backreferences change meaning once patterns are combined
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def compile_detection_pattern(pattern: str) -> re.Pattern:
+    """
+    Compile a constraint detection pattern (case-insensitive).
+
+    Args:
+        pattern: Regex pattern string from ResponseConstraint.detection_pattern
+
+    Returns:
+        Compiled pattern
+
+    Raises:
+        re.error: If the pattern is not a valid regex
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def parse_required_tools(required_tool: str) -> frozenset[str]:
+    """Split a pipe-separated required_tool value into a set of tool names."""
+    return frozenset(t.strip() for t in required_tool.split("|"))
+
+
+@dataclass
+class ConstraintSet:
+    """
+    Constraints for one category, compiled for validation.
+
+    Each constraint dict keeps its DB fields and adds `pattern` (compiled
+    regex) and `required_tools` (frozenset). `prefilter` is one alternation
+    of every pattern: a response it doesn't match can't violate any
+    constraint, which is the common case. It is None when the patterns
+    can't be combined safely (backreferences) and every pattern is checked.
+    """
+
+    constraints: list[dict[str, Any]] = field(default_factory=list)
+    prefilter: re.Pattern | None = None
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self.constraints)
+
+    def __len__(self) -> int:
+        return len(self.constraints)
+
+    def matching(self, response_text: str) -> list[dict[str, Any]]:
+        """
+        Get the constraints whose detection pattern matches, in priority order.
+
+        Args:
+            response_text: The LLM's generated response text.
+
+        Returns:
+            Matching constraint dicts (empty if nothing matched)
+        """
+        if self.prefilter is not None and not self.prefilter.search(response_text):
+            return []
+        return [c for c in self.constraints if c["pattern"].search(response_text)]
+
+
+def compile_constraints(constraints: list[dict[str, Any]]) -> ConstraintSet:
+    """
+    Compile constraint dicts into a ConstraintSet.
+
+    Constraints with an invalid detection_pattern are rejected (logged and
+    left out) so they are never evaluated per response.
+
+    Args:
+        constraints: Dicts with constraint_type, detection_pattern,
+            required_tool, error_injection and priority (already ordered)
+
+    Returns:
+        ConstraintSet ready for validate_response()
+    """
+    compiled = []
+    for constraint in constraints:
+        try:
+            pattern = compile_detection_pattern(constraint["detection_pattern"])
+        except re.error as e:
+            logger.error(
+                f"Invalid regex in constraint '{constraint['constraint_type']}', "
+                f"constraint disabled until fixed: {e}",
+                extra={
+                    "metric_type": "constraint_invalid_pattern",
+                    "constraint_type": constraint["constraint_type"],
+                },
+            )
+            continue
+        compiled.append({
+            **constraint,
+            "pattern": pattern,
+            "required_tools": parse_required_tools(constraint["required_tool"]),
+        })
+
+    prefilter = None
+    if compiled and not any(
+        _BACKREFERENCE_RE.search(c["detection_pattern"]) for c in compiled
+    ):
+        try:
+            prefilter = re.compile(
+                "|".join(f"(?:{c['detection_pattern']})" for c in compiled),
+                re.IGNORECASE,
+            )
+        except re.error:
+            # e.g. inline global flags mid-pattern: fall back to per-pattern checks
+            prefilter = None
+
+    return ConstraintSet(constraints=compiled, prefilter=prefilter)
+
+
+async def _get_constraints_version() -> int | None:
+    """
+    Get the current constraint version.
+
+    Uses the version pushed by the change listener when one is attached
+    (no I/O), otherwise reads it from Redis.
+
+    Returns:
+        Version number, or None if Redis is unavailable
+    """
+    if _listened_version is not None:
+        return _listened_version
+    try:
+        version = await get_redis_client().get(CONSTRAINTS_VERSION_KEY)
+        return int(version or 0)
+    except Exception as e:
+        logger.warning(f"Could not read constraint version from Redis: {e}")
+        return None
+
+
+async def _load_constraints_from_db(category_slug: str | None) -> list[dict[str, Any]]:
+    """
+    Query active constraints for a category (plus global ones) from PostgreSQL.
+
+    Args:
+        category_slug: The vehicle category slug, or None for global-only constraints.
+
+    Returns:
+        Constraint dicts ordered by priority (highest first)
+    """
+    async with get_async_session() as session:
+        # Get category UUID if slug provided
+        category_id = None
+        if category_slug:
+            from database.models import VehicleCategory
+            cat_result = await session.execute(
+                select(VehicleCategory.id).where(
+                    VehicleCategory.slug == category_slug,
+                    VehicleCategory.is_active == True,  # noqa: E712
+                )
+            )
+            cat_row = cat_result.scalar_one_or_none()
+            if cat_row:
+                category_id = cat_row
+
+        # Query constraints: global (category_id IS NULL) + category-specific
+        query = (
+            select(ResponseConstraint)
+            .where(ResponseConstraint.is_active == True)  # noqa: E712
+        )
+
+        if category_id:
+            query = query.where(
+                (ResponseConstraint.category_id == None) |  # noqa: E711
+                (ResponseConstraint.category_id == category_id)
+            )
+        else:
+            query = query.where(ResponseConstraint.category_id == None)  # noqa: E711
+
+        query = query.order_by(ResponseConstraint.priority.desc())
+
+        result = await session.execute(query)
+        constraints = result.scalars().all()
+
+        # Convert to dicts for cache
+        return [
+            {
+                "constraint_type": c.constraint_type,
+                "detection_pattern": c.detection_pattern,
+                "required_tool": c.required_tool,
+                "error_injection": c.error_injection,
+                "priority": c.priority,
+            }
+            for c in constraints
+        ]
 
 
-async def get_constraints_for_category(category_slug: str | None) -> list[dict[str, Any]]:
+async def get_constraints_for_category(category_slug: str | None) -> ConstraintSet:
     """
-    Load active constraints for a category (with in-memory cache).
+    Load active constraints for a category (with in-memory and Redis cache).
 
     Returns constraints that apply to the specific category OR are global (category_id=NULL).
-    Results are cached for 5 minutes to avoid repeated DB queries.
+
+    Lookup order:
+    1. In-process compiled set, if it was loaded at the current constraint version
+    2. Shared set in Redis for the current version (written by whichever
+       process loaded it first)
+    3. PostgreSQL, then stored in Redis for every other process
+
+    Admin changes bump the version (see publish_constraints_changed), so all
+    processes pick them up on their next call without waiting for a TTL.
+    If Redis is unavailable, falls back to a 5-minute per-process cache.
 
     Args:
         category_slug: The vehicle category slug, or None for global-only constraints.
 
     Returns:
-        List of constraint dicts with keys: constraint_type, detection_pattern,
-        required_tool, error_injection, priority.
+        ConstraintSet of constraint dicts with keys: constraint_type, detection_pattern,
+        required_tool, error_injection, priority, pattern, required_tools.
     """
     cache_key = category_slug or "__global__"
     now = time.time()
+    version = await _get_constraints_version()
 
-    # Check cache
+    # Check in-process cache
     if cache_key in _constraints_cache:
-        cached_time, cached_data = _constraints_cache[cache_key]
-        if now - cached_time < _CACHE_TTL_SECONDS:
+        cached_time, cached_version, cached_data = _constraints_cache[cache_key]
+        age = now - cached_time
+        if version is not None:
+            if cached_version == version and age < _SHARED_CACHE_TTL_SECONDS:
+                return cached_data
+        elif age < _CACHE_TTL_SECONDS:
             return cached_data
 
-    try:
-        async with get_async_session() as session:
-            # Get category UUID if slug provided
-            category_id = None
-            if category_slug:
-                from database.models import VehicleCategory
-                cat_result = await session.execute(
-                    select(VehicleCategory.id).where(
-                        VehicleCategory.slug == category_slug,
-                        VehicleCategory.is_active == True,  # noqa: E712
-                    )
-                )
-                cat_row = cat_result.scalar_one_or_none()
-                if cat_row:
-                    category_id = cat_row
-
-            # Query constraints: global (category_id IS NULL) + category-specific
-            query = (
-                select(ResponseConstraint)
-                .where(ResponseConstraint.is_active == True)  # noqa: E712
-            )
+    redis_key = f"constraints:v{version}:{cache_key}"
 
-            if category_id:
-                query = query.where(
-                    (ResponseConstraint.category_id == None) |  # noqa: E711
-                    (ResponseConstraint.category_id == category_id)
-                )
-            else:
-                query = query.where(ResponseConstraint.category_id == None)  # noqa: E711
-
-            query = query.order_by(ResponseConstraint.priority.desc())
-
-            result = await session.execute(query)
-            constraints = result.scalars().all()
-
-            # Convert to dicts for cache
-            constraint_dicts = [
-                {
-                    "constraint_type": c.constraint_type,
-                    "detection_pattern": c.detection_pattern,
-                    "required_tool": c.required_tool,
-                    "error_injection": c.error_injection,
-                    "priority": c.priority,
-                }
-                for c in constraints
-            ]
-
-            # Update cache
-            _constraints_cache[cache_key] = (now, constraint_dicts)
-
-            logger.info(
-                f"Loaded {len(constraint_dicts)} constraints for category '{cache_key}'",
-            )
-            return constraint_dicts
+    # Check shared cache
+    if version is not None:
+        try:
+            cached_json = await get_redis_client().get(redis_key)
+            if cached_json:
+                constraint_set = compile_constraints(json.loads(cached_json))
+                _constraints_cache[cache_key] = (now, version, constraint_set)
+                return constraint_set
+        except Exception as e:
+            logger.warning(f"Could not read shared constraints for '{cache_key}': {e}")
 
+    try:
+        constraint_dicts = await _load_constraints_from_db(category_slug)
     except Exception as e:
         logger.error(
             f"Error loading constraints: {e}",
             exc_info=True,
         )
-        # On error, return empty list (fail open - don't block agent)
-        return []
+        # On error, return no constraints (fail open - don't block agent)
+        return ConstraintSet()
+
+    if version is not None:
+        try:
+            await get_redis_client().setex(
+                redis_key, _SHARED_CACHE_TTL_SECONDS, json.dumps(constraint_dicts)
+            )
+        except Exception as e:
+            logger.warning(f"Could not store shared constraints for '{cache_key}': {e}")
+
+    constraint_set = compile_constraints(constraint_dicts)
+    _constraints_cache[cache_key] = (now, version, constraint_set)
+
+    logger.info(
+        f"Loaded {len(constraint_set)} constraints for category '{cache_key}' (version={version})",
+    )
+    return constraint_set
 
 
 def _should_skip_constraint(
@@ -152,20 +349,21 @@ def _should_skip_constraint(
 def validate_response(
     response_text: str,
     tools_called_this_turn: set[str],
-    constraints: list[dict[str, Any]],
+    constraints: ConstraintSet | list[dict[str, Any]],
     fsm_state: dict[str, Any] | None = None,
 ) -> tuple[bool, str | None]:
     """
     Validate an LLM response against loaded constraints.
 
-    For each constraint, checks if the detection_pattern matches the response.
-    If it does, verifies that the required_tool was called in this turn.
+    For each constraint whose detection_pattern matches the response,
+    verifies that one of its required tools was called in this turn.
     If not, the response is invalid and the error_injection message is returned.
 
     Args:
         response_text: The LLM's generated response text.
         tools_called_this_turn: Set of tool names called during this turn.
-        constraints: List of constraint dicts from get_constraints_for_category().
+        constraints: ConstraintSet from get_constraints_for_category()
+            (plain constraint dicts are compiled on the fly).
         fsm_state: Current FSM state (to determine if constraints should be skipped).
 
     Returns:
@@ -175,43 +373,73 @@ def validate_response(
     if not response_text or not constraints:
         return True, None
 
-    for constraint in constraints:
+    if not isinstance(constraints, ConstraintSet):
+        constraints = compile_constraints(constraints)
+
+    for constraint in constraints.matching(response_text):
         constraint_type = constraint["constraint_type"]
-        detection_pattern = constraint["detection_pattern"]
-        required_tool_str = constraint["required_tool"]
-        error_injection = constraint["error_injection"]
-        
+
         # Check if constraint should be skipped based on FSM context
         if _should_skip_constraint(constraint_type, fsm_state):
             continue
 
-        try:
-            # Check if the response matches the detection pattern
-            if re.search(detection_pattern, response_text, re.IGNORECASE):
-                # Pattern matched - check if required tool was called
-                required_tools = {t.strip() for t in required_tool_str.split("|")}
-
-                if not tools_called_this_turn.intersection(required_tools):
-                    # Violation: pattern detected but required tool not called
-                    logger.warning(
-                        f"Constraint violation: '{constraint['constraint_type']}' | "
-                        f"Pattern matched but required tools {required_tools} not in "
-                        f"called tools {tools_called_this_turn}",
-                    )
-                    return False, error_injection
-
-        except re.error as e:
-            logger.error(
-                f"Invalid regex in constraint '{constraint['constraint_type']}': {e}",
+        # Pattern matched - check if required tool was called
+        required_tools = constraint["required_tools"]
+        if tools_called_this_turn.isdisjoint(required_tools):
+            # Violation: pattern detected but required tool not called
+            logger.warning(
+                f"Constraint violation: '{constraint_type}' | "
+                f"Pattern matched but required tools {set(required_tools)} not in "
+                f"called tools {tools_called_this_turn}",
             )
-            continue
+            return False, constraint["error_injection"]
 
     return True, None
 
 
+def set_listened_version(version: int | None) -> None:
+    """
+    Record the constraint version announced on CONSTRAINTS_CHANGED_CHANNEL.
+
+    Called by the agent's change listener on subscribe and on every message.
+    Passing None (listener stopped) makes reads check the version in Redis.
+
+    Args:
+        version: Current constraint version, or None when not listening
+    """
+    global _listened_version
+    _listened_version = version
+    _constraints_cache.clear()
+    logger.debug(
+        f"Constraint version set to {version}",
+        extra={"metric_type": "constraint_cache", "version": version},
+    )
+
+
+async def publish_constraints_changed() -> int | None:
+    """
+    Bump the shared constraint version and notify agent workers.
+
+    Never raises: the DB change is already committed, and cached sets
+    expire after _SHARED_CACHE_TTL_SECONDS even if the bump is lost.
+
+    Returns:
+        New version, or None if Redis is unavailable
+    """
+    invalidate_cache()
+    try:
+        version = await get_redis_client().incr(CONSTRAINTS_VERSION_KEY)
+        await publish_to_channel(CONSTRAINTS_CHANGED_CHANNEL, {"version": version})
+        logger.info(f"Constraints changed, now at version {version}")
+        return version
+    except Exception as e:
+        logger.warning(f"Failed to publish constraint change: {e}")
+        return None
+
+
 def invalidate_cache(category_slug: str | None = None) -> None:
     """
-    Invalidate the constraint cache.
+    Invalidate this process's constraint cache.
 
     Args:
         category_slug: If provided, only invalidate for this category.
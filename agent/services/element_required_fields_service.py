@@ -4,12 +4,20 @@ MSI Automotive - Element Required Fields Service.
 Provides functionality for managing element-specific required fields
 during case data collection. Handles field retrieval, validation,
 and conditional field evaluation.
+
+During data collection the agent may call several element tools per turn,
+each needing the current element, its fields and the case's collected
+values. load_case_collection_data() fetches all of them for every element
+of a case at once, and the result is kept for the rest of the agent turn
+(see begin_collection_turn).
 """
 
 import logging
 import re
 import uuid
-from typing import Any
+from contextvars import ContextVar
+from dataclasses import dataclass, field as dataclass_field
+from typing import Any, Callable
 
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
@@ -19,6 +27,106 @@ from database.models import Element, ElementRequiredField, CaseElementData
 
 logger = logging.getLogger(__name__)
 
+# Compiled condition: collected values -> whether the field applies
+FieldCondition = Callable[[dict[str, Any]], bool]
+
+
+def compile_field_condition(
+    field: ElementRequiredField,
+    fields_by_id: dict[str, ElementRequiredField],
+) -> FieldCondition | None:
+    """
+    Compile a field's show-condition into a predicate over collected values.
+
+    Same semantics as _evaluate_field_condition in element_data_tools, but the
+    condition field lookup, operator dispatch and expected-value
+    normalization happen once instead of on every evaluation.
+
+    Args:
+        field: The conditional field
+        fields_by_id: All fields of the element, by str(id)
+
+    Returns:
+        Predicate, or None if the field has no condition (always shown)
+    """
+    if not field.condition_field_id:
+        return None
+
+    condition_field = fields_by_id.get(str(field.condition_field_id))
+    if not condition_field:
+        logger.warning(
+            f"Conditional field '{field.field_key}' references non-existent condition_field_id: "
+            f"{field.condition_field_id}. Showing field by default.",
+            extra={
+                "field_key": field.field_key,
+                "field_id": str(field.id),
+                "condition_field_id": str(field.condition_field_id),
+            },
+        )
+        return lambda values: True
+
+    key = condition_field.field_key
+    operator = field.condition_operator or "equals"
+    expected = str(field.condition_value).lower()
+
+    if operator == "equals":
+        return lambda values: bool(values.get(key)) and str(values.get(key)).lower() == expected
+    if operator == "not_equals":
+        return lambda values: not values.get(key) or str(values.get(key)).lower() != expected
+    if operator == "exists":
+        return lambda values: values.get(key) is not None and values.get(key) != ""
+    if operator == "not_exists":
+        return lambda values: values.get(key) is None or values.get(key) == ""
+    return lambda values: True
+
+
+@dataclass
+class CaseCollectionData:
+    """
+    Element definitions and collected data for all elements of a case.
+
+    Attributes:
+        case_id: UUID of the case
+        category_id: UUID of the vehicle category
+        elements: Active elements by code
+        fields: Active required fields by str(element.id), ordered by sort_order
+        element_data: Existing CaseElementData records by element code
+        conditions: Compiled show-conditions by str(field.id)
+    """
+
+    case_id: str
+    category_id: str
+    elements: dict[str, Element] = dataclass_field(default_factory=dict)
+    fields: dict[str, list[ElementRequiredField]] = dataclass_field(default_factory=dict)
+    element_data: dict[str, CaseElementData] = dataclass_field(default_factory=dict)
+    conditions: dict[str, FieldCondition] = dataclass_field(default_factory=dict)
+
+    def is_field_applicable(self, field: ElementRequiredField, collected_values: dict[str, Any]) -> bool:
+        """Evaluate a field's precompiled show-condition (True if unconditional)."""
+        condition = self.conditions.get(str(field.id))
+        return condition is None or condition(collected_values)
+
+
+# Per-turn cache of CaseCollectionData by case_id (None outside an agent turn)
+_collection_turn_cache: ContextVar[dict[str, CaseCollectionData] | None] = ContextVar(
+    "collection_turn_cache", default=None
+)
+
+
+def begin_collection_turn() -> None:
+    """
+    Start a fresh per-turn cache of case collection data.
+
+    Call once per agent turn before running tools. Data loaded during the
+    turn is reused by every element tool until the next turn starts.
+    """
+    _collection_turn_cache.set({})
+
+
+def get_turn_collection_cache() -> dict[str, CaseCollectionData] | None:
+    """Get this turn's cache (None when no agent turn is active)."""
+    return _collection_turn_cache.get()
+
 
 class ElementRequiredFieldsService:
     """
@@ -313,6 +421,63 @@ class ElementRequiredFieldsService:
 
         return result
 
+    async def load_case_collection_data(
+        self,
+        case_id: str,
+        category_id: str,
+        element_codes: list[str],
+    ) -> CaseCollectionData:
+        """
+        Load elements, required fields and collected data for a whole case.
+
+        One query for the elements (fields come with them via selectin) and
+        one for the existing CaseElementData records, instead of one round
+        trip per element and tool call.
+
+        Args:
+            case_id: UUID of the case
+            category_id: UUID of the vehicle category
+            element_codes: Codes of the case's elements
+
+        Returns:
+            CaseCollectionData (missing CaseElementData records are not created)
+        """
+        data = CaseCollectionData(case_id=case_id, category_id=category_id)
+        if not element_codes:
+            return data
+
+        async with get_async_session() as session:
+            elements_result = await session.execute(
+                select(Element)
+                .where(Element.code.in_(element_codes))
+                .where(Element.category_id == uuid.UUID(category_id))
+                .where(Element.is_active == True)  # noqa: E712
+                .options(selectinload(Element.required_fields))
+            )
+            elements = list(elements_result.scalars().all())
+
+            data_result = await session.execute(
+                select(CaseElementData)
+                .where(CaseElementData.case_id == uuid.UUID(case_id))
+                .where(CaseElementData.element_code.in_(element_codes))
+            )
+            data.element_data = {r.element_code: r for r in data_result.scalars().all()}
+
+        for element in elements:
+            fields = sorted(
+                (f for f in element.required_fields if f.is_active),
+                key=lambda f: f.sort_order,
+            )
+            fields_by_id = {str(f.id): f for f in fields}
+            data.elements[element.code] = element
+            data.fields[str(element.id)] = fields
+            for f in fields:
+                condition = compile_field_condition(f, fields_by_id)
+                if condition is not None:
+                    data.conditions[str(f.id)] = condition
+
+        return data
+
     async def get_element_data_for_case(
         self,
         case_id: str,
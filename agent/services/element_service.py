@@ -12,9 +12,11 @@ import unicodedata
 from difflib import SequenceMatcher
 from typing import Any
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Integer, any_, false, literal_column, select
+from sqlalchemy.dialects.postgresql import array as pg_array
+from sqlalchemy.orm import aliased, selectinload
 
+from agent.services.catalogue_snapshot import get_catalogue_snapshot
 from database.connection import get_async_session
 from database.models import Element, ElementImage, TierElementInclusion, Warning
 from shared.config import QUANTITY_PATTERNS, NEGATION_PATTERNS
@@ -28,6 +30,82 @@ CACHE_TTL = 300
 FUZZY_MATCH_THRESHOLD = 0.85
 
 
+class ElementMatchIndex:
+    """
+    Precompiled matching index for one category's elements.
+
+    Built once from the element list and reused across messages, so
+    _match_against_elements() only looks up the user's tokens instead of
+    re-normalizing every keyword and recomputing trigram sets per element:
+    - keyword_postings: normalized single-word keyword -> entries (phase 1)
+    - phrase_postings: word -> multi-word keyword entries (phase 2)
+    - alias_token_postings / alias_trigram_postings: alias candidates (phase 3)
+    - trigram_postings: trigram -> single-word keyword entries (phase 4 typos)
+
+    Entry ids follow element order then keyword order, so scores are
+    accumulated in exactly the same order as the original per-element loop.
+    """
+
+    def __init__(self, elements: list[dict]):
+        self.signature = self.build_signature(elements)
+        self.element_count = len(elements)
+
+        # Phase 1/4: one entry per raw keyword without spaces
+        # (element_idx, normalized keyword, trigram set)
+        self.single_keywords: list[tuple[int, str, frozenset[str]]] = []
+        self.keyword_postings: dict[str, list[int]] = {}
+        self.trigram_postings: dict[str, list[int]] = {}
+
+        # Phase 2: one entry per raw keyword with spaces
+        # (element_idx, normalized phrase, set of phrase words)
+        self.phrases: list[tuple[int, str, frozenset[str]]] = []
+        self.phrase_postings: dict[str, list[int]] = {}
+
+        # Phase 3: one entry per alias (element_idx, normalized alias, alias words)
+        self.aliases: list[tuple[int, str, frozenset[str]]] = []
+        self.alias_token_postings: dict[str, list[int]] = {}
+        # Aliases matched as substrings: indexed by their first trigram;
+        # aliases shorter than 3 chars are always checked
+        self.alias_trigram_postings: dict[str, list[int]] = {}
+        self.short_aliases: list[int] = []
+
+        normalize = ElementService._normalize_text
+        for elem_idx, element in enumerate(elements):
+            for keyword in element.get("keywords") or []:
+                kw_normalized = normalize(keyword)
+                if " " in keyword:
+                    entry_id = len(self.phrases)
+                    words = frozenset(kw_normalized.split())
+                    self.phrases.append((elem_idx, kw_normalized, words))
+                    for word in words:
+                        self.phrase_postings.setdefault(word, []).append(entry_id)
+                else:
+                    entry_id = len(self.single_keywords)
+                    trigrams = frozenset(ElementService._generate_char_ngrams(kw_normalized))
+                    self.single_keywords.append((elem_idx, kw_normalized, trigrams))
+                    self.keyword_postings.setdefault(kw_normalized, []).append(entry_id)
+                    for trigram in trigrams:
+                        self.trigram_postings.setdefault(trigram, []).append(entry_id)
+
+            for alias in element.get("aliases") or []:
+                alias_normalized = normalize(alias)
+                entry_id = len(self.aliases)
+                self.aliases.append((elem_idx, alias_normalized, frozenset(alias_normalized.split())))
+                self.alias_token_postings.setdefault(alias_normalized, []).append(entry_id)
+                if len(alias_normalized) >= 3:
+                    self.alias_trigram_postings.setdefault(alias_normalized[:3], []).append(entry_id)
+                else:
+                    self.short_aliases.append(entry_id)
+
+    @staticmethod
+    def build_signature(elements: list[dict]) -> tuple:
+        """Cheap identity of everything the index depends on (ids, keywords, aliases)."""
+        return tuple(
+            (e.get("id"), tuple(e.get("keywords") or ()), tuple(e.get("aliases") or ()))
+            for e in elements
+        )
+
+
 class ElementService:
     """
     Service for managing homologable elements and matching.
@@ -43,6 +121,34 @@ class ElementService:
         from shared.redis_client import get_redis_client
 
         self.redis = get_redis_client()
+        # Per-category matching indexes (in-process, rebuilt when elements change)
+        self._match_indexes: dict[str, ElementMatchIndex] = {}
+
+    def _get_match_index(self, category_id: str, elements: list[dict]) -> ElementMatchIndex:
+        """
+        Get the matching index for a category, rebuilding it if the elements changed.
+
+        Args:
+            category_id: UUID of the vehicle category
+            elements: Current element list for the category (from get_elements_by_category)
+
+        Returns:
+            ElementMatchIndex aligned with `elements` (same order)
+        """
+        index = self._match_indexes.get(category_id)
+        if index is None or index.signature != ElementMatchIndex.build_signature(elements):
+            index = ElementMatchIndex(elements)
+            self._match_indexes[category_id] = index
+            logger.debug(
+                f"Built element match index for category {category_id}",
+                extra={
+                    "category_id": category_id,
+                    "elements": len(elements),
+                    "keywords": len(index.single_keywords) + len(index.phrases),
+                    "aliases": len(index.aliases),
+                },
+            )
+        return index
 
     async def get_elements_by_category(
         self,
@@ -61,11 +167,20 @@ class ElementService:
         """
         cache_key = f"elements:category:{category_id}:active={is_active}"
 
+        # In-process snapshot first (no I/O), then Redis
+        snapshot = get_catalogue_snapshot()
+        entry = snapshot.get(cache_key)
+        if entry is not None:
+            return entry.value
+        version = snapshot.version
+
         # Try cache
         try:
             cached = await self.redis.get(cache_key)
             if cached:
-                return json.loads(cached)
+                data = json.loads(cached)
+                snapshot.put(cache_key, data, version)
+                return data
         except Exception as e:
             logger.warning(f"Cache read failed for {cache_key}: {e}")
 
@@ -104,6 +219,7 @@ class ElementService:
             except Exception as e:
                 logger.warning(f"Cache write failed for {cache_key}: {e}")
 
+            snapshot.put(cache_key, data, version)
             return data
 
     async def get_base_elements_by_category(
@@ -126,11 +242,20 @@ class ElementService:
         """
         cache_key = f"elements:base:category:{category_id}:active={is_active}"
 
+        # In-process snapshot first (no I/O), then Redis
+        snapshot = get_catalogue_snapshot()
+        entry = snapshot.get(cache_key)
+        if entry is not None:
+            return entry.value
+        version = snapshot.version
+
         # Try cache
         try:
             cached = await self.redis.get(cache_key)
             if cached:
-                return json.loads(cached)
+                data = json.loads(cached)
+                snapshot.put(cache_key, data, version)
+                return data
         except Exception as e:
             logger.warning(f"Cache read failed for {cache_key}: {e}")
 
@@ -173,6 +298,7 @@ class ElementService:
             except Exception as e:
                 logger.warning(f"Cache write failed for {cache_key}: {e}")
 
+            snapshot.put(cache_key, data, version)
             return data
 
     async def get_element_variants(
@@ -570,7 +696,12 @@ class ElementService:
         all_elements = await self.get_elements_by_category(category_id, is_active=True)
 
         # Match against ALL elements (base + variants)
-        all_matches = self._match_against_elements(all_elements, tokens, desc_normalized)
+        all_matches = self._match_against_elements(
+            all_elements,
+            tokens,
+            desc_normalized,
+            index=self._get_match_index(category_id, all_elements),
+        )
 
         # Threshold for high-confidence variant match (user specified variant directly)
         # e.g., "faro delantero" → FARO_DELANTERO with score >= 1.2
@@ -904,89 +1035,128 @@ class ElementService:
 
         return normalized_token
 
-    async def _get_ancestor_chain(
+    async def _get_ancestor_chains(
         self,
-        element_id: str,
+        element_ids: list[str],
         max_depth: int = 10,
-    ) -> list[dict]:
+    ) -> dict[str, list[dict]]:
         """
-        Get the chain of ancestors for an element (recursive).
+        Get the ancestor chains of several elements in a single query.
 
-        Walks up the parent chain, stopping when:
+        Uses a recursive CTE that walks up the parent chain of every
+        element at once, stopping when:
         - There's no parent (root element reached)
         - inherit_parent_data is False on the current element
+        - The parent is inactive
         - max_depth is reached (safety limit)
+        - A circular parent reference is detected
 
         Args:
-            element_id: UUID of the starting child element
-            max_depth: Maximum recursion depth (safety limit)
+            element_ids: UUIDs of the starting child elements
+            max_depth: Maximum chain length (safety limit)
 
         Returns:
-            List of ancestor dicts ordered from most distant ancestor to immediate parent.
-            Each dict contains: id, code, name, parent_element_id, inherit_parent_data
+            Dict mapping each requested element_id to its ancestor list, ordered
+            from most distant ancestor to immediate parent. Each ancestor dict
+            contains: id, code, name, parent_element_id, inherit_parent_data
         """
-        ancestors: list[dict] = []
-        current_id = element_id
-        visited: set[str] = set()
+        chains: dict[str, list[dict]] = {str(element_id): [] for element_id in element_ids}
+        if not element_ids:
+            return chains
 
         async with get_async_session() as session:
-            for _ in range(max_depth):
-                if current_id in visited:
-                    # Circular reference protection
-                    logger.warning(f"Circular parent reference detected at element {current_id}")
-                    break
-                visited.add(current_id)
-
-                result = await session.execute(
-                    select(Element).where(Element.id == current_id)
-                )
-                element = result.scalar_one_or_none()
-
-                if not element:
-                    break
+            result = await session.execute(
+                self._build_ancestor_chain_query(element_ids, max_depth)
+            )
+            rows = result.all()
 
-                # If this element doesn't inherit from parent, stop climbing
-                if current_id != element_id and not element.inherit_parent_data:
-                    break
+        for row in rows:
+            if row.is_cycle:
+                logger.warning(f"Circular parent reference detected at element {row.id}")
+            chains.setdefault(str(row.root_id), []).append({
+                "id": str(row.id),
+                "code": row.code,
+                "name": row.name,
+                "parent_element_id": str(row.parent_element_id) if row.parent_element_id else None,
+                "inherit_parent_data": row.inherit_parent_data,
+            })
 
-                if not element.parent_element_id:
-                    break
+        return chains
 
-                # Check if the current element wants to inherit
-                if current_id == element_id and not element.inherit_parent_data:
-                    break
+    @staticmethod
+    def _build_ancestor_chain_query(element_ids: list[str], max_depth: int):
+        """
+        Build the recursive CTE used by _get_ancestor_chains().
 
-                # Move to parent
-                current_id = str(element.parent_element_id)
+        Each row is (root_id, ancestor, depth); `path` holds the ids already
+        walked so a cycle adds the repeated element once and then stops.
+        Rows are ordered per root from most distant ancestor to parent.
+        """
+        parent = aliased(Element)
+
+        chain = (
+            select(
+                Element.id.label("root_id"),
+                Element.id.label("id"),
+                Element.code.label("code"),
+                Element.name.label("name"),
+                Element.parent_element_id.label("parent_element_id"),
+                Element.inherit_parent_data.label("inherit_parent_data"),
+                literal_column("0", Integer).label("depth"),
+                pg_array([Element.id]).label("path"),
+                false().label("is_cycle"),
+            )
+            .where(Element.id.in_(element_ids))
+            .cte("ancestor_chain", recursive=True)
+        )
 
-                # Fetch the parent
-                parent_result = await session.execute(
-                    select(Element).where(Element.id == current_id)
-                )
-                parent = parent_result.scalar_one_or_none()
+        chain = chain.union_all(
+            select(
+                chain.c.root_id,
+                parent.id,
+                parent.code,
+                parent.name,
+                parent.parent_element_id,
+                parent.inherit_parent_data,
+                chain.c.depth + 1,
+                chain.c.path + pg_array([parent.id]),
+                parent.id == any_(chain.c.path),
+            )
+            .join(parent, parent.id == chain.c.parent_element_id)
+            .where(
+                chain.c.inherit_parent_data == True,
+                parent.is_active == True,
+                chain.c.depth < max_depth,
+                chain.c.is_cycle == False,
+            )
+        )
 
-                if not parent or not parent.is_active:
-                    break
+        return (
+            select(chain)
+            .where(chain.c.depth > 0)
+            .order_by(chain.c.root_id, chain.c.depth.desc())
+        )
 
-                ancestors.append({
-                    "id": str(parent.id),
-                    "code": parent.code,
-                    "name": parent.name,
-                    "parent_element_id": str(parent.parent_element_id) if parent.parent_element_id else None,
-                    "inherit_parent_data": parent.inherit_parent_data,
-                })
+    async def _get_ancestor_chain(
+        self,
+        element_id: str,
+        max_depth: int = 10,
+    ) -> list[dict]:
+        """
+        Get the chain of ancestors for an element.
 
-                # Continue up the chain if this parent also inherits
-                if not parent.parent_element_id:
-                    break
+        Single-element convenience wrapper around _get_ancestor_chains().
 
-                # The parent itself must also have inherit_parent_data=True to continue
-                if not parent.inherit_parent_data:
-                    break
+        Args:
+            element_id: UUID of the starting child element
+            max_depth: Maximum recursion depth (safety limit)
 
-        # Reverse so order is: most distant ancestor first, immediate parent last
-        ancestors.reverse()
-        return ancestors
+        Returns:
+            List of ancestor dicts ordered from most distant ancestor to immediate parent.
+            Each dict contains: id, code, name, parent_element_id, inherit_parent_data
+        """
+        chains = await self._get_ancestor_chains([element_id], max_depth=max_depth)
+        return chains.get(str(element_id), [])
 
     async def get_element_with_images(
         self,
@@ -1056,28 +1226,31 @@ class ElementService:
                         f"{len(ancestors)} ancestor(s): {[a['code'] for a in ancestors]}"
                     )
 
+                    # Load images for the whole chain in one query
+                    images_result = await session.execute(
+                        select(ElementImage)
+                        .where(ElementImage.element_id.in_([a["id"] for a in ancestors]))
+                        .order_by(ElementImage.sort_order)
+                    )
+                    images_by_element: dict[str, list[ElementImage]] = {}
+                    for img in images_result.scalars().all():
+                        images_by_element.setdefault(str(img.element_id), []).append(img)
+
                     # Collect ancestor images (most distant first)
                     for ancestor in ancestors:
-                        ancestor_result = await session.execute(
-                            select(Element)
-                            .where(Element.id == ancestor["id"])
-                            .options(selectinload(Element.images))
-                        )
-                        ancestor_elem = ancestor_result.unique().scalar_one_or_none()
-                        if ancestor_elem and ancestor_elem.images:
-                            for img in sorted(ancestor_elem.images, key=lambda x: x.sort_order):
-                                all_images.append({
-                                    "id": str(img.id),
-                                    "image_url": img.image_url,
-                                    "title": img.title,
-                                    "description": img.description,
-                                    "image_type": img.image_type,
-                                    "sort_order": img.sort_order,
-                                    "is_required": img.is_required,
-                                    "status": getattr(img, "status", "placeholder"),
-                                    "user_instruction": getattr(img, "user_instruction", None),
-                                    "_inherited_from": ancestor["code"],
-                                })
+                        for img in images_by_element.get(ancestor["id"], []):
+                            all_images.append({
+                                "id": str(img.id),
+                                "image_url": img.image_url,
+                                "title": img.title,
+                                "description": img.description,
+                                "image_type": img.image_type,
+                                "sort_order": img.sort_order,
+                                "is_required": img.is_required,
+                                "status": getattr(img, "status", "placeholder"),
+                                "user_instruction": getattr(img, "user_instruction", None),
+                                "_inherited_from": ancestor["code"],
+                            })
 
                 # Add own images last
                 all_images.extend(own_images)
@@ -1135,71 +1308,47 @@ class ElementService:
         """
         from database.models import ElementWarningAssociation
 
-        all_warnings: list[dict] = []
-
-        # Get ancestor warnings if inheritance is enabled
-        if include_inherited:
-            # Check if this element has inherit_parent_data=True
-            async with get_async_session() as session:
-                elem_result = await session.execute(
-                    select(Element).where(Element.id == element_id)
-                )
-                element = elem_result.scalar_one_or_none()
-
-                if element and element.inherit_parent_data and element.parent_element_id:
-                    ancestors = await self._get_ancestor_chain(element_id)
-
-                    if ancestors:
-                        logger.info(
-                            f"[inheritance] Element {element.code} inheriting warnings from "
-                            f"{len(ancestors)} ancestor(s): {[a['code'] for a in ancestors]}"
-                        )
+        # Ancestor chain is empty unless the element inherits from its parent
+        ancestors = await self._get_ancestor_chain(element_id) if include_inherited else []
+        if ancestors:
+            logger.info(
+                f"[inheritance] Element {element_id} inheriting warnings from "
+                f"{len(ancestors)} ancestor(s): {[a['code'] for a in ancestors]}"
+            )
 
-                        # Get warnings for each ancestor (most distant first)
-                        ancestor_ids = [a["id"] for a in ancestors]
-                        for ancestor_id in ancestor_ids:
-                            ancestor_result = await session.execute(
-                                select(ElementWarningAssociation)
-                                .where(ElementWarningAssociation.element_id == ancestor_id)
-                                .options(selectinload(ElementWarningAssociation.warning))
-                            )
-                            ancestor_assocs = ancestor_result.unique().scalars().all()
-                            for assoc in ancestor_assocs:
-                                if assoc.warning.is_active:
-                                    all_warnings.append({
-                                        "id": str(assoc.warning.id),
-                                        "code": assoc.warning.code,
-                                        "message": assoc.warning.message,
-                                        "severity": assoc.warning.severity,
-                                        "show_condition": assoc.show_condition,
-                                        "threshold_quantity": assoc.threshold_quantity,
-                                        "_inherited_from": next(
-                                            (a["code"] for a in ancestors if a["id"] == ancestor_id),
-                                            None,
-                                        ),
-                                    })
-
-        # Get own warnings
+        # Load warnings for the element and its whole chain in one query
+        chain_ids = [a["id"] for a in ancestors] + [element_id]
         async with get_async_session() as session:
             result = await session.execute(
                 select(ElementWarningAssociation)
-                .where(ElementWarningAssociation.element_id == element_id)
+                .where(ElementWarningAssociation.element_id.in_(chain_ids))
                 .options(selectinload(ElementWarningAssociation.warning))
             )
             associations = result.unique().scalars().all()
 
-            own_warnings = [
-                {
-                    "id": str(assoc.warning.id),
-                    "code": assoc.warning.code,
-                    "message": assoc.warning.message,
-                    "severity": assoc.warning.severity,
-                    "show_condition": assoc.show_condition,
-                    "threshold_quantity": assoc.threshold_quantity,
-                }
-                for assoc in associations
-                if assoc.warning.is_active
-            ]
+        assocs_by_element: dict[str, list] = {}
+        for assoc in associations:
+            if assoc.warning.is_active:
+                assocs_by_element.setdefault(str(assoc.element_id), []).append(assoc)
+
+        def to_warning(assoc) -> dict:
+            return {
+                "id": str(assoc.warning.id),
+                "code": assoc.warning.code,
+                "message": assoc.warning.message,
+                "severity": assoc.warning.severity,
+                "show_condition": assoc.show_condition,
+                "threshold_quantity": assoc.threshold_quantity,
+            }
+
+        # Ancestor warnings (most distant first)
+        all_warnings: list[dict] = [
+            {**to_warning(assoc), "_inherited_from": ancestor["code"]}
+            for ancestor in ancestors
+            for assoc in assocs_by_element.get(ancestor["id"], [])
+        ]
+
+        own_warnings = [to_warning(assoc) for assoc in assocs_by_element.get(str(element_id), [])]
 
         # Merge: ancestors first, own last
         all_warnings.extend(own_warnings)
@@ -1242,26 +1391,20 @@ class ElementService:
         ancestor_warning_ids: set[str] = set()
 
         if include_inherited:
-            async with get_async_session() as session:
-                # Check which elements have inheritance enabled
-                result = await session.execute(
-                    select(Element).where(Element.id.in_(element_ids))
+            # One recursive query for every element's chain (empty if not inheriting)
+            chains = await self._get_ancestor_chains(element_ids)
+            for elem_id, ancestors in chains.items():
+                if not ancestors:
+                    continue
+                logger.info(
+                    f"[inheritance] Element {elem_id} inheriting warnings from "
+                    f"ancestors: {[a['code'] for a in ancestors]}"
                 )
-                elements = result.scalars().all()
-
-                for elem in elements:
-                    if elem.inherit_parent_data and elem.parent_element_id:
-                        ancestors = await self._get_ancestor_chain(str(elem.id))
-                        if ancestors:
-                            ancestor_ids = [a["id"] for a in ancestors]
-                            logger.info(
-                                f"[inheritance] Element {elem.code} inheriting warnings from "
-                                f"ancestors: {[a['code'] for a in ancestors]}"
-                            )
-                            for aid in ancestor_ids:
-                                if aid not in all_ids_to_query:
-                                    all_ids_to_query.append(aid)
-                                    ancestor_warning_ids.add(aid)
+                for ancestor in ancestors:
+                    aid = ancestor["id"]
+                    if aid not in all_ids_to_query:
+                        all_ids_to_query.append(aid)
+                        ancestor_warning_ids.add(aid)
 
         async with get_async_session() as session:
             result = await session.execute(
@@ -1348,48 +1491,12 @@ class ElementService:
         text = f"#{text}#"  # Boundary markers
         return {text[i:i+n] for i in range(len(text) - n + 1)}
 
-    def _ngram_similarity(self, text1: str, text2: str) -> float:
-        """
-        Calculate Jaccard similarity between character trigrams.
-
-        Args:
-            text1: First text
-            text2: Second text
-
-        Returns:
-            Similarity score (0.0-1.0)
-        """
-        ngrams1 = self._generate_char_ngrams(text1)
-        ngrams2 = self._generate_char_ngrams(text2)
-        if not ngrams1 or not ngrams2:
-            return 0.0
-        intersection = len(ngrams1 & ngrams2)
-        union = len(ngrams1 | ngrams2)
-        return intersection / union
-
-    def _word_overlap_score(self, tokens: list[str], keyword: str) -> float:
-        """
-        Calculate word overlap score for multi-word keywords.
-
-        Args:
-            tokens: User's tokenized input (already normalized)
-            keyword: Multi-word keyword
-
-        Returns:
-            Overlap score (0.0-1.0)
-        """
-        keyword_words = set(self._normalize_text(keyword).split())
-        token_set = set(tokens)
-        if not keyword_words:
-            return 0.0
-        overlap = len(keyword_words & token_set)
-        return overlap / len(keyword_words)
-
     def _match_against_elements(
         self,
         elements: list[dict],
         tokens: list[str],
         desc_normalized: str,
+        index: ElementMatchIndex | None = None,
     ) -> list[tuple[dict, float, set[str]]]:
         """
         Match tokens against a list of elements.
@@ -1400,87 +1507,108 @@ class ElementService:
         - Phase 3: Alias match (0.6 pts)
         - Phase 4: N-gram fuzzy matching for typos (0.0-0.4 pts)
 
+        Only keywords/aliases reachable from the user's tokens through the
+        index postings are scored, instead of every element x keyword pair.
+
         Args:
             elements: List of element dicts to match against
             tokens: Normalized tokens from user description
             desc_normalized: Full normalized description string
+            index: Prebuilt index for `elements` (built on the fly if None)
 
         Returns:
             List of (element_dict, score, matched_tokens) tuples
         """
-        matches = []
+        if index is None:
+            index = ElementMatchIndex(elements)
 
-        for element in elements:
-            score = 0.0
-            keywords = element.get("keywords", [])
-            aliases = element.get("aliases", [])
-            element_matched_tokens: set[str] = set()
+        scores: dict[int, float] = {}
+        matched: dict[int, set[str]] = {}
 
-            # === PHASE 1: Exact single-word keyword matches ===
-            for keyword in keywords:
-                kw_normalized = self._normalize_text(keyword)
-                if kw_normalized in tokens:
-                    score += 1.0
-                    element_matched_tokens.add(kw_normalized)
-
-            # === PHASE 2: Multi-word keyword partial/full matching ===
-            for keyword in keywords:
-                if " " in keyword:  # Multi-word keyword
-                    word_overlap = self._word_overlap_score(tokens, keyword)
-                    if word_overlap > 0.5:  # At least 50% of words match
-                        # Bonus: if full phrase is in description
-                        kw_normalized = self._normalize_text(keyword)
-                        if kw_normalized in desc_normalized:
-                            score += 0.8  # Full phrase match
-                        else:
-                            score += 0.4 * word_overlap  # Partial match
-                        # Add matched words from multi-word keyword
-                        kw_words = set(kw_normalized.split())
-                        for token in tokens:
-                            if token in kw_words:
-                                element_matched_tokens.add(token)
-
-            # === PHASE 3: Alias matches ===
-            for alias in aliases:
-                alias_normalized = self._normalize_text(alias)
-                if alias_normalized in tokens:
-                    score += 0.6
-                    element_matched_tokens.add(alias_normalized)
-                elif alias_normalized in desc_normalized:
-                    score += 0.6
-                    # Add tokens that are part of the alias
-                    alias_words = set(alias_normalized.split())
-                    for token in tokens:
-                        if token in alias_words:
-                            element_matched_tokens.add(token)
-
-            # === PHASE 4: N-gram fuzzy matching for typos ===
-            for token in tokens:
-                if len(token) >= 4:  # Only tokens with sufficient length
-                    for keyword in keywords:
-                        kw_normalized = self._normalize_text(keyword)
-                        # Only compare with single-word keywords
-                        if " " not in keyword:
-                            ngram_sim = self._ngram_similarity(token, kw_normalized)
-                            if ngram_sim > 0.5:  # Lower threshold than SequenceMatcher
-                                score += 0.4 * ngram_sim
-                                element_matched_tokens.add(token)
-
-            if score > 0:
-                matches.append((element, score, element_matched_tokens))
-
-        return matches
+        def add(elem_idx: int, points: float, new_tokens: set[str] | list[str]) -> None:
+            scores[elem_idx] = scores.get(elem_idx, 0.0) + points
+            matched.setdefault(elem_idx, set()).update(new_tokens)
+
+        token_set = set(tokens)
+
+        # === PHASE 1: Exact single-word keyword matches ===
+        phase1 = sorted(
+            entry_id
+            for token in token_set
+            for entry_id in index.keyword_postings.get(token, ())
+        )
+        for entry_id in phase1:
+            elem_idx, kw_normalized, _ = index.single_keywords[entry_id]
+            add(elem_idx, 1.0, [kw_normalized])
+
+        # === PHASE 2: Multi-word keyword partial/full matching ===
+        phase2 = sorted({
+            entry_id
+            for token in token_set
+            for entry_id in index.phrase_postings.get(token, ())
+        })
+        for entry_id in phase2:
+            elem_idx, kw_normalized, kw_words = index.phrases[entry_id]
+            word_overlap = len(kw_words & token_set) / len(kw_words)
+            if word_overlap > 0.5:  # At least 50% of words match
+                # Bonus: if full phrase is in description
+                if kw_normalized in desc_normalized:
+                    points = 0.8  # Full phrase match
+                else:
+                    points = 0.4 * word_overlap  # Partial match
+                # Add matched words from multi-word keyword
+                add(elem_idx, points, kw_words & token_set)
+
+        # === PHASE 3: Alias matches (exact token or substring of description) ===
+        alias_candidates = set(index.short_aliases)
+        for token in token_set:
+            alias_candidates.update(index.alias_token_postings.get(token, ()))
+        for i in range(len(desc_normalized) - 2):
+            alias_candidates.update(index.alias_trigram_postings.get(desc_normalized[i:i + 3], ()))
+        for entry_id in sorted(alias_candidates):
+            elem_idx, alias_normalized, alias_words = index.aliases[entry_id]
+            if alias_normalized in token_set:
+                add(elem_idx, 0.6, [alias_normalized])
+            elif alias_normalized in desc_normalized:
+                # Add tokens that are part of the alias
+                add(elem_idx, 0.6, alias_words & token_set)
+
+        # === PHASE 4: N-gram fuzzy matching for typos ===
+        for token in tokens:
+            if len(token) >= 4:  # Only tokens with sufficient length
+                token_ngrams = self._generate_char_ngrams(token)
+                # Shared-trigram counts per keyword = Jaccard intersection size
+                shared: dict[int, int] = {}
+                for trigram in token_ngrams:
+                    for entry_id in index.trigram_postings.get(trigram, ()):
+                        shared[entry_id] = shared.get(entry_id, 0) + 1
+                for entry_id in sorted(shared):
+                    elem_idx, _, kw_ngrams = index.single_keywords[entry_id]
+                    intersection = shared[entry_id]
+                    ngram_sim = intersection / (len(token_ngrams) + len(kw_ngrams) - intersection)
+                    if ngram_sim > 0.5:  # Lower threshold than SequenceMatcher
+                        add(elem_idx, 0.4 * ngram_sim, [token])
+
+        return [
+            (elements[elem_idx], scores[elem_idx], matched[elem_idx])
+            for elem_idx in sorted(scores)
+            if scores[elem_idx] > 0
+        ]
 
     async def invalidate_category_cache(self, category_id: str) -> None:
         """
         Invalidate cache for a specific category.
 
         Called when elements are created/updated/deleted.
-        Invalidates all related cache keys including variants.
+        Invalidates all related cache keys including variants, and drops
+        the in-process matching index and catalogue snapshot.
 
         Args:
             category_id: UUID of the category
         """
+        self._match_indexes.pop(category_id, None)
+        get_catalogue_snapshot().invalidate_all(reason=f"category:{category_id}")
+
         patterns = [
             f"elements:category:{category_id}:*",
             f"elements:base:category:{category_id}:*",
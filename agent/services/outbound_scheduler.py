@@ -0,0 +1,458 @@
+"""
+MSI Automotive - Outbound message scheduler.
+
+Agent replies (text, example images, follow-up text) used to be sent inline
+by the outgoing_messages listener, sleeping between images. One customer
+receiving six images held up every other customer's reply for 30+ seconds.
+
+OutboundScheduler delivers each conversation from its own FIFO queue and
+task, so pacing sleeps only delay later messages of the same conversation:
+- Messages of one conversation keep their order (one task drains its queue;
+  the task exits when the queue is empty).
+- All conversations share a limit of OUTBOUND_MAX_CONCURRENCY Chatwoot
+  calls in flight. The limit is held for a single call, never during pacing.
+- 429/502/503/504 answers are retried up to OUTBOUND_MAX_RETRIES times,
+  honoring Retry-After. A 429 pauses new calls for every conversation
+  until the Retry-After window has passed.
+- A message whose reply text could not be sent is redelivered (with
+  backoff, still ahead of later messages of its conversation) up to
+  OUTBOUND_DELIVERY_ATTEMPTS times; images are only sent after the text.
+  The on_delivered / on_failed callbacks let the stream consumer ACK or
+  dead-letter the message.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+from shared.chatwoot_client import ChatwootClient
+from shared.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+MAX_BACKOFF_SECONDS = 30.0
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """Retry-After header in seconds (HTTP-date values are ignored)."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return min(max(float(value), 0.0), MAX_BACKOFF_SECONDS)
+    except ValueError:
+        return None
+
+
+@dataclass
+class OutboundMessage:
+    """One outgoing_messages payload: reply text, images and follow-up."""
+
+    conversation_id: Any
+    customer_phone: str | None
+    message: str | None
+    images: list[dict] = field(default_factory=list)
+    follow_up_message: str | None = None
+    stream_msg_id: str | None = None
+    published_at: float | None = None  # Producer wall clock (stream mode)
+    payload: dict[str, Any] = field(default_factory=dict, repr=False)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def queue_key(self) -> str:
+        """Messages with the same key are delivered in order."""
+        return str(self.conversation_id or self.customer_phone)
+
+    @classmethod
+    def from_payload(cls, data: dict[str, Any], stream_msg_id: str | None = None) -> "OutboundMessage":
+        """
+        Build from an outgoing_messages payload.
+
+        Accepts both image formats: a list of URLs (old) or
+        {"images": [...], "follow_up_message": "..."} with image dicts.
+        Base documentation images are ordered before element images.
+
+        Args:
+            data: Payload as published by publish_outgoing_message()
+            stream_msg_id: ID in OUTGOING_STREAM (None for pub/sub)
+        """
+        pending_images = data.get("pending_images", data.get("images", []))
+        images: list = []
+        follow_up_message = None
+
+        if isinstance(pending_images, dict):
+            images = pending_images.get("images", [])
+            follow_up_message = pending_images.get("follow_up_message")
+        elif isinstance(pending_images, list):
+            images = pending_images
+
+        base_images: list[dict] = []
+        elemento_images: list[dict] = []
+        for img in images:
+            if isinstance(img, str):
+                # Old format: just URL, treat as general/elemento
+                elemento_images.append({
+                    "url": img,
+                    "tipo": "elemento",
+                    "descripcion": "Documentación específica",
+                })
+            elif isinstance(img, dict):
+                # Accept both "base" and "base_documentation" for backward compatibility
+                if img.get("tipo", "general") in ("base", "base_documentation"):
+                    base_images.append({**img, "tipo": img.get("tipo", "base")})
+                else:
+                    elemento_images.append({**img, "tipo": img.get("tipo", "elemento")})
+
+        return cls(
+            conversation_id=data.get("conversation_id"),
+            customer_phone=data.get("customer_phone"),
+            message=data.get("message"),
+            images=base_images + elemento_images,
+            follow_up_message=follow_up_message,
+            stream_msg_id=stream_msg_id,
+            published_at=data.get("published_at"),
+            payload=data,
+        )
+
+
+class OutboundScheduler:
+    """Per-conversation delivery queues with shared concurrency and rate limiting."""
+
+    def __init__(
+        self,
+        chatwoot: ChatwootClient,
+        resolve_url: Callable[[str], str | None] | None = None,
+        max_concurrency: int | None = None,
+        image_delay: float | None = None,
+        follow_up_delay: float | None = None,
+        max_retries: int | None = None,
+        max_delivery_attempts: int | None = None,
+        redelivery_delay: float | None = None,
+        on_delivered: Optional[Callable[[OutboundMessage], Awaitable[None]]] = None,
+        on_failed: Optional[Callable[[OutboundMessage, str], Awaitable[None]]] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            chatwoot: Client used for all sends
+            resolve_url: Turns stored image URLs into absolute ones (None
+                result skips the image). Defaults to identity.
+            max_concurrency: Chatwoot calls in flight (default from settings)
+            image_delay: Seconds between images of one conversation
+            follow_up_delay: Seconds between last image and follow-up text
+            max_retries: Retries for retryable HTTP statuses
+            max_delivery_attempts: Attempts per message when the reply
+                text fails
+            redelivery_delay: Base backoff between delivery attempts
+                (doubles per attempt)
+            on_delivered: Awaited after a message was delivered
+            on_failed: Awaited with the last error after the final attempt
+        """
+        settings = get_settings()
+        self._chatwoot = chatwoot
+        self._resolve_url = resolve_url or (lambda url: url)
+        self._semaphore = asyncio.Semaphore(
+            max_concurrency if max_concurrency is not None else settings.OUTBOUND_MAX_CONCURRENCY
+        )
+        self._image_delay = (
+            image_delay if image_delay is not None else settings.OUTBOUND_IMAGE_DELAY_SECONDS
+        )
+        self._follow_up_delay = (
+            follow_up_delay if follow_up_delay is not None else settings.OUTBOUND_FOLLOW_UP_DELAY_SECONDS
+        )
+        self._max_retries = max_retries if max_retries is not None else settings.OUTBOUND_MAX_RETRIES
+        self._max_delivery_attempts = (
+            max_delivery_attempts
+            if max_delivery_attempts is not None
+            else settings.OUTBOUND_DELIVERY_ATTEMPTS
+        )
+        self._redelivery_delay = (
+            redelivery_delay if redelivery_delay is not None else settings.OUTBOUND_REDELIVERY_DELAY_SECONDS
+        )
+        self._on_delivered = on_delivered
+        self._on_failed = on_failed
+        self._queues: dict[str, deque[OutboundMessage]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._paused_until = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Messages queued but not yet picked up."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def active_conversations(self) -> int:
+        """Conversations with a delivery task running."""
+        return len(self._workers)
+
+    def submit(self, message: OutboundMessage) -> None:
+        """Queue a message behind earlier messages of the same conversation."""
+        key = message.queue_key
+        self._queues.setdefault(key, deque()).append(message)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain(key), name=f"outbound:{key}")
+
+    async def join(self) -> None:
+        """Wait until every queued message has been delivered (or failed)."""
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel delivery tasks; messages still queued are dropped."""
+        if self.pending:
+            logger.warning(
+                f"Outbound scheduler closing with {self.pending} undelivered messages",
+                extra={"metric_type": "outbound_dropped", "pending": self.pending},
+            )
+        tasks = list(self._workers.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _drain(self, key: str) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                await self._deliver_with_redelivery(queue.popleft())
+        finally:
+            # No await between the empty check and these pops, so submit()
+            # either sees this task (and its queue) or starts a new one
+            self._workers.pop(key, None)
+            self._queues.pop(key, None)
+
+    async def _deliver_with_redelivery(self, message: OutboundMessage) -> None:
+        error = "Reply text was not accepted by Chatwoot"
+        for attempt in range(1, self._max_delivery_attempts + 1):
+            try:
+                if await self._deliver(message):
+                    self._log_delivered(message, attempt)
+                    await self._notify(self._on_delivered, message)
+                    return
+                error = "Reply text was not accepted by Chatwoot"
+            except Exception as e:
+                logger.error(
+                    f"Error sending outgoing message: {e}",
+                    exc_info=True,
+                    extra={"conversation_id": message.conversation_id},
+                )
+                error = str(e)
+
+            if attempt < self._max_delivery_attempts:
+                delay = min(MAX_BACKOFF_SECONDS, self._redelivery_delay * 2 ** (attempt - 1))
+                logger.warning(
+                    f"Outgoing message for conversation_id={message.conversation_id} not delivered "
+                    f"(attempt {attempt}/{self._max_delivery_attempts}), retrying in {delay:.1f}s",
+                    extra={
+                        "metric_type": "outbound_redelivery",
+                        "conversation_id": message.conversation_id,
+                        "attempt": attempt,
+                    },
+                )
+                await asyncio.sleep(delay)
+
+        logger.error(
+            f"Outgoing message for conversation_id={message.conversation_id} failed after "
+            f"{self._max_delivery_attempts} attempts: {error}",
+            extra={"metric_type": "outbound_failed", "conversation_id": message.conversation_id},
+        )
+        await self._notify(self._on_failed, message, error)
+
+    def _log_delivered(self, message: OutboundMessage, attempts: int) -> None:
+        extra: dict[str, Any] = {
+            "metric_type": "outbound_delivered",
+            "conversation_id": message.conversation_id,
+            "attempts": attempts,
+        }
+        if message.published_at is not None:
+            # Publish (agent) → Chatwoot 200 for the reply text and images
+            extra["delivery_latency_ms"] = int((time.time() - message.published_at) * 1000)
+        logger.info(
+            f"Outgoing message delivered: conversation_id={message.conversation_id}",
+            extra=extra,
+        )
+
+    async def _notify(self, callback: Optional[Callable[..., Awaitable[None]]], *args: Any) -> None:
+        if callback is None:
+            return
+        try:
+            await callback(*args)
+        except Exception as e:
+            logger.warning(
+                f"Outbound delivery callback failed: {e}",
+                extra={"conversation_id": args[0].conversation_id},
+            )
+
+    async def _call(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one Chatwoot call under the concurrency limit, retrying rate limits."""
+        attempt = 0
+        while True:
+            while (wait := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(wait)
+
+            async with self._semaphore:
+                try:
+                    return await send()
+                except httpx.HTTPStatusError as e:
+                    status = e.response.status_code
+                    if status not in RETRYABLE_STATUS_CODES or attempt >= self._max_retries:
+                        raise
+                    retry_after = _retry_after_seconds(e.response)
+
+            attempt += 1
+            delay = retry_after if retry_after is not None else min(MAX_BACKOFF_SECONDS, 2.0 ** attempt)
+            if status == 429:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            logger.warning(
+                f"Chatwoot answered {status}, retry {attempt}/{self._max_retries} in {delay:.1f}s",
+                extra={"metric_type": "outbound_retry", "status_code": status, "delay_seconds": delay},
+            )
+            await asyncio.sleep(delay)
+
+    async def _send_text(self, message: OutboundMessage, text: str) -> bool:
+        if message.conversation_id is None:
+            # Needs contact/conversation resolution (None if it fails)
+            conversation_id = await self._call(
+                lambda: self._chatwoot.send_to_customer(message.customer_phone, text)
+            )
+            return conversation_id is not None
+        await self._call(
+            lambda: self._chatwoot.post_message(message.conversation_id, text, message.customer_phone)
+        )
+        return True
+
+    async def _try_send_text(self, message: OutboundMessage, text: str, label: str) -> bool:
+        try:
+            success = await self._send_text(message, text)
+        except Exception as e:
+            logger.error(
+                f"Failed to send {label} to {message.customer_phone}: {e}",
+                extra={"conversation_id": message.conversation_id},
+            )
+            return False
+
+        if success:
+            logger.info(
+                f"{label.capitalize()} sent to {message.customer_phone}: success=True",
+                extra={
+                    "conversation_id": message.conversation_id,
+                    "customer_phone": message.customer_phone,
+                },
+            )
+        else:
+            logger.error(
+                f"{label.capitalize()} sent to {message.customer_phone}: success=False",
+                extra={
+                    "conversation_id": message.conversation_id,
+                    "customer_phone": message.customer_phone,
+                },
+            )
+        return success
+
+    async def _deliver(self, message: OutboundMessage) -> bool:
+        """Send text, images and follow-up; False if the reply text failed."""
+        conversation_id = message.conversation_id
+        queue_wait_ms = int((time.monotonic() - message.enqueued_at) * 1000)
+        logger.info(
+            f"Outgoing message delivery started: conversation_id={conversation_id}",
+            extra={
+                "metric_type": "outbound_queue_wait",
+                "conversation_id": conversation_id,
+                "queue_wait_ms": queue_wait_ms,
+                "has_images": bool(message.images),
+            },
+        )
+
+        if message.message and not await self._try_send_text(message, message.message, "message"):
+            # Nothing reached the customer yet: safe to redeliver as a whole
+            return False
+
+        if not (message.images and conversation_id):
+            return True
+
+        sendable = [img for img in message.images if img.get("url")]
+        total_images = len(sendable)
+        sent_count = 0
+
+        for image_number, img_data in enumerate(sendable, start=1):
+            url = img_data["url"]
+            tipo = img_data.get("tipo")
+            descripcion = img_data.get("descripcion", "")
+
+            absolute_url = self._resolve_url(url)
+            if not absolute_url:
+                logger.warning(
+                    f"Failed to make absolute URL | url={url}",
+                    extra={"url": url, "conversation_id": conversation_id},
+                )
+                continue
+
+            # Numbered captions make the order visible to the customer
+            numbered_caption = (
+                f"({image_number}/{total_images}) {descripcion}"
+                if descripcion
+                else f"({image_number}/{total_images})"
+            )
+
+            try:
+                message_id = await self._call(
+                    lambda: self._chatwoot.upload_image(
+                        conversation_id=int(conversation_id),
+                        image_url=absolute_url,
+                        caption=numbered_caption,
+                    )
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to send image {image_number}/{total_images}: {e}",
+                    extra={"conversation_id": conversation_id},
+                )
+                continue
+
+            if not message_id:
+                logger.warning(
+                    f"Failed to send image {image_number}/{total_images} | "
+                    f"tipo={tipo}, url={absolute_url}",
+                    extra={"tipo": tipo, "url": absolute_url},
+                )
+                continue
+
+            sent_count += 1
+            logger.info(
+                f"Image {image_number}/{total_images} sent | tipo={tipo}, message_id={message_id}",
+                extra={
+                    "tipo": tipo,
+                    "url": absolute_url,
+                    "message_id": message_id,
+                    "image_number": image_number,
+                    "total_images": total_images,
+                },
+            )
+
+            # Chatwoot waits ~2s in Sidekiq before dispatching an attachment
+            # to WhatsApp; the gap keeps images in order. Only this
+            # conversation waits.
+            if image_number < total_images:
+                await asyncio.sleep(self._image_delay)
+
+        logger.info(
+            f"Images sent to conversation {conversation_id}: {sent_count}/{total_images}",
+            extra={
+                "conversation_id": conversation_id,
+                "sent_count": sent_count,
+                "total_images": total_images,
+            },
+        )
+
+        if message.follow_up_message and sent_count > 0:
+            # Text has no Sidekiq wait, so it could overtake the last image
+            await asyncio.sleep(self._follow_up_delay)
+            await self._try_send_text(message, message.follow_up_message, "follow-up message")
+
+        return True
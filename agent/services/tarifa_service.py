@@ -2,7 +2,8 @@
 MSI Automotive - Tarifa Service for Agent.
 
 Provides tariff calculation and documentation retrieval for the LangGraph agent.
-Uses Redis caching for performance and classification_rules for AI-driven tariff selection.
+Uses an in-process catalogue snapshot and Redis caching for performance, and
+classification_rules for AI-driven tariff selection.
 """
 
 import json
@@ -14,6 +15,8 @@ from uuid import UUID as PyUUID
 from sqlalchemy import or_, select
 from sqlalchemy.orm import selectinload
 
+from agent.services.catalogue_snapshot import get_catalogue_snapshot
+from agent.services.tariff_rule_matcher import CategoryRuleMatcher
 from database.connection import get_async_session
 from database.models import (
     VehicleCategory,
@@ -56,6 +59,8 @@ class TarifaService:
 
     def __init__(self):
         self.redis = get_redis_client()
+        # Per-category compiled classification rules, built when category data is loaded
+        self._rule_matchers: dict[str, CategoryRuleMatcher] = {}
 
     async def get_active_categories(
         self,
@@ -72,11 +77,20 @@ class TarifaService:
         """
         cache_key = f"tariffs:categories:{client_type or 'all'}"
 
+        # In-process snapshot first (no I/O), then Redis
+        snapshot = get_catalogue_snapshot()
+        entry = snapshot.get(cache_key)
+        if entry is not None:
+            return entry.value
+        version = snapshot.version
+
         # Try cache
         try:
             cached = await self.redis.get(cache_key)
             if cached:
-                return json.loads(cached)
+                data = json.loads(cached)
+                snapshot.put(cache_key, data, version)
+                return data
         except Exception as e:
             logger.warning(f"Cache read failed: {e}")
 
@@ -112,6 +126,7 @@ class TarifaService:
             except Exception as e:
                 logger.warning(f"Cache write failed: {e}")
 
+            snapshot.put(cache_key, data, version)
             return data
 
     async def get_supported_categories_for_client(
@@ -132,12 +147,21 @@ class TarifaService:
         """
         cache_key = f"tariffs:supported:{client_type}"
 
+        # In-process snapshot first (no I/O), then Redis
+        snapshot = get_catalogue_snapshot()
+        entry = snapshot.get(cache_key)
+        if entry is not None:
+            return entry.value
+        version = snapshot.version
+
         # Try cache
         try:
             cached = await self.redis.get(cache_key)
             if cached:
                 logger.debug(f"Cache hit for supported categories: {client_type}")
-                return json.loads(cached)
+                data = json.loads(cached)
+                snapshot.put(cache_key, data, version)
+                return data
         except Exception as e:
             logger.warning(f"Cache read failed: {e}")
 
@@ -173,6 +197,7 @@ class TarifaService:
             except Exception as e:
                 logger.warning(f"Cache write failed: {e}")
 
+            snapshot.put(cache_key, data, version)
             return data
 
     async def get_category_data(
@@ -193,12 +218,22 @@ class TarifaService:
         """
         cache_key = f"tariffs:{category_slug}"
 
+        # In-process snapshot first (no I/O), then Redis
+        snapshot = get_catalogue_snapshot()
+        entry = snapshot.get(cache_key)
+        if entry is not None:
+            return entry.value
+        version = snapshot.version
+
         # Try cache
         try:
             cached = await self.redis.get(cache_key)
             if cached:
                 logger.debug(f"Cache hit for category: {category_slug}")
-                return json.loads(cached)
+                data = json.loads(cached)
+                self._compile_rule_matcher(category_slug, data)
+                snapshot.put(cache_key, data, version)
+                return data
         except Exception as e:
             logger.warning(f"Cache read failed: {e}")
 
@@ -216,6 +251,8 @@ class TarifaService:
                 )
             except Exception as e:
                 logger.warning(f"Cache write failed: {e}")
+            self._compile_rule_matcher(category_slug, data)
+            snapshot.put(cache_key, data, version)
 
         return data
 
@@ -356,6 +393,127 @@ class TarifaService:
                 "available_categories": [c["slug"] for c in await self.get_active_categories()],
             }
 
+        return await self._select_tariff_from_data(
+            data,
+            category_slug,
+            elements_description,
+            element_count,
+            element_codes,
+        )
+
+    async def select_tariffs_by_rules_batch(
+        self,
+        category_slug: str,
+        requests: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """
+        Select tariffs for several element sets of the same category.
+
+        Equivalent to calling select_tariff_by_rules() once per request, but
+        the category data, priority-sorted tiers and resolved tier elements
+        are loaded once and shared by every request.
+
+        Args:
+            category_slug: Vehicle category (e.g., "motos-part", "motos-prof")
+            requests: Dicts with elements_description, element_count and
+                optional element_codes
+
+        Returns:
+            One result per request, in order (same shape as select_tariff_by_rules)
+        """
+        if not requests:
+            return []
+
+        data = await self.get_category_data(category_slug)
+        if not data:
+            error = {
+                "error": f"Categoria '{category_slug}' no encontrada",
+                "available_categories": [c["slug"] for c in await self.get_active_categories()],
+            }
+            return [dict(error) for _ in requests]
+
+        matcher = self._get_rule_matcher(category_slug, data)
+        tier_elements_cache: dict[str, list[dict]] = {}
+
+        results = []
+        for request in requests:
+            results.append(await self._select_tariff_from_data(
+                data,
+                category_slug,
+                request["elements_description"],
+                request["element_count"],
+                request.get("element_codes"),
+                matcher=matcher,
+                tier_elements_cache=tier_elements_cache,
+            ))
+
+        logger.info(
+            f"Batch tariff selection | category={category_slug} requests={len(requests)} "
+            f"tiers_resolved={len(tier_elements_cache)}",
+            extra={"metric_type": "tariff_batch", "requests": len(requests)},
+        )
+        return results
+
+    def _get_rule_matcher(self, category_slug: str, data: dict) -> CategoryRuleMatcher:
+        """
+        Get the compiled rule matcher for a category's data.
+
+        get_category_data compiles the matcher whenever it loads fresh data
+        and snapshot reads return that same object, so this is an identity
+        check; other data (e.g. passed in by tests) is compiled on demand.
+
+        Args:
+            category_slug: Vehicle category slug
+            data: Current category data (from get_category_data)
+
+        Returns:
+            CategoryRuleMatcher compiled from `data`
+        """
+        matcher = self._rule_matchers.get(category_slug)
+        if matcher is not None and matcher.source is data:
+            return matcher
+        return self._compile_rule_matcher(category_slug, data)
+
+    def _compile_rule_matcher(self, category_slug: str, data: dict) -> CategoryRuleMatcher:
+        """Compile and store the rule matcher for freshly loaded category data."""
+        matcher = CategoryRuleMatcher(data)
+        self._rule_matchers[category_slug] = matcher
+        logger.debug(
+            f"Compiled classification rules for category {category_slug}",
+            extra={
+                "category": category_slug,
+                "tiers": len(data["tiers"]),
+                "warnings": len(data["warnings"]),
+                "keywords": len(matcher.automaton.patterns),
+            },
+        )
+        return matcher
+
+    async def _select_tariff_from_data(
+        self,
+        data: dict,
+        category_slug: str,
+        elements_description: str,
+        element_count: int,
+        element_codes: list[str] | None = None,
+        matcher: CategoryRuleMatcher | None = None,
+        tier_elements_cache: dict[str, list[dict]] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Select a tariff from already-loaded category data.
+
+        Args:
+            data: Category data (from get_category_data)
+            category_slug: Vehicle category slug (for error messages)
+            elements_description: Natural language description of elements
+            element_count: Number of elements identified
+            element_codes: Optional list of element codes for tier validation
+            matcher: Compiled rules for `data` (looked up if None)
+            tier_elements_cache: Resolved tier elements shared across calls
+
+        Returns:
+            Dict with selected tier, price, applicable warnings, and element_validation
+        """
         tiers = data["tiers"]
         if not tiers:
             return {
@@ -365,53 +523,41 @@ class TarifaService:
         # Normalize description for matching
         description_lower = elements_description.lower()
 
-        # Find matching tier using classification_rules
+        # Scan the description once against every tier and warning keyword
+        if matcher is None:
+            matcher = self._get_rule_matcher(category_slug, data)
+        found_keywords = matcher.find(description_lower)
+
+        # Find matching tier using classification_rules (tiers in priority order)
         selected_tier = None
         matched_rules = []
 
-        # Sort tiers by priority (from classification_rules) if available
-        def get_priority(tier):
-            rules = tier.get("classification_rules") or {}
-            return rules.get("priority", 999)
-
-        sorted_tiers = sorted(tiers, key=get_priority)
-
-        for tier in sorted_tiers:
-            rules = tier.get("classification_rules")
-            if not rules:
-                continue
-
-            # Check "applies_if_any" keywords
-            keywords = rules.get("applies_if_any", [])
-            for keyword in keywords:
-                if keyword.lower() in description_lower:
-                    matched_rules.append({
-                        "tier_code": tier["code"],
-                        "matched_keyword": keyword,
-                    })
-                    if selected_tier is None:
-                        # Verificar que el conteo de elementos esté en el rango del tier
-                        min_elem = tier.get("min_elements")
-                        max_elem = tier.get("max_elements")
-
-                        in_range = True
-                        if min_elem is not None and element_count < min_elem:
-                            in_range = False
-                        if max_elem is not None and element_count > max_elem:
-                            in_range = False
-
-                        if in_range:
-                            selected_tier = tier
-                    break
+        for tier, keyword in matcher.match_tiers(found_keywords):
+            matched_rules.append({
+                "tier_code": tier["code"],
+                "matched_keyword": keyword,
+            })
+            if selected_tier is None:
+                # Verificar que el conteo de elementos esté en el rango del tier
+                min_elem = tier.get("min_elements")
+                max_elem = tier.get("max_elements")
+
+                in_range = True
+                if min_elem is not None and element_count < min_elem:
+                    in_range = False
+                if max_elem is not None and element_count > max_elem:
+                    in_range = False
+
+                if in_range:
+                    selected_tier = tier
 
         # If no tier with keywords matched the element range, fall back to count logic
         if selected_tier is None:
             selected_tier = self._select_tier_by_count(tiers, element_count)
 
         # Find applicable warnings (pass tier_id for tier-scoped warnings)
-        applicable_warnings = self._find_applicable_warnings(
-            data["warnings"],
-            description_lower,
+        applicable_warnings = matcher.applicable_warnings(
+            found_keywords,
             selected_tier_id=selected_tier.get("id"),
         )
 
@@ -422,6 +568,7 @@ class TarifaService:
                 tier_id=selected_tier["id"],
                 element_codes=element_codes,
                 category_id=data["category"]["id"],
+                tier_elements_cache=tier_elements_cache,
             )
 
         return {
@@ -443,6 +590,7 @@ class TarifaService:
         tier_id: str,
         element_codes: list[str],
         category_id: str,
+        tier_elements_cache: dict[str, list[dict]] | None = None,
     ) -> dict[str, Any]:
         """
         Validate that elements are included in the selected tier.
@@ -455,6 +603,7 @@ class TarifaService:
             tier_id: UUID of the selected tier
             element_codes: List of element codes to validate
             category_id: UUID of the vehicle category
+            tier_elements_cache: Optional tier_id -> resolved elements memo (batch pricing)
 
         Returns:
             Dict with:
@@ -472,7 +621,12 @@ class TarifaService:
 
         try:
             # Get all elements included in this tier (using resolve_tier_elements)
-            tier_elements = await self.resolve_tier_elements(tier_id)
+            if tier_elements_cache is not None and tier_id in tier_elements_cache:
+                tier_elements = tier_elements_cache[tier_id]
+            else:
+                tier_elements = await self.resolve_tier_elements(tier_id)
+                if tier_elements_cache is not None:
+                    tier_elements_cache[tier_id] = tier_elements
 
             if not tier_elements:
                 # If tier has no element inclusions defined, treat as "all elements allowed"
@@ -553,85 +707,6 @@ class TarifaService:
             "price": 140,
         }
 
-    def _find_applicable_warnings(
-        self,
-        warnings: list[dict],
-        description_lower: str,
-        selected_tier_id: str | None = None,
-    ) -> list[dict]:
-        """
-        Find warnings that should be shown based on trigger_conditions and scope.
-
-        Warning scoping:
-        - Global warnings (no scope): Apply based on trigger_conditions only
-        - Category-scoped: Already filtered in query, apply based on trigger_conditions
-        - Tier-scoped: Only apply if selected_tier_id matches
-        - Element-scoped: Apply based on element matching (future)
-
-        Args:
-            warnings: List of warning dicts with trigger_conditions and scope fields
-            description_lower: Lowercased element description
-            selected_tier_id: ID of the selected tier (to filter tier-scoped warnings)
-
-        Returns:
-            List of applicable warnings
-        """
-        applicable = []
-        seen_codes = set()  # Avoid duplicates
-
-        for warning in warnings:
-            code = warning["code"]
-            if code in seen_codes:
-                continue
-
-            # Check tier scope - if warning has tier_id, only apply if it matches selected tier
-            warning_tier_id = warning.get("tier_id")
-            if warning_tier_id and warning_tier_id != selected_tier_id:
-                continue
-
-            conditions = warning.get("trigger_conditions")
-
-            # Scoped warnings (category or tier) without conditions: always show
-            is_scoped = warning.get("category_id") or warning.get("tier_id") or warning.get("element_id")
-            if is_scoped and not conditions:
-                applicable.append({
-                    "code": code,
-                    "message": warning["message"],
-                    "severity": warning["severity"],
-                    "scope": "category" if warning.get("category_id") else "tier" if warning.get("tier_id") else "element",
-                })
-                seen_codes.add(code)
-                continue
-
-            # If no conditions for global warning, skip (explicit trigger required)
-            if not conditions:
-                continue
-
-            # Check "always_show"
-            if conditions.get("always_show"):
-                applicable.append({
-                    "code": code,
-                    "message": warning["message"],
-                    "severity": warning["severity"],
-                })
-                seen_codes.add(code)
-                continue
-
-            # Check "element_keywords"
-            keywords = conditions.get("element_keywords", [])
-            for keyword in keywords:
-                if keyword.lower() in description_lower:
-                    applicable.append({
-                        "code": code,
-                        "message": warning["message"],
-                        "severity": warning["severity"],
-                        "triggered_by": keyword,
-                    })
-                    seen_codes.add(code)
-                    break
-
-        return applicable
-
     async def get_warnings_by_scope(
         self,
         category_id: str | None = None,
@@ -743,6 +818,8 @@ class TarifaService:
 
         This method resolves TierElementInclusion records, following
         included_tier_id references to build a complete list of elements.
+        Every inclusion reachable from the tier is loaded in one recursive
+        query and resolved in memory (single session, no nested sessions).
 
         Uses Redis caching with longer TTL since tier structure rarely changes.
 
@@ -753,72 +830,34 @@ class TarifaService:
         Returns:
             List of element dicts with code, name, max_quantity, notes
         """
-        # Only check cache for top-level calls (not recursive calls)
+        # Only check cache for top-level calls
         is_top_level = visited_tiers is None
         cache_key = f"tier:elements:{tier_id}"
 
         if is_top_level:
-            # Try cache first
+            # In-process snapshot first (no I/O), then Redis
+            snapshot = get_catalogue_snapshot()
+            entry = snapshot.get(cache_key)
+            if entry is not None:
+                return entry.value
+            version = snapshot.version
+
             try:
                 cached = await self.redis.get(cache_key)
                 if cached:
                     logger.debug(f"Tier elements cache hit for: {tier_id}")
-                    return json.loads(cached)
+                    data = json.loads(cached)
+                    snapshot.put(cache_key, data, version)
+                    return data
             except Exception as e:
                 logger.warning(f"Tier elements cache read failed for {cache_key}: {e}")
 
-        if visited_tiers is None:
-            visited_tiers = set()
-
-        # Prevent infinite recursion
-        if tier_id in visited_tiers:
-            return []
-        visited_tiers.add(tier_id)
-
-        elements = []
-        seen_element_ids = set()
-
         async with get_async_session() as session:
-            # Get all inclusions for this tier
-            result = await session.execute(
-                select(TierElementInclusion)
-                .where(TierElementInclusion.tier_id == PyUUID(tier_id))
-                .options(
-                    selectinload(TierElementInclusion.element),
-                    selectinload(TierElementInclusion.included_tier),
-                )
-            )
-            inclusions = result.scalars().all()
-
-            for inc in inclusions:
-                # If inclusion references an element directly
-                if inc.element_id and inc.element:
-                    if inc.element_id not in seen_element_ids:
-                        seen_element_ids.add(inc.element_id)
-                        elements.append({
-                            "id": str(inc.element.id),
-                            "code": inc.element.code,
-                            "name": inc.element.name,
-                            "description": inc.element.description,
-                            "min_quantity": inc.min_quantity,
-                            "max_quantity": inc.max_quantity,
-                            "notes": inc.notes,
-                            "source_tier": tier_id,
-                        })
-
-                # If inclusion references another tier (recursive)
-                elif inc.included_tier_id:
-                    nested_elements = await self.resolve_tier_elements(
-                        str(inc.included_tier_id),
-                        visited_tiers.copy(),
-                    )
-                    for elem in nested_elements:
-                        elem_id = elem.get("id")
-                        if elem_id and elem_id not in seen_element_ids:
-                            seen_element_ids.add(PyUUID(elem_id))
-                            # Update notes to indicate inherited
-                            elem["notes"] = f"Heredado de {inc.included_tier.code if inc.included_tier else 'tier'}: {elem.get('notes', '')}"
-                            elements.append(elem)
+            inclusions_by_tier = await self._load_tier_inclusions(session, [tier_id])
+
+        elements = self._collect_tier_elements(
+            tier_id, inclusions_by_tier, set(visited_tiers or ())
+        )
 
         # Cache result for top-level calls (tier structure rarely changes, use longer TTL)
         if is_top_level and elements:
@@ -828,9 +867,139 @@ class TarifaService:
                 logger.debug(f"Tier elements cached for: {tier_id}")
             except Exception as e:
                 logger.warning(f"Tier elements cache write failed for {cache_key}: {e}")
+            snapshot.put(cache_key, elements, version)
+
+        return elements
+
+    @staticmethod
+    async def _load_tier_inclusions(
+        session,
+        tier_ids: list[str] | None = None,
+    ) -> dict[str, list[TierElementInclusion]]:
+        """
+        Load tier inclusions grouped by tier, in one query.
+
+        Args:
+            session: Open database session
+            tier_ids: Root tiers; every tier reachable from them through
+                included_tier_id is loaded via a recursive CTE. None loads all.
+
+        Returns:
+            Dict tier_id -> inclusions (element and included_tier loaded)
+        """
+        query = select(TierElementInclusion).options(
+            selectinload(TierElementInclusion.element),
+            selectinload(TierElementInclusion.included_tier),
+        )
+
+        if tier_ids is not None:
+            # Transitive closure of included tiers (UNION drops repeats, so cycles terminate)
+            reachable = (
+                select(TariffTier.id.label("tier_id"))
+                .where(TariffTier.id.in_([PyUUID(str(t)) for t in tier_ids]))
+                .cte("reachable_tiers", recursive=True)
+            )
+            reachable = reachable.union(
+                select(TierElementInclusion.included_tier_id)
+                .join(reachable, TierElementInclusion.tier_id == reachable.c.tier_id)
+                .where(TierElementInclusion.included_tier_id.is_not(None))
+            )
+            query = query.where(TierElementInclusion.tier_id.in_(select(reachable.c.tier_id)))
+
+        result = await session.execute(query.order_by(TierElementInclusion.created_at))
+
+        inclusions_by_tier: dict[str, list[TierElementInclusion]] = {}
+        for inc in result.scalars().all():
+            inclusions_by_tier.setdefault(str(inc.tier_id), []).append(inc)
+        return inclusions_by_tier
+
+    def _collect_tier_elements(
+        self,
+        tier_id: str,
+        inclusions_by_tier: dict[str, list[TierElementInclusion]],
+        visited_tiers: set[str],
+    ) -> list[dict]:
+        """
+        Resolve a tier's elements from preloaded inclusions (no I/O).
+
+        Direct elements keep the inclusion's quantities and notes; elements
+        from included tiers get their notes prefixed with the included
+        tier's code. Each element appears once (first occurrence wins).
+        """
+        # Prevent infinite recursion
+        if tier_id in visited_tiers:
+            return []
+        visited_tiers.add(tier_id)
+
+        elements = []
+        seen_element_ids = set()
+
+        for inc in inclusions_by_tier.get(tier_id, []):
+            # If inclusion references an element directly
+            if inc.element_id and inc.element:
+                if inc.element_id not in seen_element_ids:
+                    seen_element_ids.add(inc.element_id)
+                    elements.append({
+                        "id": str(inc.element.id),
+                        "code": inc.element.code,
+                        "name": inc.element.name,
+                        "description": inc.element.description,
+                        "min_quantity": inc.min_quantity,
+                        "max_quantity": inc.max_quantity,
+                        "notes": inc.notes,
+                        "source_tier": tier_id,
+                    })
+
+            # If inclusion references another tier (recursive)
+            elif inc.included_tier_id:
+                nested_elements = self._collect_tier_elements(
+                    str(inc.included_tier_id),
+                    inclusions_by_tier,
+                    visited_tiers.copy(),
+                )
+                for elem in nested_elements:
+                    elem_id = elem.get("id")
+                    if elem_id and PyUUID(elem_id) not in seen_element_ids:
+                        seen_element_ids.add(PyUUID(elem_id))
+                        # Update notes to indicate inherited
+                        elem["notes"] = f"Heredado de {inc.included_tier.code if inc.included_tier else 'tier'}: {elem.get('notes', '')}"
+                        elements.append(elem)
 
         return elements
 
+    async def warm_tier_elements_cache(self) -> int:
+        """
+        Recompute and cache resolved elements for every tier.
+
+        Called after catalogue edits so the first pricing request after a
+        change does not pay for resolution. Loads all inclusions in one
+        query and resolves each tier in memory.
+
+        Returns:
+            Number of tiers cached (tiers without elements have their key removed)
+        """
+        async with get_async_session() as session:
+            tier_ids = [str(t) for t in (await session.execute(select(TariffTier.id))).scalars().all()]
+            inclusions_by_tier = await self._load_tier_inclusions(session)
+
+        warmed = 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for tier_id in tier_ids:
+                elements = self._collect_tier_elements(tier_id, inclusions_by_tier, set())
+                cache_key = f"tier:elements:{tier_id}"
+                if elements:
+                    pipe.setex(cache_key, CACHE_TTL * 2, json.dumps(elements, cls=DecimalEncoder))
+                    warmed += 1
+                else:
+                    pipe.delete(cache_key)
+            await pipe.execute()
+
+        logger.info(
+            f"Tier elements cache warmed for {warmed}/{len(tier_ids)} tiers",
+            extra={"metric_type": "tier_elements_warm", "tiers": len(tier_ids), "warmed": warmed},
+        )
+        return warmed
+
     async def invalidate_cache(self, category_slug: str | None = None) -> None:
         """
         Invalidate cached tariff data.
@@ -838,6 +1007,8 @@ class TarifaService:
         Args:
             category_slug: Specific category to invalidate, or None for all
         """
+        get_catalogue_snapshot().invalidate_all(reason=f"tariffs:{category_slug or '*'}")
+
         try:
             if category_slug:
                 # Invalidate specific category
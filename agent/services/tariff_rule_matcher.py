@@ -0,0 +1,231 @@
+"""
+MSI Automotive - Compiled classification-rule matcher.
+
+TarifaService selects a tier by checking every `applies_if_any` keyword of
+every tier, and warnings by checking every `element_keywords` trigger,
+against the lowercased element description. CategoryRuleMatcher compiles
+all of those keywords for a category into one Aho-Corasick automaton, so
+a description is scanned once and the cost no longer grows with the
+number of rules and warnings.
+
+Selections are identical to the keyword-by-keyword scan:
+- Tiers are evaluated in priority order; each tier reports the first of
+  its keywords (in list order) found in the description
+- Warnings keep their list order, tier scoping and first-code-wins dedup
+"""
+
+from collections import deque
+from typing import Any
+
+DEFAULT_TIER_PRIORITY = 999
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    __slots__ = ("patterns", "_goto", "_fail", "_output", "_always")
+
+    def __init__(self, patterns: list[str]):
+        """
+        Build the automaton.
+
+        Args:
+            patterns: Patterns to search for (matched case-sensitively;
+                callers pass lowercased patterns and text)
+        """
+        self.patterns = patterns
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[int, ...]] = [()]
+        # The empty string occurs in every text
+        self._always = frozenset(i for i, p in enumerate(patterns) if p == "")
+
+        outputs: list[list[int]] = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(pattern_id)
+
+        # Breadth-first failure links; outputs inherit their suffix outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = link if link != next_state else 0
+                outputs[next_state].extend(outputs[self._fail[next_state]])
+
+        self._output = [tuple(out) for out in outputs]
+
+    def find(self, text: str) -> set[int]:
+        """
+        Get the ids of all patterns that occur in `text`.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of pattern indexes (into self.patterns)
+        """
+        found = set(self._always)
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class CategoryRuleMatcher:
+    """Compiled tier rules and warning triggers for one category's data."""
+
+    def __init__(self, data: dict):
+        """
+        Compile the matcher.
+
+        Args:
+            data: Category data as returned by TarifaService.get_category_data
+        """
+        self.source = data
+        self.sorted_tiers = sorted(data["tiers"], key=self._tier_priority)
+
+        pattern_ids: dict[str, int] = {}
+
+        def pattern_id(keyword: str) -> int:
+            return pattern_ids.setdefault(keyword.lower(), len(pattern_ids))
+
+        # pattern -> [(tier rank, keyword position, original keyword)]
+        self._tier_postings: dict[int, list[tuple[int, int, str]]] = {}
+        for rank, tier in enumerate(self.sorted_tiers):
+            rules = tier.get("classification_rules")
+            if not rules:
+                continue
+            for position, keyword in enumerate(rules.get("applies_if_any", [])):
+                self._tier_postings.setdefault(pattern_id(keyword), []).append(
+                    (rank, position, keyword)
+                )
+
+        # Warnings shown without a keyword match, and keyword postings
+        # pattern -> [(warning index, keyword position, original keyword)]
+        self._unconditional_warnings: list[tuple[int, dict[str, Any]]] = []
+        self._warning_postings: dict[int, list[tuple[int, int, str]]] = {}
+        self.warnings = data["warnings"]
+        for index, warning in enumerate(self.warnings):
+            conditions = warning.get("trigger_conditions")
+            is_scoped = warning.get("category_id") or warning.get("tier_id") or warning.get("element_id")
+            if is_scoped and not conditions:
+                self._unconditional_warnings.append((index, {
+                    "code": warning["code"],
+                    "message": warning["message"],
+                    "severity": warning["severity"],
+                    "scope": "category" if warning.get("category_id") else "tier" if warning.get("tier_id") else "element",
+                }))
+            elif not conditions:
+                continue
+            elif conditions.get("always_show"):
+                self._unconditional_warnings.append((index, {
+                    "code": warning["code"],
+                    "message": warning["message"],
+                    "severity": warning["severity"],
+                }))
+            else:
+                for position, keyword in enumerate(conditions.get("element_keywords", [])):
+                    self._warning_postings.setdefault(pattern_id(keyword), []).append(
+                        (index, position, keyword)
+                    )
+
+        self.automaton = KeywordAutomaton(list(pattern_ids))
+
+    @staticmethod
+    def _tier_priority(tier: dict) -> int:
+        rules = tier.get("classification_rules") or {}
+        return rules.get("priority", DEFAULT_TIER_PRIORITY)
+
+    def find(self, description_lower: str) -> set[int]:
+        """Pattern ids present in a lowercased description (scan once, reuse)."""
+        return self.automaton.find(description_lower)
+
+    def match_tiers(self, found: set[int]) -> list[tuple[dict, str]]:
+        """
+        Tiers whose applies_if_any keywords matched, in priority order.
+
+        Args:
+            found: Pattern ids from find()
+
+        Returns:
+            [(tier, first matching keyword in the tier's list order)]
+        """
+        first_hit: dict[int, tuple[int, str]] = {}
+        for pid in found:
+            for rank, position, keyword in self._tier_postings.get(pid, ()):
+                best = first_hit.get(rank)
+                if best is None or position < best[0]:
+                    first_hit[rank] = (position, keyword)
+
+        return [(self.sorted_tiers[rank], first_hit[rank][1]) for rank in sorted(first_hit)]
+
+    def applicable_warnings(
+        self,
+        found: set[int],
+        selected_tier_id: str | None = None,
+    ) -> list[dict]:
+        """
+        Warnings to show, in warning order and deduplicated by code.
+
+        Tier-scoped warnings only apply to the selected tier. Scoped warnings
+        without trigger_conditions and "always_show" ones are always shown;
+        the rest need one of their element_keywords in the description.
+
+        Args:
+            found: Pattern ids from find()
+            selected_tier_id: ID of the selected tier (to filter tier-scoped warnings)
+
+        Returns:
+            List of applicable warnings
+        """
+        first_hit: dict[int, tuple[int, str]] = {}
+        for pid in found:
+            for index, position, keyword in self._warning_postings.get(pid, ()):
+                best = first_hit.get(index)
+                if best is None or position < best[0]:
+                    first_hit[index] = (position, keyword)
+
+        candidates: list[tuple[int, dict[str, Any]]] = list(self._unconditional_warnings)
+        for index, (_, keyword) in first_hit.items():
+            warning = self.warnings[index]
+            candidates.append((index, {
+                "code": warning["code"],
+                "message": warning["message"],
+                "severity": warning["severity"],
+                "triggered_by": keyword,
+            }))
+        candidates.sort(key=lambda item: item[0])
+
+        applicable = []
+        seen_codes = set()
+        for index, entry in candidates:
+            warning_tier_id = self.warnings[index].get("tier_id")
+            if warning_tier_id and warning_tier_id != selected_tier_id:
+                continue
+            if entry["code"] in seen_codes:
+                continue
+            applicable.append(dict(entry))
+            seen_codes.add(entry["code"])
+        return applicable
@@ -1,29 +1,179 @@
 """
 MSI Automotive - Token Usage Tracking Service.
 
-Provides atomic token usage recording for LLM calls.
-Uses PostgreSQL UPSERT pattern to aggregate monthly totals.
+Provides token usage recording for LLM calls, aggregated into monthly totals.
+
+Every LLM call increments a per-month Redis hash (HINCRBY, no row lock).
+flush_token_usage() periodically moves those counters into the single
+PostgreSQL (year, month) row with one UPSERT, so concurrent agent turns
+never contend on that row. Counters live in Redis, so pending totals
+survive agent restarts; if Redis is unavailable the call falls back to
+the direct UPSERT.
+
+Each flushed batch gets an id that is recorded (TokenUsageFlushBatch) in
+the same transaction as its UPSERT, so retrying a batch whose Redis key
+survived a crash never counts it twice. Batch ids are pruned after
+TOKEN_USAGE_FLUSH_BATCH_RETENTION.
+
+Months with pending counters and unfinished batch keys are tracked in
+Redis sets, so flushes and pending reads never SCAN the keyspace (which
+also holds LangGraph checkpoints).
 """
 
 import logging
 import uuid
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.dialects.postgresql import insert
 
 from database.connection import get_async_session
-from database.models import TokenUsage
+from database.models import TokenUsage, TokenUsageFlushBatch
+from shared.redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Redis accumulator keys
+TOKEN_USAGE_PENDING_PREFIX = "token_usage:pending:"    # + "{year}:{month}" (being incremented)
+TOKEN_USAGE_FLUSHING_PREFIX = "token_usage:flushing:"  # + "{year}:{month}:{batch_id}" (being written to DB)
+TOKEN_USAGE_PERIODS_KEY = "token_usage:periods"            # set of "{year}:{month}" with pending counters
+TOKEN_USAGE_BATCHES_KEY = "token_usage:flushing_batches"    # set of flushing keys not yet deleted
+TOKEN_USAGE_FLUSH_LOCK = "token_usage:flush_lock"
+TOKEN_USAGE_FLUSH_LOCK_TTL = 60  # seconds
+
+# Applied batch ids are only needed while their Redis key may be retried
+TOKEN_USAGE_FLUSH_BATCH_RETENTION = timedelta(days=7)
+
+# Delete the lock only if it still holds our token (it may have expired
+# and been taken by another flusher)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Move a counters hash to a new batch key and track it, atomically.
+# KEYS: source, batch key, batches set, periods set; ARGV[1]: period to
+# untrack once its pending key is gone ("" to leave the periods set alone)
+_START_BATCH_SCRIPT = """
+if ARGV[1] ~= "" then
+    redis.call("srem", KEYS[4], ARGV[1])
+end
+if redis.call("exists", KEYS[1]) == 0 then
+    return 0
+end
+redis.call("rename", KEYS[1], KEYS[2])
+redis.call("sadd", KEYS[3], KEYS[2])
+return 1
+"""
+
+TOKEN_USAGE_FIELDS = ("input_tokens", "output_tokens", "total_requests")
+
+
+def _upsert_statement(
+    year: int,
+    month: int,
+    input_tokens: int,
+    output_tokens: int,
+    total_requests: int,
+):
+    """Build the UPSERT adding counters to the (year, month) row."""
+    now = datetime.now(UTC)
+
+    # PostgreSQL UPSERT with increment
+    stmt = insert(TokenUsage).values(
+        id=uuid.uuid4(),
+        year=year,
+        month=month,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_requests=total_requests,
+        created_at=now,
+        updated_at=now,
+    )
+
+    # On conflict, increment existing values
+    return stmt.on_conflict_do_update(
+        constraint="uq_token_usage_year_month",
+        set_={
+            "input_tokens": TokenUsage.input_tokens + input_tokens,
+            "output_tokens": TokenUsage.output_tokens + output_tokens,
+            "total_requests": TokenUsage.total_requests + total_requests,
+            "updated_at": now,
+        },
+    )
+
+
+async def _upsert_token_usage(
+    year: int,
+    month: int,
+    input_tokens: int,
+    output_tokens: int,
+    total_requests: int,
+) -> None:
+    """
+    Add counters to the (year, month) row with an atomic UPSERT.
+
+    Raises:
+        Exception: Database errors are propagated to the caller
+    """
+    async with get_async_session() as session:
+        await session.execute(
+            _upsert_statement(year, month, input_tokens, output_tokens, total_requests)
+        )
+        await session.commit()
+
+
+async def _apply_flush_batch(
+    batch_id: str,
+    year: int,
+    month: int,
+    input_tokens: int,
+    output_tokens: int,
+    total_requests: int,
+) -> bool:
+    """
+    Add a flushed batch to the (year, month) row exactly once.
+
+    The batch id is inserted in the same transaction as the UPSERT; if it
+    is already recorded the batch was applied before and nothing is added.
+    Ids older than TOKEN_USAGE_FLUSH_BATCH_RETENTION are pruned meanwhile.
+
+    Returns:
+        True if applied now, False if it had already been applied
+
+    Raises:
+        Exception: Database errors are propagated to the caller
+    """
+    async with get_async_session() as session:
+        result = await session.execute(
+            insert(TokenUsageFlushBatch)
+            .values(batch_id=batch_id, year=year, month=month, applied_at=datetime.now(UTC))
+            .on_conflict_do_nothing(index_elements=["batch_id"])
+            .returning(TokenUsageFlushBatch.batch_id)
+        )
+        if result.scalar_one_or_none() is None:
+            return False
+
+        await session.execute(
+            _upsert_statement(year, month, input_tokens, output_tokens, total_requests)
+        )
+        await session.execute(
+            delete(TokenUsageFlushBatch).where(
+                TokenUsageFlushBatch.applied_at < datetime.now(UTC) - TOKEN_USAGE_FLUSH_BATCH_RETENTION
+            )
+        )
+        await session.commit()
+        return True
+
 
 async def record_token_usage(input_tokens: int, output_tokens: int) -> None:
     """
     Record token usage for the current month.
 
-    Uses atomic UPSERT to increment counters. If a record for the current
-    year/month exists, it increments the values. Otherwise, creates a new record.
+    Increments the month's Redis accumulator; flush_token_usage() persists
+    it. Falls back to a direct UPSERT if Redis is unavailable.
 
     Args:
         input_tokens: Number of input/prompt tokens used
@@ -37,46 +187,159 @@ async def record_token_usage(input_tokens: int, output_tokens: int) -> None:
     month = now.month
 
     try:
-        async with get_async_session() as session:
-            # PostgreSQL UPSERT with increment
-            stmt = insert(TokenUsage).values(
-                id=uuid.uuid4(),
-                year=year,
-                month=month,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                total_requests=1,
-                created_at=now,
-                updated_at=now,
-            )
+        redis = get_redis_client()
+        async with redis.pipeline(transaction=True) as pipe:
+            key = f"{TOKEN_USAGE_PENDING_PREFIX}{year}:{month}"
+            pipe.hincrby(key, "input_tokens", input_tokens)
+            pipe.hincrby(key, "output_tokens", output_tokens)
+            pipe.hincrby(key, "total_requests", 1)
+            pipe.sadd(TOKEN_USAGE_PERIODS_KEY, f"{year}:{month}")
+            await pipe.execute()
 
-            # On conflict, increment existing values
-            stmt = stmt.on_conflict_do_update(
-                constraint="uq_token_usage_year_month",
-                set_={
-                    "input_tokens": TokenUsage.input_tokens + input_tokens,
-                    "output_tokens": TokenUsage.output_tokens + output_tokens,
-                    "total_requests": TokenUsage.total_requests + 1,
-                    "updated_at": now,
-                },
-            )
+        logger.debug(
+            f"Accumulated token usage | year={year} month={month} "
+            f"input={input_tokens} output={output_tokens}"
+        )
+        return
+
+    except Exception as e:
+        logger.warning(f"Token usage accumulator unavailable, writing directly: {e}")
+
+    try:
+        await _upsert_token_usage(year, month, input_tokens, output_tokens, 1)
+        logger.debug(
+            f"Recorded token usage | year={year} month={month} "
+            f"input={input_tokens} output={output_tokens}"
+        )
+    except Exception as e:
+        # Log but don't raise - token tracking should not break the agent
+        logger.error(f"Failed to record token usage: {e}")
+
+
+def _recent_periods() -> set[str]:
+    """Current and previous month, flushed even if missing from the periods set."""
+    now = datetime.now(UTC)
+    previous = now.replace(day=1) - timedelta(days=1)
+    return {f"{now.year}:{now.month}", f"{previous.year}:{previous.month}"}
+
+
+async def _start_batch(redis, source_key: str, period: str, untrack_period: bool) -> str | None:
+    """Move `source_key` to a new tracked batch key; None if it does not exist."""
+    batch_key = f"{TOKEN_USAGE_FLUSHING_PREFIX}{period}:{uuid.uuid4().hex}"
+    moved = await redis.eval(
+        _START_BATCH_SCRIPT,
+        4,
+        source_key,
+        batch_key,
+        TOKEN_USAGE_BATCHES_KEY,
+        TOKEN_USAGE_PERIODS_KEY,
+        period if untrack_period else "",
+    )
+    return batch_key if moved else None
+
+
+def _parse_counters(data: dict[str, str] | None) -> dict[str, int]:
+    """Parse a Redis counters hash into ints (missing fields are 0)."""
+    data = data or {}
+    return {field: int(data.get(field) or 0) for field in TOKEN_USAGE_FIELDS}
+
+
+async def flush_token_usage() -> int:
+    """
+    Move accumulated Redis counters into PostgreSQL.
+
+    For each month with pending counters (TOKEN_USAGE_PERIODS_KEY):
+    1. RENAME pending -> flushing:{period}:{batch_id} and track it in
+       TOKEN_USAGE_BATCHES_KEY (new increments go to a fresh pending key)
+    2. Record the batch id and UPSERT its totals in one transaction
+    3. DELETE the flushing key and untrack it
+
+    A flushing key left behind by a crash or a failed DELETE is retried
+    on the next flush; the recorded batch id makes that retry a no-op if
+    step 2 had already committed. A lock (released only by its owner)
+    keeps concurrent flushers (agent + API) from racing on the same keys.
+
+    Returns:
+        Number of batches flushed
+    """
+    redis = get_redis_client()
+
+    lock_token = uuid.uuid4().hex
+    if not await redis.set(TOKEN_USAGE_FLUSH_LOCK, lock_token, nx=True, ex=TOKEN_USAGE_FLUSH_LOCK_TTL):
+        return 0
 
-            await session.execute(stmt)
-            await session.commit()
+    flushed = 0
+    try:
+        # Leftover batches from failed flushes are written first
+        flushing_keys = set(await redis.smembers(TOKEN_USAGE_BATCHES_KEY))
+        periods = set(await redis.smembers(TOKEN_USAGE_PERIODS_KEY)) | _recent_periods()
+        for period in sorted(periods):
+            # Key from before batch ids: give it one before applying
+            legacy_key = await _start_batch(redis, f"{TOKEN_USAGE_FLUSHING_PREFIX}{period}", period, False)
+            batch_key = await _start_batch(redis, f"{TOKEN_USAGE_PENDING_PREFIX}{period}", period, True)
+            flushing_keys.update(key for key in (legacy_key, batch_key) if key)
+
+        for flushing_key in sorted(flushing_keys):
+            year, month, batch_id = flushing_key[len(TOKEN_USAGE_FLUSHING_PREFIX):].split(":")
+            year, month = int(year), int(month)
+            counters = _parse_counters(await redis.hgetall(flushing_key))
+
+            applied = any(counters.values()) and await _apply_flush_batch(batch_id, year, month, **counters)
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.delete(flushing_key)
+                pipe.srem(TOKEN_USAGE_BATCHES_KEY, flushing_key)
+                await pipe.execute()
+            flushed += 1
 
             logger.debug(
-                f"Recorded token usage | year={year} month={month} "
-                f"input={input_tokens} output={output_tokens}"
+                f"Flushed token usage | year={year} month={month} batch={batch_id} "
+                f"input={counters['input_tokens']} output={counters['output_tokens']} "
+                f"requests={counters['total_requests']}"
+                + ("" if applied else " (already applied)"),
+                extra={"metric_type": "token_usage_flush", "batch_id": batch_id, **counters},
             )
 
     except Exception as e:
-        # Log but don't raise - token tracking should not break the agent
-        logger.error(f"Failed to record token usage: {e}")
+        logger.error(f"Failed to flush token usage (will retry): {e}")
+
+    finally:
+        try:
+            await redis.eval(_RELEASE_LOCK_SCRIPT, 1, TOKEN_USAGE_FLUSH_LOCK, lock_token)
+        except Exception as e:
+            logger.warning(f"Failed to release token usage flush lock (expires in {TOKEN_USAGE_FLUSH_LOCK_TTL}s): {e}")
+
+    return flushed
+
+
+async def get_pending_token_usage(year: int, month: int) -> dict[str, int]:
+    """
+    Get counters accumulated in Redis but not yet flushed to PostgreSQL.
+
+    Args:
+        year: Usage year
+        month: Usage month
+
+    Returns:
+        Dict with input_tokens, output_tokens and total_requests (0 on error)
+    """
+    totals = dict.fromkeys(TOKEN_USAGE_FIELDS, 0)
+    try:
+        redis = get_redis_client()
+        batch_prefix = f"{TOKEN_USAGE_FLUSHING_PREFIX}{year}:{month}:"
+        keys = [f"{TOKEN_USAGE_PENDING_PREFIX}{year}:{month}", f"{TOKEN_USAGE_FLUSHING_PREFIX}{year}:{month}"]
+        keys += [key for key in await redis.smembers(TOKEN_USAGE_BATCHES_KEY) if key.startswith(batch_prefix)]
+        for key in keys:
+            counters = _parse_counters(await redis.hgetall(key))
+            for field in TOKEN_USAGE_FIELDS:
+                totals[field] += counters[field]
+    except Exception as e:
+        logger.warning(f"Failed to read pending token usage: {e}")
+    return totals
 
 
 async def get_current_month_usage() -> dict | None:
     """
-    Get token usage for the current month.
+    Get token usage for the current month (persisted + pending).
 
     Returns:
         Dict with usage data or None if no data exists.
@@ -93,16 +356,20 @@ async def get_current_month_usage() -> dict | None:
             )
             usage = result.scalar_one_or_none()
 
-            if usage:
-                return {
-                    "year": usage.year,
-                    "month": usage.month,
-                    "input_tokens": usage.input_tokens,
-                    "output_tokens": usage.output_tokens,
-                    "total_tokens": usage.input_tokens + usage.output_tokens,
-                    "total_requests": usage.total_requests,
-                }
-            return None
+        pending = await get_pending_token_usage(now.year, now.month)
+
+        if usage or any(pending.values()):
+            input_tokens = (usage.input_tokens if usage else 0) + pending["input_tokens"]
+            output_tokens = (usage.output_tokens if usage else 0) + pending["output_tokens"]
+            return {
+                "year": now.year,
+                "month": now.month,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+                "total_requests": (usage.total_requests if usage else 0) + pending["total_requests"],
+            }
+        return None
 
     except Exception as e:
         logger.error(f"Failed to get current month usage: {e}")
@@ -11,6 +11,15 @@ from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Rough token estimate: ~4 chars per token for Spanish (same heuristic as prompts.loader)
+CHARS_PER_TOKEN = 4
+# Per-message overhead for role/delimiters added by the chat template
+MESSAGE_TOKEN_OVERHEAD = 4
+# Max characters kept per evicted message in the memory line
+MEMORY_SNIPPET_CHARS = 80
+# Max characters for the whole memory line
+MEMORY_MAX_CHARS = 600
+
 # ContextVar for passing state to tools during execution
 # This allows tools like escalar_a_humano() to access conversation_id
 _current_state: ContextVar[dict[str, Any] | None] = ContextVar(
@@ -141,10 +150,140 @@ def compress_tool_result(content: str, max_length: int = 300) -> str:
     return f"[RESULTADO RESUMIDO]: {first_line}..."
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text without calling a tokenizer.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Approximate number of tokens (~4 chars per token)
+    """
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def estimate_message_tokens(message: dict[str, Any]) -> int:
+    """
+    Estimate the token count of a single history message.
+
+    Args:
+        message: Message dict with "content"
+
+    Returns:
+        Approximate number of tokens including per-message overhead
+    """
+    return estimate_tokens(message.get("content") or "") + MESSAGE_TOKEN_OVERHEAD
+
+
+def get_history_token_budget(phase: str | None) -> int:
+    """
+    Get the history token budget for an FSM phase.
+
+    Phases without an explicit entry in HISTORY_TOKEN_BUDGET_BY_PHASE
+    use the global HISTORY_TOKEN_BUDGET.
+
+    Args:
+        phase: CollectionStep value (e.g., "collect_element_data")
+
+    Returns:
+        Token budget for the conversation history
+    """
+    from shared.config import get_settings
+
+    settings = get_settings()
+    if phase and phase in settings.HISTORY_TOKEN_BUDGET_BY_PHASE:
+        return settings.HISTORY_TOKEN_BUDGET_BY_PHASE[phase]
+    return settings.HISTORY_TOKEN_BUDGET
+
+
+def window_messages_by_tokens(
+    messages: list[dict[str, Any]],
+    token_budget: int,
+    min_recent: int = 2,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Split history into messages that fit the token budget and evicted ones.
+
+    Walks the history from newest to oldest and keeps messages while they
+    fit in the budget. The last `min_recent` messages are always kept so the
+    LLM never loses the current exchange, even if it alone exceeds the budget.
+
+    Args:
+        messages: Message history (oldest first)
+        token_budget: Maximum estimated tokens for kept messages
+        min_recent: Number of most recent messages always kept (default: 2)
+
+    Returns:
+        Tuple of (kept_messages, evicted_messages), both oldest first
+    """
+    used = 0
+    split_at = len(messages)
+
+    for i in range(len(messages) - 1, -1, -1):
+        cost = estimate_message_tokens(messages[i])
+        is_recent = (len(messages) - i) <= min_recent
+        if not is_recent and used + cost > token_budget:
+            break
+        used += cost
+        split_at = i
+
+    return messages[split_at:], messages[:split_at]
+
+
+def summarize_evicted_messages(evicted: list[dict[str, Any]]) -> str | None:
+    """
+    Summarize evicted turns into a compact memory line.
+
+    This is a deterministic extractive summary (no LLM call): each evicted
+    user/assistant message contributes a short snippet, newest snippets are
+    preferred when the line exceeds MEMORY_MAX_CHARS.
+
+    Args:
+        evicted: Messages dropped from the window (oldest first)
+
+    Returns:
+        Memory line for a system message, or None if nothing to summarize
+    """
+    role_labels = {"user": "Usuario", "assistant": "Asistente"}
+    snippets: list[str] = []
+
+    for msg in evicted:
+        label = role_labels.get(msg.get("role", ""))
+        content = " ".join((msg.get("content") or "").split())
+        if not label or not content:
+            continue
+        if len(content) > MEMORY_SNIPPET_CHARS:
+            content = content[:MEMORY_SNIPPET_CHARS].rstrip() + "..."
+        snippets.append(f"{label}: {content}")
+
+    if not snippets:
+        return None
+
+    # Keep the newest snippets that fit in the memory line
+    kept: list[str] = []
+    total = 0
+    for snippet in reversed(snippets):
+        if kept and total + len(snippet) > MEMORY_MAX_CHARS:
+            break
+        kept.append(snippet)
+        total += len(snippet) + 3
+
+    omitted = len(snippets) - len(kept)
+    header = f"[MEMORIA] Resumen de {len(evicted)} mensajes anteriores"
+    if omitted:
+        header += f" ({omitted} omitidos)"
+    return f"{header}: " + " | ".join(reversed(kept))
+
+
 def format_messages_for_llm(
     messages: list[dict[str, Any]],
     compress_old_tools: bool = True,
     recent_threshold: int = 6,
+    token_budget: int | None = None,
+    conversation_id: str | None = None,
 ) -> list[dict[str, str]]:
     """
     Format messages for LLM input with security wrapping and tool compression.
@@ -156,15 +295,49 @@ def format_messages_for_llm(
     Tool results older than `recent_threshold` messages are compressed
     to reduce token usage (saves ~500-1500 tokens per conversation).
 
+    If `token_budget` is set, the history is windowed by estimated tokens
+    instead of message count: messages that don't fit are evicted and
+    replaced by a single [MEMORIA] system line.
+
     Args:
         messages: Raw message list with timestamps
         compress_old_tools: Whether to compress old tool results (default: True)
         recent_threshold: Keep last N messages uncompressed (default: 6)
+        token_budget: Optional token budget for the history (default: None)
+        conversation_id: Conversation ID for metrics logging
 
     Returns:
         Cleaned message list with only role and content
     """
     formatted = []
+
+    if token_budget is not None:
+        kept, evicted = window_messages_by_tokens(messages, token_budget)
+        if evicted:
+            memory_line = summarize_evicted_messages(evicted)
+            if memory_line:
+                formatted.append({"role": "system", "content": memory_line})
+
+            tokens_before = sum(estimate_message_tokens(m) for m in messages)
+            tokens_after = sum(estimate_message_tokens(m) for m in kept) + (
+                estimate_tokens(memory_line) if memory_line else 0
+            )
+            logger.info(
+                f"History windowed by tokens | evicted={len(evicted)} | "
+                f"~{tokens_before - tokens_after} tokens saved",
+                extra={
+                    "metric_type": "history_windowing",
+                    "conversation_id": conversation_id,
+                    "token_budget": token_budget,
+                    "messages_kept": len(kept),
+                    "messages_evicted": len(evicted),
+                    "tokens_before": tokens_before,
+                    "tokens_after": tokens_after,
+                    "tokens_saved": tokens_before - tokens_after,
+                },
+            )
+        messages = kept
+
     total = len(messages)
     
     for i, msg in enumerate(messages):
@@ -70,6 +70,8 @@ class ConversationState(TypedDict, total=False):
 
         # Node Tracking
         last_node: Last executed node (for debugging)
+        fast_path_handled: Whether fast_path answered the current message
+            without invoking the LLM (routes the graph straight to END)
     """
 
     # Core Metadata
@@ -118,3 +120,4 @@ class ConversationState(TypedDict, total=False):
 
     # Node Tracking
     last_node: str | None
+    fast_path_handled: bool
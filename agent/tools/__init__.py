@@ -21,6 +21,7 @@ from agent.tools.element_tools import (
     identificar_y_resolver_elementos,
     seleccionar_variante_por_respuesta,
     calcular_tarifa_con_elementos,
+    comparar_tarifas_elementos,
     obtener_documentacion_elemento,
     get_element_tools,
     ELEMENT_TOOLS,
@@ -86,6 +87,7 @@ __all__ = [
     "identificar_y_resolver_elementos",
     "seleccionar_variante_por_respuesta",
     "calcular_tarifa_con_elementos",
+    "comparar_tarifas_elementos",
     "obtener_documentacion_elemento",
     "get_element_tools",
     "ELEMENT_TOOLS",
@@ -37,6 +37,11 @@ from agent.fsm.case_collection import (
     ELEMENT_STATUS_PHOTOS_DONE,
     ELEMENT_STATUS_COMPLETE,
 )
+from agent.services.element_required_fields_service import (
+    CaseCollectionData,
+    get_element_required_fields_service,
+    get_turn_collection_cache,
+)
 from agent.state.helpers import get_current_state
 from agent.utils.errors import ErrorCategory
 from agent.utils.tool_helpers import tool_error_response
@@ -53,6 +58,45 @@ logger = logging.getLogger(__name__)
 from agent.utils.text_utils import normalize_field_key as _normalize_field_key
 
 
+async def _preload_case_collection_data(case_state: dict[str, Any]) -> CaseCollectionData | None:
+    """
+    Load elements, fields and collected data for all case elements once per turn.
+
+    No-op outside an agent turn (see begin_collection_turn). The helpers
+    below serve from the loaded data and fall back to the DB on a miss.
+    """
+    cache = get_turn_collection_cache()
+    case_id = case_state.get("case_id")
+    category_id = case_state.get("category_id")
+    if cache is None or not case_id or not category_id:
+        return None
+
+    data = cache.get(case_id)
+    if data is not None and data.category_id == category_id:
+        return data
+
+    try:
+        data = await get_element_required_fields_service().load_case_collection_data(
+            case_id, category_id, case_state.get("element_codes", []),
+        )
+    except Exception as e:
+        logger.error(
+            f"Database error in _preload_case_collection_data: {e}",
+            extra={"case_id": case_id, "category_id": category_id},
+            exc_info=True,
+        )
+        return None
+
+    cache[case_id] = data
+    return data
+
+
+def _turn_collection_data() -> list[CaseCollectionData]:
+    """Case collection data loaded during this turn (empty outside a turn)."""
+    cache = get_turn_collection_cache()
+    return list(cache.values()) if cache else []
+
+
 async def _get_element_by_code(element_code: str, category_id: str, load_images: bool = False) -> Element | None:
     """
     Get element by code and category.
@@ -62,6 +106,11 @@ async def _get_element_by_code(element_code: str, category_id: str, load_images:
         category_id: Category UUID
         load_images: If True, eagerly load element.images relationship
     """
+    if not load_images:
+        for data in _turn_collection_data():
+            if data.category_id == category_id and element_code in data.elements:
+                return data.elements[element_code]
+
     try:
         async with get_async_session() as session:
             from sqlalchemy import select
@@ -97,6 +146,10 @@ async def _get_element_by_code(element_code: str, category_id: str, load_images:
 
 async def _get_required_fields_for_element(element_id: str) -> list[ElementRequiredField]:
     """Get all active required fields for an element, ordered by sort_order."""
+    for data in _turn_collection_data():
+        if element_id in data.fields:
+            return data.fields[element_id]
+
     try:
         async with get_async_session() as session:
             from sqlalchemy import select
@@ -126,6 +179,11 @@ async def _get_or_create_case_element_data(
     Uses INSERT ... ON CONFLICT DO NOTHING pattern to avoid race conditions
     when multiple concurrent requests try to create the same record.
     """
+    cache = get_turn_collection_cache()
+    data = cache.get(case_id) if cache else None
+    if data is not None and element_code in data.element_data:
+        return data.element_data[element_code]
+
     try:
         async with get_async_session() as session:
             from sqlalchemy import select
@@ -152,6 +210,8 @@ async def _get_or_create_case_element_data(
             )
             record = result.scalar_one_or_none()
 
+            if data is not None and record is not None:
+                data.element_data[element_code] = record
             return record
     except Exception as e:
         logger.error(
@@ -186,6 +246,11 @@ async def _update_case_element_data(
                 await session.commit()
                 await session.refresh(record)
 
+                # Keep this turn's cached copy current for the next tool call
+                cache = get_turn_collection_cache()
+                if cache and case_id in cache:
+                    cache[case_id].element_data[element_code] = record
+
             return record
     except Exception as e:
         logger.error(
@@ -280,6 +345,11 @@ def _evaluate_field_condition(
     if not field.condition_field_id:
         return True  # No condition, always show
 
+    # Precompiled when the case was preloaded this turn
+    for data in _turn_collection_data():
+        if str(field.id) in data.conditions:
+            return data.conditions[str(field.id)](collected_values)
+
     # Find the condition field
     condition_field = next(
         (f for f in all_fields if str(f.id) == str(field.condition_field_id)),
@@ -396,6 +466,8 @@ async def obtener_campos_elemento(element_code: str | None = None) -> dict[str,
     if not case_id:
         return _tool_error_response("No hay expediente activo")
 
+    await _preload_case_collection_data(case_state)
+
     # Get element
     element = await _get_element_by_code(element_code, category_id)
     if not element:
@@ -514,6 +586,8 @@ async def guardar_datos_elemento(
     if not category_id or not case_id:
         return _tool_error_response("Expediente no configurado correctamente")
 
+    await _preload_case_collection_data(case_state)
+
     # Get element and fields
     element = await _get_element_by_code(element_code, category_id)
     if not element:
@@ -804,6 +878,8 @@ async def confirmar_fotos_elemento() -> dict[str, Any]:
     if not category_id or not case_id:
         return _tool_error_response("Expediente no configurado correctamente")
 
+    await _preload_case_collection_data(case_state)
+
     # Get element to check if it has required fields
     element = await _get_element_by_code(element_code, category_id)
     if not element:
@@ -1042,6 +1118,8 @@ async def completar_elemento_actual() -> dict[str, Any]:
     if not category_id or not case_id:
         return _tool_error_response("Expediente no configurado correctamente")
 
+    await _preload_case_collection_data(case_state)
+
     # Get element
     element = await _get_element_by_code(element_code, category_id)
     if not element:
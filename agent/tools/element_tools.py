@@ -715,6 +715,18 @@ async def seleccionar_variante_por_respuesta(
     }, ensure_ascii=False, indent=2)
 
 
+def _should_show_element_warning(warning: dict, element_count: int) -> bool:
+    """Evaluate an element warning's show_condition for the number of elements quoted."""
+    show_condition = warning.get("show_condition", "always")
+    threshold = warning.get("threshold_quantity")
+
+    if show_condition == "on_exceed_max" and threshold is not None:
+        return element_count > threshold
+    if show_condition == "on_below_min" and threshold is not None:
+        return element_count < threshold
+    return True
+
+
 @tool
 async def calcular_tarifa_con_elementos(
     categoria_vehiculo: str,
@@ -866,21 +878,7 @@ async def calcular_tarifa_con_elementos(
             if ew["code"] in existing_warning_codes:
                 continue
 
-            # Evaluate show_condition
-            show_condition = ew.get("show_condition", "always")
-            threshold = ew.get("threshold_quantity")
-
-            should_show = False
-            if show_condition == "always":
-                should_show = True
-            elif show_condition == "on_exceed_max" and threshold is not None:
-                should_show = element_count > threshold
-            elif show_condition == "on_below_min" and threshold is not None:
-                should_show = element_count < threshold
-            else:
-                should_show = True
-
-            if should_show:
+            if _should_show_element_warning(ew, element_count):
                 warning_data = {
                     "code": ew["code"],
                     "message": ew["message"],
@@ -1148,6 +1146,137 @@ async def calcular_tarifa_con_elementos(
     return json.dumps(response, ensure_ascii=False, indent=2)
 
 
+# Maximum element combinations priced by one comparar_tarifas_elementos call
+MAX_TARIFF_COMBINATIONS = 10
+
+
+@tool
+async def comparar_tarifas_elementos(
+    categoria_vehiculo: str,
+    combinaciones: list[list[str]],
+) -> str:
+    """
+    Compara el precio de varias combinaciones de elementos en una sola llamada.
+
+    Úsala cuando el usuario pregunta por alternativas (ej: "¿y si solo cambio el
+    escape?", "¿cuánto con y sin faros?"). Para el presupuesto definitivo y la
+    documentación usa `calcular_tarifa_con_elementos`.
+
+    Args:
+        categoria_vehiculo: Slug de la categoría (ej: "motos-part", "aseicars-prof")
+        combinaciones: Listas de códigos EXACTOS retornados por identificar_y_resolver_elementos
+                      Ejemplo: [["ESCAPE"], ["ESCAPE", "FARO_DELANTERO"]] (máximo 10)
+
+    Returns:
+        JSON con la tarifa, el precio (SIN IVA) y las advertencias de cada combinación.
+    """
+    import json
+
+    categoria_vehiculo = categoria_vehiculo.lower().strip()
+    try:
+        validate_category_slug(categoria_vehiculo)
+    except ValueError as e:
+        logger.error(f"Invalid category slug rejected in comparar_tarifas_elementos: {e}")
+        return f"Error: {str(e)}"
+
+    if not combinaciones:
+        return "Error: Debes especificar al menos una combinación de elementos."
+    if len(combinaciones) > MAX_TARIFF_COMBINATIONS:
+        return f"Error: Máximo {MAX_TARIFF_COMBINATIONS} combinaciones por llamada."
+
+    tarifa_service = get_tarifa_service()
+    element_service = get_element_service()
+
+    category_id = await get_or_fetch_category_id(categoria_vehiculo)
+    if not category_id:
+        categories = await tarifa_service.get_active_categories()
+        available = ", ".join(c["slug"] for c in categories)
+        return f"Categoría '{categoria_vehiculo}' no encontrada. Categorías disponibles: {available}"
+
+    # Category elements are loaded once for every combination
+    elements = await element_service.get_elements_by_category(category_id, is_active=True)
+    element_by_code = {e["code"]: e for e in elements}
+    valid_codes_set = set(element_by_code.keys())
+
+    combinations: list[dict[str, Any]] = []
+    requests = []
+    for codes in combinaciones:
+        normalized_codes, _, truly_invalid = normalize_element_codes(codes, valid_codes_set)
+        invalid_codes = [c for c in normalized_codes if c not in element_by_code] + truly_invalid
+        if not codes or invalid_codes:
+            combinations.append({"element_codes": codes, "invalid_codes": invalid_codes})
+            continue
+
+        valid_elements = [element_by_code[c] for c in normalized_codes]
+        combinations.append({"element_codes": codes, "elements": valid_elements})
+        requests.append({
+            "elements_description": ", ".join(e["name"] for e in valid_elements),
+            "element_count": len(valid_elements),
+            "element_codes": [c.upper() for c in normalized_codes],
+        })
+
+    # One batch: category data, compiled rules and tier elements shared
+    results = iter(await tarifa_service.select_tariffs_by_rules_batch(categoria_vehiculo, requests))
+    warnings_by_element: dict[str, list[dict]] = {}
+
+    output = []
+    for combination in combinations:
+        if "invalid_codes" in combination:
+            output.append({
+                "element_codes": combination["element_codes"],
+                "error": (
+                    f"Códigos no encontrados: {', '.join(combination['invalid_codes'])}"
+                    if combination["invalid_codes"] else "Combinación vacía"
+                ),
+            })
+            continue
+
+        result = next(results)
+        if "error" in result:
+            output.append({"element_codes": combination["element_codes"], "error": result["error"]})
+            continue
+
+        valid_elements = combination["elements"]
+        warnings = [
+            {"message": w["message"], "severity": w.get("severity", "info")}
+            for w in result.get("warnings", [])
+        ]
+        seen_codes = {w.get("code") for w in result.get("warnings", [])}
+        for elem in valid_elements:
+            if elem["id"] not in warnings_by_element:
+                warnings_by_element[elem["id"]] = await element_service.get_element_warnings(elem["id"])
+            for ew in warnings_by_element[elem["id"]]:
+                if ew["code"] in seen_codes or not _should_show_element_warning(ew, len(valid_elements)):
+                    continue
+                seen_codes.add(ew["code"])
+                warnings.append({
+                    "message": ew["message"],
+                    "severity": ew["severity"],
+                    "element_code": elem["code"],
+                })
+
+        validation = result.get("element_validation", {})
+        output.append({
+            "element_codes": combination["element_codes"],
+            "elements": [e["name"] for e in valid_elements],
+            "tier_name": result["tier_name"],
+            "price": float(result["price"]),
+            "warnings": warnings,
+            "elementos_no_incluidos": validation.get("missing_elements", []),
+        })
+
+    logger.info(
+        f"[comparar_tarifas] Priced {len(requests)} combinations | category={categoria_vehiculo}",
+        extra={"combinations": len(combinaciones), "priced": len(requests)},
+    )
+
+    return json.dumps(
+        {"categoria": categoria_vehiculo, "precios_sin_iva": True, "combinaciones": output},
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
 @tool
 async def obtener_documentacion_elemento(
     categoria_vehiculo: str,
@@ -1504,6 +1633,7 @@ ELEMENT_TOOLS = [
     identificar_y_resolver_elementos,  # Consolidated tool (replaces identificar + verificar)
     seleccionar_variante_por_respuesta,
     calcular_tarifa_con_elementos,
+    comparar_tarifas_elementos,
     obtener_documentacion_elemento,
 ]
 
@@ -1521,6 +1651,7 @@ __all__ = [
     "identificar_y_resolver_elementos",
     "seleccionar_variante_por_respuesta",
     "calcular_tarifa_con_elementos",
+    "comparar_tarifas_elementos",
     "obtener_documentacion_elemento",
     "get_element_tools",
     "ELEMENT_TOOLS",
@@ -30,6 +30,7 @@ IDLE_TOOLS = [
     "identificar_y_resolver_elementos",
     "seleccionar_variante_por_respuesta",
     "calcular_tarifa_con_elementos",
+    "comparar_tarifas_elementos",
     # Information tools
     "listar_categorias",
     "listar_tarifas",
@@ -121,6 +122,7 @@ COMPLETED_TOOLS = [
     "identificar_y_resolver_elementos",
     "seleccionar_variante_por_respuesta",
     "calcular_tarifa_con_elementos",
+    "comparar_tarifas_elementos",
     # Information tools
     "listar_categorias",
     "listar_tarifas",
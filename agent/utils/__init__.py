@@ -8,9 +8,15 @@ from agent.utils.errors import (
     get_error_logger,
     handle_tool_errors,
 )
+from agent.utils.similarity import (
+    FuzzyCandidates,
+    LevenshteinMatcher,
+    levenshtein_distance,
+)
 from agent.utils.text_utils import (
     fuzzy_match,
     fuzzy_match_with_scores,
+    is_completion_message,
     normalize_field_key,
     normalize_text,
 )
@@ -38,6 +44,11 @@ __all__ = [
     "normalize_field_key",
     "fuzzy_match",
     "fuzzy_match_with_scores",
+    "is_completion_message",
+    # Similarity
+    "FuzzyCandidates",
+    "LevenshteinMatcher",
+    "levenshtein_distance",
     # Tool helpers
     "format_field_list",
     "parse_confirmation_message",
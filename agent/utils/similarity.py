@@ -0,0 +1,212 @@
+"""
+Shared string similarity for the agent.
+
+Fuzzy lookups run several times per turn (confirmation typos, field and
+option matching) and always compare one query against a small, fixed set
+of candidates. The classes here do the per-candidate work once:
+
+- LevenshteinMatcher: bit-parallel edit distance (Myers/Hyyrö). Each
+  candidate is turned into per-character bitmasks once; a distance then
+  costs one pass over the query with a handful of integer ops per char,
+  instead of a full len(a) x len(b) table.
+- FuzzyCandidates: normalized forms and word sets of the candidates,
+  scored against a query with the same word-Jaccard + substring boost as
+  agent.utils.text_utils.fuzzy_match.
+
+scripts/benchmark_similarity.py compares them with the per-pair loops
+they replace.
+"""
+
+from functools import lru_cache
+
+from agent.utils.text_utils import normalize_text
+
+# Score given to a candidate containing (or contained in) the query
+SUBSTRING_MATCH_SCORE = 0.8
+
+
+def _char_masks(pattern: str) -> dict[str, int]:
+    """Bitmask per character: bit i set where pattern[i] == char."""
+    masks: dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _bitparallel_distance(masks: dict[str, int], length: int, text: str) -> int:
+    """
+    Levenshtein distance between a precompiled pattern and `text`.
+
+    Myers' bit-vector algorithm with Hyyrö's formulation for global edit
+    distance. Python ints are unbounded, so patterns of any length work
+    (one machine-word pass for the short strings used here).
+
+    Args:
+        masks: _char_masks(pattern)
+        length: len(pattern)
+        text: String to compare against
+
+    Returns:
+        Edit distance
+    """
+    if length == 0:
+        return len(text)
+
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    pv, mv, score = full, 0, length
+
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+
+    return score
+
+
+def levenshtein_distance(s1: str, s2: str) -> int:
+    """
+    Calculate Levenshtein distance between two strings.
+
+    This is the minimum number of single-character edits (insertions, deletions,
+    or substitutions) required to change one string into the other.
+
+    Args:
+        s1: First string
+        s2: Second string
+
+    Returns:
+        Levenshtein distance as integer
+    """
+    # Bit vectors over the shorter string
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    return _bitparallel_distance(_char_masks(s2), len(s2), s1)
+
+
+class LevenshteinMatcher:
+    """Edit distance from a query to a fixed list of words."""
+
+    __slots__ = ("words", "_compiled")
+
+    def __init__(self, words: list[str]):
+        """
+        Precompile the words.
+
+        Args:
+            words: Candidate words (compared as-is, callers normalize case)
+        """
+        self.words = list(words)
+        self._compiled = [(_char_masks(w), len(w)) for w in self.words]
+
+    def distances(self, query: str) -> list[int]:
+        """
+        Edit distance from `query` to every word.
+
+        Args:
+            query: String to compare
+
+        Returns:
+            Distances, in the same order as self.words
+        """
+        return [_bitparallel_distance(masks, length, query) for masks, length in self._compiled]
+
+    def within(self, query: str, max_distance: int) -> list[tuple[str, int]]:
+        """
+        Words within `max_distance` edits of `query`.
+
+        Args:
+            query: String to compare
+            max_distance: Maximum edit distance (inclusive)
+
+        Returns:
+            (word, distance) pairs in word order
+        """
+        return [
+            (word, distance)
+            for word, distance in zip(self.words, self.distances(query))
+            if distance <= max_distance
+        ]
+
+
+class FuzzyCandidates:
+    """Candidate strings with their normalized forms precomputed."""
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, candidates: list[str]):
+        """
+        Normalize the candidates once.
+
+        Args:
+            candidates: Candidate strings (empty ones are ignored)
+        """
+        entries = []
+        for candidate in candidates:
+            if not candidate:
+                continue
+            normalized = normalize_text(candidate)
+            words = frozenset(normalized.split())
+            if words:
+                entries.append((candidate, normalized, words))
+        self._entries = entries
+
+    def scores(self, query: str) -> list[tuple[str, float]]:
+        """
+        Similarity of `query` to every candidate.
+
+        Word-set Jaccard similarity, raised to SUBSTRING_MATCH_SCORE when
+        one normalized string contains the other.
+
+        Args:
+            query: The search query
+
+        Returns:
+            (candidate, score) pairs in candidate order
+        """
+        normalized_query = normalize_text(query) if query else ""
+        query_words = set(normalized_query.split())
+        if not query_words:
+            return []
+
+        results = []
+        for candidate, normalized, words in self._entries:
+            score = len(query_words & words) / len(query_words | words)
+            if normalized_query in normalized or normalized in normalized_query:
+                score = max(score, SUBSTRING_MATCH_SCORE)
+            results.append((candidate, score))
+        return results
+
+    def best(self, query: str, threshold: float = 0.6) -> str | None:
+        """
+        Best-scoring candidate at or above `threshold` (first one on ties).
+
+        Args:
+            query: The search query
+            threshold: Minimum similarity score (0.0-1.0)
+
+        Returns:
+            The best matching candidate, or None
+        """
+        best_match: str | None = None
+        best_score = 0.0
+        for candidate, score in self.scores(query):
+            if score > best_score and score >= threshold:
+                best_match, best_score = candidate, score
+        return best_match
+
+
+@lru_cache(maxsize=64)
+def get_fuzzy_candidates(candidates: tuple[str, ...]) -> FuzzyCandidates:
+    """Get precomputed candidates for a (hashable) candidate list, cached."""
+    return FuzzyCandidates(list(candidates))
@@ -6,6 +6,32 @@ from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Phrases that indicate the user finished sending images
+COMPLETION_PHRASES = ["listo", "terminado", "ya está", "ya esta", "hecho", "fin", "ya", "eso es todo", "nada más", "nada mas"]
+
+
+def is_completion_message(message_text: str | None) -> bool:
+    """
+    Check if message text indicates user wants to finish sending images.
+
+    Args:
+        message_text: The user's message text
+
+    Returns:
+        True if message contains a completion phrase
+    """
+    if not message_text:
+        return False
+
+    text_lower = message_text.lower().strip()
+
+    # Exact match or starts with completion phrase
+    for phrase in COMPLETION_PHRASES:
+        if text_lower == phrase or text_lower.startswith(phrase + " "):
+            return True
+
+    return False
+
 
 def normalize_text(text: str) -> str:
     """
@@ -79,47 +105,12 @@ def fuzzy_match(query: str, candidates: list[str], threshold: float = 0.6) -> st
     """
     if not query or not candidates:
         return None
-    
-    normalized_query = normalize_text(query)
-    if not normalized_query:
-        return None
-    
-    best_match: str | None = None
-    best_score: float = 0.0
-    
-    for candidate in candidates:
-        if not candidate:
-            continue
-            
-        normalized_candidate = normalize_text(candidate)
-        if not normalized_candidate:
-            continue
-        
-        # Calculate simple word overlap score
-        query_words = set(normalized_query.split())
-        candidate_words = set(normalized_candidate.split())
-        
-        if not query_words or not candidate_words:
-            continue
-        
-        # Jaccard similarity: intersection / union
-        intersection = len(query_words & candidate_words)
-        union = len(query_words | candidate_words)
-        
-        if union > 0:
-            score = intersection / union
-        else:
-            score = 0.0
-        
-        # Boost score for exact substring match
-        if normalized_query in normalized_candidate or normalized_candidate in normalized_query:
-            score = max(score, 0.8)
-        
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = candidate
-    
-    return best_match
+
+    # Imported here: similarity builds on normalize_text above
+    from agent.utils.similarity import get_fuzzy_candidates
+
+    # Candidate normalization is cached across calls with the same list
+    return get_fuzzy_candidates(tuple(candidates)).best(query, threshold)
 
 
 def fuzzy_match_with_scores(query: str, candidates: list[str]) -> list[tuple[str, float]]:
@@ -135,42 +126,10 @@ def fuzzy_match_with_scores(query: str, candidates: list[str]) -> list[tuple[str
     """
     if not query or not candidates:
         return []
-    
-    normalized_query = normalize_text(query)
-    if not normalized_query:
-        return []
-    
-    results: list[tuple[str, float]] = []
-    query_words = set(normalized_query.split())
-    
-    for candidate in candidates:
-        if not candidate:
-            continue
-            
-        normalized_candidate = normalize_text(candidate)
-        if not normalized_candidate:
-            continue
-        
-        candidate_words = set(normalized_candidate.split())
-        
-        if not query_words or not candidate_words:
-            continue
-        
-        # Jaccard similarity
-        intersection = len(query_words & candidate_words)
-        union = len(query_words | candidate_words)
-        
-        if union > 0:
-            score = intersection / union
-        else:
-            score = 0.0
-        
-        # Boost for substring match
-        if normalized_query in normalized_candidate or normalized_candidate in normalized_query:
-            score = max(score, 0.8)
-        
-        results.append((candidate, score))
-    
+
+    from agent.utils.similarity import get_fuzzy_candidates
+
+    results = get_fuzzy_candidates(tuple(candidates)).scores(query)
     # Sort by score descending
     results.sort(key=lambda x: x[1], reverse=True)
     return results
@@ -17,7 +17,9 @@ from api.services.log_monitor import LogMonitor, set_log_monitor, get_log_monito
 from database.connection import get_async_session
 from database.models import AdminUser
 
+from shared.chatwoot_client import close_chatwoot_http_client
 from shared.config import get_settings
+from shared.llm_metrics_flusher import LLMMetricsFlusher, get_llm_metrics_flusher, set_llm_metrics_flusher
 from shared.logging_config import configure_logging
 from shared.fastapi_errors import register_error_handlers
 
@@ -155,6 +157,14 @@ async def startup_event():
 
     # NOTE: Seeds are now manual only. Run: python -m database.seeds.run_all_seeds
 
+    # Start LLM metrics flusher (batch-persists LLMRouter metrics)
+    try:
+        flusher = LLMMetricsFlusher()
+        await flusher.start()
+        set_llm_metrics_flusher(flusher)
+    except Exception as e:
+        logger.error(f"Failed to start LLM metrics flusher: {e}")
+
     # Start LogMonitor for container error tracking
     try:
         conn_type, base_url = get_docker_connection_type()
@@ -191,6 +201,21 @@ async def shutdown_event():
         except Exception as e:
             logger.error(f"Error stopping LogMonitor: {e}")
 
+    # Flush remaining LLM metrics
+    flusher = get_llm_metrics_flusher()
+    if flusher:
+        try:
+            await flusher.stop()
+            set_llm_metrics_flusher(None)
+        except Exception as e:
+            logger.error(f"Error stopping LLM metrics flusher: {e}")
+
+    # Close pooled Chatwoot connections
+    try:
+        await close_chatwoot_http_client()
+    except Exception as e:
+        logger.error(f"Error closing Chatwoot HTTP client: {e}")
+
 
 # Exception handlers are now registered via register_error_handlers()
 # See shared/fastapi_errors.py for implementation
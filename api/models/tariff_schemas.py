@@ -464,6 +464,26 @@ class TariffSelectionRequest(BaseModel):
     )
 
 
+class TariffBatchSelectionItem(TariffSelectionRequest):
+    """One element set of a batch tariff selection."""
+
+    element_codes: list[str] | None = Field(
+        None,
+        description="Element codes, to check they are included in the selected tier"
+    )
+
+
+class TariffBatchSelectionRequest(BaseModel):
+    """Schema for pricing several element sets of one category in one call."""
+
+    items: list[TariffBatchSelectionItem] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Element sets to price with the agent's classification rules"
+    )
+
+
 class TariffSelectionResponse(BaseModel):
     """Schema for tariff selection response."""
 
@@ -8,7 +8,6 @@ Includes listing, detail views, status management, and image downloads.
 import io
 import logging
 import uuid
-import zipfile
 from datetime import datetime, UTC
 from pathlib import Path
 from typing import Any
@@ -22,6 +21,7 @@ from sqlalchemy.orm import selectinload
 from api.models.element import CaseElementDataResponse, CaseElementDataUpdate
 from api.routes.admin import get_current_user, require_role
 from api.services.chatwoot_image_service import get_chatwoot_image_service
+from api.services.zip_stream import stream_zip
 from database.connection import get_async_session
 from database.models import (
     AdminUser,
@@ -34,6 +34,7 @@ from database.models import (
 )
 from shared.chatwoot_client import ChatwootClient
 from shared.config import get_settings
+from shared.image_derivatives import enqueue_derivatives, get_derivatives
 
 logger = logging.getLogger(__name__)
 
@@ -274,6 +275,13 @@ async def get_case(
         # Get image service for URLs
         image_service = get_chatwoot_image_service()
 
+        # Gallery thumbnails; images without them fall back to the original.
+        # Older uploads are queued (once; failed ones have an error manifest)
+        derivatives = await get_derivatives([img.stored_filename for img in case.images])
+        missing = [name for name, names in derivatives.items() if names is None]
+        if missing:
+            await enqueue_derivatives(missing)
+
         return JSONResponse(
             content={
                 "id": str(case.id),
@@ -352,6 +360,12 @@ async def get_case(
                         "is_valid": img.is_valid,
                         "validation_notes": img.validation_notes,
                         "url": image_service.get_image_url(img.stored_filename),
+                        "thumbnail_url": image_service.get_derivative_url(
+                            (derivatives[img.stored_filename] or {}).get("thumb")
+                        ),
+                        "preview_url": image_service.get_derivative_url(
+                            (derivatives[img.stored_filename] or {}).get("preview")
+                        ),
                         "created_at": img.created_at.isoformat(),
                     }
                     for img in case.images
@@ -597,7 +611,7 @@ async def resolve_case(
 # =============================================================================
 
 
-@router.get("/{case_id}/images/{image_id}")
+@router.get("/{case_id}/images/{image_id:uuid}")
 async def download_case_image(
     case_id: uuid.UUID,
     image_id: uuid.UUID,
@@ -681,20 +695,15 @@ async def download_all_images(
         if not case.images:
             raise HTTPException(status_code=404, detail="No images found for this case")
 
-        # Create ZIP in memory
-        zip_buffer = io.BytesIO()
+        # ZIP is built while it is sent (see stream_zip), nothing is buffered
         image_service = get_chatwoot_image_service()
-
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            for img in case.images:
-                image_data = await image_service.get_image_bytes(img.stored_filename)
-                if image_data:
-                    content, _ = image_data
-                    ext = img.stored_filename.rsplit(".", 1)[-1]
-                    filename = f"{img.display_name}.{ext}"
-                    zf.writestr(filename, content)
-
-        zip_buffer.seek(0)
+        files = [
+            (
+                f"{img.display_name}.{img.stored_filename.rsplit('.', 1)[-1]}",
+                image_service.case_images_dir / img.stored_filename,
+            )
+            for img in case.images
+        ]
 
         # Create descriptive ZIP filename
         matricula = case.vehiculo_matricula or "sin_matricula"
@@ -704,10 +713,10 @@ async def download_all_images(
         user_name = (user_name or "").replace(" ", "_")
         zip_filename = f"expediente_{matricula}_{user_name}.zip"
 
-        logger.info(f"Generated ZIP for case {case_id} with {len(case.images)} images")
+        logger.info(f"Streaming ZIP for case {case_id} with {len(case.images)} images")
 
         return StreamingResponse(
-            zip_buffer,
+            stream_zip(files),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f'attachment; filename="{zip_filename}"',
@@ -7,12 +7,17 @@ force retries when the agent attempts to respond without using required tools.
 """
 
 import logging
+import re
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field, field_validator
 from sqlalchemy import select, update, delete
 
+from agent.services.constraint_service import (
+    compile_detection_pattern,
+    publish_constraints_changed,
+)
 from api.routes.admin import get_current_user
 from database.connection import get_async_session
 from database.models import AdminUser, ResponseConstraint, VehicleCategory
@@ -27,6 +32,17 @@ router = APIRouter(prefix="/api/admin/response-constraints")
 # =============================================================================
 
 
+def _validate_detection_pattern(v: str | None) -> str | None:
+    """Reject patterns the agent could not compile (they would never be checked)."""
+    if v is None:
+        return v
+    try:
+        compile_detection_pattern(v)
+    except re.error as e:
+        raise ValueError(f"detection_pattern is not a valid regex: {e}")
+    return v
+
+
 class ConstraintCreate(BaseModel):
     """Schema for creating a ResponseConstraint."""
 
@@ -38,6 +54,12 @@ class ConstraintCreate(BaseModel):
     is_active: bool = Field(default=True)
     priority: int = Field(default=0, description="Higher priority = checked first")
 
+    @field_validator("detection_pattern")
+    @classmethod
+    def validate_detection_pattern(cls, v):
+        """Validate detection_pattern compiles as a regex."""
+        return _validate_detection_pattern(v)
+
 
 class ConstraintUpdate(BaseModel):
     """Schema for updating a ResponseConstraint."""
@@ -50,6 +72,12 @@ class ConstraintUpdate(BaseModel):
     is_active: bool | None = None
     priority: int | None = None
 
+    @field_validator("detection_pattern")
+    @classmethod
+    def validate_detection_pattern(cls, v):
+        """Validate detection_pattern compiles as a regex."""
+        return _validate_detection_pattern(v)
+
 
 class ConstraintResponse(BaseModel):
     """Schema for ResponseConstraint response."""
@@ -151,7 +179,7 @@ async def create_constraint(
         await session.refresh(constraint)
 
         # Invalidate agent cache
-        _invalidate_constraint_cache()
+        await _invalidate_constraint_cache()
 
         # Get category name if category_id is set
         category_name = None
@@ -195,7 +223,7 @@ async def update_constraint(
         await session.refresh(constraint)
 
         # Invalidate agent cache
-        _invalidate_constraint_cache()
+        await _invalidate_constraint_cache()
 
         # Get category name if category_id is set
         category_name = None
@@ -233,14 +261,9 @@ async def delete_constraint(
         await session.commit()
 
         # Invalidate agent cache
-        _invalidate_constraint_cache()
+        await _invalidate_constraint_cache()
 
 
-def _invalidate_constraint_cache() -> None:
-    """Invalidate the agent's constraint cache after DB changes."""
-    try:
-        from agent.services.constraint_service import invalidate_cache
-        invalidate_cache()
-    except Exception:
-        # Agent may not be running in same process
-        pass
+async def _invalidate_constraint_cache() -> None:
+    """Bump the shared constraint version so agent workers reload after DB changes."""
+    await publish_constraints_changed()
@@ -47,6 +47,7 @@ from database.models import (
 )
 from agent.services.element_service import get_element_service
 from agent.services.tarifa_service import get_tarifa_service
+from api.services.cache_service import get_cache_service
 from shared.redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
@@ -265,6 +266,7 @@ async def create_element(
                 await redis.delete(f"elements:category:{data.category_id}:active=True")
             except Exception as e:
                 logger.warning(f"Cache invalidation failed: {e}")
+            await get_cache_service().publish_catalogue_changed("elements", category_id=data.category_id)
 
             return ElementResponse.model_validate(element)
         except HTTPException:
@@ -385,6 +387,8 @@ async def update_element(
                 await redis.delete(f"element:details:{element_id}:inherited=False")
             except Exception as e:
                 logger.warning(f"Cache invalidation failed: {e}")
+            await get_cache_service().warm_tier_elements_cache()
+            await get_cache_service().publish_catalogue_changed("elements", category_id=element.category_id)
 
             return ElementResponse.model_validate(element)
         except HTTPException:
@@ -418,6 +422,8 @@ async def delete_element(
                 await redis.delete(f"element:details:{element_id}:inherited=False")
             except Exception as e:
                 logger.warning(f"Cache invalidation failed: {e}")
+            await get_cache_service().warm_tier_elements_cache()
+            await get_cache_service().publish_catalogue_changed("elements", category_id=element.category_id)
 
         except HTTPException:
             raise
@@ -660,9 +666,11 @@ async def create_tier_inclusion(
             # Invalidate tier cache
             redis = get_redis_client()
             try:
-                await redis.delete(f"tier_elements:{tier_id}")
+                await redis.delete(f"tier:elements:{tier_id}")
             except Exception as e:
                 logger.warning(f"Cache invalidation failed: {e}")
+            await get_cache_service().warm_tier_elements_cache()
+            await get_cache_service().publish_catalogue_changed("tier_elements", tier_id=tier_id)
 
             return TierElementInclusionResponse.model_validate(inclusion)
         except HTTPException:
@@ -736,9 +744,11 @@ async def update_tier_inclusion(
             # Invalidate cache
             redis = get_redis_client()
             try:
-                await redis.delete(f"tier_elements:{tier_id}")
+                await redis.delete(f"tier:elements:{tier_id}")
             except Exception as e:
                 logger.warning(f"Cache invalidation failed: {e}")
+            await get_cache_service().warm_tier_elements_cache()
+            await get_cache_service().publish_catalogue_changed("tier_elements", tier_id=tier_id)
 
             return TierElementInclusionResponse.model_validate(inclusion)
         except HTTPException:
@@ -774,9 +784,11 @@ async def delete_tier_inclusion(
             # Invalidate cache
             redis = get_redis_client()
             try:
-                await redis.delete(f"tier_elements:{tier_id}")
+                await redis.delete(f"tier:elements:{tier_id}")
             except Exception as e:
                 logger.warning(f"Cache invalidation failed: {e}")
+            await get_cache_service().warm_tier_elements_cache()
+            await get_cache_service().publish_catalogue_changed("tier_elements", tier_id=tier_id)
 
         except HTTPException:
             raise
@@ -841,9 +853,11 @@ async def batch_create_tier_inclusions(
             # Invalidate tier cache
             redis = get_redis_client()
             try:
-                await redis.delete(f"tier_elements:{tier_id}")
+                await redis.delete(f"tier:elements:{tier_id}")
             except Exception as e:
                 logger.warning(f"Cache invalidation failed: {e}")
+            await get_cache_service().warm_tier_elements_cache()
+            await get_cache_service().publish_catalogue_changed("tier_elements", tier_id=tier_id)
 
             return {
                 "tier_id": str(tier_id),
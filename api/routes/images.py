@@ -7,8 +7,8 @@ Handles image upload, listing, and deletion for the admin panel.
 import logging
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, Response
 from pydantic import BaseModel
 
 from api.middleware.rate_limit import get_rate_limiter
@@ -17,6 +17,7 @@ from api.routes.admin import get_current_user
 from api.services.image_service import get_image_service
 from database.models import AdminUser
 from shared.config import get_settings
+from shared.image_derivatives import DERIVATIVE_NAME_RE, get_derivatives_dir
 
 logger = logging.getLogger(__name__)
 
@@ -157,12 +158,14 @@ def get_public_image_router() -> APIRouter:
     public_router = APIRouter()
 
     @public_router.get("/{filename}", response_model=None)
-    async def serve_image(filename: str) -> FileResponse | JSONResponse:
+    async def serve_image(filename: str, request: Request) -> Response:
         """
         Serve an uploaded image file.
 
         This endpoint is public (no auth) so images can be displayed
-        in WhatsApp messages sent via Chatwoot.
+        in WhatsApp messages sent via Chatwoot. Answers 304 when the
+        If-None-Match header matches the file's ETag, so the agent's image
+        byte cache can revalidate without downloading.
 
         SECURITY: Validates filename to prevent path traversal attacks.
 
@@ -204,7 +207,16 @@ def get_public_image_router() -> APIRouter:
         if not file_path.is_file():
             return JSONResponse(status_code=403, content={"detail": "Access denied"})
 
-        return FileResponse(file_path)
+        response = FileResponse(file_path, stat_result=file_path.stat())
+        if request.headers.get("if-none-match") == response.headers["etag"]:
+            return Response(
+                status_code=304,
+                headers={
+                    "etag": response.headers["etag"],
+                    "last-modified": response.headers["last-modified"],
+                },
+            )
+        return response
 
     return public_router
 
@@ -218,6 +230,35 @@ def get_case_images_router() -> APIRouter:
     """
     case_router = APIRouter()
 
+    @case_router.get("/derivatives/{name}", response_model=None)
+    async def serve_case_image_derivative(name: str, request: Request) -> Response:
+        """
+        Serve a WebP thumbnail/preview of a case image.
+
+        Names embed the original's content hash, so responses never change
+        and are cached for a year; the hash doubles as the ETag.
+
+        Args:
+            name: Derivative name (<hash>_<size>.webp)
+
+        Returns:
+            WebP image, 304, or 404
+        """
+        # Only generated names are accepted (also prevents path traversal)
+        if not DERIVATIVE_NAME_RE.fullmatch(name):
+            return JSONResponse(status_code=404, content={"detail": "Case image not found"})
+
+        etag = f'"{name.removesuffix(".webp")}"'
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        file_path = get_derivatives_dir() / name
+        if not file_path.is_file():
+            return JSONResponse(status_code=404, content={"detail": "Case image not found"})
+
+        return FileResponse(file_path, media_type="image/webp", headers=headers)
+
     @case_router.get("/{filename}", response_model=None)
     async def serve_case_image(filename: str) -> FileResponse | JSONResponse:
         """
@@ -19,7 +19,9 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from agent.services.tarifa_service import get_tarifa_service
 from api.models.tariff_schemas import (
+    TariffBatchSelectionRequest,
     TariffSelectionRequest,
     TariffSelectionResponse,
     DocumentationResponse,
@@ -202,6 +204,132 @@ async def fetch_category_from_db(category_slug: str) -> dict:
         return data
 
 
+async def get_category_data_cached(category_slug: str) -> dict:
+    """Get category data from cache, loading and caching it on a miss."""
+    cached = await get_cached_category_data(category_slug)
+    if not cached:
+        cached = await fetch_category_from_db(category_slug)
+        await set_cached_category_data(category_slug, cached)
+    return cached
+
+
+def select_tier_from_data(
+    cached: dict,
+    elements_description: str,
+    element_count: int,
+) -> dict[str, Any]:
+    """
+    Match tiers and warnings for one element description.
+
+    Args:
+        cached: Category data (from get_category_data_cached)
+        elements_description: Natural language description of elements
+        element_count: Number of elements identified
+
+    Returns:
+        select-tier response payload
+    """
+    description_lower = elements_description.lower()
+
+    # Match tiers based on classification_rules
+    matched_tiers = []
+    for tier in cached["tiers"]:
+        rules = tier.get("classification_rules") or {}
+        applies_if_any = rules.get("applies_if_any", [])
+        priority = rules.get("priority", 999)
+        requires_project = rules.get("requires_project", False)
+
+        # Check keyword matches
+        keyword_match = any(
+            keyword.lower() in description_lower
+            for keyword in applies_if_any
+        ) if applies_if_any else False
+
+        # Check element count constraints
+        min_elements = tier.get("min_elements")
+        max_elements = tier.get("max_elements")
+        count_match = True
+        if min_elements is not None and element_count < min_elements:
+            count_match = False
+        if max_elements is not None and element_count > max_elements:
+            count_match = False
+
+        # Add to matches if applicable
+        if keyword_match or (count_match and not applies_if_any):
+            matched_tiers.append({
+                "tier_code": tier["code"],
+                "tier_name": tier["name"],
+                "price": tier["price"],
+                "conditions": tier["conditions"],
+                "priority": priority,
+                "requires_project": requires_project,
+                "match_type": "keyword" if keyword_match else "element_count",
+            })
+
+    # Sort by priority (lower = higher priority)
+    matched_tiers.sort(key=lambda x: x["priority"])
+
+    # If no matches, use element count heuristic
+    if not matched_tiers:
+        # Default tier selection based on element count
+        for tier in cached["tiers"]:
+            min_elements = tier.get("min_elements")
+            max_elements = tier.get("max_elements")
+            if min_elements is not None and max_elements is not None:
+                if min_elements <= element_count <= max_elements:
+                    matched_tiers.append({
+                        "tier_code": tier["code"],
+                        "tier_name": tier["name"],
+                        "price": tier["price"],
+                        "conditions": tier["conditions"],
+                        "priority": 999,
+                        "requires_project": False,
+                        "match_type": "element_count_fallback",
+                    })
+
+    # Get best match
+    best_match = matched_tiers[0] if matched_tiers else {
+        "tier_code": "UNKNOWN",
+        "tier_name": "Consultar",
+        "price": 0,
+        "conditions": "Requiere consulta personalizada",
+        "priority": 999,
+        "requires_project": False,
+        "match_type": "no_match",
+    }
+
+    # Collect applicable warnings based on trigger_conditions
+    applicable_warnings = []
+    for warning in cached["warnings"]:
+        trigger = warning.get("trigger_conditions") or {}
+        always_show = trigger.get("always_show", False)
+        element_keywords = trigger.get("element_keywords", [])
+
+        should_show = always_show or any(
+            kw.lower() in description_lower
+            for kw in element_keywords
+        )
+
+        if should_show:
+            applicable_warnings.append({
+                "code": warning["code"],
+                "message": warning["message"],
+                "severity": warning["severity"],
+            })
+
+    return {
+        "tier_code": best_match["tier_code"],
+        "tier_name": best_match["tier_name"],
+        "price": best_match["price"],
+        "conditions": best_match["conditions"],
+        "element_count": element_count,
+        "matched_rules": matched_tiers,
+        "warnings": applicable_warnings,
+        "additional_services": cached["additional_services"],
+        "requires_project": best_match["requires_project"],
+    }
+
+
 # =============================================================================
 # Public Routes
 # =============================================================================
@@ -329,113 +457,49 @@ async def select_tier(
     Note: client_type is now part of the category slug. The client_type field
     in the request is used for validation but the category already determines it.
     """
-    # Get category data
-    cached = await get_cached_category_data(category_slug)
-    if not cached:
-        cached = await fetch_category_from_db(category_slug)
-        await set_cached_category_data(category_slug, cached)
-
-    description_lower = request.elements_description.lower()
-    element_count = request.element_count
-
-    # Match tiers based on classification_rules
-    matched_tiers = []
-    for tier in cached["tiers"]:
-        rules = tier.get("classification_rules") or {}
-        applies_if_any = rules.get("applies_if_any", [])
-        priority = rules.get("priority", 999)
-        requires_project = rules.get("requires_project", False)
-
-        # Check keyword matches
-        keyword_match = any(
-            keyword.lower() in description_lower
-            for keyword in applies_if_any
-        ) if applies_if_any else False
-
-        # Check element count constraints
-        min_elements = tier.get("min_elements")
-        max_elements = tier.get("max_elements")
-        count_match = True
-        if min_elements is not None and element_count < min_elements:
-            count_match = False
-        if max_elements is not None and element_count > max_elements:
-            count_match = False
+    cached = await get_category_data_cached(category_slug)
 
-        # Add to matches if applicable
-        if keyword_match or (count_match and not applies_if_any):
-            matched_tiers.append({
-                "tier_code": tier["code"],
-                "tier_name": tier["name"],
-                "price": tier["price"],
-                "conditions": tier["conditions"],
-                "priority": priority,
-                "requires_project": requires_project,
-                "match_type": "keyword" if keyword_match else "element_count",
-            })
-
-    # Sort by priority (lower = higher priority)
-    matched_tiers.sort(key=lambda x: x["priority"])
+    return JSONResponse(
+        content=select_tier_from_data(
+            cached,
+            request.elements_description,
+            request.element_count,
+        )
+    )
 
-    # If no matches, use element count heuristic
-    if not matched_tiers:
-        # Default tier selection based on element count
-        for tier in cached["tiers"]:
-            min_elements = tier.get("min_elements")
-            max_elements = tier.get("max_elements")
-            if min_elements is not None and max_elements is not None:
-                if min_elements <= element_count <= max_elements:
-                    matched_tiers.append({
-                        "tier_code": tier["code"],
-                        "tier_name": tier["name"],
-                        "price": tier["price"],
-                        "conditions": tier["conditions"],
-                        "priority": 999,
-                        "requires_project": False,
-                        "match_type": "element_count_fallback",
-                    })
 
-    # Get best match
-    best_match = matched_tiers[0] if matched_tiers else {
-        "tier_code": "UNKNOWN",
-        "tier_name": "Consultar",
-        "price": 0,
-        "conditions": "Requiere consulta personalizada",
-        "priority": 999,
-        "requires_project": False,
-        "match_type": "no_match",
-    }
+@router.post("/{category_slug}/select-tier/batch")
+async def select_tier_batch(
+    category_slug: str,
+    request: TariffBatchSelectionRequest,
+) -> JSONResponse:
+    """
+    Select tiers for several element sets of one category in one call.
 
-    # Collect applicable warnings based on trigger_conditions
-    applicable_warnings = []
-    for warning in cached["warnings"]:
-        trigger = warning.get("trigger_conditions") or {}
-        always_show = trigger.get("always_show", False)
-        element_keywords = trigger.get("element_keywords", [])
+    Items are priced like the agent does (TarifaService.select_tariff_by_rules):
+    the category data, compiled classification rules and resolved tier
+    elements are loaded once for the whole batch.
 
-        should_show = always_show or any(
-            kw.lower() in description_lower
-            for kw in element_keywords
-        )
+    Args:
+        category_slug: Vehicle category (e.g., "motos-part", "motos-prof")
+        request: Up to 100 element descriptions, counts and optional codes
 
-        if should_show:
-            applicable_warnings.append({
-                "code": warning["code"],
-                "message": warning["message"],
-                "severity": warning["severity"],
-            })
+    Returns:
+        One tariff selection per item, in request order
+    """
+    results = await get_tarifa_service().select_tariffs_by_rules_batch(
+        category_slug,
+        [item.model_dump(include={"elements_description", "element_count", "element_codes"})
+         for item in request.items],
+    )
+    if results and "available_categories" in results[0]:
+        raise HTTPException(status_code=404, detail="Category not found")
 
     return JSONResponse(
-        content={
-            "tier_code": best_match["tier_code"],
-            "tier_name": best_match["tier_name"],
-            "price": best_match["price"],
-            "conditions": best_match["conditions"],
-            "element_count": element_count,
-            "matched_rules": matched_tiers,
-            "warnings": applicable_warnings,
-            "additional_services": cached["additional_services"],
-            "requires_project": best_match["requires_project"],
-        }
+        content=json.loads(json.dumps(
+            {"category": category_slug, "results": results},
+            cls=DecimalEncoder,
+        ))
     )
 
 
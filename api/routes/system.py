@@ -550,6 +550,10 @@ async def clear_system_cache(
 
         logger.info(f"Cleared {deleted} cache keys")
 
+        from api.services.cache_service import get_cache_service
+
+        await get_cache_service().publish_catalogue_changed("tariffs")
+
         return ServiceActionResponse(
             success=True,
             message=f"Cache del sistema limpiada ({deleted} claves eliminadas)"
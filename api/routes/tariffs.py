@@ -48,6 +48,7 @@ from api.models.tariff_schemas import (
     PromptPreviewResponse,
 )
 from api.routes.admin import get_current_user
+from api.services.cache_service import get_cache_service
 from database.connection import get_async_session
 from database.models import (
     AdminUser,
@@ -91,8 +92,14 @@ async def create_audit_log(
     session.add(audit)
 
 
-async def invalidate_tariff_cache(category_slug: str) -> None:
-    """Invalidate Redis cache for a category."""
+async def invalidate_tariff_cache(category_slug: str, refresh_tiers: bool = False) -> None:
+    """
+    Invalidate Redis cache for a category.
+
+    Args:
+        category_slug: Category whose caches are dropped
+        refresh_tiers: Also rebuild resolved tier elements (tier/category edits)
+    """
     try:
         redis = get_redis_client()
         # Invalidate category cache (slug now includes client_type)
@@ -108,6 +115,9 @@ async def invalidate_tariff_cache(category_slug: str) -> None:
         logger.info(f"Cache invalidated for category: {category_slug}")
     except Exception as e:
         logger.warning(f"Failed to invalidate cache: {e}")
+    if refresh_tiers:
+        await get_cache_service().warm_tier_elements_cache()
+    await get_cache_service().publish_catalogue_changed("tariffs", category_slug=category_slug)
 
 
 # =============================================================================
@@ -274,7 +284,7 @@ async def delete_vehicle_category(
         await session.commit()
 
         # Invalidate cache
-        await invalidate_tariff_cache(slug)
+        await invalidate_tariff_cache(slug, refresh_tiers=True)
 
         logger.info(f"Deleted vehicle category: {slug}")
 
@@ -381,7 +391,7 @@ async def create_tariff_tier(
         await session.refresh(tier)
 
         # Invalidate cache
-        await invalidate_tariff_cache(category.slug)
+        await invalidate_tariff_cache(category.slug, refresh_tiers=True)
 
         logger.info(f"Created tariff tier: {tier.code} for {category.slug}")
         return TariffTierResponse.model_validate(tier)
@@ -429,7 +439,7 @@ async def update_tariff_tier(
             # Get category for cache invalidation
             category = await session.get(VehicleCategory, tier.category_id)
             if category:
-                await invalidate_tariff_cache(category.slug)
+                await invalidate_tariff_cache(category.slug, refresh_tiers=True)
 
         logger.info(f"Updated tariff tier: {tier.code}")
         return TariffTierResponse.model_validate(tier)
@@ -461,7 +471,7 @@ async def delete_tariff_tier(
         await session.commit()
 
         if category:
-            await invalidate_tariff_cache(category.slug)
+            await invalidate_tariff_cache(category.slug, refresh_tiers=True)
 
         logger.info(f"Deleted tariff tier: {tier.code}")
 
@@ -18,6 +18,7 @@ from api.models.token_usage import (
     TokenPricingResponse,
     CurrentMonthUsageResponse,
 )
+from agent.services.token_tracking import get_pending_token_usage
 from api.routes.admin import get_current_user, require_role
 from database.connection import get_async_session
 from database.models import AdminUser, TokenUsage
@@ -74,6 +75,7 @@ async def get_current_month_usage(
     Get token usage for the current month.
 
     Returns usage data with computed costs based on configured pricing.
+    Includes counters accumulated in Redis that are not yet flushed.
     """
     now = datetime.now(UTC)
     settings = get_settings()
@@ -87,35 +89,26 @@ async def get_current_month_usage(
         )
         usage = result.scalar_one_or_none()
 
-        if not usage:
-            # No data yet this month
-            return CurrentMonthUsageResponse(
-                year=now.year,
-                month=now.month,
-                input_tokens=0,
-                output_tokens=0,
-                total_tokens=0,
-                total_requests=0,
-                cost_input_eur=Decimal("0.00"),
-                cost_output_eur=Decimal("0.00"),
-                cost_total_eur=Decimal("0.00"),
-            )
-
-        # Calculate costs
-        input_cost = (Decimal(usage.input_tokens) / Decimal(1_000_000)) * settings.TOKEN_PRICE_INPUT
-        output_cost = (Decimal(usage.output_tokens) / Decimal(1_000_000)) * settings.TOKEN_PRICE_OUTPUT
-
-        return CurrentMonthUsageResponse(
-            year=usage.year,
-            month=usage.month,
-            input_tokens=usage.input_tokens,
-            output_tokens=usage.output_tokens,
-            total_tokens=usage.input_tokens + usage.output_tokens,
-            total_requests=usage.total_requests,
-            cost_input_eur=input_cost,
-            cost_output_eur=output_cost,
-            cost_total_eur=input_cost + output_cost,
-        )
+    pending = await get_pending_token_usage(now.year, now.month)
+    input_tokens = (usage.input_tokens if usage else 0) + pending["input_tokens"]
+    output_tokens = (usage.output_tokens if usage else 0) + pending["output_tokens"]
+    total_requests = (usage.total_requests if usage else 0) + pending["total_requests"]
+
+    # Calculate costs
+    input_cost = (Decimal(input_tokens) / Decimal(1_000_000)) * settings.TOKEN_PRICE_INPUT
+    output_cost = (Decimal(output_tokens) / Decimal(1_000_000)) * settings.TOKEN_PRICE_OUTPUT
+
+    return CurrentMonthUsageResponse(
+        year=now.year,
+        month=now.month,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=input_tokens + output_tokens,
+        total_requests=total_requests,
+        cost_input_eur=input_cost,
+        cost_output_eur=output_cost,
+        cost_total_eur=input_cost + output_cost,
+    )
 
 
 @router.get(
@@ -3,12 +3,17 @@ Centralized cache invalidation service.
 
 Provides consistent cache invalidation patterns across all API routes,
 reducing code duplication and ensuring all related cache keys are cleared.
+
+Every catalogue invalidation is also announced on CATALOGUE_CHANGED_CHANNEL
+so agent workers drop their in-process catalogue snapshot immediately.
 """
 
 import logging
 from typing import Literal
 
-from shared.redis_client import get_redis_client
+from agent.services.catalogue_snapshot import CATALOGUE_CHANGED_CHANNEL
+from agent.services.tarifa_service import get_tarifa_service
+from shared.redis_client import get_redis_client, publish_to_channel
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +24,23 @@ class CacheService:
     def __init__(self):
         self.redis = get_redis_client()
 
+    async def publish_catalogue_changed(self, scope: str, **ids: str | None) -> None:
+        """
+        Notify agent workers that the tariff/element catalogue changed.
+
+        Never raises: Redis keys are already invalidated and the agent
+        snapshot also expires after CATALOGUE_SNAPSHOT_TTL_SECONDS.
+
+        Args:
+            scope: What changed (e.g. "elements", "tariffs", "tier_elements")
+            **ids: Identifiers of the changed entity, for logging
+        """
+        message = {"scope": scope, **{k: str(v) for k, v in ids.items() if v is not None}}
+        try:
+            await publish_to_channel(CATALOGUE_CHANGED_CHANNEL, message)
+        except Exception as e:
+            logger.warning(f"Failed to publish catalogue change {message}: {e}")
+
     async def invalidate_element_cache(
         self,
         element_id: str | None = None,
@@ -62,6 +84,7 @@ class CacheService:
         if deleted > 0:
             logger.debug(f"Invalidated {deleted} element cache keys")
 
+        await self.publish_catalogue_changed("elements", element_id=element_id, category_id=category_id)
         return deleted
 
     async def invalidate_element_children_cache(self, parent_id: str) -> int:
@@ -91,7 +114,7 @@ class CacheService:
             Number of cache keys deleted
         """
         deleted = 0
-        pattern = f"tier_elements:{tier_id}"
+        pattern = f"tier:elements:{tier_id}"
 
         try:
             result = await self.redis.delete(pattern)
@@ -101,8 +124,26 @@ class CacheService:
         except Exception as e:
             logger.warning(f"Failed to delete tier elements cache '{pattern}': {e}")
 
+        await self.publish_catalogue_changed("tier_elements", tier_id=tier_id)
         return deleted
 
+    async def warm_tier_elements_cache(self) -> int:
+        """
+        Recompute the resolved elements of every tier into Redis.
+
+        A tier's elements depend on every tier it includes, so one edit can
+        affect many tiers; rebuilding all of them (one inclusion query)
+        is cheaper than tracking dependents. Never raises.
+
+        Returns:
+            Number of tiers cached
+        """
+        try:
+            return await get_tarifa_service().warm_tier_elements_cache()
+        except Exception as e:
+            logger.warning(f"Failed to warm tier elements cache: {e}")
+            return 0
+
     async def invalidate_tariff_cache(
         self,
         category_slug: str | None = None,
@@ -156,6 +197,7 @@ class CacheService:
         if deleted > 0:
             logger.debug(f"Invalidated {deleted} tariff cache keys")
 
+        await self.publish_catalogue_changed("tariffs", category_slug=category_slug)
         return deleted
 
     async def invalidate_all_element_caches(self) -> int:
@@ -169,7 +211,7 @@ class CacheService:
         patterns = [
             "elements:*",
             "element:*",
-            "tier_elements:*",
+            "tier:elements:*",
         ]
 
         for pattern in patterns:
@@ -189,6 +231,7 @@ class CacheService:
         if deleted > 0:
             logger.info(f"Invalidated ALL element caches: {deleted} keys deleted")
 
+        await self.publish_catalogue_changed("elements")
         return deleted
 
     async def invalidate_all_tariff_caches(self) -> int:
@@ -221,6 +264,7 @@ class CacheService:
         if deleted > 0:
             logger.info(f"Invalidated ALL tariff caches: {deleted} keys deleted")
 
+        await self.publish_catalogue_changed("tariffs")
         return deleted
 
 
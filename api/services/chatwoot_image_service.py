@@ -13,14 +13,16 @@ from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
+import aiofiles
 import httpx
 
 from shared.config import get_settings
+from shared.image_derivatives import delete_derivatives
 from shared.image_security import (
     ImageSecurityError,
     get_extension_for_mime,
     sanitize_filename,
-    validate_image_full,
+    validate_image_full_async,
     validate_url,
 )
 
@@ -207,7 +209,7 @@ class ChatwootImageService:
 
             # SECURITY: Full image validation (magic numbers + PIL)
             try:
-                validation_result = validate_image_full(
+                validation_result = await validate_image_full_async(
                     content=content,
                     declared_mime=declared_mime,
                     url=data_url,
@@ -245,8 +247,8 @@ class ChatwootImageService:
                     original_filename = sanitize_filename(path_parts[-1])
 
             # Save validated file
-            with open(file_path, "wb") as f:
-                f.write(content)
+            async with aiofiles.open(file_path, "wb") as f:
+                await f.write(content)
 
             logger.info(
                 f"Image downloaded and validated: {stored_filename} "
@@ -312,6 +314,12 @@ class ChatwootImageService:
         """Get URL for serving a stored image."""
         return f"{self.base_url}/{stored_filename}"
 
+    def get_derivative_url(self, derivative_name: str | None) -> str | None:
+        """Get URL for serving a thumbnail/preview (None if not generated)."""
+        if not derivative_name:
+            return None
+        return f"{self.base_url}/derivatives/{derivative_name}"
+
     def delete_image(self, stored_filename: str) -> bool:
         """
         Delete a stored image.
@@ -323,6 +331,7 @@ class ChatwootImageService:
             True if deleted, False if not found
         """
         path = self.case_images_dir / stored_filename
+        delete_derivatives(stored_filename)
         if path.exists():
             path.unlink()
             logger.info(f"Case image deleted: {stored_filename}")
@@ -340,8 +349,6 @@ class ChatwootImageService:
             Tuple of (bytes, mime_type) or None if not found
         """
         path = self.case_images_dir / stored_filename
-        if not path.exists():
-            return None
 
         ext = stored_filename.rsplit(".", 1)[-1].lower()
         mime_type = {
@@ -352,8 +359,11 @@ class ChatwootImageService:
             "webp": "image/webp",
         }.get(ext, "image/jpeg")
 
-        with open(path, "rb") as f:
-            return f.read(), mime_type
+        try:
+            async with aiofiles.open(path, "rb") as f:
+                return await f.read(), mime_type
+        except FileNotFoundError:
+            return None
 
 
 # Singleton
@@ -9,6 +9,7 @@ import logging
 import uuid
 from pathlib import Path
 
+import aiofiles
 from fastapi import HTTPException, UploadFile
 from sqlalchemy import func, select
 
@@ -19,7 +20,7 @@ from shared.image_security import (
     ImageSecurityError,
     get_extension_for_mime,
     sanitize_filename,
-    validate_image_full,
+    validate_image_full_async,
 )
 
 logger = logging.getLogger(__name__)
@@ -69,7 +70,7 @@ class ImageService:
 
         # SECURITY: Full image validation (magic numbers + PIL)
         try:
-            validation_result = validate_image_full(
+            validation_result = await validate_image_full_async(
                 content=content,
                 declared_mime=file.content_type or "application/octet-stream",
             )
@@ -92,8 +93,8 @@ class ImageService:
         file_path = self.upload_dir / stored_filename
 
         # Save validated file
-        with open(file_path, "wb") as f:
-            f.write(content)
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.write(content)
 
         logger.info(
             f"Image uploaded and validated: {stored_filename} "
@@ -0,0 +1,97 @@
+"""
+MSI Automotive - Streaming ZIP writer.
+
+Builds a ZIP archive chunk by chunk while it is being sent, so downloads
+start immediately and memory stays constant regardless of archive size.
+Already-compressed formats (JPEG, PNG, WebP, ...) are stored as-is:
+deflating them costs CPU and saves almost nothing.
+"""
+
+import asyncio
+import io
+import logging
+import time
+import zipfile
+from collections.abc import AsyncIterator, Iterable
+from pathlib import Path
+
+import aiofiles
+
+logger = logging.getLogger(__name__)
+
+# Read size for source files (also roughly the size of yielded chunks)
+CHUNK_SIZE = 64 * 1024
+
+# Extensions written with ZIP_STORED instead of ZIP_DEFLATED
+STORED_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp", "heic", "heif", "zip", "pdf"}
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back on drain()."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(
+    files: Iterable[tuple[str, Path]],
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP archive of the given files.
+
+    Missing or unreadable files are skipped with a warning, so one lost
+    image does not abort a download that has already started.
+
+    Args:
+        files: (name inside the archive, path on disk) pairs
+        chunk_size: Bytes read from disk per step
+
+    Yields:
+        Consecutive pieces of the ZIP archive
+    """
+    buffer = _ChunkBuffer()
+    # Non-seekable output makes zipfile write sizes/CRCs in data descriptors
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for arcname, path in files:
+            try:
+                stat = await asyncio.to_thread(path.stat)
+                source = await aiofiles.open(path, "rb")
+            except OSError as e:
+                logger.warning(f"Skipping {path} in ZIP: {e}")
+                continue
+
+            zinfo = zipfile.ZipInfo(arcname, date_time=time.localtime(stat.st_mtime)[:6])
+            zinfo.file_size = stat.st_size  # lets zipfile pick zip64 up front
+            ext = path.suffix.lstrip(".").lower()
+            zinfo.compress_type = zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+            try:
+                with zf.open(zinfo, "w") as dest:
+                    while chunk := await source.read(chunk_size):
+                        dest.write(chunk)
+                        if data := buffer.drain():
+                            yield data
+            finally:
+                await source.close()
+            if data := buffer.drain():
+                yield data
+
+    yield buffer.drain()
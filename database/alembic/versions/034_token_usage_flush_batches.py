@@ -0,0 +1,42 @@
+"""Create token_usage_flush_batches table.
+
+Records which Redis token-usage batches have been added to token_usage,
+so flushes retried after a crash are idempotent.
+
+Revision ID: 034_token_usage_flush_batches
+Revises: 7dc32f4a106a
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "034_token_usage_flush_batches"
+down_revision: Union[str, None] = "7dc32f4a106a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create token_usage_flush_batches table."""
+    op.create_table(
+        "token_usage_flush_batches",
+        sa.Column(
+            "batch_id",
+            sa.String(64),
+            primary_key=True,
+            comment="Batch id from the token_usage:flushing:* Redis key",
+        ),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("applied_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop token_usage_flush_batches table."""
+    op.drop_table("token_usage_flush_batches")
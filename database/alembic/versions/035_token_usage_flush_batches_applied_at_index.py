@@ -0,0 +1,33 @@
+"""Index token_usage_flush_batches.applied_at.
+
+Applied batch ids are pruned by age on every token-usage flush.
+
+Revision ID: 035_flush_batches_applied_at
+Revises: 034_token_usage_flush_batches
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "035_flush_batches_applied_at"
+down_revision: Union[str, None] = "034_token_usage_flush_batches"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the applied_at index used for pruning."""
+    op.create_index(
+        "ix_token_usage_flush_batches_applied_at",
+        "token_usage_flush_batches",
+        ["applied_at"],
+    )
+
+
+def downgrade() -> None:
+    """Drop the applied_at index."""
+    op.drop_index("ix_token_usage_flush_batches_applied_at", table_name="token_usage_flush_batches")
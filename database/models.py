@@ -2935,6 +2935,34 @@ class TokenUsage(Base):
         return f"<TokenUsage(year={self.year}, month={self.month}, total={total})>"
 
 
+class TokenUsageFlushBatch(Base):
+    """
+    TokenUsageFlushBatch model - Redis counter batches already added to TokenUsage.
+
+    Written in the same transaction as the TokenUsage UPSERT, so a batch
+    retried after a crash (or a failed Redis cleanup) is not counted twice.
+    """
+
+    __tablename__ = "token_usage_flush_batches"
+
+    batch_id: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="Batch id from the token_usage:flushing:* Redis key",
+    )
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<TokenUsageFlushBatch(batch_id={self.batch_id}, year={self.year}, month={self.month})>"
+
+
 # =============================================================================
 # Response Constraints (Anti-hallucination validation layer)
 # =============================================================================
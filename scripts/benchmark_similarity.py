@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for agent.utils.similarity.
+
+Compares the precompiled matchers with the per-pair loops they replaced:
+- Confirmation typo check: full-table Levenshtein per (word, confirmation
+  word) pair vs LevenshteinMatcher.distances()
+- fuzzy_match: normalize every candidate on every call vs FuzzyCandidates
+
+Usage:
+    python -m scripts.benchmark_similarity [--rounds N]
+"""
+
+import argparse
+import random
+import string
+import timeit
+
+from agent.nodes.conversational_agent import CONFIRMATION_BASE_WORDS
+from agent.utils.similarity import FuzzyCandidates, LevenshteinMatcher
+from agent.utils.text_utils import normalize_text
+
+
+def table_levenshtein(s1: str, s2: str) -> int:
+    """Previous implementation (two-row dynamic programming)."""
+    if len(s1) < len(s2):
+        return table_levenshtein(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def per_pair_fuzzy_match(query: str, candidates: list[str], threshold: float = 0.6) -> str | None:
+    """Previous fuzzy_match (normalizes every candidate per call)."""
+    normalized_query = normalize_text(query)
+    best_match, best_score = None, 0.0
+    for candidate in candidates:
+        normalized_candidate = normalize_text(candidate)
+        query_words = set(normalized_query.split())
+        candidate_words = set(normalized_candidate.split())
+        if not query_words or not candidate_words:
+            continue
+        score = len(query_words & candidate_words) / len(query_words | candidate_words)
+        if normalized_query in normalized_candidate or normalized_candidate in normalized_query:
+            score = max(score, 0.8)
+        if score > best_score and score >= threshold:
+            best_match, best_score = candidate, score
+    return best_match
+
+
+def _report(name: str, baseline: float, optimized: float, calls: int) -> None:
+    print(
+        f"{name:<28} before {baseline / calls * 1e6:8.2f} us/call   "
+        f"after {optimized / calls * 1e6:8.2f} us/call   x{baseline / optimized:5.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+
+    # Confirmation typo check: one short user word against all base words
+    words = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+        for _ in range(100)
+    ]
+    matcher = LevenshteinMatcher(CONFIRMATION_BASE_WORDS)
+    assert all(
+        matcher.distances(w) == [table_levenshtein(w, c) for c in CONFIRMATION_BASE_WORDS]
+        for w in words
+    )
+    baseline = timeit.timeit(
+        lambda: [[table_levenshtein(w, c) for c in CONFIRMATION_BASE_WORDS] for w in words],
+        number=args.rounds // 100 or 1,
+    )
+    optimized = timeit.timeit(
+        lambda: [matcher.distances(w) for w in words],
+        number=args.rounds // 100 or 1,
+    )
+    _report("confirmation typo check", baseline, optimized, len(words) * (args.rounds // 100 or 1))
+
+    # Field option / label matching: one query against ~40 candidates
+    vocabulary = ["delantero", "trasero", "izquierdo", "derecho", "faro", "piloto", "escape",
+                  "suspensión", "horquilla", "manillar", "espejo", "matrícula", "soporte"]
+    candidates = [" ".join(rng.sample(vocabulary, rng.randint(1, 3))).title() for _ in range(40)]
+    queries = [" ".join(rng.sample(vocabulary, rng.randint(1, 2))) for _ in range(50)]
+    prepared = FuzzyCandidates(candidates)
+    assert all(prepared.best(q) == per_pair_fuzzy_match(q, candidates) for q in queries)
+    baseline = timeit.timeit(
+        lambda: [per_pair_fuzzy_match(q, candidates) for q in queries], number=args.rounds // 50 or 1,
+    )
+    optimized = timeit.timeit(
+        lambda: [prepared.best(q) for q in queries], number=args.rounds // 50 or 1,
+    )
+    _report("fuzzy_match (40 candidates)", baseline, optimized, len(queries) * (args.rounds // 50 or 1))
+
+
+if __name__ == "__main__":
+    main()
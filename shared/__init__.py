@@ -7,7 +7,7 @@ used across the application.
 
 from shared.chatwoot_client import ChatwootClient
 from shared.config import Settings, get_settings
-from shared.image_security import ImageSecurityError, validate_image_full
+from shared.image_security import ImageSecurityError, validate_image_full, validate_image_full_async
 from shared.llm_router import LLMRouter, ModelTier, TaskType, get_llm_router
 from shared.logging_config import configure_logging
 from shared.redis_client import get_redis_client
@@ -39,6 +39,7 @@ __all__ = [
     "ModelTier",
     # Image security
     "validate_image_full",
+    "validate_image_full_async",
     "ImageSecurityError",
     # Error handling
     "ErrorCategory",
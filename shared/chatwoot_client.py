@@ -4,11 +4,22 @@ Chatwoot client for sending messages and managing conversations.
 This module provides the ChatwootClient class for interacting with the
 Chatwoot API, including sending WhatsApp messages and updating conversation
 attributes.
+
+All ChatwootClient instances share one pooled httpx.AsyncClient per process
+(keep-alive, HTTP/2 when the `h2` package is installed), so a message that
+needs several API calls reuses the same connection instead of paying DNS,
+TCP and TLS setup on every call. Call close_chatwoot_http_client() on
+shutdown.
+
+Contact and conversation ids resolved for a phone are cached (see
+shared.chatwoot_id_cache), so messages to returning customers go straight
+to the message POST.
 """
 
 import asyncio
 import logging
-from typing import Any, cast
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, cast
 
 import httpx
 from tenacity import (
@@ -18,12 +29,143 @@ from tenacity import (
     wait_exponential,
 )
 
+from shared.chatwoot_id_cache import (
+    cache_contact_id,
+    cache_conversation_id,
+    get_cached_contact_id,
+    get_cached_conversation_id,
+    invalidate_chatwoot_ids,
+)
 from shared.config import get_settings
 from shared.errors import ErrorCategory, get_error_logger
+from shared.image_byte_cache import get_image_byte_cache
 
 logger = logging.getLogger(__name__)
 error_logger = get_error_logger()
 
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+
+class ChatwootHttpStats:
+    """Connection reuse counters for the shared Chatwoot HTTP client."""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        """httpx request hook: count the request and trace connection setup."""
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        # Only emitted when the pool has no idle connection to reuse
+        if event_name == "connection.connect_tcp.started":
+            self.new_connections += 1
+        elif event_name == "connection.start_tls.started":
+            self.tls_handshakes += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters plus the share of requests served on a reused connection."""
+        reused = max(self.requests - self.new_connections, 0)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "tls_handshakes": self.tls_handshakes,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else None,
+        }
+
+
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+_http_stats = ChatwootHttpStats()
+# aclose() tasks for clients replaced after an event loop change
+_closing_clients: set[asyncio.Task] = set()
+
+
+def _request_timeout(total: float) -> httpx.Timeout:
+    """Per-call timeout with the configured connect timeout."""
+    return httpx.Timeout(total, connect=min(total, get_settings().CHATWOOT_HTTP_CONNECT_TIMEOUT))
+
+
+def get_chatwoot_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled HTTP client for Chatwoot calls.
+
+    Created lazily on first use. Connections belong to an event loop, so a
+    client created on another (finished) loop is closed and replaced.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is not None and not _http_client.is_closed and _http_client_loop is loop:
+        return _http_client
+
+    if _http_client is not None and not _http_client.is_closed:
+        _close_stale_client(_http_client, _http_client_loop)
+
+    settings = get_settings()
+    _http_client = httpx.AsyncClient(
+        http2=settings.CHATWOOT_HTTP2 and H2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.CHATWOOT_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CHATWOOT_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.CHATWOOT_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=_request_timeout(10.0),
+        event_hooks={"request": [_http_stats.on_request]},
+    )
+    _http_client_loop = loop
+    logger.info(
+        f"Chatwoot HTTP pool created | http2={settings.CHATWOOT_HTTP2 and H2_AVAILABLE} "
+        f"max_connections={settings.CHATWOOT_HTTP_MAX_CONNECTIONS}",
+    )
+    return _http_client
+
+
+def _close_stale_client(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+    """Close a client created on another event loop without waiting for it."""
+    if loop is not None and loop.is_running():
+        # Its connections can only be closed cleanly on their own loop
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+
+    task = asyncio.get_running_loop().create_task(client.aclose())
+    _closing_clients.add(task)
+    task.add_done_callback(_on_stale_client_closed)
+
+
+def _on_stale_client_closed(task: asyncio.Task) -> None:
+    _closing_clients.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        # Transports of a finished loop may fail to close; they are dropped anyway
+        logger.debug(f"Error closing stale Chatwoot HTTP client: {task.exception()}")
+
+
+async def close_chatwoot_http_client() -> None:
+    """Close the shared HTTP client (on process shutdown) and log reuse stats."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+    stats = _http_stats.get_stats()
+    logger.info(
+        f"Chatwoot HTTP pool closed | {stats}",
+        extra={"metric_type": "chatwoot_http_pool", **stats},
+    )
+
+
+def get_chatwoot_http_stats() -> dict[str, Any]:
+    """Connection reuse counters for the shared Chatwoot HTTP client."""
+    return _http_stats.get_stats()
+
 
 class ChatwootClient:
     """
@@ -47,6 +189,11 @@ class ChatwootClient:
         }
 
         logger.info(f"ChatwootClient initialized: {self.api_url}, account_id={self.account_id}")
+
+    @asynccontextmanager
+    async def _http(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Borrow the shared pooled client (left open on exit)."""
+        yield get_chatwoot_http_client()
     
     def _log_chatwoot_error(
         self,
@@ -91,20 +238,23 @@ class ChatwootClient:
         Returns:
             Contact dict if found, None otherwise
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 response = await client.get(
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts/search",
                     params={"q": phone},
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
                 payload = response.json().get("payload", [])
                 if payload and len(payload) > 0:
                     logger.debug(f"Contact found for phone {phone}")
-                    return cast(dict[str, Any], payload[0])
+                    contact = cast(dict[str, Any], payload[0])
+                    if contact.get("id"):
+                        await cache_contact_id(phone, contact["id"])
+                    return contact
 
                 logger.debug(f"No contact found for phone {phone}")
                 return None
@@ -113,6 +263,153 @@ class ChatwootClient:
                 logger.error(f"HTTP error finding contact: {e}")
                 raise
 
+    async def get_contact_id_by_phone(self, phone: str) -> int | None:
+        """
+        Chatwoot contact id for a phone, from the ID cache or a contact search.
+
+        Args:
+            phone: E.164 formatted phone number
+
+        Returns:
+            Contact ID if the contact exists, None otherwise
+        """
+        contact_id = await get_cached_contact_id(phone)
+        if contact_id is not None:
+            return contact_id
+
+        contact = await self.find_contact_by_phone(phone)
+        return cast(int | None, contact.get("id")) if contact else None
+
+    async def _resolve_contact_id(self, phone: str, name: str | None = None) -> int | None:
+        """Contact id for a phone (cached, searched, or newly created)."""
+        contact_id = await self.get_contact_id_by_phone(phone)
+        if contact_id is not None:
+            return contact_id
+
+        logger.info(f"Creating new contact for {phone}")
+        contact = await self._create_contact(phone, name)
+        contact_id = contact.get("id")
+        if not contact_id:
+            logger.error(f"No contact ID found for {phone}")
+            return None
+
+        await cache_contact_id(phone, contact_id)
+        return cast(int, contact_id)
+
+    async def _resolve_conversation_id(self, phone: str, name: str | None = None) -> int | None:
+        """
+        Conversation id for outgoing messages to a phone.
+
+        Uses the ID cache first; otherwise resolves the contact and opens a
+        conversation, caching both ids.
+        """
+        contact_cached = await get_cached_contact_id(phone) is not None
+        contact_id = await self._resolve_contact_id(phone, name)
+        if contact_id is None:
+            return None
+
+        conversation_id = await get_cached_conversation_id(contact_id)
+        if conversation_id is not None:
+            return conversation_id
+
+        try:
+            conversation_id = await self._get_or_create_conversation(contact_id)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404 or not contact_cached:
+                raise
+            # Cached contact no longer exists in Chatwoot
+            await invalidate_chatwoot_ids(phone, contact_id)
+            return await self._resolve_conversation_id(phone, name)
+
+        await cache_conversation_id(contact_id, conversation_id)
+        return conversation_id
+
+    async def post_message(
+        self, conversation_id: int, message: str, customer_phone: str | None = None
+    ) -> None:
+        """
+        POST an outgoing text message to a known conversation.
+
+        Unlike send_message(), HTTP errors are raised (not logged and
+        swallowed), so callers can tell rate limits and 404s apart.
+
+        Args:
+            conversation_id: Chatwoot conversation ID
+            message: Message text to send
+            customer_phone: Phone, only used for log context
+        """
+        async with self._http() as client:
+            api_payload = {
+                "content": message,
+                "message_type": "outgoing",
+                "private": False,
+            }
+
+            logger.debug(
+                f"Chatwoot API payload: {api_payload}",
+                extra={
+                    "conversation_id": conversation_id,
+                    "customer_phone": customer_phone,
+                }
+            )
+
+            response = await client.post(
+                f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
+                json=api_payload,
+                headers=self.headers,
+                timeout=_request_timeout(10.0),
+            )
+            response.raise_for_status()
+
+            logger.debug(
+                f"Chatwoot API response: status={response.status_code}",
+                extra={
+                    "conversation_id": conversation_id,
+                    "customer_phone": customer_phone,
+                }
+            )
+
+    async def send_to_customer(
+        self, customer_phone: str, message: str, customer_name: str | None = None
+    ) -> int | None:
+        """
+        Send a message to the customer's conversation resolved via the ID cache.
+
+        The POST is a single attempt and HTTP errors are raised, like
+        post_message(); send_message() is the retrying, non-raising wrapper.
+
+        A 404 on a cached conversation means it was deleted or merged in
+        Chatwoot: the cached ids are dropped and resolution is redone once.
+
+        Returns:
+            Conversation ID the message was posted to, or None if the
+            contact could not be resolved
+        """
+        contact_id = await get_cached_contact_id(customer_phone)
+        conversation_id = (
+            await get_cached_conversation_id(contact_id) if contact_id is not None else None
+        )
+
+        if conversation_id is not None:
+            try:
+                await self.post_message(conversation_id, message, customer_phone)
+                return conversation_id
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                logger.warning(
+                    f"Cached conversation {conversation_id} for {customer_phone} not found, resolving again",
+                    extra={"metric_type": "chatwoot_id_cache_stale", "conversation_id": conversation_id},
+                )
+                await invalidate_chatwoot_ids(customer_phone, contact_id)
+
+        conversation_id = await self._resolve_conversation_id(customer_phone, customer_name)
+        if conversation_id is None:
+            return None
+
+        await self.post_message(conversation_id, message, customer_phone)
+        return conversation_id
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -138,7 +435,7 @@ class ChatwootClient:
         Returns:
             True if update successful, False otherwise
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 payload: dict[str, Any] = {}
 
@@ -163,7 +460,7 @@ class ChatwootClient:
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts/{contact_id}",
                     json=payload,
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -194,7 +491,7 @@ class ChatwootClient:
         Returns:
             Created contact dict
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 payload = {
                     "inbox_id": self.inbox_id,
@@ -207,7 +504,7 @@ class ChatwootClient:
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts",
                     json=payload,
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -235,12 +532,12 @@ class ChatwootClient:
         Returns:
             Conversation ID
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 response = await client.get(
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts/{contact_id}",
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -263,7 +560,7 @@ class ChatwootClient:
                         "status": "open",
                     },
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -296,7 +593,7 @@ class ChatwootClient:
         Returns:
             True if update successful, False otherwise
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 logger.info(
                     f"Updating conversation {conversation_id} custom_attributes: {attributes}"
@@ -306,7 +603,7 @@ class ChatwootClient:
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/custom_attributes",
                     json={"custom_attributes": attributes},
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -340,8 +637,8 @@ class ChatwootClient:
 
         This method handles the complete flow:
         1. If conversation_id provided, use it directly
-        2. Otherwise: Find or create contact by phone
-        3. Get or create conversation for contact
+        2. Otherwise: Find or create contact by phone (ID cache first)
+        3. Get or create conversation for contact (ID cache first)
         4. Send message to conversation
 
         Args:
@@ -367,54 +664,18 @@ class ChatwootClient:
 
             if conversation_id is not None:
                 logger.info(f"Using existing conversation_id={conversation_id}")
+                await self.post_message(conversation_id, message, customer_phone)
             else:
-                contact = await self._find_contact_by_phone(customer_phone)
-                if not contact:
-                    logger.info(f"Creating new contact for {customer_phone}")
-                    contact = await self._create_contact(customer_phone, customer_name)
-
-                contact_id = contact.get("id")
-                if not contact_id:
-                    logger.error(f"No contact ID found for {customer_phone}")
-                    return False
-
-                conversation_id = await self._get_or_create_conversation(contact_id)
-
-            async with httpx.AsyncClient() as client:
-                api_payload = {
-                    "content": message,
-                    "message_type": "outgoing",
-                    "private": False,
-                }
-
-                logger.debug(
-                    f"Chatwoot API payload: {api_payload}",
-                    extra={
-                        "conversation_id": conversation_id,
-                        "customer_phone": customer_phone,
-                    }
-                )
-
-                response = await client.post(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
-                    json=api_payload,
-                    headers=self.headers,
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-
-                logger.debug(
-                    f"Chatwoot API response: status={response.status_code}",
-                    extra={
-                        "conversation_id": conversation_id,
-                        "customer_phone": customer_phone,
-                    }
+                conversation_id = await self.send_to_customer(
+                    customer_phone, message, customer_name
                 )
+                if conversation_id is None:
+                    return False
 
-                logger.info(
-                    f"Message sent successfully to {customer_phone}, conversation_id={conversation_id}"
-                )
-                return True
+            logger.info(
+                f"Message sent successfully to {customer_phone}, conversation_id={conversation_id}"
+            )
+            return True
 
         except httpx.HTTPError as e:
             self._log_chatwoot_error("send message", customer_phone, e)
@@ -477,14 +738,9 @@ class ChatwootClient:
                     fallback_content=fallback_content,
                 )
 
-            contact = await self._find_contact_by_phone(customer_phone)
-            if not contact:
-                logger.info(f"Creating new contact for {customer_phone}")
-                contact = await self._create_contact(customer_phone, customer_name)
-
-            contact_id = contact.get("id")
-            if not contact_id:
-                logger.error(f"No contact ID found for {customer_phone}")
+            contact_cached = await get_cached_contact_id(customer_phone) is not None
+            contact_id = await self._resolve_contact_id(customer_phone, customer_name)
+            if contact_id is None:
                 return False
 
             logger.info(
@@ -492,15 +748,32 @@ class ChatwootClient:
                 f"contact_id={contact_id}, phone={customer_phone}"
             )
 
-            _, success = await self._create_conversation_with_template(
-                contact_id=contact_id,
-                phone=customer_phone,
-                template_name=template_name,
-                body_params=body_params,
-                category=category,
-                language=language,
-                fallback_content=fallback_content,
-            )
+            template_kwargs: dict[str, Any] = {
+                "phone": customer_phone,
+                "template_name": template_name,
+                "body_params": body_params,
+                "category": category,
+                "language": language,
+                "fallback_content": fallback_content,
+            }
+            try:
+                new_conversation_id, success = await self._create_conversation_with_template(
+                    contact_id=contact_id, **template_kwargs
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404 or not contact_cached:
+                    raise
+                # Cached contact no longer exists in Chatwoot
+                await invalidate_chatwoot_ids(customer_phone, contact_id)
+                contact_id = await self._resolve_contact_id(customer_phone, customer_name)
+                if contact_id is None:
+                    return False
+                new_conversation_id, success = await self._create_conversation_with_template(
+                    contact_id=contact_id, **template_kwargs
+                )
+
+            if success and new_conversation_id:
+                await cache_conversation_id(contact_id, new_conversation_id)
             return success
 
         except httpx.HTTPError as e:
@@ -528,7 +801,7 @@ class ChatwootClient:
         fallback_content: str | None = None,
     ) -> tuple[int, bool]:
         """Create a new conversation with an initial template message."""
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 source_id = phone.lstrip("+")
 
@@ -558,7 +831,7 @@ class ChatwootClient:
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations",
                     json=payload,
                     headers=self.headers,
-                    timeout=15.0,
+                    timeout=_request_timeout(15.0),
                 )
                 response.raise_for_status()
 
@@ -611,12 +884,12 @@ class ChatwootClient:
             }
         )
 
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             response = await client.post(
                 f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
                 json=api_payload,
                 headers=self.headers,
-                timeout=15.0,
+                timeout=_request_timeout(15.0),
             )
             response.raise_for_status()
 
@@ -626,23 +899,22 @@ class ChatwootClient:
             )
             return True
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(httpx.HTTPError),
-        reraise=True,
-    )
-    async def send_image(
+    async def upload_image(
         self,
         conversation_id: int,
         image_url: str,
         caption: str | None = None,
     ) -> int | None:
         """
-        Send an image to a conversation via Chatwoot.
+        Upload an image to a conversation (single attempt, no retries).
 
         Downloads the image from the URL and uploads it as multipart/form-data
-        since Chatwoot doesn't support external_url in attachments.
+        since Chatwoot doesn't support external_url in attachments. Image
+        bytes are cached (see shared.image_byte_cache), so repeated sends of
+        the same image usually skip the download.
+
+        HTTP errors are raised so callers with their own retry policy (the
+        outbound scheduler) can honor rate limits.
 
         Args:
             conversation_id: Chatwoot conversation ID
@@ -650,71 +922,92 @@ class ChatwootClient:
             caption: Optional caption text to accompany the image
 
         Returns:
-            The Chatwoot message ID if sent successfully, None otherwise.
-            Note: callers using truthiness checks (if result:) remain compatible.
+            The Chatwoot message ID
         """
-        try:
-            logger.info(
-                f"Sending image to conversation {conversation_id} | url={image_url}",
-                extra={
-                    "conversation_id": conversation_id,
-                    "image_url": image_url,
-                },
-            )
+        logger.info(
+            f"Sending image to conversation {conversation_id} | url={image_url}",
+            extra={
+                "conversation_id": conversation_id,
+                "image_url": image_url,
+            },
+        )
 
-            async with httpx.AsyncClient() as client:
-                # Step 1: Download the image from URL
-                logger.debug(f"Downloading image from {image_url}")
-                img_response = await client.get(image_url, timeout=30.0)
-                img_response.raise_for_status()
+        async with self._http() as client:
+            # Step 1: Get the image bytes (cached, revalidated, or downloaded)
+            file_content, content_type = await get_image_byte_cache().fetch(
+                client, image_url, timeout=_request_timeout(30.0)
+            )
+            filename = image_url.split("/")[-1] or "image.png"
 
-                # Extract filename and content type
-                filename = image_url.split("/")[-1] or "image.png"
-                content_type = img_response.headers.get("content-type", "image/png")
-                file_content = img_response.content
+            # Step 2: Upload to Chatwoot as multipart/form-data
+            files = {
+                "attachments[]": (filename, file_content, content_type),
+            }
+            data = {
+                "content": caption or "",
+                "message_type": "outgoing",
+                "private": "false",
+            }
 
-                # Step 2: Upload to Chatwoot as multipart/form-data
-                files = {
-                    "attachments[]": (filename, file_content, content_type),
-                }
-                data = {
-                    "content": caption or "",
-                    "message_type": "outgoing",
-                    "private": "false",
-                }
+            # Don't use json headers for multipart
+            headers = {"api_access_token": self.api_token}
 
-                # Don't use json headers for multipart
-                headers = {"api_access_token": self.api_token}
+            response = await client.post(
+                f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
+                data=data,
+                files=files,
+                headers=headers,
+                timeout=_request_timeout(30.0),
+            )
 
-                response = await client.post(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
-                    data=data,
-                    files=files,
-                    headers=headers,
-                    timeout=30.0,
+            # Log response body on error before raising
+            if response.status_code >= 400:
+                logger.error(
+                    f"Chatwoot error response: status={response.status_code} body={response.text}",
+                    extra={"conversation_id": conversation_id},
                 )
 
-                # Log response body on error before raising
-                if response.status_code >= 400:
-                    logger.error(
-                        f"Chatwoot error response: status={response.status_code} body={response.text}",
-                        extra={"conversation_id": conversation_id},
-                    )
+            response.raise_for_status()
 
-                response.raise_for_status()
+            # Parse response to get message_id for delivery tracking
+            response_data = response.json()
+            message_id = response_data.get("id")
 
-                # Parse response to get message_id for delivery tracking
-                response_data = response.json()
-                message_id = response_data.get("id")
+            logger.info(
+                f"Image sent successfully to conversation {conversation_id} | message_id={message_id}",
+                extra={
+                    "conversation_id": conversation_id,
+                    "message_id": message_id,
+                },
+            )
+            return message_id
 
-                logger.info(
-                    f"Image sent successfully to conversation {conversation_id} | message_id={message_id}",
-                    extra={
-                        "conversation_id": conversation_id,
-                        "message_id": message_id,
-                    },
-                )
-                return message_id
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(httpx.HTTPError),
+        reraise=True,
+    )
+    async def send_image(
+        self,
+        conversation_id: int,
+        image_url: str,
+        caption: str | None = None,
+    ) -> int | None:
+        """
+        Send an image to a conversation via Chatwoot, retrying HTTP errors.
+
+        Args:
+            conversation_id: Chatwoot conversation ID
+            image_url: Public URL of the image to send
+            caption: Optional caption text to accompany the image
+
+        Returns:
+            The Chatwoot message ID if sent successfully, None otherwise.
+            Note: callers using truthiness checks (if result:) remain compatible.
+        """
+        try:
+            return await self.upload_image(conversation_id, image_url, caption)
 
         except httpx.HTTPError as e:
             logger.error(
@@ -814,7 +1107,7 @@ class ChatwootClient:
         Returns:
             True if labels added successfully, False otherwise
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 logger.info(
                     f"Adding labels {labels} to conversation {conversation_id}"
@@ -824,7 +1117,7 @@ class ChatwootClient:
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/labels",
                     json={"labels": labels},
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -868,7 +1161,7 @@ class ChatwootClient:
         Returns:
             True if note added successfully, False otherwise
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 logger.info(
                     f"Adding private note to conversation {conversation_id}"
@@ -882,7 +1175,7 @@ class ChatwootClient:
                         "private": True,
                     },
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -918,7 +1211,7 @@ class ChatwootClient:
         Returns:
             True if assignment successful, False otherwise
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 logger.info(
                     f"Attempting to assign conversation {conversation_id} to team {team_id}"
@@ -928,7 +1221,7 @@ class ChatwootClient:
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/assignments",
                     json={"team_id": team_id},
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -986,7 +1279,7 @@ class ChatwootClient:
         """
         image_messages: list[dict[str, Any]] = []
 
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 # Chatwoot messages API returns paginated results
                 # We fetch all pages to ensure we don't miss any
@@ -999,7 +1292,7 @@ class ChatwootClient:
                         f"/conversations/{conversation_id}/messages",
                         headers=self.headers,
                         params={"page": page, "per_page": 100},
-                        timeout=15.0,
+                        timeout=_request_timeout(15.0),
                     )
                     response.raise_for_status()
                     data = response.json()
@@ -1066,12 +1359,12 @@ class ChatwootClient:
         Raises:
             httpx.HTTPError: If Chatwoot API call fails
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 response = await client.get(
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}",
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -1102,7 +1395,7 @@ class ChatwootClient:
         Returns:
             True if labels removed successfully, False otherwise
         """
-        async with httpx.AsyncClient() as client:
+        async with self._http() as client:
             try:
                 # First, get current labels
                 conversation = await self.get_conversation(conversation_id)
@@ -1126,7 +1419,7 @@ class ChatwootClient:
                     f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/labels",
                     json={"labels": new_labels},
                     headers=self.headers,
-                    timeout=10.0,
+                    timeout=_request_timeout(10.0),
                 )
                 response.raise_for_status()
 
@@ -0,0 +1,158 @@
+"""
+Chatwoot ID cache - phone → contact_id and contact_id → conversation_id.
+
+Sending to a customer without a known conversation id costs a contact
+search plus a contact fetch and a conversation create before the message
+POST. The ids rarely change, so they are cached in two layers:
+
+- An in-process LRU (bounded, TTL per entry) for hot conversations.
+- Redis with the same TTL, shared by the api and agent processes.
+
+Ids are only dropped when Chatwoot answers 404 for a cached id (contact or
+conversation deleted/merged); callers then resolve again against the API.
+Redis errors are logged and treated as a cache miss.
+"""
+
+__all__ = [
+    "get_cached_contact_id",
+    "get_cached_conversation_id",
+    "cache_contact_id",
+    "cache_conversation_id",
+    "invalidate_chatwoot_ids",
+    "clear_local_chatwoot_id_cache",
+]
+
+import logging
+import time
+from collections import OrderedDict
+
+from shared.config import get_settings
+from shared.redis_client import get_redis_client
+from shared.redis_keys import RedisKeys
+
+logger = logging.getLogger(__name__)
+
+
+class _LocalLRU:
+    """Small LRU of int values with a per-entry expiry."""
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+    def get(self, key: str) -> int | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: int, ttl: int, max_entries: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_local_cache = _LocalLRU()
+
+
+async def _get(key: str) -> int | None:
+    value = _local_cache.get(key)
+    if value is not None:
+        return value
+
+    try:
+        cached = await get_redis_client().get(key)
+    except Exception as e:
+        logger.warning(f"Chatwoot ID cache read failed for {key}: {e}")
+        return None
+    if cached is None:
+        return None
+
+    try:
+        value = int(cached)
+    except ValueError:
+        return None
+    settings = get_settings()
+    _local_cache.set(
+        key, value, settings.CHATWOOT_ID_CACHE_TTL_SECONDS, settings.CHATWOOT_ID_CACHE_MAX_ENTRIES
+    )
+    return value
+
+
+async def _set(key: str, value: int) -> None:
+    settings = get_settings()
+    _local_cache.set(
+        key, value, settings.CHATWOOT_ID_CACHE_TTL_SECONDS, settings.CHATWOOT_ID_CACHE_MAX_ENTRIES
+    )
+    try:
+        await get_redis_client().setex(key, settings.CHATWOOT_ID_CACHE_TTL_SECONDS, value)
+    except Exception as e:
+        logger.warning(f"Chatwoot ID cache write failed for {key}: {e}")
+
+
+async def get_cached_contact_id(phone: str) -> int | None:
+    """Cached Chatwoot contact id for an E.164 phone, or None."""
+    return await _get(RedisKeys.chatwoot_contact_by_phone(phone))
+
+
+async def get_cached_conversation_id(contact_id: int) -> int | None:
+    """Cached Chatwoot conversation id for a contact, or None."""
+    return await _get(RedisKeys.chatwoot_conversation_by_contact(contact_id))
+
+
+async def cache_contact_id(phone: str, contact_id: int) -> None:
+    """Remember the Chatwoot contact id for a phone."""
+    await _set(RedisKeys.chatwoot_contact_by_phone(phone), contact_id)
+
+
+async def cache_conversation_id(contact_id: int, conversation_id: int) -> None:
+    """Remember the conversation outgoing messages to a contact go to."""
+    await _set(RedisKeys.chatwoot_conversation_by_contact(contact_id), conversation_id)
+
+
+async def invalidate_chatwoot_ids(phone: str | None = None, contact_id: int | None = None) -> None:
+    """
+    Drop cached ids after Chatwoot returned 404 for one of them.
+
+    Args:
+        phone: Drop the phone → contact_id entry (and that contact's
+            conversation entry, if it is cached)
+        contact_id: Drop the contact_id → conversation_id entry
+    """
+    keys = []
+    if phone is not None:
+        if contact_id is None:
+            contact_id = await get_cached_contact_id(phone)
+        keys.append(RedisKeys.chatwoot_contact_by_phone(phone))
+    if contact_id is not None:
+        keys.append(RedisKeys.chatwoot_conversation_by_contact(contact_id))
+    if not keys:
+        return
+
+    for key in keys:
+        _local_cache.pop(key)
+    try:
+        await get_redis_client().delete(*keys)
+    except Exception as e:
+        logger.warning(f"Chatwoot ID cache invalidation failed for {keys}: {e}")
+
+    logger.info(
+        f"Invalidated Chatwoot ID cache: {keys}",
+        extra={"metric_type": "chatwoot_id_cache_invalidated", "keys": keys},
+    )
+
+
+def clear_local_chatwoot_id_cache() -> None:
+    """Empty the in-process layer (Redis entries are kept)."""
+    _local_cache.clear()
@@ -63,18 +63,16 @@ async def sync_user_to_chatwoot(
     # Try to find contact by phone if not stored
     if not contact_id:
         try:
-            contact = await chatwoot_client.find_contact_by_phone(user.phone)
-            if contact:
-                contact_id = contact["id"]
-                if save_contact_id:
-                    user.chatwoot_contact_id = contact_id
-                    logger.info(
-                        f"Discovered chatwoot_contact_id={contact_id} for user {user.id}",
-                        extra={
-                            "user_id": str(user.id),
-                            "chatwoot_contact_id": contact_id,
-                        },
-                    )
+            contact_id = await chatwoot_client.get_contact_id_by_phone(user.phone)
+            if contact_id and save_contact_id:
+                user.chatwoot_contact_id = contact_id
+                logger.info(
+                    f"Discovered chatwoot_contact_id={contact_id} for user {user.id}",
+                    extra={
+                        "user_id": str(user.id),
+                        "chatwoot_contact_id": contact_id,
+                    },
+                )
         except Exception as e:
             logger.warning(
                 f"Failed to find Chatwoot contact by phone for user {user.id}: {e}",
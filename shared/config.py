@@ -75,6 +75,59 @@ class Settings(BaseSettings):
         default="",
         description="Domain for Chatwoot active_storage URLs (e.g., chats.autohomologacion.net)"
     )
+    CHATWOOT_HTTP_MAX_CONNECTIONS: int = Field(
+        default=20,
+        ge=1,
+        description="Max concurrent connections in the shared Chatwoot HTTP pool (per process)"
+    )
+    CHATWOOT_HTTP_MAX_KEEPALIVE: int = Field(
+        default=10,
+        ge=0,
+        description="Idle keep-alive connections kept open to Chatwoot"
+    )
+    CHATWOOT_HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        gt=0.0,
+        description="Seconds an idle Chatwoot connection is kept before closing"
+    )
+    CHATWOOT_HTTP_CONNECT_TIMEOUT: float = Field(
+        default=5.0,
+        gt=0.0,
+        description="Connect timeout for Chatwoot API calls (seconds)"
+    )
+    CHATWOOT_HTTP2: bool = Field(
+        default=True,
+        description="Use HTTP/2 for Chatwoot calls when the h2 package is installed"
+    )
+    CHATWOOT_ID_CACHE_TTL_SECONDS: int = Field(
+        default=21600,
+        ge=1,
+        description="TTL of cached Chatwoot phone → contact and contact → conversation ids"
+    )
+    CHATWOOT_ID_CACHE_MAX_ENTRIES: int = Field(
+        default=4096,
+        ge=1,
+        description="Max entries in the in-process Chatwoot ID cache (per process)"
+    )
+    CHATWOOT_IMAGE_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Memory budget for cached image bytes re-uploaded to Chatwoot (per process)"
+    )
+    CHATWOOT_IMAGE_CACHE_FRESH_SECONDS: float = Field(
+        default=300.0,
+        ge=0.0,
+        description="Cached images validated this recently are sent without revalidating"
+    )
+    CHATWOOT_IMAGE_CACHE_DIR: str = Field(
+        default="",
+        description="Directory for the on-disk image byte cache (empty = memory only)"
+    )
+    CHATWOOT_IMAGE_CACHE_DISK_MAX_BYTES: int = Field(
+        default=512 * 1024 * 1024,
+        ge=0,
+        description="Disk budget for the image byte cache (least recently used files are deleted)"
+    )
 
     # OpenRouter (Unified LLM API)
     OPENROUTER_API_KEY: str = Field(default="sk-or-placeholder")
@@ -128,6 +181,11 @@ class Settings(BaseSettings):
         default=15,
         description="Maximum case image size in MB"
     )
+    CASE_IMAGES_DOWNLOAD_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        description="Concurrent Chatwoot attachment downloads per incoming message"
+    )
 
     # Image Security
     MAX_IMAGES_PER_CASE: int = Field(
@@ -138,6 +196,11 @@ class Settings(BaseSettings):
         default=10,
         description="Maximum image uploads per minute per user"
     )
+    IMAGE_VALIDATION_MAX_WORKERS: int = Field(
+        default=2,
+        ge=1,
+        description="Threads decoding/validating images (per process); extra images wait their turn"
+    )
 
     # API Base URL (for generating absolute URLs for external services like Chatwoot)
     API_BASE_URL: str = Field(
@@ -263,6 +326,38 @@ class Settings(BaseSettings):
         description="Capable local model for RAG and moderate complexity tasks"
     )
 
+    # Hedged LLM requests / provider health
+    LLM_HEDGING_ENABLED: bool = Field(
+        default=True,
+        description="Fire a backup LLM request (Ollama) when the primary is slower than its p95"
+    )
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = Field(
+        default=4.0,
+        ge=0.0,
+        description="Lower bound for the hedge delay (avoids doubling load on fast responses)"
+    )
+    LLM_HEDGE_MAX_DELAY_SECONDS: float = Field(
+        default=20.0,
+        ge=0.0,
+        description="Upper bound for the hedge delay (also used until latency stats are warm)"
+    )
+    LLM_LATENCY_EWMA_ALPHA: float = Field(
+        default=0.2,
+        gt=0.0,
+        le=1.0,
+        description="Smoothing factor for per-provider EWMA latency tracking"
+    )
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        ge=1,
+        description="Consecutive failures before a provider's circuit opens"
+    )
+    LLM_CIRCUIT_RESET_SECONDS: float = Field(
+        default=30.0,
+        ge=1.0,
+        description="Seconds a provider's circuit stays open before a probe request"
+    )
+
     # Vehicle Classification
     USE_LOCAL_VEHICLE_CLASSIFICATION: bool = Field(
         default=True,
@@ -302,6 +397,45 @@ class Settings(BaseSettings):
         default=90,
         description="Days to retain LLM metrics data"
     )
+    LLM_METRICS_BUFFER_MAX_SIZE: int = Field(
+        default=5000,
+        ge=1,
+        description="Max buffered LLM metrics in memory; oldest are dropped (and counted) beyond this"
+    )
+    LLM_METRICS_FLUSH_BATCH_SIZE: int = Field(
+        default=100,
+        ge=1,
+        description="Flush LLM metrics to the database as soon as this many are buffered"
+    )
+    LLM_METRICS_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=10.0,
+        gt=0.0,
+        description="Max seconds between LLM metrics flushes"
+    )
+
+    # Conversation History Windowing
+    HISTORY_TOKEN_BUDGET: int = Field(
+        default=3000,
+        ge=200,
+        description="Default token budget for conversation history sent to the LLM"
+    )
+    HISTORY_TOKEN_BUDGET_BY_PHASE: dict[str, int] = Field(
+        default_factory=lambda: {
+            "collect_element_data": 2000,
+            "collect_base_docs": 1500,
+            "collect_personal": 1500,
+            "collect_vehicle": 1500,
+            "collect_workshop": 1500,
+            "review_summary": 2000,
+        },
+        description="Per-phase history token budgets (JSON, keyed by CollectionStep value)"
+    )
+
+    # Fast Path (rule-based replies that skip the LLM)
+    ENABLE_FAST_PATH: bool = Field(
+        default=True,
+        description="Answer greetings, thanks, 'listo' after photos and pending-action rejections without the LLM"
+    )
 
     # Token Pricing (EUR per million tokens)
     # DeepSeek: €0.14 input, €0.28 output (much cheaper than GPT-4o-mini)
@@ -313,6 +447,70 @@ class Settings(BaseSettings):
         default=Decimal("0.28"),
         description="Price per million output tokens in EUR"
     )
+    LLM_MODEL_PRICES_USD: dict[str, tuple[Decimal, Decimal]] = Field(
+        default_factory=lambda: {
+            "deepseek/deepseek-chat": (Decimal("0.27"), Decimal("1.10")),
+            "openai/gpt-4o": (Decimal("2.50"), Decimal("10.00")),
+            "openai/gpt-4o-mini": (Decimal("0.15"), Decimal("0.60")),
+        },
+        description=(
+            "USD per million (input, output) tokens by OpenRouter model id (JSON), used for "
+            "llm_usage_metrics.estimated_cost_usd; models not listed get no cost estimate"
+        )
+    )
+    TOKEN_USAGE_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=30.0,
+        gt=0.0,
+        description="Seconds between flushes of Redis token-usage counters to PostgreSQL"
+    )
+
+    # Catalogue snapshot (in-process tariff/element cache, invalidated via pub/sub)
+    ENABLE_CATALOGUE_SNAPSHOT: bool = Field(
+        default=True,
+        description="Serve tariff/element catalogue reads from agent memory, invalidated on the catalogue_changed channel"
+    )
+    CATALOGUE_SNAPSHOT_TTL_SECONDS: float = Field(
+        default=3600.0,
+        gt=0.0,
+        description="Safety TTL for catalogue snapshot entries (pub/sub invalidation is the primary mechanism)"
+    )
+
+    # Outbound scheduler (per-conversation delivery of agent replies)
+    OUTBOUND_MAX_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        description="Max Chatwoot calls in flight from the outbound scheduler (all conversations)"
+    )
+    OUTBOUND_IMAGE_DELAY_SECONDS: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Gap between images sent to one conversation (keeps WhatsApp ordering)"
+    )
+    OUTBOUND_FOLLOW_UP_DELAY_SECONDS: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Gap between the last image and the follow-up text in one conversation"
+    )
+    OUTBOUND_MAX_RETRIES: int = Field(
+        default=3,
+        ge=0,
+        description="Retries for a Chatwoot call answered with 429/502/503/504"
+    )
+    OUTBOUND_DELIVERY_ATTEMPTS: int = Field(
+        default=3,
+        ge=1,
+        description="Delivery attempts per outgoing message before it is dead-lettered"
+    )
+    OUTBOUND_REDELIVERY_DELAY_SECONDS: float = Field(
+        default=2.0,
+        ge=0.0,
+        description="Base backoff between delivery attempts (doubles per attempt)"
+    )
+    OUTBOUND_STREAM_CLAIM_IDLE_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        description="Outgoing stream messages unacknowledged this long are taken over by another sender"
+    )
 
     class Config:
         env_file = ".env"
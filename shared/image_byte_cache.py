@@ -0,0 +1,276 @@
+"""
+Image byte cache for images re-uploaded to Chatwoot.
+
+ChatwootClient.send_image() has to download an image before uploading it
+as an attachment, and the images it sends (element example images) are
+the same small set over and over. ImageByteCache keeps their bytes so a
+send usually only pays the upload:
+
+- Bytes are content-addressed (sha256): URLs serving identical files
+  share one copy.
+- An in-memory LRU bounded by CHATWOOT_IMAGE_CACHE_MAX_BYTES, optionally
+  backed by a directory (CHATWOOT_IMAGE_CACHE_DIR) bounded by
+  CHATWOOT_IMAGE_CACHE_DISK_MAX_BYTES, which survives restarts.
+- Entries younger than CHATWOOT_IMAGE_CACHE_FRESH_SECONDS are used as-is;
+  older ones are revalidated with If-None-Match / If-Modified-Since and
+  only re-downloaded when the server does not answer 304.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from shared.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# URL index entries kept in memory (metadata only, bytes are bounded separately)
+MAX_INDEX_ENTRIES = 4096
+
+
+@dataclass
+class CachedImage:
+    """Validators and content address of a cached URL."""
+
+    digest: str
+    content_type: str
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+    validated_at: float = 0.0
+
+
+class ImageByteCache:
+    """URL → image bytes cache with HTTP revalidation."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        fresh_seconds: float,
+        directory: str | Path | None = None,
+        disk_max_bytes: int = 0,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for image bytes
+            fresh_seconds: Serve entries validated this recently without a request
+            directory: Optional on-disk store (None/"" for memory only)
+            disk_max_bytes: Disk budget for image bytes
+        """
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self.directory = Path(directory) if directory else None
+        self.disk_max_bytes = disk_max_bytes
+        self._index: OrderedDict[str, CachedImage] = OrderedDict()
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._blob_bytes = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit counters and memory usage."""
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "memory_bytes": self._blob_bytes,
+            "urls": len(self._index),
+        }
+
+    async def fetch(
+        self, client: httpx.AsyncClient, url: str, timeout: httpx.Timeout | float | None = None
+    ) -> tuple[bytes, str]:
+        """
+        Get image bytes for a URL, downloading only when needed.
+
+        Args:
+            client: HTTP client used for (conditional) downloads
+            url: Image URL
+            timeout: Request timeout
+
+        Returns:
+            (content, content_type)
+
+        Raises:
+            httpx.HTTPError: If the download fails
+        """
+        entry = self._index.get(url) or await self._load_index_entry(url)
+        content = await self._read(entry.digest) if entry else None
+
+        if entry and content is not None:
+            self._index[url] = entry
+            self._index.move_to_end(url)
+            if time.time() - entry.validated_at < self.fresh_seconds:
+                self.hits += 1
+                return content, entry.content_type
+
+        headers = {}
+        if entry and content is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = await client.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and entry and content is not None:
+            self.revalidated += 1
+            entry.validated_at = time.time()
+            await self._save_index_entry(url, entry)
+            return content, entry.content_type
+
+        response.raise_for_status()
+        self.misses += 1
+        content = response.content
+        content_type = response.headers.get("content-type", "image/png")
+        entry = CachedImage(
+            digest=hashlib.sha256(content).hexdigest(),
+            content_type=content_type,
+            size=len(content),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            validated_at=time.time(),
+        )
+        self._index[url] = entry
+        self._index.move_to_end(url)
+        while len(self._index) > MAX_INDEX_ENTRIES:
+            self._index.popitem(last=False)
+        self._remember(entry.digest, content)
+        await self._write(url, entry, content)
+        return content, content_type
+
+    def _remember(self, digest: str, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        if digest not in self._blobs:
+            self._blobs[digest] = content
+            self._blob_bytes += len(content)
+        self._blobs.move_to_end(digest)
+        while self._blob_bytes > self.max_bytes:
+            _, evicted = self._blobs.popitem(last=False)
+            self._blob_bytes -= len(evicted)
+
+    async def _read(self, digest: str) -> bytes | None:
+        content = self._blobs.get(digest)
+        if content is not None:
+            self._blobs.move_to_end(digest)
+            return content
+        if self.directory is None:
+            return None
+
+        content = await asyncio.to_thread(self._read_blob_file, digest)
+        if content is not None:
+            self._remember(digest, content)
+        return content
+
+    # ------------------------------------------------------------------
+    # Disk layer (blocking helpers run in a thread)
+    # ------------------------------------------------------------------
+
+    def _blob_path(self, digest: str) -> Path:
+        assert self.directory is not None
+        return self.directory / "blobs" / digest[:2] / digest
+
+    def _index_path(self, url: str) -> Path:
+        assert self.directory is not None
+        return self.directory / "urls" / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _read_blob_file(self, digest: str) -> bytes | None:
+        path = self._blob_path(digest)
+        try:
+            content = path.read_bytes()
+            os.utime(path)  # mtime is the LRU clock for disk eviction
+        except OSError:
+            return None
+        if hashlib.sha256(content).hexdigest() != digest:
+            logger.warning(f"Corrupt cached image {digest}, discarding")
+            path.unlink(missing_ok=True)
+            return None
+        return content
+
+    async def _load_index_entry(self, url: str) -> CachedImage | None:
+        if self.directory is None:
+            return None
+        try:
+            raw = await asyncio.to_thread(self._index_path(url).read_text)
+            return CachedImage(**json.loads(raw))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    async def _save_index_entry(self, url: str, entry: CachedImage) -> None:
+        if self.directory is None:
+            return
+        try:
+            await asyncio.to_thread(self._write_index_file, url, entry)
+        except OSError as e:
+            logger.warning(f"Image cache index write failed for {url}: {e}")
+
+    def _write_index_file(self, url: str, entry: CachedImage) -> None:
+        path = self._index_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(entry)))
+        os.replace(tmp, path)
+
+    async def _write(self, url: str, entry: CachedImage, content: bytes) -> None:
+        if self.directory is None or entry.size > self.disk_max_bytes:
+            return
+        try:
+            await asyncio.to_thread(self._write_files, url, entry, content)
+        except OSError as e:
+            logger.warning(f"Image cache write failed for {url}: {e}")
+
+    def _write_files(self, url: str, entry: CachedImage, content: bytes) -> None:
+        path = self._blob_path(entry.digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, path)
+            self._prune_disk()
+        self._write_index_file(url, entry)
+
+    def _prune_disk(self) -> None:
+        """Delete least recently used blobs until the disk budget is met."""
+        assert self.directory is not None
+        files = []
+        total = 0
+        for path in (self.directory / "blobs").glob("*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            # URL index files pointing at it become misses on next read
+
+
+@lru_cache
+def get_image_byte_cache() -> ImageByteCache:
+    """Get the process-wide image byte cache (configured from settings)."""
+    settings = get_settings()
+    return ImageByteCache(
+        max_bytes=settings.CHATWOOT_IMAGE_CACHE_MAX_BYTES,
+        fresh_seconds=settings.CHATWOOT_IMAGE_CACHE_FRESH_SECONDS,
+        directory=settings.CHATWOOT_IMAGE_CACHE_DIR or None,
+        disk_max_bytes=settings.CHATWOOT_IMAGE_CACHE_DISK_MAX_BYTES,
+    )
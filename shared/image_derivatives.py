@@ -0,0 +1,189 @@
+"""
+WebP derivatives (thumbnails and previews) of case images.
+
+The admin panel only needs small versions of user photos to render case
+galleries. After an image is saved, its stored filename is queued in
+Redis; the agent's derivative worker decodes it once and writes:
+
+    CASE_IMAGES_DIR/derivatives/<sha256[:16]>_thumb.webp
+    CASE_IMAGES_DIR/derivatives/<sha256[:16]>_preview.webp
+    CASE_IMAGES_DIR/derivatives/<stored_filename>.json   (manifest)
+
+Images that cannot be converted (missing original, HEIC without a Pillow
+plugin, corrupt data) get a manifest with an "error" entry so they are
+not queued again. Each image is queued at most once at a time.
+
+Names are derived from the original's content hash, so they never change
+for a given file and can be served with immutable cache headers.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from shared.config import get_settings
+from shared.redis_client import get_redis_client
+from shared.redis_keys import RedisKeys
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels of each derivative
+DERIVATIVE_SIZES = {"thumb": 320, "preview": 1280}
+
+WEBP_QUALITY = 80
+
+DERIVATIVES_SUBDIR = "derivatives"
+
+# An image stays marked as queued this long if the worker never finishes it
+QUEUED_MARKER_TTL_SECONDS = 3600
+
+# Only names produced by generate_derivatives() are served
+DERIVATIVE_NAME_RE = re.compile(r"^[0-9a-f]{16}_(thumb|preview)\.webp$")
+
+
+def get_derivatives_dir() -> Path:
+    """Directory holding derivatives and manifests."""
+    return Path(get_settings().CASE_IMAGES_DIR) / DERIVATIVES_SUBDIR
+
+
+def _manifest_path(stored_filename: str) -> Path:
+    return get_derivatives_dir() / f"{stored_filename}.json"
+
+
+def read_derivatives(stored_filename: str) -> dict[str, str] | None:
+    """
+    Get derivative names for a stored image (blocking).
+
+    Returns:
+        {"thumb": name, "preview": name}; {"error": reason} if they cannot
+        be generated; None if not generated (yet) or not (all) on disk
+    """
+    try:
+        names = json.loads(_manifest_path(stored_filename).read_text())
+    except (OSError, ValueError):
+        return None
+    if "error" in names:
+        return names
+    directory = get_derivatives_dir()
+    if set(names) != set(DERIVATIVE_SIZES) or not all((directory / n).is_file() for n in names.values()):
+        return None
+    return names
+
+
+def generate_derivatives(stored_filename: str) -> dict[str, str] | None:
+    """
+    Create the WebP derivatives of a stored case image (blocking, CPU-bound).
+
+    Idempotent: returns the existing manifest when derivatives are present.
+    Failures are recorded in the manifest and not retried.
+
+    Returns:
+        Derivative names by size, or None if the original is missing or
+        cannot be decoded (e.g. HEIC without a plugin)
+    """
+    existing = read_derivatives(stored_filename)
+    if existing:
+        return None if "error" in existing else existing
+
+    directory = get_derivatives_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    source = Path(get_settings().CASE_IMAGES_DIR) / stored_filename
+    try:
+        content = source.read_bytes()
+    except OSError as e:
+        logger.warning(f"Cannot read case image for derivatives: {stored_filename}: {e}")
+        _write_manifest(stored_filename, {"error": f"unreadable original: {e.strerror or e}"})
+        return None
+
+    content_hash = hashlib.sha256(content).hexdigest()[:16]
+
+    try:
+        with Image.open(source) as img:
+            # JPEG: decode at reduced scale, the largest derivative is enough
+            img.draft("RGB", (max(DERIVATIVE_SIZES.values()),) * 2)
+            img = ImageOps.exif_transpose(img)
+            img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P", "PA") else "RGB")
+
+            names = {}
+            # Largest first so smaller sizes are resampled from it
+            for size_name, size in sorted(DERIVATIVE_SIZES.items(), key=lambda item: -item[1]):
+                img.thumbnail((size, size), Image.Resampling.LANCZOS)
+                name = f"{content_hash}_{size_name}.webp"
+                path = directory / name
+                if not path.is_file():
+                    tmp = path.with_suffix(".tmp")
+                    img.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+                    os.replace(tmp, path)
+                names[size_name] = name
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.warning(f"Cannot create derivatives for {stored_filename}: {e}")
+        _write_manifest(stored_filename, {"error": str(e)})
+        return None
+
+    _write_manifest(stored_filename, names)
+    return names
+
+
+def _write_manifest(stored_filename: str, content: dict[str, str]) -> None:
+    manifest = _manifest_path(stored_filename)
+    tmp = manifest.with_suffix(".tmp")
+    tmp.write_text(json.dumps(content))
+    os.replace(tmp, manifest)
+
+
+def delete_derivatives(stored_filename: str) -> None:
+    """Remove the manifest and derivative files of a deleted image (blocking)."""
+    names = read_derivatives(stored_filename) or {}
+    directory = get_derivatives_dir()
+    for size_name, name in names.items():
+        if size_name in DERIVATIVE_SIZES:
+            (directory / name).unlink(missing_ok=True)
+    _manifest_path(stored_filename).unlink(missing_ok=True)
+
+
+async def get_derivatives(stored_filenames: list[str]) -> dict[str, dict[str, str] | None]:
+    """Read the manifests of several images without blocking the event loop."""
+    def read_all():
+        return {name: read_derivatives(name) for name in stored_filenames}
+
+    return await asyncio.to_thread(read_all)
+
+
+async def enqueue_derivatives(stored_filenames: list[str]) -> None:
+    """
+    Queue images for the derivative worker, skipping those already queued.
+
+    Never raises: galleries fall back to the originals when derivatives
+    are missing.
+    """
+    if not stored_filenames:
+        return
+    try:
+        redis = get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            for stored_filename in stored_filenames:
+                pipe.set(
+                    RedisKeys.case_image_derivatives_queued(stored_filename),
+                    "1",
+                    nx=True,
+                    ex=QUEUED_MARKER_TTL_SECONDS,
+                )
+            marked = await pipe.execute()
+
+        new = [name for name, was_set in zip(stored_filenames, marked) if was_set]
+        if new:
+            await redis.rpush(RedisKeys.case_image_derivatives_queue(), *new)
+    except Exception as e:
+        logger.warning(f"Failed to queue image derivatives: {e}")
+
+
+async def mark_derivatives_processed(stored_filename: str) -> None:
+    """Clear the queued marker once the worker has handled an image."""
+    await get_redis_client().delete(RedisKeys.case_image_derivatives_queued(stored_filename))
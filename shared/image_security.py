@@ -9,14 +9,19 @@ Protects against:
 - Image bombs (decompression attacks)
 """
 
+import asyncio
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from io import BytesIO
 from pathlib import Path
 from urllib.parse import urlparse
 
 from PIL import Image
 
+from shared.config import get_settings
+
 logger = logging.getLogger(__name__)
 
 # Magic number signatures for allowed image types
@@ -428,6 +433,44 @@ def validate_image_full(
     }
 
 
+@lru_cache
+def _get_validation_executor() -> ThreadPoolExecutor:
+    """Thread pool for image decoding, sized by IMAGE_VALIDATION_MAX_WORKERS."""
+    return ThreadPoolExecutor(
+        max_workers=get_settings().IMAGE_VALIDATION_MAX_WORKERS,
+        thread_name_prefix="image-validation",
+    )
+
+
+async def validate_image_full_async(
+    content: bytes,
+    declared_mime: str | None = None,
+    url: str | None = None,
+    allowed_domains: list[str] | None = None,
+) -> dict:
+    """
+    Run validate_image_full() without blocking the event loop.
+
+    PIL decoding runs on a dedicated thread pool, so a burst of large
+    photos queues for IMAGE_VALIDATION_MAX_WORKERS threads instead of
+    stalling request handling.
+
+    Raises:
+        ImageSecurityError: If any validation fails
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_validation_executor(),
+        partial(
+            validate_image_full,
+            content=content,
+            declared_mime=declared_mime,
+            url=url,
+            allowed_domains=allowed_domains,
+        ),
+    )
+
+
 def get_extension_for_mime(mime_type: str) -> str:
     """
     Get file extension for a MIME type.
@@ -0,0 +1,229 @@
+"""
+LLM Metrics Flusher - Background persistence of LLMRouter metrics.
+
+LLMRouter buffers one LLMMetrics entry per call in memory. This flusher
+drains the buffer and batch-inserts into llm_usage_metrics:
+- As soon as LLM_METRICS_FLUSH_BATCH_SIZE entries are buffered
+- At least every LLM_METRICS_FLUSH_INTERVAL_SECONDS
+- Once more on shutdown (graceful stop)
+
+Failed inserts are re-queued into the (bounded) buffer, so a database
+outage drops the oldest metrics with accounting instead of growing memory.
+
+Usage:
+    flusher = LLMMetricsFlusher()
+    await flusher.start()
+    # ... later ...
+    await flusher.stop()
+"""
+
+__all__ = [
+    "LLMMetricsFlusher",
+    "get_llm_metrics_flusher",
+    "set_llm_metrics_flusher",
+]
+
+import asyncio
+import logging
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import insert
+
+from shared.config import get_settings
+from shared.llm_router import LLMMetrics, LLMRouter, Provider, get_llm_router
+
+logger = logging.getLogger(__name__)
+
+TOKENS_PER_MILLION = Decimal("1000000")
+
+
+class LLMMetricsFlusher:
+    """Background task that persists LLMRouter metrics in batches."""
+
+    def __init__(self, router: LLMRouter | None = None):
+        """
+        Initialize the flusher.
+
+        Args:
+            router: Router whose buffer is drained (defaults to the singleton)
+        """
+        self.router = router or get_llm_router()
+        self.settings = get_settings()
+        self._flush_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self.flushed_total = 0
+        self._unpriced_models: set[str] = set()
+        self.failed_flushes = 0
+
+    async def start(self) -> None:
+        """Start the background flush loop."""
+        if self._running:
+            logger.warning("LLMMetricsFlusher already running")
+            return
+
+        self._running = True
+        self.router.attach_flush_event(self._flush_event)
+        self._task = asyncio.create_task(self._run(), name="llm_metrics_flusher")
+        for model in sorted(self.router.get_cloud_models()):
+            self._check_model_priced(model)
+        logger.info(
+            f"LLMMetricsFlusher started | batch_size={self.settings.LLM_METRICS_FLUSH_BATCH_SIZE}, "
+            f"interval={self.settings.LLM_METRICS_FLUSH_INTERVAL_SECONDS}s"
+        )
+
+    async def stop(self) -> None:
+        """Stop the loop and flush whatever is still buffered."""
+        if not self._running:
+            return
+
+        self._running = False
+        self.router.attach_flush_event(None)
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        # Final flush so a graceful shutdown does not lose buffered metrics
+        while self.router.get_metrics_buffer_stats()["buffered"] > 0:
+            if not await self.flush():
+                break
+
+        logger.info(
+            "LLMMetricsFlusher stopped",
+            extra={"metric_type": "llm_metrics_flush", **self.get_stats()},
+        )
+
+    async def _run(self) -> None:
+        """Flush on batch-size signal or interval, whichever comes first."""
+        interval = self.settings.LLM_METRICS_FLUSH_INTERVAL_SECONDS
+        while self._running:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+
+            # Drain in batches (buffer may hold several after a DB outage)
+            while self.router.get_metrics_buffer_stats()["buffered"] > 0:
+                if not await self.flush():
+                    break
+
+    async def flush(self) -> bool:
+        """
+        Persist one batch of buffered metrics.
+
+        Returns:
+            True if the batch was written (or nothing to write), False on failure
+        """
+        batch = self.router.get_pending_metrics(
+            max_items=self.settings.LLM_METRICS_FLUSH_BATCH_SIZE
+        )
+        if not batch:
+            return True
+
+        try:
+            from database.connection import get_async_session
+            from database.models import LLMUsageMetric
+
+            async with get_async_session() as session:
+                await session.execute(
+                    insert(LLMUsageMetric),
+                    [self._to_row(m) for m in batch],
+                )
+                await session.commit()
+        except asyncio.CancelledError:
+            # Stopped mid-insert: keep the batch for the final flush
+            self.router.requeue_metrics(batch)
+            raise
+        except Exception as e:
+            self.failed_flushes += 1
+            self.router.requeue_metrics(batch)
+            logger.error(
+                f"Failed to flush {len(batch)} LLM metrics, re-queued: {e}",
+                extra={"metric_type": "llm_metrics_flush", "batch_size": len(batch)},
+            )
+            return False
+
+        self.flushed_total += len(batch)
+        logger.debug(
+            f"Flushed {len(batch)} LLM metrics",
+            extra={"metric_type": "llm_metrics_flush", "batch_size": len(batch)},
+        )
+        return True
+
+    def _to_row(self, metrics: LLMMetrics) -> dict[str, Any]:
+        """Convert an LLMMetrics entry into an llm_usage_metrics row."""
+        return {
+            "task_type": metrics.task_type.value,
+            "tier": metrics.tier.value,
+            "provider": metrics.provider.value,
+            "model": metrics.model,
+            "latency_ms": metrics.latency_ms,
+            "input_tokens": metrics.input_tokens,
+            "output_tokens": metrics.output_tokens,
+            "success": metrics.success,
+            "error": metrics.error,
+            "fallback_used": metrics.fallback_used,
+            "original_tier": metrics.original_tier.value if metrics.original_tier else None,
+            "estimated_cost_usd": self._estimate_cost(metrics),
+            "conversation_id": metrics.conversation_id,
+        }
+
+    def _estimate_cost(self, metrics: LLMMetrics) -> Decimal | None:
+        """
+        Estimate cloud cost in USD from token counts and the model's price.
+
+        Local calls are free; models without an LLM_MODEL_PRICES_USD entry
+        get None rather than a guess.
+        """
+        if metrics.provider != Provider.OPENROUTER:
+            return None
+        if metrics.input_tokens is None and metrics.output_tokens is None:
+            return None
+        if not self._check_model_priced(metrics.model):
+            return None
+        prices = self.settings.LLM_MODEL_PRICES_USD[metrics.model]
+        input_price, output_price = prices
+        return (
+            Decimal(metrics.input_tokens or 0) * input_price
+            + Decimal(metrics.output_tokens or 0) * output_price
+        ) / TOKENS_PER_MILLION
+
+    def _check_model_priced(self, model: str) -> bool:
+        """Whether a model has a USD price; warns once per unpriced model."""
+        if model in self.settings.LLM_MODEL_PRICES_USD:
+            return True
+        if model not in self._unpriced_models:
+            self._unpriced_models.add(model)
+            logger.warning(
+                f"No LLM_MODEL_PRICES_USD entry for {model}: its calls are stored without estimated_cost_usd",
+                extra={"metric_type": "llm_cost", "llm_model": model},
+            )
+        return False
+
+    def get_stats(self) -> dict[str, int]:
+        """Flush counters plus the router's buffer stats."""
+        buffer_stats = self.router.get_metrics_buffer_stats()
+        return {
+            "flushed_total": self.flushed_total,
+            "failed_flushes": self.failed_flushes,
+            "buffered": buffer_stats["buffered"],
+            "dropped": buffer_stats["dropped"],
+        }
+
+
+# Global instance
+_llm_metrics_flusher: LLMMetricsFlusher | None = None
+
+
+def get_llm_metrics_flusher() -> LLMMetricsFlusher | None:
+    """Get the global LLMMetricsFlusher instance."""
+    return _llm_metrics_flusher
+
+
+def set_llm_metrics_flusher(flusher: LLMMetricsFlusher | None) -> None:
+    """Set the global LLMMetricsFlusher instance."""
+    global _llm_metrics_flusher
+    _llm_metrics_flusher = flusher
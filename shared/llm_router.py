@@ -9,6 +9,10 @@ Routes LLM requests to the appropriate tier based on task type:
 Features:
 - Automatic model selection based on task type
 - Fallback chains for resilience
+- Hedged requests: a backup call is fired after a p95-derived delay and the
+  slower call is cancelled
+- Per provider/model EWMA latency tracking and circuit breakers, shared
+  across requests through the router singleton
 - Usage metrics tracking
 - Configurable via environment variables
 """
@@ -19,15 +23,22 @@ __all__ = [
     "Provider",
     "LLMResponse",
     "LLMMetrics",
+    "LatencyTracker",
+    "CircuitBreaker",
+    "CircuitState",
     "LLMRouter",
     "get_llm_router",
 ]
 
+import asyncio
 import logging
+import math
 import time
+from collections import deque
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import Any, TypeVar
 
 import httpx
 
@@ -35,6 +46,8 @@ from shared.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class TaskType(Enum):
     """Types of LLM tasks for routing decisions."""
@@ -90,6 +103,7 @@ class LLMMetrics:
     error: str | None = None
     fallback_used: bool = False
     original_tier: ModelTier | None = None
+    conversation_id: str | None = None
 
 
 # Task type to default tier mapping
@@ -113,6 +127,110 @@ FALLBACK_CHAIN: dict[ModelTier, ModelTier | None] = {
 }
 
 
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"          # Healthy, requests flow normally
+    OPEN = "open"              # Failing, requests are skipped
+    HALF_OPEN = "half_open"    # Cooling period over, next request is a probe
+
+
+# z-score for the 95th percentile of a normal distribution
+P95_Z_SCORE = 1.645
+
+
+@dataclass
+class LatencyTracker:
+    """
+    Exponentially-weighted moving average of latency for one provider/model.
+
+    Tracks both mean and variance so a p95 estimate (mean + 1.645 * stddev)
+    can be derived without keeping a window of samples.
+    """
+    alpha: float = 0.2
+    min_samples: int = 5
+    mean_ms: float = 0.0
+    variance_ms: float = 0.0
+    samples: int = 0
+
+    def record(self, latency_ms: float) -> None:
+        """Add a latency sample (successful calls only)."""
+        if self.samples == 0:
+            self.mean_ms = latency_ms
+            self.variance_ms = 0.0
+        else:
+            diff = latency_ms - self.mean_ms
+            self.mean_ms += self.alpha * diff
+            self.variance_ms = (1 - self.alpha) * (self.variance_ms + self.alpha * diff * diff)
+        self.samples += 1
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether enough samples were seen for the estimate to be useful."""
+        return self.samples >= self.min_samples
+
+    @property
+    def p95_ms(self) -> float:
+        """Estimated 95th percentile latency."""
+        return self.mean_ms + P95_Z_SCORE * math.sqrt(self.variance_ms)
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one provider/model.
+
+    After `failure_threshold` consecutive failures the circuit opens and the
+    provider is skipped for `reset_timeout` seconds. Then one probe request
+    is allowed (half-open): success closes the circuit, failure re-opens it.
+    Other callers are refused while the probe is in flight; a probe that
+    never reports back (cancelled) is given up after `reset_timeout`.
+    """
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+    probe_started_at: float = 0.0
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent to this provider."""
+        if self.state == CircuitState.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == CircuitState.OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+        if self.probe_in_flight and now - self.probe_started_at < self.reset_timeout:
+            return False
+        self.probe_in_flight = True
+        self.probe_started_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure and open the circuit if the threshold is reached."""
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != CircuitState.OPEN:
+                logger.warning(
+                    f"LLM circuit opened after {self.consecutive_failures} consecutive failures",
+                    extra={"metric_type": "llm_circuit_breaker", "circuit_state": "open"},
+                )
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+
 class LLMRouter:
     """
     Centralized router for hybrid LLM architecture.
@@ -123,7 +241,186 @@ class LLMRouter:
 
     def __init__(self):
         self.settings = get_settings()
-        self._metrics_buffer: list[LLMMetrics] = []
+        # Bounded: if the flusher falls behind (DB down) the oldest entries
+        # are dropped and counted instead of growing without limit
+        self._metrics_buffer: deque[LLMMetrics] = deque()
+        self._metrics_dropped = 0
+        self._flush_event: asyncio.Event | None = None
+        # Keyed by "provider:model"; shared by every caller of the singleton
+        self._latency: dict[str, LatencyTracker] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    @staticmethod
+    def provider_key(provider: Provider, model: str) -> str:
+        """Build the key used for latency tracking and circuit breakers."""
+        return f"{provider.value}:{model}"
+
+    def get_latency_tracker(self, key: str) -> LatencyTracker:
+        """Get (or create) the latency tracker for a provider/model key."""
+        tracker = self._latency.get(key)
+        if tracker is None:
+            tracker = LatencyTracker(alpha=self.settings.LLM_LATENCY_EWMA_ALPHA)
+            self._latency[key] = tracker
+        return tracker
+
+    def get_circuit_breaker(self, key: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker for a provider/model key."""
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=self.settings.LLM_CIRCUIT_RESET_SECONDS,
+            )
+            self._breakers[key] = breaker
+        return breaker
+
+    def record_call_result(self, key: str, latency_ms: float, success: bool) -> None:
+        """Feed a call outcome into the latency tracker and circuit breaker."""
+        breaker = self.get_circuit_breaker(key)
+        if success:
+            self.get_latency_tracker(key).record(latency_ms)
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def get_hedge_delay(self, key: str) -> float:
+        """
+        Seconds to wait for the primary before firing the backup request.
+
+        Uses the primary's p95 latency, clamped to the configured bounds.
+        Until the tracker is warm, the maximum delay is used so a cold
+        start never hedges aggressively.
+        """
+        min_delay = self.settings.LLM_HEDGE_MIN_DELAY_SECONDS
+        max_delay = self.settings.LLM_HEDGE_MAX_DELAY_SECONDS
+        tracker = self.get_latency_tracker(key)
+        if not tracker.is_warm:
+            return max_delay
+        return min(max_delay, max(min_delay, tracker.p95_ms / 1000))
+
+    def get_provider_stats(self) -> dict[str, dict[str, Any]]:
+        """Latency and circuit state per provider/model (for monitoring)."""
+        stats: dict[str, dict[str, Any]] = {}
+        for key in set(self._latency) | set(self._breakers):
+            tracker = self.get_latency_tracker(key)
+            breaker = self.get_circuit_breaker(key)
+            stats[key] = {
+                "ewma_latency_ms": round(tracker.mean_ms, 1),
+                "p95_latency_ms": round(tracker.p95_ms, 1),
+                "samples": tracker.samples,
+                "circuit_state": breaker.state.value,
+                "consecutive_failures": breaker.consecutive_failures,
+            }
+        return stats
+
+    async def _timed_call(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run a call and record its outcome for `key` (cancellation is not recorded)."""
+        start = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.record_call_result(key, (time.monotonic() - start) * 1000, success=False)
+            raise
+        self.record_call_result(key, (time.monotonic() - start) * 1000, success=True)
+        return result
+
+    async def hedged_call(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        primary_key: str,
+        backup: Callable[[], Awaitable[T]] | None = None,
+        backup_key: str | None = None,
+    ) -> tuple[T, str]:
+        """
+        Run `primary`, firing `backup` if it is slow or failing.
+
+        - If the primary's circuit is open, the backup is called directly.
+        - Otherwise the backup is started after get_hedge_delay() seconds
+          (or immediately if the primary fails) and the first successful
+          result wins; the other call is cancelled.
+        - If every attempted call fails, the primary's error is raised.
+
+        Only use this for side-effect-free calls (LLM completions).
+
+        Args:
+            primary: Zero-arg coroutine factory for the preferred provider
+            primary_key: provider_key() of the primary
+            backup: Optional coroutine factory for the backup provider
+            backup_key: provider_key() of the backup
+
+        Returns:
+            Tuple of (result, key of the provider that produced it)
+        """
+        hedging_enabled = self.settings.LLM_HEDGING_ENABLED
+        backup_allowed = (
+            backup is not None
+            and backup_key is not None
+            and self.get_circuit_breaker(backup_key).allow_request()
+        )
+
+        if not self.get_circuit_breaker(primary_key).allow_request() and backup_allowed:
+            logger.info(
+                f"LLM circuit open for {primary_key}, routing to {backup_key}",
+                extra={"metric_type": "llm_hedge", "hedge_outcome": "circuit_open"},
+            )
+            try:
+                return await self._timed_call(backup_key, backup), backup_key
+            except Exception:
+                # Backup failed too - give the primary a chance anyway
+                return await self._timed_call(primary_key, primary), primary_key
+
+        tasks: dict[asyncio.Task, str] = {
+            asyncio.create_task(self._timed_call(primary_key, primary)): primary_key,
+        }
+        primary_error: BaseException | None = None
+        hedge_delay = self.get_hedge_delay(primary_key)
+        backup_started = False
+
+        try:
+            while tasks:
+                # Wait for the primary until the hedge delay, then for any task
+                timeout = (
+                    hedge_delay
+                    if backup_allowed and hedging_enabled and not backup_started
+                    else None
+                )
+                done, _ = await asyncio.wait(
+                    tasks.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    key = tasks.pop(task)
+                    if task.exception() is None:
+                        if backup_started:
+                            logger.info(
+                                f"Hedged LLM request won by {key}",
+                                extra={
+                                    "metric_type": "llm_hedge",
+                                    "hedge_outcome": "primary_won" if key == primary_key else "backup_won",
+                                    "hedge_delay_ms": int(hedge_delay * 1000),
+                                },
+                            )
+                        return task.result(), key
+                    if key == primary_key:
+                        primary_error = task.exception()
+
+                # Start the backup on slow primary (timeout) or failed primary
+                if backup_allowed and not backup_started and (not done or primary_error):
+                    backup_started = True
+                    logger.info(
+                        f"Firing backup LLM request {backup_key} "
+                        f"({'primary failed' if done else f'primary slower than {hedge_delay:.1f}s'})",
+                        extra={"metric_type": "llm_hedge", "hedge_outcome": "backup_fired"},
+                    )
+                    tasks[asyncio.create_task(self._timed_call(backup_key, backup))] = backup_key
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # Every attempted call failed
+        raise primary_error or RuntimeError("All hedged LLM calls failed")
 
     def _get_tier_config(self, tier: ModelTier) -> tuple[Provider, str]:
         """Get provider and model for a tier."""
@@ -135,6 +432,14 @@ class LLMRouter:
         }
         return configs.get(tier, (Provider.OPENROUTER, self.settings.LLM_MODEL))
 
+    def get_cloud_models(self) -> set[str]:
+        """OpenRouter model ids this router may call (for cost accounting)."""
+        return {
+            model
+            for provider, model in map(self._get_tier_config, ModelTier)
+            if provider == Provider.OPENROUTER
+        }
+
     async def invoke(
         self,
         task_type: TaskType,
@@ -174,6 +479,26 @@ class LLMRouter:
 
         original_tier = tier
         provider, model = self._get_tier_config(tier)
+        breaker_key = self.provider_key(provider, model)
+
+        # Skip a tier whose circuit is open (failing fast) if a fallback exists
+        fallback_tier = FALLBACK_CHAIN.get(tier)
+        if (
+            not disable_fallback
+            and fallback_tier
+            and fallback_tier != tier
+            and not self.get_circuit_breaker(breaker_key).allow_request()
+        ):
+            logger.info(f"Circuit open for {breaker_key}, routing to {fallback_tier.value}")
+            return await self.invoke(
+                task_type=task_type,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+                force_tier=fallback_tier,
+                disable_fallback=True,
+            )
 
         logger.debug(
             f"LLM Router: task={task_type.value}, tier={tier.value}, "
@@ -193,6 +518,7 @@ class LLMRouter:
                 )
 
             latency_ms = int((time.time() - start_time) * 1000)
+            self.record_call_result(breaker_key, latency_ms, success=True)
 
             # Track metrics
             self._record_metrics(LLMMetrics(
@@ -219,6 +545,7 @@ class LLMRouter:
         except Exception as e:
             latency_ms = int((time.time() - start_time) * 1000)
             error_msg = str(e)
+            self.record_call_result(breaker_key, latency_ms, success=False)
 
             logger.warning(
                 f"LLM call failed: tier={tier.value}, provider={provider.value}, "
@@ -240,7 +567,6 @@ class LLMRouter:
 
             # Try fallback
             if not disable_fallback:
-                fallback_tier = FALLBACK_CHAIN.get(tier)
                 if fallback_tier and fallback_tier != tier:
                     logger.info(f"Attempting fallback: {tier.value} -> {fallback_tier.value}")
                     return await self.invoke(
@@ -334,8 +660,9 @@ class LLMRouter:
             }
 
     def _record_metrics(self, metrics: LLMMetrics) -> None:
-        """Buffer metrics for batch processing."""
-        self._metrics_buffer.append(metrics)
+        """Buffer metrics for batch persistence by LLMMetricsFlusher."""
+        if self.settings.ENABLE_LLM_METRICS:
+            self._buffer_metrics([metrics])
 
         # Log metrics
         logger.info(
@@ -354,11 +681,76 @@ class LLMRouter:
             }
         )
 
-    def get_pending_metrics(self) -> list[LLMMetrics]:
-        """Get and clear pending metrics for batch persistence."""
-        metrics = self._metrics_buffer.copy()
-        self._metrics_buffer.clear()
-        return metrics
+    def record_metrics(self, metrics: LLMMetrics) -> None:
+        """
+        Record metrics for an LLM call made outside invoke().
+
+        Used by callers that talk to the provider directly (e.g. the
+        conversational agent's LangChain client) so their calls show up
+        in /llm-metrics too.
+        """
+        self._record_metrics(metrics)
+
+    def _buffer_metrics(self, metrics: list[LLMMetrics], front: bool = False) -> None:
+        """
+        Add metrics to the bounded buffer, dropping the oldest on overflow.
+
+        Args:
+            metrics: Metrics to add
+            front: Re-queue at the front (used when a flush fails)
+        """
+        max_size = self.settings.LLM_METRICS_BUFFER_MAX_SIZE
+        if front:
+            self._metrics_buffer.extendleft(reversed(metrics))
+        else:
+            self._metrics_buffer.extend(metrics)
+
+        overflow = len(self._metrics_buffer) - max_size
+        if overflow > 0:
+            for _ in range(overflow):
+                self._metrics_buffer.popleft()
+            self._metrics_dropped += overflow
+            logger.warning(
+                f"LLM metrics buffer full, dropped {overflow} oldest entries "
+                f"(total dropped: {self._metrics_dropped})",
+                extra={
+                    "metric_type": "llm_metrics_buffer",
+                    "dropped": overflow,
+                    "total_dropped": self._metrics_dropped,
+                },
+            )
+
+        if (
+            self._flush_event is not None
+            and len(self._metrics_buffer) >= self.settings.LLM_METRICS_FLUSH_BATCH_SIZE
+        ):
+            self._flush_event.set()
+
+    def requeue_metrics(self, metrics: list[LLMMetrics]) -> None:
+        """Put back metrics whose persistence failed (still bounded)."""
+        self._buffer_metrics(metrics, front=True)
+
+    def attach_flush_event(self, event: asyncio.Event | None) -> None:
+        """Register the event set when the buffer reaches the flush batch size."""
+        self._flush_event = event
+
+    def get_pending_metrics(self, max_items: int | None = None) -> list[LLMMetrics]:
+        """
+        Get and clear pending metrics for batch persistence.
+
+        Args:
+            max_items: Maximum number of entries to drain (all if None)
+        """
+        count = len(self._metrics_buffer) if max_items is None else min(max_items, len(self._metrics_buffer))
+        return [self._metrics_buffer.popleft() for _ in range(count)]
+
+    def get_metrics_buffer_stats(self) -> dict[str, int]:
+        """Buffered and dropped metric counts (for monitoring)."""
+        return {
+            "buffered": len(self._metrics_buffer),
+            "dropped": self._metrics_dropped,
+            "max_size": self.settings.LLM_METRICS_BUFFER_MAX_SIZE,
+        }
 
     async def health_check(self) -> dict[str, Any]:
         """Check health of all LLM providers."""
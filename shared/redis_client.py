@@ -11,6 +11,7 @@ Supports two messaging modes:
 
 import json
 import logging
+import time
 from datetime import datetime, UTC
 from functools import lru_cache
 from typing import Any
@@ -38,6 +39,8 @@ class RedisServiceError(Exception):
 INCOMING_STREAM = "incoming_messages_stream"
 OUTGOING_STREAM = "outgoing_messages_stream"
 CONSUMER_GROUP = "agent_workers"
+OUTGOING_CONSUMER_GROUP = "outgoing_senders"
+OUTGOING_CHANNEL = "outgoing_messages"  # Legacy pub/sub channel
 DEAD_LETTER_STREAM = "dead_letter_stream"
 STREAM_MAX_LEN = 10000  # Approximate trim to keep stream bounded
 
@@ -201,6 +204,32 @@ async def add_to_stream(
         ) from e
 
 
+async def publish_outgoing_message(message: dict[str, Any]) -> str | None:
+    """
+    Queue a reply for delivery to the customer via Chatwoot.
+
+    With USE_REDIS_STREAMS the message is added to OUTGOING_STREAM (kept
+    until a sender acknowledges it) and stamped with `published_at` for
+    delivery-latency metrics; otherwise it is published on the legacy
+    outgoing_messages pub/sub channel.
+
+    Args:
+        message: Outgoing payload (conversation_id, customer_phone, message,
+            optional pending_images)
+
+    Returns:
+        Stream message ID, or None in pub/sub mode
+
+    Raises:
+        RedisServiceError: 503 if Redis connection fails
+    """
+    if get_settings().USE_REDIS_STREAMS:
+        return await add_to_stream(OUTGOING_STREAM, {**message, "published_at": time.time()})
+
+    await publish_to_channel(OUTGOING_CHANNEL, message)
+    return None
+
+
 async def create_consumer_group(
     stream: str,
     group: str,
@@ -247,6 +276,30 @@ async def create_consumer_group(
         ) from e
 
 
+def _parse_stream_entries(entries: list[Any]) -> list[tuple[str, dict[str, Any]]]:
+    """Decode the JSON `data` field of raw (id, fields) stream entries."""
+    result: list[tuple[str, dict[str, Any]]] = []
+    for msg_id, msg_data in entries:
+        if msg_data is None:
+            # Entry trimmed from the stream while pending
+            continue
+
+        data_key = b"data" if b"data" in msg_data else "data"
+        raw_data = msg_data.get(data_key, "{}")
+
+        if isinstance(raw_data, bytes):
+            raw_data = raw_data.decode("utf-8")
+
+        try:
+            parsed_data = json.loads(raw_data)
+        except json.JSONDecodeError:
+            logger.warning(f"Invalid JSON in message {msg_id}: {raw_data[:100]}")
+            parsed_data = {"_raw": raw_data, "_parse_error": True}
+
+        result.append((msg_id, parsed_data))
+    return result
+
+
 async def read_from_stream(
     stream: str,
     group: str,
@@ -282,20 +335,7 @@ async def read_from_stream(
 
         if messages:
             for stream_name, stream_messages in messages:
-                for msg_id, msg_data in stream_messages:
-                    data_key = b"data" if b"data" in msg_data else "data"
-                    raw_data = msg_data.get(data_key, "{}")
-
-                    if isinstance(raw_data, bytes):
-                        raw_data = raw_data.decode("utf-8")
-
-                    try:
-                        parsed_data = json.loads(raw_data)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid JSON in message {msg_id}: {raw_data[:100]}")
-                        parsed_data = {"_raw": raw_data, "_parse_error": True}
-
-                    result.append((msg_id, parsed_data))
+                result.extend(_parse_stream_entries(stream_messages))
 
         if result:
             logger.debug(
@@ -327,6 +367,107 @@ async def read_from_stream(
         ) from e
 
 
+async def claim_stale_messages(
+    stream: str,
+    group: str,
+    consumer: str,
+    min_idle_ms: int,
+    count: int = 50,
+) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Take over messages left unacknowledged by other consumers (XAUTOCLAIM).
+
+    Used to recover messages whose consumer died or gave up without ACK.
+
+    Args:
+        stream: Name of the Redis Stream
+        group: Name of the consumer group
+        consumer: Consumer that takes ownership
+        min_idle_ms: Only claim messages pending for at least this long
+        count: Maximum number of messages to claim
+
+    Returns:
+        List of tuples: [(message_id, message_data), ...]
+    """
+    client = get_redis_client()
+
+    try:
+        response = await client.xautoclaim(
+            stream,
+            group,
+            consumer,
+            min_idle_time=min_idle_ms,
+            start_id="0-0",
+            count=count,
+        )
+        result = _parse_stream_entries(response[1] if response else [])
+
+        if result:
+            logger.info(
+                f"Claimed {len(result)} stale messages from stream '{stream}' "
+                f"(consumer={consumer})"
+            )
+        return result
+
+    except RedisConnectionError as e:
+        logger.error(f"Redis connection error claiming from stream '{stream}': {e}")
+        raise RedisServiceError(
+            message=f"Redis connection failed: {e}",
+            status_code=503,
+        ) from e
+
+    except RedisResponseError as e:
+        if "NOGROUP" in str(e):
+            await create_consumer_group(stream, group)
+            return []
+        raise
+
+
+async def refresh_pending_messages(
+    stream: str,
+    group: str,
+    consumer: str,
+    message_ids: list[str],
+) -> int:
+    """
+    Reset the idle time of messages this consumer is still processing.
+
+    XCLAIM with JUSTID to the same consumer, so slow work in progress is
+    not taken over by claim_stale_messages() in another process.
+
+    Args:
+        stream: Name of the Redis Stream
+        group: Name of the consumer group
+        consumer: Consumer that owns the messages
+        message_ids: IDs of the messages in progress
+
+    Returns:
+        Number of messages still pending
+    """
+    if not message_ids:
+        return 0
+
+    client = get_redis_client()
+
+    try:
+        refreshed = await client.xclaim(
+            stream,
+            group,
+            consumer,
+            min_idle_time=0,
+            message_ids=message_ids,
+            justid=True,
+        )
+        return len(refreshed)
+
+    except RedisConnectionError as e:
+        logger.error(f"Redis connection error refreshing pending messages in '{stream}': {e}")
+        raise RedisServiceError(
+            message=f"Redis connection failed: {e}",
+            status_code=503,
+        ) from e
+
+
 async def acknowledge_message(
     stream: str,
     group: str,
@@ -79,6 +79,28 @@ class RedisKeys:
         """Embedding cache for content."""
         return f"emb:{content_hash}"
 
+    # Chatwoot ID cache
+    @staticmethod
+    def chatwoot_contact_by_phone(phone: str) -> str:
+        """Chatwoot contact id for a phone number."""
+        return f"chatwoot:contact:{phone}"
+
+    @staticmethod
+    def chatwoot_conversation_by_contact(contact_id: int) -> str:
+        """Chatwoot conversation id used for outgoing messages to a contact."""
+        return f"chatwoot:conversation:{contact_id}"
+
+    # Case image derivatives
+    @staticmethod
+    def case_image_derivatives_queue() -> str:
+        """Stored filenames waiting for thumbnail/preview generation."""
+        return "case_images:derivatives:queue"
+
+    @staticmethod
+    def case_image_derivatives_queued(stored_filename: str) -> str:
+        """Marker for an image already in the derivatives queue (dedup)."""
+        return f"case_images:derivatives:queued:{stored_filename}"
+
     # Settings cache
     @staticmethod
     def setting(key: str) -> str:
@@ -0,0 +1,133 @@
+"""
+Tests for batched ancestor chain resolution.
+
+Ancestor chains for any number of elements are resolved with one
+recursive CTE instead of one SELECT per level per element.
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from agent.services.element_service import ElementService
+
+CHILD_A, CHILD_B, PARENT, GRANDPARENT = (uuid4() for _ in range(4))
+
+
+def _service() -> ElementService:
+    service = ElementService.__new__(ElementService)
+    service._match_indexes = {}
+    return service
+
+
+def _row(root_id, elem_id, code, depth, parent_id=None, is_cycle=False):
+    return SimpleNamespace(
+        root_id=root_id,
+        id=elem_id,
+        code=code,
+        name=code.title(),
+        parent_element_id=parent_id,
+        inherit_parent_data=True,
+        depth=depth,
+        is_cycle=is_cycle,
+    )
+
+
+def _fake_session(*results):
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=list(results))
+
+    @asynccontextmanager
+    async def fake_get_async_session():
+        yield session
+
+    return session, fake_get_async_session
+
+
+def _rows_result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+class TestAncestorChainQuery:
+    """Test cases for the recursive CTE."""
+
+    def test_query_is_recursive_cte_with_cycle_guard(self):
+        sql = str(
+            ElementService._build_ancestor_chain_query([str(CHILD_A)], 10)
+            .compile(dialect=postgresql.dialect())
+        )
+        assert sql.startswith("WITH RECURSIVE ancestor_chain")
+        assert "ANY (ancestor_chain.path)" in sql
+        assert "ancestor_chain.inherit_parent_data = true" in sql
+        assert "ORDER BY ancestor_chain.root_id, ancestor_chain.depth DESC" in sql
+
+
+class TestGetAncestorChains:
+    """Test cases for grouping CTE rows into chains."""
+
+    @pytest.mark.asyncio
+    async def test_rows_grouped_per_element_in_order(self):
+        rows = [
+            _row(CHILD_A, GRANDPARENT, "GRANDPARENT", 2),
+            _row(CHILD_A, PARENT, "PARENT", 1, parent_id=GRANDPARENT),
+            _row(CHILD_B, PARENT, "PARENT", 1, parent_id=GRANDPARENT),
+        ]
+        session, fake = _fake_session(_rows_result(rows))
+        with patch("agent.services.element_service.get_async_session", fake):
+            chains = await _service()._get_ancestor_chains(
+                [str(CHILD_A), str(CHILD_B), str(PARENT)]
+            )
+
+        session.execute.assert_awaited_once()
+        assert [a["code"] for a in chains[str(CHILD_A)]] == ["GRANDPARENT", "PARENT"]
+        assert chains[str(CHILD_A)][1]["parent_element_id"] == str(GRANDPARENT)
+        assert [a["code"] for a in chains[str(CHILD_B)]] == ["PARENT"]
+        assert chains[str(PARENT)] == []
+
+    @pytest.mark.asyncio
+    async def test_single_element_wrapper(self):
+        _, fake = _fake_session(_rows_result([_row(CHILD_A, PARENT, "PARENT", 1)]))
+        with patch("agent.services.element_service.get_async_session", fake):
+            chain = await _service()._get_ancestor_chain(CHILD_A)
+        assert [a["id"] for a in chain] == [str(PARENT)]
+
+
+class TestWarningsForElements:
+    """Test cases for batched inherited warnings."""
+
+    @pytest.mark.asyncio
+    async def test_two_round_trips_regardless_of_element_count(self):
+        def assoc(element_id, code):
+            warning = SimpleNamespace(
+                id=uuid4(), code=code, message=code, severity="warning", is_active=True
+            )
+            return SimpleNamespace(
+                element_id=element_id, warning=warning,
+                show_condition="always", threshold_quantity=None,
+            )
+
+        chain_rows = [
+            _row(CHILD_A, PARENT, "PARENT", 1),
+            _row(CHILD_B, PARENT, "PARENT", 1),
+        ]
+        assocs_result = MagicMock()
+        assocs_result.unique.return_value.scalars.return_value.all.return_value = [
+            assoc(CHILD_A, "OWN_A"),
+            assoc(PARENT, "INHERITED"),
+        ]
+        session, fake = _fake_session(_rows_result(chain_rows), assocs_result)
+
+        with patch("agent.services.element_service.get_async_session", fake):
+            warnings = await _service().get_warnings_for_elements(
+                [str(CHILD_A), str(CHILD_B)]
+            )
+
+        assert session.execute.await_count == 2
+        # Ancestor warnings first, direct warnings last
+        assert [w["code"] for w in warnings] == ["INHERITED", "OWN_A"]
@@ -0,0 +1,157 @@
+"""
+Tests for the per-turn case collection data loader.
+
+Element tools called during one agent turn share elements, required
+fields and collected values loaded once for the whole case, and
+precompiled field conditions behave like _evaluate_field_condition.
+"""
+
+import itertools
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.fsm.case_collection import CollectionStep
+from agent.services import element_required_fields_service as fields_service
+from agent.services.element_required_fields_service import (
+    CaseCollectionData,
+    begin_collection_turn,
+    compile_field_condition,
+)
+from agent.state.helpers import clear_current_state, set_current_state
+from agent.tools import element_data_tools
+
+
+def _field(key, condition_field=None, operator=None, value=None, sort_order=0, is_active=True):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        field_key=key,
+        field_label=key.title(),
+        field_type="text",
+        is_required=True,
+        is_active=is_active,
+        sort_order=sort_order,
+        options=None,
+        example_value=None,
+        llm_instruction=None,
+        validation_rules=None,
+        condition_field_id=condition_field.id if condition_field else None,
+        condition_operator=operator,
+        condition_value=value,
+    )
+
+
+class TestCompileFieldCondition:
+    """Compiled conditions must agree with _evaluate_field_condition."""
+
+    def test_matches_tool_evaluation(self):
+        base = _field("tipo")
+        values_to_try = [None, "", "Si", "si", "no", 0, False, "otro"]
+        for operator, expected in itertools.product(
+            [None, "equals", "not_equals", "exists", "not_exists", "unknown"], ["si", "No"]
+        ):
+            dependent = _field("detalle", condition_field=base, operator=operator, value=expected)
+            condition = compile_field_condition(dependent, {str(base.id): base})
+            for value in values_to_try:
+                collected = {} if value is None else {"tipo": value}
+                assert condition(collected) == element_data_tools._evaluate_field_condition(
+                    dependent, collected, [base, dependent]
+                ), (operator, expected, value)
+
+    def test_unconditional_and_dangling_conditions(self):
+        base = _field("tipo")
+        assert compile_field_condition(base, {}) is None
+        dangling = _field("detalle", condition_field=_field("borrado"), operator="equals", value="x")
+        assert compile_field_condition(dangling, {str(base.id): base})({}) is True
+
+
+class TestLoadCaseCollectionData:
+    """Test cases for ElementRequiredFieldsService.load_case_collection_data()."""
+
+    @pytest.mark.asyncio
+    async def test_two_queries_for_all_elements(self):
+        base = _field("tipo", sort_order=2)
+        dependent = _field("detalle", condition_field=base, operator="equals", value="si", sort_order=1)
+        inactive = _field("viejo", is_active=False)
+        escape = SimpleNamespace(id=uuid.uuid4(), code="ESCAPE", required_fields=[base, inactive, dependent])
+        faro = SimpleNamespace(id=uuid.uuid4(), code="FARO", required_fields=[])
+        record = SimpleNamespace(element_code="ESCAPE", field_values={"tipo": "si"})
+
+        elements_result = MagicMock()
+        elements_result.scalars.return_value.all.return_value = [escape, faro]
+        data_result = MagicMock()
+        data_result.scalars.return_value.all.return_value = [record]
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[elements_result, data_result])
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch.object(fields_service, "get_async_session", fake_session):
+            data = await fields_service.ElementRequiredFieldsService().load_case_collection_data(
+                str(uuid.uuid4()), str(uuid.uuid4()), ["ESCAPE", "FARO"],
+            )
+
+        assert session.execute.await_count == 2
+        assert set(data.elements) == {"ESCAPE", "FARO"}
+        assert [f.field_key for f in data.fields[str(escape.id)]] == ["detalle", "tipo"]
+        assert data.element_data == {"ESCAPE": record}
+        assert data.is_field_applicable(dependent, record.field_values)
+        assert not data.is_field_applicable(dependent, {})
+
+
+class TestToolsWithinTurn:
+    """Element tools reuse the preloaded data within a turn."""
+
+    @pytest.mark.asyncio
+    async def test_case_loaded_once_per_turn(self):
+        case_id, category_id = str(uuid.uuid4()), str(uuid.uuid4())
+        field = _field("descripcion")
+        element = SimpleNamespace(id=uuid.uuid4(), code="ESCAPE", name="Escape")
+        record = SimpleNamespace(element_code="ESCAPE", field_values={})
+        data = CaseCollectionData(
+            case_id=case_id,
+            category_id=category_id,
+            elements={"ESCAPE": element},
+            fields={str(element.id): [field]},
+            element_data={"ESCAPE": record},
+        )
+        state = {
+            "conversation_id": "conv-1",
+            "fsm_state": {
+                "case_collection": {
+                    "step": CollectionStep.COLLECT_ELEMENT_DATA.value,
+                    "case_id": case_id,
+                    "category_id": category_id,
+                    "element_codes": ["ESCAPE"],
+                    "current_element_index": 0,
+                    "element_phase": "data",
+                    "element_data_status": {"ESCAPE": "photos_done"},
+                }
+            },
+        }
+
+        def no_db():
+            raise AssertionError("unexpected DB access")
+
+        begin_collection_turn()
+        set_current_state(state)
+        try:
+            with patch.object(
+                fields_service.ElementRequiredFieldsService,
+                "load_case_collection_data",
+                new=AsyncMock(return_value=data),
+            ) as load, patch.object(element_data_tools, "get_async_session", no_db):
+                first = await element_data_tools.obtener_campos_elemento.ainvoke({})
+                second = await element_data_tools.obtener_campos_elemento.ainvoke({})
+        finally:
+            clear_current_state()
+            fields_service._collection_turn_cache.set(None)
+
+        load.assert_awaited_once_with(case_id, category_id, ["ESCAPE"])
+        assert first == second
+        assert [f["field_key"] for f in first["fields"]] == ["descripcion"]
@@ -0,0 +1,95 @@
+"""
+Tests for the in-process catalogue snapshot.
+
+Reads are served from memory only while subscribed to the
+catalogue_changed channel; any invalidation bumps the version so a load
+that started before the change is never stored.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.services import catalogue_snapshot
+from agent.services.catalogue_snapshot import CatalogueSnapshot, SnapshotEntry
+from agent.services.tarifa_service import TarifaService
+
+
+@pytest.fixture
+def snapshot():
+    snap = CatalogueSnapshot(ttl_seconds=60)
+    snap.set_subscribed(True)
+    with patch.object(catalogue_snapshot, "_catalogue_snapshot", snap):
+        yield snap
+
+
+class TestSnapshotEntry:
+    """Test cases for SnapshotEntry."""
+
+    def test_entry_is_immutable(self):
+        entry = SnapshotEntry(value=[1], version=0, expires_at=0.0)
+        with pytest.raises(AttributeError):
+            entry.value = [2]
+        with pytest.raises(AttributeError):
+            entry.extra = True
+
+
+class TestCatalogueSnapshot:
+    """Test cases for CatalogueSnapshot."""
+
+    def test_inactive_snapshot_never_serves(self):
+        snap = CatalogueSnapshot(ttl_seconds=60)
+        assert not snap.put("tariffs:motos-part", {"a": 1}, snap.version)
+        assert snap.get("tariffs:motos-part") is None
+
+    def test_put_and_get(self, snapshot):
+        assert snapshot.put("tariffs:motos-part", {"a": 1}, snapshot.version)
+        assert snapshot.get("tariffs:motos-part").value == {"a": 1}
+
+    def test_stale_load_not_stored(self, snapshot):
+        version = snapshot.version
+        snapshot.invalidate_all()
+        assert not snapshot.put("tariffs:motos-part", {"a": 1}, version)
+        assert snapshot.get("tariffs:motos-part") is None
+
+    def test_expired_entry_is_a_miss(self):
+        snap = CatalogueSnapshot(ttl_seconds=0)
+        snap.set_subscribed(True)
+        snap.put("tariffs:motos-part", {"a": 1}, snap.version)
+        assert snap.get("tariffs:motos-part") is None
+
+    def test_unsubscribe_drops_entries(self, snapshot):
+        snapshot.put("tariffs:motos-part", {"a": 1}, snapshot.version)
+        snapshot.set_subscribed(False)
+        snapshot.set_subscribed(True)
+        assert snapshot.get("tariffs:motos-part") is None
+
+
+class TestTarifaServiceSnapshot:
+    """Test cases for TarifaService reads through the snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_second_read_skips_redis(self, snapshot):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=json.dumps([{"slug": "motos-part"}]))
+        with patch("agent.services.tarifa_service.get_redis_client", return_value=redis):
+            service = TarifaService()
+            first = await service.get_active_categories()
+            second = await service.get_active_categories()
+
+        assert first == second == [{"slug": "motos-part"}]
+        redis.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_cache_clears_snapshot(self, snapshot):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=json.dumps([{"slug": "motos-part"}]))
+        redis.delete = AsyncMock()
+        with patch("agent.services.tarifa_service.get_redis_client", return_value=redis):
+            service = TarifaService()
+            await service.get_active_categories()
+            await service.invalidate_cache("motos-part")
+            await service.get_active_categories()
+
+        assert redis.get.await_count == 2
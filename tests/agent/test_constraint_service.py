@@ -0,0 +1,188 @@
+"""
+Tests for response constraint compilation, validation and caching.
+
+Constraints are compiled once when loaded; validate_response only runs
+precompiled patterns and gives the same verdicts as the raw-string scan.
+Sets are shared through Redis under a version bumped on every admin change.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from agent.services import constraint_service
+from agent.services.constraint_service import (
+    ConstraintSet,
+    compile_constraints,
+    validate_response,
+)
+from api.routes.constraints import ConstraintCreate, ConstraintUpdate
+
+
+def _constraint(constraint_type, pattern, tools, priority=0):
+    return {
+        "constraint_type": constraint_type,
+        "detection_pattern": pattern,
+        "required_tool": tools,
+        "error_injection": f"fix {constraint_type}",
+        "priority": priority,
+    }
+
+
+CONSTRAINTS = [
+    _constraint("price_requires_tool", r"\d+\s*(?:€|euros?)", "calcular_tarifa_con_elementos | select_tariff", 10),
+    _constraint("docs_requires_tool", r"documentaci[oó]n", "obtener_documentacion_elemento", 5),
+]
+
+
+class TestCompileConstraints:
+    """Test cases for compile_constraints()."""
+
+    def test_compiles_patterns_and_tool_sets(self):
+        compiled = compile_constraints(CONSTRAINTS)
+
+        assert len(compiled) == 2
+        first = next(iter(compiled))
+        assert first["pattern"].search("cuesta 410 EUROS")
+        assert first["required_tools"] == frozenset({"calcular_tarifa_con_elementos", "select_tariff"})
+        assert compiled.prefilter is not None
+
+    def test_invalid_pattern_rejected_at_load(self):
+        compiled = compile_constraints([_constraint("broken", r"(unclosed", "x"), *CONSTRAINTS])
+        assert [c["constraint_type"] for c in compiled] == ["price_requires_tool", "docs_requires_tool"]
+
+    def test_backreferences_disable_prefilter(self):
+        compiled = compile_constraints([_constraint("repeat", r"(\w+) \1", "x")])
+        assert compiled.prefilter is None
+        assert [c["constraint_type"] for c in compiled.matching("muy muy caro")] == ["repeat"]
+
+    def test_matching_reports_all_hits_in_priority_order(self):
+        compiled = compile_constraints(CONSTRAINTS)
+        assert compiled.matching("hola") == []
+        hits = compiled.matching("La documentación cuesta 50€")
+        assert [c["constraint_type"] for c in hits] == ["price_requires_tool", "docs_requires_tool"]
+
+
+class TestValidateResponse:
+    """Test cases for validate_response()."""
+
+    def test_violation_returns_first_error_injection(self):
+        assert validate_response("Son 410 €", set(), compile_constraints(CONSTRAINTS)) == (
+            False, "fix price_requires_tool",
+        )
+
+    def test_required_tool_called(self):
+        assert validate_response(
+            "Son 410 €", {"select_tariff"}, compile_constraints(CONSTRAINTS)
+        ) == (True, None)
+
+    def test_plain_dicts_still_accepted(self):
+        assert validate_response("Necesitas documentación", set(), CONSTRAINTS) == (
+            False, "fix docs_requires_tool",
+        )
+
+    def test_skipped_constraint_during_case_collection(self):
+        fsm_state = {"case_collection": {"step": "collect_personal", "tariff_amount": 410}}
+        assert validate_response(
+            "Son 410 €", set(), compile_constraints(CONSTRAINTS), fsm_state=fsm_state
+        ) == (True, None)
+
+    def test_empty_set_is_valid(self):
+        assert validate_response("Son 410 €", set(), ConstraintSet()) == (True, None)
+
+
+class TestConstraintSchemas:
+    """Invalid patterns are rejected when saved from the admin panel."""
+
+    def test_create_rejects_invalid_regex(self):
+        with pytest.raises(ValidationError, match="not a valid regex"):
+            ConstraintCreate(
+                constraint_type="x", detection_pattern="[a-", required_tool="t", error_injection="e",
+            )
+
+    def test_update_rejects_invalid_regex(self):
+        with pytest.raises(ValidationError):
+            ConstraintUpdate(detection_pattern="(?P<x")
+        assert ConstraintUpdate(priority=1).detection_pattern is None
+
+
+@pytest.fixture
+def redis():
+    store: dict[str, str] = {}
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=lambda key: store.get(key))
+    client.setex = AsyncMock(side_effect=lambda key, ttl, value: store.__setitem__(key, value))
+
+    async def incr(key):
+        store[key] = str(int(store.get(key) or 0) + 1)
+        return int(store[key])
+
+    client.incr = AsyncMock(side_effect=incr)
+    client.store = store
+
+    constraint_service._constraints_cache.clear()
+    with patch.object(constraint_service, "get_redis_client", return_value=client), \
+            patch.object(constraint_service, "publish_to_channel", new=AsyncMock()) as publish:
+        client.publish = publish
+        yield client
+    constraint_service.set_listened_version(None)
+
+
+class TestSharedConstraintCache:
+    """Test cases for the versioned cross-process constraint cache."""
+
+    @pytest.mark.asyncio
+    async def test_db_loaded_once_then_served_from_redis(self, redis):
+        with patch.object(
+            constraint_service, "_load_constraints_from_db", new=AsyncMock(return_value=CONSTRAINTS)
+        ) as load:
+            first = await constraint_service.get_constraints_for_category("motos-part")
+            # Another process: empty local cache, same Redis
+            constraint_service._constraints_cache.clear()
+            second = await constraint_service.get_constraints_for_category("motos-part")
+
+        load.assert_awaited_once_with("motos-part")
+        assert json.loads(redis.store["constraints:v0:motos-part"]) == CONSTRAINTS
+        assert [c["constraint_type"] for c in second] == [c["constraint_type"] for c in first]
+
+    @pytest.mark.asyncio
+    async def test_listener_version_avoids_redis(self, redis):
+        constraint_service.set_listened_version(0)
+        with patch.object(
+            constraint_service, "_load_constraints_from_db", new=AsyncMock(return_value=CONSTRAINTS)
+        ):
+            await constraint_service.get_constraints_for_category("motos-part")
+            redis.get.reset_mock()
+            await constraint_service.get_constraints_for_category("motos-part")
+
+        redis.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_published_change_reloads_everywhere(self, redis):
+        with patch.object(
+            constraint_service, "_load_constraints_from_db", new=AsyncMock(return_value=CONSTRAINTS)
+        ) as load:
+            await constraint_service.get_constraints_for_category("motos-part")
+            assert await constraint_service.publish_constraints_changed() == 1
+            load.return_value = CONSTRAINTS[:1]
+            reloaded = await constraint_service.get_constraints_for_category("motos-part")
+
+        assert load.await_count == 2
+        assert len(reloaded) == 1
+        redis.publish.assert_awaited_once_with(
+            constraint_service.CONSTRAINTS_CHANGED_CHANNEL, {"version": 1}
+        )
+
+    @pytest.mark.asyncio
+    async def test_redis_down_falls_back_to_local_ttl_cache(self, redis):
+        redis.get.side_effect = ConnectionError("down")
+        with patch.object(
+            constraint_service, "_load_constraints_from_db", new=AsyncMock(return_value=CONSTRAINTS)
+        ) as load:
+            await constraint_service.get_constraints_for_category(None)
+            await constraint_service.get_constraints_for_category(None)
+
+        load.assert_awaited_once_with(None)
+        assert await constraint_service.publish_constraints_changed() == 1
@@ -0,0 +1,104 @@
+"""
+Tests for the precompiled element matching index.
+
+The index must give exactly the same scores as scoring every element x
+keyword pair, and must be rebuilt when the category's elements change.
+"""
+
+from agent.services.element_service import ElementMatchIndex, ElementService
+
+
+def _service() -> ElementService:
+    service = ElementService.__new__(ElementService)
+    service._match_indexes = {}
+    return service
+
+
+ELEMENTS = [
+    {
+        "id": "1",
+        "code": "ESCAPE",
+        "name": "Escape",
+        "keywords": ["escape", "silencioso", "tubo de escape"],
+        "aliases": ["colector"],
+        "parent_element_id": None,
+    },
+    {
+        "id": "2",
+        "code": "FARO_DELANTERO",
+        "name": "Faro delantero",
+        "keywords": ["faro", "faro delantero"],
+        "aliases": ["óptica"],
+        "parent_element_id": None,
+    },
+    {
+        "id": "3",
+        "code": "BOLA_REMOLQUE",
+        "name": "Bola de remolque",
+        "keywords": ["remolque", "bola de remolque"],
+        "aliases": [],
+        "parent_element_id": None,
+    },
+]
+
+
+def _match(service: ElementService, description: str, elements=ELEMENTS):
+    desc_normalized = service._normalize_text(description)
+    index = service._get_match_index("cat", elements)
+    return {
+        e["code"]: round(score, 4)
+        for e, score, _ in service._match_against_elements(
+            elements, desc_normalized.split(), desc_normalized, index=index
+        )
+    }
+
+
+class TestElementMatchIndex:
+    """Test cases for ElementMatchIndex-backed matching."""
+
+    def test_exact_and_phrase_match(self):
+        scores = _match(_service(), "quiero homologar el faro delantero")
+        # 1.0 exact "faro" + 0.8 full phrase + 0.4 trigram self-match on "faro"
+        assert scores == {"FARO_DELANTERO": 2.2}
+
+    def test_typo_matches_through_trigrams(self):
+        scores = _match(_service(), "los escapes nuevos")
+        assert "ESCAPE" in scores
+        assert scores["ESCAPE"] < 1.0
+
+    def test_alias_with_accent_matches(self):
+        scores = _match(_service(), "cambio la optica")
+        assert scores["FARO_DELANTERO"] >= 0.6
+
+    def test_no_match(self):
+        assert _match(_service(), "hola buenos dias") == {}
+
+    def test_same_result_with_and_without_cached_index(self):
+        service = _service()
+        desc = service._normalize_text("bola de remolque y escape")
+        with_index = service._match_against_elements(
+            ELEMENTS, desc.split(), desc, index=service._get_match_index("cat", ELEMENTS)
+        )
+        without_index = service._match_against_elements(ELEMENTS, desc.split(), desc)
+        assert [(e["code"], s) for e, s, _ in with_index] == [(e["code"], s) for e, s, _ in without_index]
+
+
+class TestMatchIndexCache:
+    """Test cases for per-category index reuse and rebuild."""
+
+    def test_index_reused_for_same_elements(self):
+        service = _service()
+        first = service._get_match_index("cat", ELEMENTS)
+        assert service._get_match_index("cat", [dict(e) for e in ELEMENTS]) is first
+
+    def test_index_rebuilt_when_keywords_change(self):
+        service = _service()
+        first = service._get_match_index("cat", ELEMENTS)
+        changed = [dict(e) for e in ELEMENTS]
+        changed[0] = {**changed[0], "keywords": ["escape", "catalizador"]}
+        assert service._get_match_index("cat", changed) is not first
+        assert "ESCAPE" in _match(service, "cambiar catalizador", changed)
+
+    def test_signature_ignores_unrelated_fields(self):
+        renamed = [{**e, "name": e["name"].upper()} for e in ELEMENTS]
+        assert ElementMatchIndex.build_signature(renamed) == ElementMatchIndex.build_signature(ELEMENTS)
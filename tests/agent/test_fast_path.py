@@ -0,0 +1,126 @@
+"""
+Tests for the rule-based fast path.
+
+Ensures that only high-confidence, phase-appropriate messages are
+classified for the fast path, and that everything else falls through
+to the LLM.
+"""
+
+import pytest
+
+from agent.fsm.case_collection import (
+    CollectionStep,
+    create_initial_fsm_state,
+)
+from agent.graphs.conversation_flow import should_continue_after_fast_path
+from agent.nodes.fast_path import (
+    INTENT_GRATITUDE,
+    INTENT_GREETING,
+    INTENT_PHOTOS_DONE,
+    INTENT_REJECT_PENDING_ACTION,
+    classify_fast_path_intent,
+)
+
+
+def _state(
+    message: str,
+    step: CollectionStep = CollectionStep.IDLE,
+    element_phase: str = "photos",
+    **extra,
+) -> dict:
+    case_state = create_initial_fsm_state()
+    case_state["step"] = step.value
+    case_state["element_phase"] = element_phase
+    state = {
+        "conversation_id": "test-conv",
+        "user_message": message,
+        "fsm_state": {"case_collection": case_state},
+    }
+    state.update(extra)
+    return state
+
+
+class TestClassifyIdle:
+    """Greetings and thanks are only handled outside of case collection."""
+
+    @pytest.mark.parametrize("message", ["hola", "Hola!", "Buenos días", "buenas tardes 👋"])
+    def test_greeting(self, message):
+        assert classify_fast_path_intent(_state(message)) == INTENT_GREETING
+
+    @pytest.mark.parametrize("message", ["gracias", "Muchas gracias!!", "ok, gracias"])
+    def test_gratitude(self, message):
+        assert classify_fast_path_intent(_state(message)) == INTENT_GRATITUDE
+
+    def test_gratitude_after_completed_case(self):
+        state = _state("gracias", step=CollectionStep.COMPLETED)
+        assert classify_fast_path_intent(state) == INTENT_GRATITUDE
+
+    @pytest.mark.parametrize("message", [
+        "hola, quiero homologar el escape",
+        "hola?",
+        "cuánto cuesta homologar una bola de remolque",
+        "",
+    ])
+    def test_non_trivial_messages_go_to_llm(self, message):
+        assert classify_fast_path_intent(_state(message)) is None
+
+    def test_attachments_go_to_llm(self):
+        state = _state("hola", incoming_attachments=[{"id": 1, "file_type": "image"}])
+        assert classify_fast_path_intent(state) is None
+
+    def test_pending_variants_go_to_llm(self):
+        state = _state("gracias", pending_variants=[{"code": "X"}])
+        assert classify_fast_path_intent(state) is None
+
+    def test_greeting_during_collection_goes_to_llm(self):
+        state = _state("hola", step=CollectionStep.COLLECT_PERSONAL)
+        assert classify_fast_path_intent(state) is None
+
+
+class TestClassifyPendingAction:
+    """Pending-action rejections are handled, confirmations are not."""
+
+    def test_rejection(self):
+        state = _state("no gracias", pending_action="iniciar_expediente")
+        assert classify_fast_path_intent(state) == INTENT_REJECT_PENDING_ACTION
+
+    def test_confirmation_goes_to_llm(self):
+        state = _state("dale", pending_action="iniciar_expediente")
+        assert classify_fast_path_intent(state) is None
+
+    def test_greeting_with_pending_action_goes_to_llm(self):
+        state = _state("hola", pending_action="iniciar_expediente")
+        assert classify_fast_path_intent(state) is None
+
+
+class TestClassifyPhotosDone:
+    """'listo' is only handled in the photos phase of element collection."""
+
+    @pytest.mark.parametrize("message", ["listo", "Listo!", "ya está", "hecho"])
+    def test_photos_done(self, message):
+        state = _state(message, step=CollectionStep.COLLECT_ELEMENT_DATA)
+        assert classify_fast_path_intent(state) == INTENT_PHOTOS_DONE
+
+    def test_data_phase_goes_to_llm(self):
+        state = _state("listo", step=CollectionStep.COLLECT_ELEMENT_DATA, element_phase="data")
+        assert classify_fast_path_intent(state) is None
+
+    def test_loose_prefix_goes_to_llm(self):
+        state = _state("ya voy", step=CollectionStep.COLLECT_ELEMENT_DATA)
+        assert classify_fast_path_intent(state) is None
+
+    def test_base_docs_goes_to_llm(self):
+        state = _state("listo", step=CollectionStep.COLLECT_BASE_DOCS)
+        assert classify_fast_path_intent(state) is None
+
+
+class TestRouting:
+    """Test cases for should_continue_after_fast_path()."""
+
+    def test_handled_ends(self):
+        from langgraph.graph import END
+
+        assert should_continue_after_fast_path({"fast_path_handled": True}) == END
+
+    def test_not_handled_goes_to_agent(self):
+        assert should_continue_after_fast_path({"fast_path_handled": False}) == "conversational_agent"
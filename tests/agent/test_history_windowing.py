@@ -0,0 +1,127 @@
+"""
+Tests for token-budgeted conversation history windowing.
+
+Ensures that history is trimmed by estimated tokens instead of message count,
+that the most recent exchange is always kept, and that evicted turns are
+summarized into a single [MEMORIA] line.
+"""
+
+import pytest
+
+from agent.state.helpers import (
+    estimate_tokens,
+    format_messages_for_llm,
+    get_history_token_budget,
+    summarize_evicted_messages,
+    window_messages_by_tokens,
+)
+
+
+def _msg(role: str, content: str) -> dict:
+    return {"role": role, "content": content, "timestamp": "2026-01-01T00:00:00+00:00"}
+
+
+class TestEstimateTokens:
+    """Test cases for estimate_tokens()."""
+
+    def test_empty_text_is_zero(self):
+        assert estimate_tokens("") == 0
+
+    def test_grows_with_length(self):
+        assert estimate_tokens("a" * 400) > estimate_tokens("a" * 40)
+
+
+class TestWindowMessagesByTokens:
+    """Test cases for window_messages_by_tokens()."""
+
+    def test_everything_fits(self):
+        messages = [_msg("user", "hola"), _msg("assistant", "¡Hola!")]
+        kept, evicted = window_messages_by_tokens(messages, token_budget=1000)
+        assert kept == messages
+        assert evicted == []
+
+    def test_evicts_oldest_large_messages(self):
+        messages = [
+            _msg("user", "x" * 4000),
+            _msg("assistant", "y" * 4000),
+            _msg("user", "quiero homologar el escape"),
+            _msg("assistant", "Perfecto, ¿qué moto tienes?"),
+        ]
+        kept, evicted = window_messages_by_tokens(messages, token_budget=100)
+        assert kept == messages[2:]
+        assert evicted == messages[:2]
+
+    def test_always_keeps_min_recent(self):
+        messages = [
+            _msg("user", "hola"),
+            _msg("assistant", "z" * 8000),
+            _msg("user", "w" * 8000),
+        ]
+        kept, evicted = window_messages_by_tokens(messages, token_budget=10, min_recent=2)
+        assert kept == messages[1:]
+        assert evicted == messages[:1]
+
+    def test_order_is_preserved(self):
+        messages = [_msg("user", f"mensaje {i}") for i in range(10)]
+        kept, evicted = window_messages_by_tokens(messages, token_budget=40)
+        assert evicted + kept == messages
+
+
+class TestSummarizeEvictedMessages:
+    """Test cases for summarize_evicted_messages()."""
+
+    def test_returns_none_for_empty(self):
+        assert summarize_evicted_messages([]) is None
+
+    def test_includes_role_labels(self):
+        summary = summarize_evicted_messages([
+            _msg("user", "quiero homologar el escape"),
+            _msg("assistant", "El presupuesto es de 410€ +IVA"),
+        ])
+        assert summary.startswith("[MEMORIA]")
+        assert "Usuario: quiero homologar el escape" in summary
+        assert "Asistente: El presupuesto es de 410€ +IVA" in summary
+
+    def test_long_content_is_truncated(self):
+        summary = summarize_evicted_messages([_msg("user", "a" * 500)])
+        assert len(summary) < 200
+        assert summary.endswith("...")
+
+    def test_summary_is_bounded(self):
+        evicted = [_msg("user", f"mensaje largo número {i} " * 10) for i in range(50)]
+        summary = summarize_evicted_messages(evicted)
+        assert len(summary) < 800
+        assert "omitidos" in summary
+
+
+class TestFormatMessagesWithBudget:
+    """Test cases for format_messages_for_llm() with token_budget."""
+
+    def test_no_budget_keeps_all(self):
+        messages = [_msg("user", "x" * 4000), _msg("assistant", "ok")]
+        formatted = format_messages_for_llm(messages)
+        assert len(formatted) == 2
+
+    def test_budget_adds_memory_line(self):
+        messages = [
+            _msg("user", "x" * 4000),
+            _msg("assistant", "y" * 4000),
+            _msg("user", "listo"),
+            _msg("assistant", "Perfecto"),
+        ]
+        formatted = format_messages_for_llm(messages, token_budget=100)
+        assert formatted[0]["role"] == "system"
+        assert formatted[0]["content"].startswith("[MEMORIA]")
+        assert len(formatted) == 3
+        assert "<USER_MESSAGE>" in formatted[1]["content"]
+
+
+class TestHistoryTokenBudget:
+    """Test cases for get_history_token_budget()."""
+
+    def test_phase_override(self):
+        assert get_history_token_budget("collect_personal") == 1500
+
+    @pytest.mark.parametrize("phase", [None, "idle", "unknown_phase"])
+    def test_default_budget(self, phase):
+        assert get_history_token_budget(phase) == 3000
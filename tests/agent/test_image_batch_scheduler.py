@@ -0,0 +1,200 @@
+"""
+Tests for the image batch confirmation deadlines in agent.main.
+
+Batches are scheduled in a sorted set when images arrive and confirmed in
+their own task once due, so a slow reconciliation never delays others.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agent import main
+from agent.main import (
+    IMAGE_BATCH_DEADLINES_KEY,
+    IMAGE_BATCH_KEY_PREFIX,
+    IMAGE_BATCH_TIMEOUT_SECONDS,
+    backfill_batch_deadlines,
+    confirm_image_batch,
+    reset_batch_counter,
+    update_batch_counter,
+)
+
+
+class FakeRedis:
+    """Hashes and sorted sets, enough for the batch counter helpers."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+
+    async def exists(self, key):
+        return int(key in self.hashes)
+
+    async def hincrby(self, key, field, amount):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    async def zadd(self, key, mapping, nx=False, gt=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if nx and member in zset:
+                continue
+            if gt and member in zset and score <= zset[member]:
+                continue
+            zset[member] = score
+
+    async def zrem(self, key, member):
+        return 1 if self.zsets.get(key, {}).pop(member, None) is not None else 0
+
+    async def scan(self, cursor=0, match="*", count=100):
+        prefix = match.rstrip("*")
+        return 0, [key for key in self.hashes if key.startswith(prefix)]
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+class TestBatchDeadlines:
+    """Test cases for scheduling batch confirmations."""
+
+    @pytest.mark.asyncio
+    async def test_update_schedules_and_reset_unschedules(self, redis):
+        await update_batch_counter(redis, "42", 2, "+34600000000")
+        deadline = redis.zsets[IMAGE_BATCH_DEADLINES_KEY]["42"]
+        assert deadline == pytest.approx(time.time() + IMAGE_BATCH_TIMEOUT_SECONDS, abs=1)
+
+        await reset_batch_counter(redis, "42")
+        assert "42" not in redis.zsets[IMAGE_BATCH_DEADLINES_KEY]
+
+    @pytest.mark.asyncio
+    async def test_backfill_keeps_existing_deadlines(self, redis):
+        redis.hashes[f"{IMAGE_BATCH_KEY_PREFIX}1"] = {"count": "1", "last_update": "100"}
+        redis.hashes[f"{IMAGE_BATCH_KEY_PREFIX}2"] = {"count": "1", "last_update": "100"}
+        redis.zsets[IMAGE_BATCH_DEADLINES_KEY] = {"2": 5.0}
+
+        assert await backfill_batch_deadlines(redis) == 2
+        assert redis.zsets[IMAGE_BATCH_DEADLINES_KEY] == {
+            "1": 100 + IMAGE_BATCH_TIMEOUT_SECONDS,
+            "2": 5.0,
+        }
+
+
+class TestConfirmImageBatch:
+    """Test cases for confirm_image_batch()."""
+
+    @pytest.mark.asyncio
+    async def test_not_yet_due_is_rescheduled(self, redis):
+        last_update = time.time()
+        redis.hashes[f"{IMAGE_BATCH_KEY_PREFIX}7"] = {"count": "1", "last_update": str(last_update)}
+        chatwoot = AsyncMock()
+
+        await confirm_image_batch(redis, chatwoot, "7")
+
+        chatwoot.send_message.assert_not_called()
+        assert redis.zsets[IMAGE_BATCH_DEADLINES_KEY]["7"] == last_update + IMAGE_BATCH_TIMEOUT_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_due_batch_is_confirmed_and_cleared(self, redis):
+        redis.hashes[f"{IMAGE_BATCH_KEY_PREFIX}7"] = {
+            "count": "3",
+            "failed": "0",
+            "last_update": str(time.time() - IMAGE_BATCH_TIMEOUT_SECONDS - 1),
+            "user_phone": "+34600000000",
+        }
+        chatwoot = AsyncMock()
+        chatwoot.send_message.return_value = True
+
+        with patch.object(main, "get_redis_checkpointer"), \
+                patch.object(main, "get_fsm_state_from_checkpoint", AsyncMock(return_value=None)):
+            await confirm_image_batch(redis, chatwoot, "7")
+
+        assert "He recibido 3 imagen(es)" in chatwoot.send_message.call_args.kwargs["message"]
+        assert f"{IMAGE_BATCH_KEY_PREFIX}7" not in redis.hashes
+        assert redis.hashes[f"{main.IMAGE_BATCH_FINAL_PREFIX}7"]["confirmed_count"] == "3"
+
+    @pytest.mark.asyncio
+    async def test_failed_confirmation_is_retried_with_backoff(self, redis):
+        key = f"{IMAGE_BATCH_KEY_PREFIX}7"
+        redis.hashes[key] = {
+            "count": "3",
+            "last_update": str(time.time() - IMAGE_BATCH_TIMEOUT_SECONDS - 1),
+            "user_phone": "+34600000000",
+        }
+        chatwoot = AsyncMock()
+        chatwoot.send_message.side_effect = ConnectionError("chatwoot down")
+
+        with patch.object(main, "get_redis_checkpointer"), \
+                patch.object(main, "get_fsm_state_from_checkpoint", AsyncMock(return_value=None)):
+            await confirm_image_batch(redis, chatwoot, "7")
+            first = redis.zsets[IMAGE_BATCH_DEADLINES_KEY]["7"]
+            await confirm_image_batch(redis, chatwoot, "7")
+            second = redis.zsets[IMAGE_BATCH_DEADLINES_KEY]["7"]
+
+        assert key in redis.hashes
+        assert first == pytest.approx(time.time() + main.IMAGE_BATCH_RETRY_BASE_SECONDS, abs=1)
+        assert second == pytest.approx(time.time() + 2 * main.IMAGE_BATCH_RETRY_BASE_SECONDS, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_retry_does_not_advance_a_newer_deadline(self, redis):
+        redis.hashes[f"{IMAGE_BATCH_KEY_PREFIX}7"] = {"count": "1"}
+        later = time.time() + 60
+        redis.zsets[IMAGE_BATCH_DEADLINES_KEY] = {"7": later}
+
+        await main._retry_batch_confirmation(redis, "7")
+
+        assert redis.zsets[IMAGE_BATCH_DEADLINES_KEY]["7"] == later
+
+    @pytest.mark.asyncio
+    async def test_missing_batch_is_ignored(self, redis):
+        chatwoot = AsyncMock()
+        await confirm_image_batch(redis, chatwoot, "7")
+        chatwoot.send_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slow_reconciliation_does_not_block_other_batches(self, redis):
+        stale = str(time.time() - IMAGE_BATCH_TIMEOUT_SECONDS - 1)
+        for conversation_id, case_id in (("1", "00000000-0000-0000-0000-000000000001"), ("2", "")):
+            redis.hashes[f"{IMAGE_BATCH_KEY_PREFIX}{conversation_id}"] = {
+                "count": "1", "last_update": stale, "user_phone": "+34600000000", "case_id": case_id,
+            }
+        release = asyncio.Event()
+
+        async def slow_reconcile(**kwargs):
+            await release.wait()
+            return 0, 0
+
+        chatwoot = AsyncMock()
+        with patch.object(main, "reconcile_conversation_images", slow_reconcile), \
+                patch.object(main, "get_async_session", side_effect=RuntimeError("no db")), \
+                patch.object(main, "get_total_case_images", AsyncMock(return_value=1)), \
+                patch.object(main, "get_redis_checkpointer"), \
+                patch.object(main, "get_fsm_state_from_checkpoint", AsyncMock(return_value=None)):
+            slow = asyncio.create_task(confirm_image_batch(redis, chatwoot, "1"))
+            await asyncio.wait_for(confirm_image_batch(redis, chatwoot, "2"), timeout=1)
+
+            assert chatwoot.send_message.call_count == 1
+            release.set()
+            await slow
+
+        assert chatwoot.send_message.call_count == 2
@@ -0,0 +1,212 @@
+"""
+Tests for the per-conversation outbound scheduler.
+
+Pacing between images of one conversation must not delay replies to other
+conversations, order within a conversation is kept, rate-limited Chatwoot
+calls are retried, and undeliverable messages are reported for
+dead-lettering.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from agent.services import outbound_scheduler
+from agent.services.outbound_scheduler import OutboundMessage, OutboundScheduler
+
+
+class FakeChatwoot:
+    """Records sends as (kind, conversation_id, content)."""
+
+    def __init__(self, failures: list[int] | None = None):
+        self.events: list[tuple[str, object, str]] = []
+        self.failures = list(failures or [])
+
+    def _maybe_fail(self):
+        if self.failures:
+            status = self.failures.pop(0)
+            request = httpx.Request("POST", "https://chatwoot.example/messages")
+            response = httpx.Response(status, headers={"Retry-After": "0"}, request=request)
+            raise httpx.HTTPStatusError("error", request=request, response=response)
+
+    async def post_message(self, conversation_id, message, customer_phone=None):
+        self._maybe_fail()
+        self.events.append(("text", conversation_id, message))
+
+    async def send_to_customer(self, customer_phone, message, customer_name=None):
+        self._maybe_fail()
+        self.events.append(("text", customer_phone, message))
+        return 99
+
+    async def upload_image(self, conversation_id, image_url, caption=None):
+        self._maybe_fail()
+        self.events.append(("image", conversation_id, caption))
+        return len(self.events)
+
+
+def _images(count):
+    return {
+        "images": [{"url": f"/img/{i}.png", "descripcion": f"foto {i}"} for i in range(count)],
+        "follow_up_message": "¿Te encaja?",
+    }
+
+
+class TestOutboundMessage:
+    """Test cases for OutboundMessage.from_payload()."""
+
+    def test_base_images_first_and_old_format(self):
+        message = OutboundMessage.from_payload({
+            "conversation_id": 5,
+            "message": "hola",
+            "pending_images": {
+                "images": [
+                    {"url": "/e.png", "tipo": "elemento"},
+                    {"url": "/b.png", "tipo": "base_documentation"},
+                ],
+            },
+        })
+        assert [img["url"] for img in message.images] == ["/b.png", "/e.png"]
+
+        old = OutboundMessage.from_payload({"conversation_id": 5, "images": ["/x.png"]})
+        assert old.images == [{"url": "/x.png", "tipo": "elemento", "descripcion": "Documentación específica"}]
+        assert old.follow_up_message is None
+
+
+class TestOutboundScheduler:
+    """Test cases for OutboundScheduler delivery."""
+
+    @pytest.mark.asyncio
+    async def test_image_pacing_does_not_block_other_conversations(self):
+        chatwoot = FakeChatwoot()
+        scheduler = OutboundScheduler(chatwoot, image_delay=0.05, follow_up_delay=0.05, max_concurrency=2)
+
+        scheduler.submit(OutboundMessage.from_payload(
+            {"conversation_id": 1, "message": "aquí van fotos", "pending_images": _images(3)}
+        ))
+        scheduler.submit(OutboundMessage.from_payload({"conversation_id": 2, "message": "hola"}))
+        await scheduler.join()
+
+        reply_to_other = chatwoot.events.index(("text", 2, "hola"))
+        assert reply_to_other < chatwoot.events.index(("image", 1, "(2/3) foto 1"))
+
+        first = [(kind, content) for kind, conv, content in chatwoot.events if conv == 1]
+        assert first == [
+            ("text", "aquí van fotos"),
+            ("image", "(1/3) foto 0"),
+            ("image", "(2/3) foto 1"),
+            ("image", "(3/3) foto 2"),
+            ("text", "¿Te encaja?"),
+        ]
+        assert scheduler.active_conversations == 0 and scheduler.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_same_conversation_keeps_order(self):
+        chatwoot = FakeChatwoot()
+        scheduler = OutboundScheduler(chatwoot, image_delay=0.02, follow_up_delay=0.0)
+
+        scheduler.submit(OutboundMessage.from_payload(
+            {"conversation_id": 1, "message": "primero", "pending_images": _images(2)}
+        ))
+        scheduler.submit(OutboundMessage.from_payload({"conversation_id": 1, "message": "segundo"}))
+        await scheduler.join()
+
+        assert [content for _, _, content in chatwoot.events][-1] == "segundo"
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_calls_are_retried(self):
+        chatwoot = FakeChatwoot(failures=[429, 503])
+        scheduler = OutboundScheduler(chatwoot, max_retries=3)
+
+        scheduler.submit(OutboundMessage.from_payload({"conversation_id": 1, "message": "hola"}))
+        await scheduler.join()
+
+        assert chatwoot.events == [("text", 1, "hola")]
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_does_not_stop_queue(self):
+        chatwoot = FakeChatwoot(failures=[404])
+        scheduler = OutboundScheduler(chatwoot, max_retries=3, max_delivery_attempts=1)
+
+        scheduler.submit(OutboundMessage.from_payload({"conversation_id": 1, "message": "perdido"}))
+        scheduler.submit(OutboundMessage.from_payload({"conversation_id": 1, "message": "entregado"}))
+        await scheduler.join()
+
+        assert chatwoot.events == [("text", 1, "entregado")]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        in_flight = 0
+        peak = 0
+
+        class SlowChatwoot(FakeChatwoot):
+            async def post_message(self, conversation_id, message, customer_phone=None):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        scheduler = OutboundScheduler(SlowChatwoot(), max_concurrency=2)
+        for conversation_id in range(6):
+            scheduler.submit(OutboundMessage.from_payload({"conversation_id": conversation_id, "message": "x"}))
+        await scheduler.join()
+
+        assert peak == 2
+
+    def test_retry_after_parsing(self):
+        response = httpx.Response(429, headers={"Retry-After": "120"})
+        assert outbound_scheduler._retry_after_seconds(response) == outbound_scheduler.MAX_BACKOFF_SECONDS
+        assert outbound_scheduler._retry_after_seconds(httpx.Response(429)) is None
+
+
+class TestDeliveryCallbacks:
+    """Test cases for redelivery and the ACK / dead-letter callbacks."""
+
+    @pytest.mark.asyncio
+    async def test_failed_text_is_redelivered_before_images(self):
+        chatwoot = FakeChatwoot(failures=[404])
+        delivered = []
+
+        async def on_delivered(message):
+            delivered.append(message.stream_msg_id)
+
+        scheduler = OutboundScheduler(
+            chatwoot, image_delay=0.0, max_delivery_attempts=2, redelivery_delay=0.0, on_delivered=on_delivered,
+        )
+        scheduler.submit(OutboundMessage.from_payload(
+            {"conversation_id": 1, "message": "hola", "pending_images": {"images": [{"url": "/a.png"}]},
+             "published_at": 1.0},
+            stream_msg_id="1-0",
+        ))
+        await scheduler.join()
+
+        assert chatwoot.events == [("text", 1, "hola"), ("image", 1, "(1/1)")]
+        assert delivered == ["1-0"]
+
+    @pytest.mark.asyncio
+    async def test_exhausted_attempts_reported_as_failed(self):
+        chatwoot = FakeChatwoot(failures=[404, 404])
+        failed = []
+
+        async def on_failed(message, error):
+            failed.append((message.payload["message"], error))
+
+        scheduler = OutboundScheduler(
+            chatwoot, max_delivery_attempts=2, redelivery_delay=0.0, on_failed=on_failed,
+        )
+        scheduler.submit(OutboundMessage.from_payload({"conversation_id": 1, "message": "hola"}, "1-0"))
+        await scheduler.join()
+
+        assert chatwoot.events == []
+        assert failed and failed[0][0] == "hola"
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_on_unresolved_conversation_is_retried(self):
+        chatwoot = FakeChatwoot(failures=[429])
+        scheduler = OutboundScheduler(chatwoot, max_retries=2, max_delivery_attempts=1)
+
+        scheduler.submit(OutboundMessage.from_payload({"customer_phone": "+34600000000", "message": "hola"}))
+        await scheduler.join()
+
+        assert chatwoot.events == [("text", "+34600000000", "hola")]
@@ -0,0 +1,93 @@
+"""
+Tests for save_images_silently() in agent.main.
+
+Attachments are downloaded concurrently, rows are inserted in a single
+transaction and numbered in the order the user sent the photos.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent import main
+from agent.main import save_images_silently
+
+CASE_ID = str(uuid.uuid4())
+
+
+class FakeImageService:
+    """Downloads finish in reverse order; URLs containing 'bad' fail."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.in_flight = 0
+        self.peak = 0
+        self.deleted: list[str] = []
+
+    async def download_image(self, data_url, display_name, element_code=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        index = int(data_url.rsplit("/", 1)[-1].split(".")[0].replace("bad", ""))
+        await asyncio.sleep(0.01 * (self.count - index))
+        self.in_flight -= 1
+        if "bad" in data_url:
+            return None
+        return {"stored_filename": f"{index}.jpg", "mime_type": "image/jpeg", "file_size": 10}
+
+    def delete_image(self, stored_filename):
+        self.deleted.append(stored_filename)
+        return True
+
+
+def _attachments(*names):
+    return [{"file_type": "image", "data_url": f"https://chatwoot.example/{name}.jpg"} for name in names]
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.commit = AsyncMock()
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=None)
+    with patch.object(main, "get_async_session", factory), \
+            patch.object(main, "get_case_image_count", AsyncMock(return_value=2)), \
+            patch.object(main, "enqueue_derivatives", AsyncMock()) as enqueue:
+        session.enqueue_derivatives = enqueue
+        yield session
+
+
+class TestSaveImagesSilently:
+    """Test cases for save_images_silently()."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_downloads_single_commit_ordered_names(self, session):
+        service = FakeImageService(count=6)
+        with patch.object(main, "get_chatwoot_image_service", return_value=service):
+            saved, failed = await save_images_silently(
+                CASE_ID, "1", _attachments("0", "1", "bad2", "3", "4", "5"), "+34600000000",
+            )
+
+        assert (saved, failed) == (5, 1)
+        assert 1 < service.peak <= main.get_settings().CASE_IMAGES_DOWNLOAD_CONCURRENCY
+        session.commit.assert_awaited_once()
+        rows = [call.args[0] for call in session.add.call_args_list]
+        assert [row.stored_filename for row in rows] == ["0.jpg", "1.jpg", "3.jpg", "4.jpg", "5.jpg"]
+        assert [row.display_name for row in rows] == [
+            f"case_{CASE_ID[:8]}_image_{n}" for n in range(3, 8)
+        ]
+        session.enqueue_derivatives.assert_awaited_once_with(["0.jpg", "1.jpg", "3.jpg", "4.jpg", "5.jpg"])
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_removes_downloaded_files(self, session):
+        session.commit.side_effect = RuntimeError("db down")
+        service = FakeImageService(count=2)
+        with patch.object(main, "get_chatwoot_image_service", return_value=service):
+            saved, failed = await save_images_silently(
+                CASE_ID, "1", _attachments("0", "1"), "+34600000000",
+            )
+
+        assert (saved, failed) == (0, 2)
+        assert sorted(service.deleted) == ["0.jpg", "1.jpg"]
@@ -0,0 +1,73 @@
+"""
+Tests for the shared similarity module.
+
+The bit-parallel and precomputed matchers must return exactly what the
+per-pair implementations they replace returned.
+"""
+
+import random
+
+from agent.utils.similarity import (
+    FuzzyCandidates,
+    LevenshteinMatcher,
+    get_fuzzy_candidates,
+    levenshtein_distance,
+)
+from agent.utils.text_utils import fuzzy_match, fuzzy_match_with_scores
+
+
+def _table_levenshtein(s1: str, s2: str) -> int:
+    rows = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1, 1):
+        prev, rows[0] = rows[0], i
+        for j, c2 in enumerate(s2, 1):
+            prev, rows[j] = rows[j], min(rows[j] + 1, rows[j - 1] + 1, prev + (c1 != c2))
+    return rows[-1]
+
+
+class TestLevenshtein:
+    """Test cases for bit-parallel edit distance."""
+
+    def test_known_distances(self):
+        assert levenshtein_distance("dale", "dlae") == 2
+        assert levenshtein_distance("si", "sii") == 1
+        assert levenshtein_distance("", "abc") == 3
+        assert levenshtein_distance("sí", "si") == 1
+
+    def test_matches_dynamic_programming(self):
+        rng = random.Random(3)
+        for _ in range(2000):
+            a = "".join(rng.choice("abñ ") for _ in range(rng.randint(0, 10)))
+            b = "".join(rng.choice("abñ ") for _ in range(rng.randint(0, 80)))
+            assert levenshtein_distance(a, b) == _table_levenshtein(a, b)
+
+    def test_matcher_distances_and_within(self):
+        matcher = LevenshteinMatcher(["dale", "vale", "si"])
+        assert matcher.distances("vael") == [3, 2, 4]
+        assert matcher.within("dle", 1) == [("dale", 1)]
+
+
+class TestFuzzyCandidates:
+    """Test cases for precomputed fuzzy matching."""
+
+    CANDIDATES = ["Faro delantero", "Piloto trasero", "", "Escape", "Soporte de matrícula"]
+
+    def test_scores_and_substring_boost(self):
+        scores = dict(FuzzyCandidates(self.CANDIDATES).scores("faro"))
+        assert scores["Faro delantero"] == 0.8
+        assert scores["Escape"] == 0.0
+        assert "" not in scores
+
+    def test_accents_ignored(self):
+        assert fuzzy_match("matricula", self.CANDIDATES) == "Soporte de matrícula"
+
+    def test_wrappers_keep_contract(self):
+        assert fuzzy_match("", self.CANDIDATES) is None
+        assert fuzzy_match("faro", []) is None
+        assert fuzzy_match("bola", self.CANDIDATES) is None
+        ranked = fuzzy_match_with_scores("piloto trasero", self.CANDIDATES)
+        assert ranked[0] == ("Piloto trasero", 1.0)
+        assert [s for _, s in ranked] == sorted((s for _, s in ranked), reverse=True)
+
+    def test_candidate_sets_cached(self):
+        assert get_fuzzy_candidates(tuple(self.CANDIDATES)) is get_fuzzy_candidates(tuple(self.CANDIDATES))
@@ -0,0 +1,180 @@
+"""
+Tests for the compiled classification-rule matcher.
+
+The matcher must select the same tiers, keywords and warnings as the
+keyword-by-keyword scan it replaces.
+"""
+
+import json
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.services.tarifa_service import TarifaService
+from agent.services.tariff_rule_matcher import CategoryRuleMatcher, KeywordAutomaton
+
+
+def _service() -> TarifaService:
+    service = TarifaService.__new__(TarifaService)
+    service.redis = MagicMock()
+    service._rule_matchers = {}
+    return service
+
+
+def _naive_tier_matches(data: dict, description_lower: str) -> list[tuple[str, str]]:
+    tiers = sorted(
+        data["tiers"],
+        key=lambda t: (t.get("classification_rules") or {}).get("priority", 999),
+    )
+    matches = []
+    for tier in tiers:
+        for keyword in (tier.get("classification_rules") or {}).get("applies_if_any", []):
+            if keyword.lower() in description_lower:
+                matches.append((tier["code"], keyword))
+                break
+    return matches
+
+
+def _naive_warnings(warnings: list[dict], description_lower: str, selected_tier_id: str | None) -> list[dict]:
+    applicable = []
+    seen_codes = set()
+    for warning in warnings:
+        code = warning["code"]
+        if code in seen_codes:
+            continue
+        warning_tier_id = warning.get("tier_id")
+        if warning_tier_id and warning_tier_id != selected_tier_id:
+            continue
+
+        conditions = warning.get("trigger_conditions")
+        is_scoped = warning.get("category_id") or warning.get("tier_id") or warning.get("element_id")
+        if is_scoped and not conditions:
+            applicable.append({
+                "code": code,
+                "message": warning["message"],
+                "severity": warning["severity"],
+                "scope": "category" if warning.get("category_id") else "tier" if warning.get("tier_id") else "element",
+            })
+            seen_codes.add(code)
+            continue
+        if not conditions:
+            continue
+        if conditions.get("always_show"):
+            applicable.append({"code": code, "message": warning["message"], "severity": warning["severity"]})
+            seen_codes.add(code)
+            continue
+        for keyword in conditions.get("element_keywords", []):
+            if keyword.lower() in description_lower:
+                applicable.append({
+                    "code": code,
+                    "message": warning["message"],
+                    "severity": warning["severity"],
+                    "triggered_by": keyword,
+                })
+                seen_codes.add(code)
+                break
+    return applicable
+
+
+class TestKeywordAutomaton:
+    """Test cases for KeywordAutomaton."""
+
+    def test_overlapping_and_nested_patterns(self):
+        automaton = KeywordAutomaton(["he", "she", "his", "hers", "ers"])
+        assert automaton.find("ushers") == {0, 1, 3, 4}
+        assert automaton.find("this") == {2}
+        assert automaton.find("xyz") == set()
+
+    def test_empty_pattern_always_matches(self):
+        automaton = KeywordAutomaton(["", "faro"])
+        assert automaton.find("") == {0}
+        assert automaton.find("faro trasero") == {0, 1}
+
+    def test_matches_substring_check_on_random_text(self):
+        rng = random.Random(7)
+        patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+        automaton = KeywordAutomaton(patterns)
+        for _ in range(200):
+            text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 20)))
+            assert automaton.find(text) == {i for i, p in enumerate(patterns) if p in text}
+
+
+class TestCategoryRuleMatcher:
+    """Test cases for CategoryRuleMatcher against the naive scan."""
+
+    WORDS = ["escape", "faro", "chasis", "horquilla", "suspension", "llanta", "bola", "esc", "aro"]
+
+    def _random_data(self, rng: random.Random) -> dict:
+        tier_ids = [f"t{i}" for i in range(5)]
+        tiers = []
+        for i, tier_id in enumerate(tier_ids):
+            rules = None
+            if rng.random() < 0.8:
+                rules = {"applies_if_any": [rng.choice(self.WORDS).upper() for _ in range(rng.randint(0, 3))]}
+                if rng.random() < 0.7:
+                    rules["priority"] = rng.randint(1, 3)
+            tiers.append({"id": tier_id, "code": f"T{i}", "classification_rules": rules})
+
+        warnings = []
+        for i in range(8):
+            conditions = rng.choice([
+                None,
+                {"always_show": True},
+                {"element_keywords": [rng.choice(self.WORDS) for _ in range(rng.randint(1, 3))]},
+            ])
+            warnings.append({
+                "code": f"W{rng.randint(0, 4)}",
+                "message": f"m{i}",
+                "severity": "warning",
+                "trigger_conditions": conditions,
+                "category_id": "cat" if rng.random() < 0.2 else None,
+                "tier_id": rng.choice(tier_ids) if rng.random() < 0.3 else None,
+                "element_id": None,
+            })
+        return {"tiers": tiers, "warnings": warnings}
+
+    def test_identical_to_naive_scan(self):
+        rng = random.Random(11)
+        for _ in range(100):
+            data = self._random_data(rng)
+            matcher = CategoryRuleMatcher(data)
+            for _ in range(10):
+                description = " ".join(rng.choice(self.WORDS) for _ in range(rng.randint(0, 4)))
+                found = matcher.find(description)
+
+                assert [(t["code"], k) for t, k in matcher.match_tiers(found)] == \
+                    _naive_tier_matches(data, description)
+
+                selected_tier_id = rng.choice([None, "t0", "t1", "t2"])
+                assert matcher.applicable_warnings(found, selected_tier_id) == \
+                    _naive_warnings(data["warnings"], description, selected_tier_id)
+
+    def test_matcher_reused_until_data_changes(self):
+        service = _service()
+        data = {"tiers": [{"id": "t1", "code": "T1", "classification_rules": {"applies_if_any": ["faro"]}}],
+                "warnings": []}
+
+        matcher = service._get_rule_matcher("motos-part", data)
+        assert service._get_rule_matcher("motos-part", data) is matcher
+
+        changed = {**data, "tiers": [{"id": "t1", "code": "T1", "classification_rules": {"applies_if_any": ["bola"]}}]}
+        assert service._get_rule_matcher("motos-part", changed) is not matcher
+
+    @pytest.mark.asyncio
+    async def test_matcher_compiled_when_category_data_loads(self):
+        service = _service()
+        data = {"tiers": [{"id": "t1", "code": "T1", "classification_rules": {"applies_if_any": ["faro"]}}],
+                "warnings": []}
+        service.redis.get = AsyncMock(return_value=json.dumps(data))
+        snapshot = MagicMock()
+        snapshot.get.return_value = None
+
+        with patch("agent.services.tarifa_service.get_catalogue_snapshot", return_value=snapshot), \
+                patch("agent.services.tarifa_service.CategoryRuleMatcher", wraps=CategoryRuleMatcher) as compile_:
+            loaded = await service.get_category_data("motos-part")
+            matcher = service._get_rule_matcher("motos-part", loaded)
+            assert service._get_rule_matcher("motos-part", loaded) is matcher
+
+        compile_.assert_called_once_with(loaded)
+        assert matcher.source is loaded
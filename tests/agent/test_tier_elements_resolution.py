@@ -0,0 +1,128 @@
+"""
+Tests for tier element resolution from preloaded inclusions.
+
+All inclusions reachable from a tier are loaded in one query; nesting,
+cycles and de-duplication are resolved in memory.
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from agent.services.tarifa_service import TarifaService
+
+T1, T2, T3 = (str(uuid4()) for _ in range(3))
+
+
+def _service() -> TarifaService:
+    service = TarifaService.__new__(TarifaService)
+    service.redis = MagicMock()
+    return service
+
+
+def _element(code: str):
+    return SimpleNamespace(id=uuid4(), code=code, name=code.title(), description=None)
+
+
+def _includes_element(element, notes=None, max_quantity=None):
+    return SimpleNamespace(
+        element_id=element.id, element=element, included_tier_id=None, included_tier=None,
+        min_quantity=None, max_quantity=max_quantity, notes=notes,
+    )
+
+
+def _includes_tier(tier_id: str, code: str):
+    return SimpleNamespace(
+        element_id=None, element=None, included_tier_id=tier_id,
+        included_tier=SimpleNamespace(code=code),
+        min_quantity=None, max_quantity=None, notes=None,
+    )
+
+
+ESCAPE, FARO, BOLA = _element("ESCAPE"), _element("FARO"), _element("BOLA")
+
+
+class TestCollectTierElements:
+    """Test cases for TarifaService._collect_tier_elements()."""
+
+    def test_direct_and_nested_elements(self):
+        graph = {
+            T1: [_includes_element(ESCAPE, notes="max 1", max_quantity=1), _includes_tier(T2, "T2")],
+            T2: [_includes_element(FARO, notes="par")],
+        }
+        elements = _service()._collect_tier_elements(T1, graph, set())
+
+        assert [e["code"] for e in elements] == ["ESCAPE", "FARO"]
+        assert elements[0]["source_tier"] == T1
+        assert elements[0]["max_quantity"] == 1
+        assert elements[1]["source_tier"] == T2
+        assert elements[1]["notes"] == "Heredado de T2: par"
+
+    def test_notes_prefix_accumulates_per_level(self):
+        graph = {
+            T1: [_includes_tier(T2, "T2")],
+            T2: [_includes_tier(T3, "T3")],
+            T3: [_includes_element(BOLA, notes="x")],
+        }
+        (elem,) = _service()._collect_tier_elements(T1, graph, set())
+        assert elem["notes"] == "Heredado de T2: Heredado de T3: x"
+
+    def test_cycle_terminates(self):
+        graph = {
+            T1: [_includes_element(ESCAPE), _includes_tier(T2, "T2")],
+            T2: [_includes_element(FARO), _includes_tier(T1, "T1")],
+        }
+        elements = _service()._collect_tier_elements(T1, graph, set())
+        assert [e["code"] for e in elements] == ["ESCAPE", "FARO"]
+
+    def test_nested_duplicate_of_direct_element_skipped(self):
+        graph = {
+            T1: [_includes_element(ESCAPE), _includes_tier(T2, "T2")],
+            T2: [_includes_element(ESCAPE), _includes_element(FARO)],
+        }
+        elements = _service()._collect_tier_elements(T1, graph, set())
+        assert [e["code"] for e in elements] == ["ESCAPE", "FARO"]
+
+    def test_repeated_resolution_does_not_leak_notes(self):
+        graph = {T1: [_includes_tier(T2, "T2")], T2: [_includes_element(FARO, notes="par")]}
+        service = _service()
+        service._collect_tier_elements(T1, graph, set())
+        (elem,) = service._collect_tier_elements(T1, graph, set())
+        assert elem["notes"] == "Heredado de T2: par"
+
+
+class TestWarmTierElementsCache:
+    """Test cases for TarifaService.warm_tier_elements_cache()."""
+
+    @pytest.mark.asyncio
+    async def test_warms_every_tier_from_one_inclusion_load(self):
+        service = _service()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+
+        @asynccontextmanager
+        async def fake_pipeline(transaction=True):
+            yield pipe
+
+        service.redis.pipeline = fake_pipeline
+
+        tiers_result = MagicMock()
+        tiers_result.scalars.return_value.all.return_value = [T1, T2, T3]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=tiers_result)
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        graph = {T1: [_includes_tier(T2, "T2")], T2: [_includes_element(FARO)]}
+        with patch("agent.services.tarifa_service.get_async_session", fake_session), \
+                patch.object(TarifaService, "_load_tier_inclusions", new=AsyncMock(return_value=graph)) as load:
+            assert await service.warm_tier_elements_cache() == 2
+
+        load.assert_awaited_once()
+        assert {c.args[0] for c in pipe.setex.call_args_list} == {f"tier:elements:{T1}", f"tier:elements:{T2}"}
+        pipe.delete.assert_called_once_with(f"tier:elements:{T3}")
@@ -0,0 +1,258 @@
+"""
+Tests for coalesced token-usage accounting.
+
+record_token_usage() only increments Redis counters; flush_token_usage()
+moves them into PostgreSQL with one UPSERT per month.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.services import token_tracking
+
+
+class FakeRedis:
+    """Minimal in-memory Redis supporting the commands token_tracking uses (no SCAN)."""
+
+    def __init__(self):
+        self.data: dict[str, dict[str, str] | set[str] | str] = {}
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+    async def hincrby(self, key, field, amount):
+        bucket = self.data.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def srem(self, key, *members):
+        members_set = self.data.get(key, set())
+        members_set.difference_update(members)
+        if not members_set:
+            self.data.pop(key, None)
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == token_tracking._RELEASE_LOCK_SCRIPT:
+            # Compare-and-delete lock release
+            if self.data.get(keys[0]) == argv[0]:
+                del self.data[keys[0]]
+                return 1
+            return 0
+
+        assert script == token_tracking._START_BATCH_SCRIPT
+        source, batch_key, batches_key, periods_key = keys
+        if argv[0]:
+            await self.srem(periods_key, argv[0])
+        if source not in self.data:
+            return 0
+        self.data[batch_key] = self.data.pop(source)
+        await self.sadd(batches_key, batch_key)
+        return 1
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, command):
+        return lambda *args: self.ops.append((command, args))
+
+    async def execute(self):
+        for command, args in self.ops:
+            await getattr(self.redis, command)(*args)
+
+
+def _period(months_ago: int = 0) -> tuple[int, int]:
+    now = datetime.now(UTC)
+    index = now.year * 12 + now.month - 1 - months_ago
+    return index // 12, index % 12 + 1
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch.object(token_tracking, "get_redis_client", return_value=redis):
+        yield redis
+
+
+class TestRecordTokenUsage:
+    """Test cases for record_token_usage()."""
+
+    @pytest.mark.asyncio
+    async def test_accumulates_without_db_write(self, fake_redis):
+        with patch.object(token_tracking, "_upsert_token_usage", new=AsyncMock()) as upsert:
+            await token_tracking.record_token_usage(100, 20)
+            await token_tracking.record_token_usage(50, 10)
+
+        upsert.assert_not_called()
+        (key,) = [k for k in fake_redis.data if k.startswith(token_tracking.TOKEN_USAGE_PENDING_PREFIX)]
+        assert fake_redis.data[key] == {"input_tokens": "150", "output_tokens": "30", "total_requests": "2"}
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_upsert_without_redis(self):
+        with patch.object(token_tracking, "get_redis_client", side_effect=ConnectionError("down")), \
+                patch.object(token_tracking, "_upsert_token_usage", new=AsyncMock()) as upsert:
+            await token_tracking.record_token_usage(100, 20)
+
+        assert upsert.call_args.args[2:] == (100, 20, 1)
+
+
+class TestFlushTokenUsage:
+    """Test cases for flush_token_usage()."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_totals_once(self, fake_redis):
+        await token_tracking.record_token_usage(100, 20)
+        await token_tracking.record_token_usage(50, 10)
+
+        with patch.object(token_tracking, "_apply_flush_batch", new=AsyncMock(return_value=True)) as apply:
+            assert await token_tracking.flush_token_usage() == 1
+            assert await token_tracking.flush_token_usage() == 0
+
+        apply.assert_called_once()
+        assert apply.call_args.kwargs == {"input_tokens": 150, "output_tokens": 30, "total_requests": 2}
+        assert fake_redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_counters(self, fake_redis):
+        await token_tracking.record_token_usage(100, 20)
+
+        with patch.object(token_tracking, "_apply_flush_batch", new=AsyncMock(side_effect=RuntimeError("db"))):
+            await token_tracking.flush_token_usage()
+
+        (batch_key,) = fake_redis.data[token_tracking.TOKEN_USAGE_BATCHES_KEY]
+        pending = await token_tracking.get_pending_token_usage(*_period())
+        assert batch_key.startswith(token_tracking.TOKEN_USAGE_FLUSHING_PREFIX)
+        assert pending == {"input_tokens": 100, "output_tokens": 20, "total_requests": 1}
+
+        with patch.object(token_tracking, "_apply_flush_batch", new=AsyncMock(return_value=True)) as apply:
+            await token_tracking.flush_token_usage()
+        assert apply.call_args.kwargs["input_tokens"] == 100
+
+    @pytest.mark.asyncio
+    async def test_lock_prevents_concurrent_flush(self, fake_redis):
+        await token_tracking.record_token_usage(100, 20)
+        fake_redis.data[token_tracking.TOKEN_USAGE_FLUSH_LOCK] = "1"
+
+        with patch.object(token_tracking, "_apply_flush_batch", new=AsyncMock()) as apply:
+            assert await token_tracking.flush_token_usage() == 0
+        apply.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_retried_after_failed_cleanup_is_applied_once(self, fake_redis):
+        await token_tracking.record_token_usage(100, 20)
+        applied: dict[str, dict] = {}
+
+        async def apply(batch_id, year, month, **counters):
+            # Stands in for the batch-id insert + UPSERT transaction
+            if batch_id in applied:
+                return False
+            applied[batch_id] = counters
+            return True
+
+        original_delete = fake_redis.delete
+
+        async def failing_delete(key):
+            if key.startswith(token_tracking.TOKEN_USAGE_FLUSHING_PREFIX):
+                raise ConnectionError("redis blip")
+            await original_delete(key)
+
+        with patch.object(token_tracking, "_apply_flush_batch", new=apply):
+            fake_redis.delete = failing_delete
+            await token_tracking.flush_token_usage()
+            fake_redis.delete = original_delete
+            await token_tracking.flush_token_usage()
+
+        assert list(applied.values()) == [{"input_tokens": 100, "output_tokens": 20, "total_requests": 1}]
+        assert fake_redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_expired_lock_taken_by_other_flusher_is_kept(self, fake_redis):
+        await token_tracking.record_token_usage(100, 20)
+
+        async def slow_apply(*args, **kwargs):
+            # Our lock expired and another process acquired it meanwhile
+            fake_redis.data[token_tracking.TOKEN_USAGE_FLUSH_LOCK] = "other-flusher"
+            return True
+
+        with patch.object(token_tracking, "_apply_flush_batch", new=slow_apply):
+            await token_tracking.flush_token_usage()
+
+        assert fake_redis.data[token_tracking.TOKEN_USAGE_FLUSH_LOCK] == "other-flusher"
+
+    @pytest.mark.asyncio
+    async def test_legacy_flushing_key_gets_batch_id(self, fake_redis):
+        year, month = _period(months_ago=1)
+        fake_redis.data[f"{token_tracking.TOKEN_USAGE_FLUSHING_PREFIX}{year}:{month}"] = {"input_tokens": "5"}
+
+        with patch.object(token_tracking, "_apply_flush_batch", new=AsyncMock(return_value=True)) as apply:
+            assert await token_tracking.flush_token_usage() == 1
+
+        batch_id, *period = apply.call_args.args
+        assert period == [year, month] and len(batch_id) == 32
+        assert fake_redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_old_period_is_flushed_from_tracking_set(self, fake_redis):
+        await token_tracking.record_token_usage(100, 20)
+        # Counters of a month the flusher missed entirely
+        key = f"{token_tracking.TOKEN_USAGE_PENDING_PREFIX}2025:1"
+        fake_redis.data[key] = {"input_tokens": "7", "total_requests": "1"}
+        await fake_redis.sadd(token_tracking.TOKEN_USAGE_PERIODS_KEY, "2025:1")
+
+        with patch.object(token_tracking, "_apply_flush_batch", new=AsyncMock(return_value=True)) as apply:
+            assert await token_tracking.flush_token_usage() == 2
+
+        assert sorted(call.args[1:] for call in apply.call_args_list) == [(2025, 1), _period()]
+        assert fake_redis.data == {}
+
+
+class TestApplyFlushBatch:
+    """Test cases for _apply_flush_batch()."""
+
+    @pytest.mark.asyncio
+    async def test_applied_batch_prunes_old_batch_ids(self):
+        session = MagicMock()
+        inserted = MagicMock()
+        inserted.scalar_one_or_none.return_value = "batch-1"
+        session.execute = AsyncMock(return_value=inserted)
+        session.commit = AsyncMock()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch.object(token_tracking, "get_async_session", fake_session):
+            assert await token_tracking._apply_flush_batch("batch-1", 2026, 10, 100, 20, 1)
+
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert statements[-1].startswith("DELETE FROM token_usage_flush_batches WHERE")
+        session.commit.assert_awaited_once()
@@ -0,0 +1,121 @@
+"""
+Tests for the shared, pooled Chatwoot HTTP client.
+
+ChatwootClient calls borrow one long-lived httpx.AsyncClient per process
+instead of opening (and tearing down) a connection per call.
+"""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from shared import chatwoot_client
+from shared.chatwoot_client import (
+    ChatwootClient,
+    ChatwootHttpStats,
+    close_chatwoot_http_client,
+    get_chatwoot_http_client,
+)
+
+
+@pytest_asyncio.fixture
+async def mock_pool():
+    """Install a shared client backed by a mock transport."""
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"payload": [{"id": 7}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    chatwoot_client._http_client = client
+    chatwoot_client._http_client_loop = asyncio.get_running_loop()
+    yield client, calls
+    await close_chatwoot_http_client()
+
+
+class TestSharedHttpClient:
+    """Test cases for get_chatwoot_http_client()."""
+
+    @pytest.mark.asyncio
+    async def test_singleton_per_loop_and_recreated_after_close(self):
+        first = get_chatwoot_http_client()
+        assert get_chatwoot_http_client() is first
+
+        await close_chatwoot_http_client()
+        assert first.is_closed
+        second = get_chatwoot_http_client()
+        assert second is not first
+        await close_chatwoot_http_client()
+
+    @pytest.mark.asyncio
+    async def test_client_from_finished_loop_is_closed(self):
+        old_loop = asyncio.new_event_loop()
+        old_loop.close()
+        stale = httpx.AsyncClient()
+        chatwoot_client._http_client = stale
+        chatwoot_client._http_client_loop = old_loop
+
+        replacement = get_chatwoot_http_client()
+        await asyncio.sleep(0)
+
+        assert replacement is not stale
+        assert stale.is_closed
+        await close_chatwoot_http_client()
+
+    @pytest.mark.asyncio
+    async def test_client_from_running_loop_is_closed_on_its_loop(self):
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever)
+        thread.start()
+        try:
+            stale = httpx.AsyncClient()
+            chatwoot_client._http_client = stale
+            chatwoot_client._http_client_loop = other_loop
+
+            assert get_chatwoot_http_client() is not stale
+            # Runs after the scheduled aclose() on the other loop
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop))
+            assert stale.is_closed
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+            await close_chatwoot_http_client()
+
+    @pytest.mark.asyncio
+    async def test_client_calls_reuse_shared_client(self, mock_pool):
+        client, calls = mock_pool
+        chatwoot = ChatwootClient()
+
+        assert await chatwoot.find_contact_by_phone("+34600000000") == {"id": 7}
+        assert await ChatwootClient().find_contact_by_phone("+34600000001") == {"id": 7}
+
+        assert len(calls) == 2
+        assert not client.is_closed
+        assert calls[0].headers["api_access_token"] == chatwoot.api_token
+
+
+class TestChatwootHttpStats:
+    """Test cases for connection reuse metrics."""
+
+    @pytest.mark.asyncio
+    async def test_reuse_ratio_counts_new_connections(self):
+        stats = ChatwootHttpStats()
+        assert stats.get_stats()["reuse_ratio"] is None
+
+        for _ in range(4):
+            request = httpx.Request("GET", "https://chatwoot.example/api")
+            await stats.on_request(request)
+        await request.extensions["trace"]("connection.connect_tcp.started", {})
+        await request.extensions["trace"]("connection.start_tls.started", {})
+
+        assert stats.get_stats() == {
+            "requests": 4,
+            "new_connections": 1,
+            "tls_handshakes": 1,
+            "reuse_ratio": 0.75,
+        }
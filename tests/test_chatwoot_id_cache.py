@@ -0,0 +1,128 @@
+"""
+Tests for the Chatwoot contact/conversation ID cache.
+
+Messages to a returning customer skip the contact search, contact fetch
+and conversation create; a 404 on a cached id drops it and resolves again.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from shared import chatwoot_client, chatwoot_id_cache
+from shared.chatwoot_client import ChatwootClient, close_chatwoot_http_client
+
+PHONE = "+34600000000"
+
+
+class FakeChatwoot:
+    """Minimal Chatwoot API: one contact, conversations created on demand."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+        self.next_conversation_id = 100
+        self.deleted_conversations: set[int] = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split("/accounts/")[1].split("/", 1)[1]
+        self.calls.append((request.method, path))
+
+        if path == "contacts/search":
+            return httpx.Response(200, json={"payload": [{"id": 7}]})
+        if request.method == "GET" and path == "contacts/7":
+            return httpx.Response(
+                200, json={"payload": {"id": 7, "contact_inboxes": [{"source_id": "src"}]}}
+            )
+        if request.method == "POST" and path == "conversations":
+            self.next_conversation_id += 1
+            return httpx.Response(200, json={"id": self.next_conversation_id})
+        if path.endswith("/messages"):
+            conversation_id = int(path.split("/")[1])
+            if conversation_id in self.deleted_conversations:
+                return httpx.Response(404, json={"error": "Resource could not be found"})
+            return httpx.Response(200, json={"id": 1})
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def redis():
+    store: dict[str, str] = {}
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=lambda key: store.get(key))
+    client.setex = AsyncMock(side_effect=lambda key, ttl, value: store.__setitem__(key, str(value)))
+    client.delete = AsyncMock(side_effect=lambda *keys: [store.pop(k, None) for k in keys])
+    client.store = store
+
+    chatwoot_id_cache.clear_local_chatwoot_id_cache()
+    with patch.object(chatwoot_id_cache, "get_redis_client", return_value=client):
+        yield client
+    chatwoot_id_cache.clear_local_chatwoot_id_cache()
+
+
+@pytest_asyncio.fixture
+async def chatwoot():
+    api = FakeChatwoot()
+    chatwoot_client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    chatwoot_client._http_client_loop = asyncio.get_running_loop()
+    yield api
+    await close_chatwoot_http_client()
+
+
+class TestSendMessageWithIdCache:
+    """Test cases for ChatwootClient.send_message() id resolution."""
+
+    @pytest.mark.asyncio
+    async def test_returning_customer_only_posts_message(self, redis, chatwoot):
+        client = ChatwootClient()
+
+        assert await client.send_message(PHONE, "hola")
+        assert len(chatwoot.calls) == 4
+
+        chatwoot.calls.clear()
+        assert await client.send_message(PHONE, "otra vez")
+        assert chatwoot.calls == [("POST", "conversations/101/messages")]
+
+        # Another process: empty local layer, ids still shared through Redis
+        chatwoot_id_cache.clear_local_chatwoot_id_cache()
+        chatwoot.calls.clear()
+        assert await ChatwootClient().send_message(PHONE, "desde otro worker")
+        assert chatwoot.calls == [("POST", "conversations/101/messages")]
+        assert redis.store == {"chatwoot:contact:+34600000000": "7", "chatwoot:conversation:7": "101"}
+
+    @pytest.mark.asyncio
+    async def test_stale_conversation_is_invalidated_and_resolved(self, redis, chatwoot):
+        client = ChatwootClient()
+        assert await client.send_message(PHONE, "hola")
+
+        chatwoot.deleted_conversations.add(101)
+        chatwoot.calls.clear()
+        assert await client.send_message(PHONE, "sigues ahí?")
+
+        assert chatwoot.calls[0] == ("POST", "conversations/101/messages")
+        assert chatwoot.calls[-1] == ("POST", "conversations/102/messages")
+        assert redis.store["chatwoot:conversation:7"] == "102"
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_api(self, redis, chatwoot):
+        redis.get.side_effect = ConnectionError("redis down")
+        redis.setex.side_effect = ConnectionError("redis down")
+
+        assert await ChatwootClient().send_message(PHONE, "hola")
+        assert ("POST", "conversations/101/messages") in chatwoot.calls
+
+
+class TestLocalLRU:
+    """Test cases for the in-process layer."""
+
+    def test_bounded_and_expiring(self):
+        lru = chatwoot_id_cache._LocalLRU()
+        for i in range(5):
+            lru.set(f"k{i}", i, ttl=60, max_entries=3)
+        assert lru.get("k0") is None
+        assert lru.get("k4") == 4
+
+        lru.set("short", 1, ttl=0, max_entries=3)
+        assert lru.get("short") is None
@@ -0,0 +1,107 @@
+"""
+Tests for the image byte cache used by ChatwootClient.send_image().
+"""
+
+import os
+
+import httpx
+import pytest
+
+from shared import image_byte_cache
+from shared.image_byte_cache import ImageByteCache
+
+
+class ImageServer:
+    """Serves images with ETags and answers conditional requests."""
+
+    def __init__(self):
+        self.files = {"/images/a.png": b"A" * 100, "/images/b.png": b"B" * 100}
+        self.requests: list[tuple[str, int]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        content = self.files[request.url.path]
+        etag = f'"{hash(content)}"'
+        if request.headers.get("if-none-match") == etag:
+            self.requests.append((request.url.path, 304))
+            return httpx.Response(304, headers={"etag": etag})
+        self.requests.append((request.url.path, 200))
+        return httpx.Response(200, content=content, headers={"etag": etag, "content-type": "image/png"})
+
+
+@pytest.fixture
+def server():
+    return ImageServer()
+
+
+@pytest.fixture
+def http(server):
+    return httpx.AsyncClient(transport=httpx.MockTransport(server), base_url="https://api.example")
+
+
+URL_A = "https://api.example/images/a.png"
+URL_B = "https://api.example/images/b.png"
+
+
+class TestImageByteCache:
+    """Test cases for ImageByteCache.fetch()."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entries_skip_the_download(self, server, http):
+        cache = ImageByteCache(max_bytes=1000, fresh_seconds=60)
+
+        assert await cache.fetch(http, URL_A) == (b"A" * 100, "image/png")
+        assert await cache.fetch(http, URL_A) == (b"A" * 100, "image/png")
+
+        assert server.requests == [("/images/a.png", 200)]
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entries_are_revalidated(self, server, http):
+        cache = ImageByteCache(max_bytes=1000, fresh_seconds=0)
+
+        await cache.fetch(http, URL_A)
+        assert await cache.fetch(http, URL_A) == (b"A" * 100, "image/png")
+
+        server.files["/images/a.png"] = b"new"
+        assert (await cache.fetch(http, URL_A))[0] == b"new"
+
+        assert [status for _, status in server.requests] == [200, 304, 200]
+
+    @pytest.mark.asyncio
+    async def test_memory_budget_evicts_least_recently_used(self, server, http):
+        cache = ImageByteCache(max_bytes=150, fresh_seconds=60)
+
+        await cache.fetch(http, URL_A)
+        await cache.fetch(http, URL_B)
+        await cache.fetch(http, URL_A)
+
+        assert server.requests == [("/images/a.png", 200), ("/images/b.png", 200), ("/images/a.png", 200)]
+        assert cache.get_stats()["memory_bytes"] == 100
+
+    @pytest.mark.asyncio
+    async def test_disk_layer_survives_restart_and_dedups(self, server, http, tmp_path):
+        server.files["/images/b.png"] = server.files["/images/a.png"]
+        cache = ImageByteCache(max_bytes=1000, fresh_seconds=60, directory=tmp_path, disk_max_bytes=1000)
+        await cache.fetch(http, URL_A)
+        await cache.fetch(http, URL_B)
+        assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
+
+        restarted = ImageByteCache(max_bytes=1000, fresh_seconds=60, directory=tmp_path, disk_max_bytes=1000)
+        assert await restarted.fetch(http, URL_A) == (b"A" * 100, "image/png")
+        assert len(server.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_disk_budget_prunes_oldest(self, server, http, tmp_path):
+        cache = ImageByteCache(max_bytes=0, fresh_seconds=60, directory=tmp_path, disk_max_bytes=150)
+
+        await cache.fetch(http, URL_A)
+        for blob in (tmp_path / "blobs").glob("*/*"):
+            os.utime(blob, (0, 0))
+        await cache.fetch(http, URL_B)
+
+        assert [p.read_bytes() for p in (tmp_path / "blobs").glob("*/*")] == [b"B" * 100]
+
+    def test_singleton_from_settings(self):
+        image_byte_cache.get_image_byte_cache.cache_clear()
+        assert image_byte_cache.get_image_byte_cache() is image_byte_cache.get_image_byte_cache()
+        image_byte_cache.get_image_byte_cache.cache_clear()
@@ -0,0 +1,176 @@
+"""
+Tests for case image thumbnails/previews (shared.image_derivatives) and
+the route that serves them.
+"""
+
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from api.routes import images
+from shared import image_derivatives
+from shared.image_derivatives import (
+    DERIVATIVE_SIZES,
+    delete_derivatives,
+    enqueue_derivatives,
+    generate_derivatives,
+    get_derivatives_dir,
+    read_derivatives,
+)
+
+
+@pytest.fixture
+def case_dir(tmp_path):
+    settings = SimpleNamespace(CASE_IMAGES_DIR=str(tmp_path))
+    with patch.object(image_derivatives, "get_settings", return_value=settings):
+        yield tmp_path
+
+
+def _save_jpeg(path, size=(2000, 1500)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color="orange").save(buffer, format="JPEG")
+    path.write_bytes(buffer.getvalue())
+
+
+class TestGenerateDerivatives:
+    """Test cases for generate_derivatives()."""
+
+    def test_creates_webp_sizes_named_by_content(self, case_dir):
+        _save_jpeg(case_dir / "a.jpg")
+
+        names = generate_derivatives("a.jpg")
+
+        assert set(names) == set(DERIVATIVE_SIZES)
+        for size_name, name in names.items():
+            assert image_derivatives.DERIVATIVE_NAME_RE.fullmatch(name)
+            with Image.open(get_derivatives_dir() / name) as img:
+                assert img.format == "WEBP"
+                assert max(img.size) == DERIVATIVE_SIZES[size_name]
+        assert read_derivatives("a.jpg") == names
+
+    def test_identical_files_share_derivatives(self, case_dir):
+        _save_jpeg(case_dir / "a.jpg")
+        (case_dir / "b.jpg").write_bytes((case_dir / "a.jpg").read_bytes())
+
+        assert generate_derivatives("a.jpg") == generate_derivatives("b.jpg")
+
+    def test_undecodable_or_missing_original_is_recorded(self, case_dir):
+        (case_dir / "broken.jpg").write_bytes(b"not an image")
+
+        assert generate_derivatives("broken.jpg") is None
+        assert generate_derivatives("missing.jpg") is None
+        assert "error" in read_derivatives("broken.jpg")
+        assert "error" in read_derivatives("missing.jpg")
+
+        # Not retried, even once the file becomes readable
+        _save_jpeg(case_dir / "missing.jpg")
+        assert generate_derivatives("missing.jpg") is None
+
+        delete_derivatives("broken.jpg")
+        assert read_derivatives("broken.jpg") is None
+
+    def test_missing_files_invalidate_manifest(self, case_dir):
+        _save_jpeg(case_dir / "a.jpg")
+        names = generate_derivatives("a.jpg")
+
+        (get_derivatives_dir() / names["thumb"]).unlink()
+        assert read_derivatives("a.jpg") is None
+        assert generate_derivatives("a.jpg") == names
+
+        delete_derivatives("a.jpg")
+        assert not any(get_derivatives_dir().glob("*.webp"))
+
+
+class FakeRedis:
+    """SET NX markers and a list, enough for enqueue_derivatives()."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.lists: dict[str, list[str]] = {}
+        self.commands: list = []
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            async def __aenter__(self):
+                redis.commands = []
+                return self
+
+            async def __aexit__(self, *exc):
+                return None
+
+            def set(self, key, value, nx=False, ex=None):
+                redis.commands.append((key, value))
+
+            async def execute(self):
+                results = []
+                for key, value in redis.commands:
+                    results.append(key not in redis.values or None)
+                    redis.values.setdefault(key, value)
+                return results
+
+        return Pipeline()
+
+    async def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+class TestEnqueueDerivatives:
+    """Test cases for enqueue_derivatives()."""
+
+    @pytest.mark.asyncio
+    async def test_images_are_queued_once_until_processed(self):
+        redis = FakeRedis()
+        queue_key = image_derivatives.RedisKeys.case_image_derivatives_queue()
+        with patch.object(image_derivatives, "get_redis_client", return_value=redis):
+            await enqueue_derivatives(["a.jpg", "b.jpg"])
+            await enqueue_derivatives(["a.jpg", "c.jpg"])
+            assert redis.lists[queue_key] == ["a.jpg", "b.jpg", "c.jpg"]
+
+            await image_derivatives.mark_derivatives_processed("a.jpg")
+            await enqueue_derivatives(["a.jpg", "b.jpg"])
+            assert redis.lists[queue_key] == ["a.jpg", "b.jpg", "c.jpg", "a.jpg"]
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_swallowed(self):
+        redis = MagicMock()
+        redis.pipeline.side_effect = ConnectionError("down")
+        with patch.object(image_derivatives, "get_redis_client", return_value=redis):
+            await enqueue_derivatives(["a.jpg"])
+
+
+class TestServeDerivative:
+    """Test cases for GET /case-images/derivatives/{name}."""
+
+    @pytest.fixture
+    def client(self, case_dir):
+        app = FastAPI()
+        app.include_router(images.get_case_images_router(), prefix="/case-images")
+        with patch.object(images, "get_derivatives_dir", return_value=get_derivatives_dir()):
+            yield TestClient(app)
+
+    def test_immutable_cache_headers_and_etag(self, case_dir, client):
+        _save_jpeg(case_dir / "a.jpg")
+        name = generate_derivatives("a.jpg")["thumb"]
+
+        response = client.get(f"/case-images/derivatives/{name}")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+        assert "immutable" in response.headers["cache-control"]
+
+        etag = response.headers["etag"]
+        revalidated = client.get(f"/case-images/derivatives/{name}", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+
+    def test_rejects_unknown_names(self, client):
+        assert client.get("/case-images/derivatives/..%2F..%2Fsecret.webp").status_code == 404
+        assert client.get("/case-images/derivatives/0123456789abcdef_thumb.webp").status_code == 404
@@ -21,6 +21,7 @@ from shared.image_security import (
     validate_image_content,
     sanitize_filename,
     validate_image_full,
+    validate_image_full_async,
     detect_mime_from_magic,
     get_extension_for_mime,
 )
@@ -342,6 +343,40 @@ class TestValidateImageFull:
         assert result["detected_mime"] == "image/png"
 
 
+class TestValidateImageFullAsync:
+    """Tests for validate_image_full_async function."""
+
+    @pytest.mark.asyncio
+    async def test_runs_on_validation_pool(self, monkeypatch):
+        """Decoding should happen on the validation threads, not the loop."""
+        import threading
+        from shared import image_security
+
+        threads = []
+        original = image_security.validate_image_content
+
+        def recording(content):
+            threads.append(threading.current_thread().name)
+            return original(content)
+
+        monkeypatch.setattr(image_security, "validate_image_content", recording)
+
+        img = Image.new("RGB", (400, 300), color="purple")
+        buffer = BytesIO()
+        img.save(buffer, format="PNG")
+
+        result = await validate_image_full_async(buffer.getvalue(), declared_mime="image/png")
+
+        assert (result["width"], result["height"]) == (400, 300)
+        assert threads[0].startswith("image-validation")
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self):
+        """Validation errors should be raised to the caller."""
+        with pytest.raises(ImageSecurityError):
+            await validate_image_full_async(b"not an image" * 20, declared_mime="image/png")
+
+
 # =============================================================================
 # Helper Function Tests
 # =============================================================================
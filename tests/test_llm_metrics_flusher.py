@@ -0,0 +1,160 @@
+"""
+Tests for the bounded LLM metrics buffer and LLMMetricsFlusher.
+"""
+
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared.llm_metrics_flusher import LLMMetricsFlusher
+from shared.llm_router import LLMMetrics, LLMRouter, ModelTier, Provider, TaskType
+
+
+def _router(**overrides) -> LLMRouter:
+    router = LLMRouter()
+    router.settings = router.settings.model_copy(update={
+        "ENABLE_LLM_METRICS": True,
+        "LLM_METRICS_BUFFER_MAX_SIZE": 5,
+        "LLM_METRICS_FLUSH_BATCH_SIZE": 3,
+        **overrides,
+    })
+    return router
+
+
+def _metrics(latency_ms: int = 100, provider: Provider = Provider.OPENROUTER) -> LLMMetrics:
+    return LLMMetrics(
+        task_type=TaskType.CONVERSATION,
+        tier=ModelTier.CLOUD_STANDARD,
+        provider=provider,
+        model="test-model",
+        latency_ms=latency_ms,
+        input_tokens=1_000_000,
+        output_tokens=500_000,
+        success=True,
+    )
+
+
+def _flusher(router: LLMRouter) -> LLMMetricsFlusher:
+    flusher = LLMMetricsFlusher(router=router)
+    flusher.settings = router.settings
+    return flusher
+
+
+class TestMetricsBuffer:
+    """Test cases for the router's bounded metrics buffer."""
+
+    def test_overflow_drops_oldest_and_counts(self):
+        router = _router()
+        for i in range(8):
+            router.record_metrics(_metrics(latency_ms=i))
+        stats = router.get_metrics_buffer_stats()
+        assert stats["buffered"] == 5
+        assert stats["dropped"] == 3
+        assert [m.latency_ms for m in router.get_pending_metrics()] == [3, 4, 5, 6, 7]
+
+    def test_drain_respects_max_items(self):
+        router = _router()
+        for i in range(4):
+            router.record_metrics(_metrics(latency_ms=i))
+        assert [m.latency_ms for m in router.get_pending_metrics(max_items=3)] == [0, 1, 2]
+        assert router.get_metrics_buffer_stats()["buffered"] == 1
+
+    def test_requeue_goes_to_front(self):
+        router = _router()
+        router.record_metrics(_metrics(latency_ms=2))
+        router.requeue_metrics([_metrics(latency_ms=0), _metrics(latency_ms=1)])
+        assert [m.latency_ms for m in router.get_pending_metrics()] == [0, 1, 2]
+
+    def test_disabled_metrics_not_buffered(self):
+        router = _router(ENABLE_LLM_METRICS=False)
+        router.record_metrics(_metrics())
+        assert router.get_metrics_buffer_stats()["buffered"] == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_size_sets_flush_event(self):
+        import asyncio
+
+        router = _router()
+        event = asyncio.Event()
+        router.attach_flush_event(event)
+        for _ in range(2):
+            router.record_metrics(_metrics())
+        assert not event.is_set()
+        router.record_metrics(_metrics())
+        assert event.is_set()
+
+
+class TestLLMMetricsFlusher:
+    """Test cases for LLMMetricsFlusher.flush()."""
+
+    @pytest.mark.asyncio
+    async def test_flush_inserts_one_batch(self):
+        router = _router()
+        for _ in range(4):
+            router.record_metrics(_metrics())
+
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch("database.connection.get_async_session", fake_session):
+            assert await _flusher(router).flush()
+
+        rows = session.execute.call_args.args[1]
+        assert len(rows) == 3
+        assert router.get_metrics_buffer_stats()["buffered"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_requeues(self):
+        router = _router()
+        for _ in range(3):
+            router.record_metrics(_metrics())
+
+        @asynccontextmanager
+        async def broken_session():
+            raise ConnectionError("db down")
+            yield
+
+        flusher = _flusher(router)
+        with patch("database.connection.get_async_session", broken_session):
+            assert not await flusher.flush()
+
+        assert router.get_metrics_buffer_stats()["buffered"] == 3
+        assert flusher.failed_flushes == 1
+
+    def test_cost_only_for_cloud(self):
+        router = _router(LLM_MODEL_PRICES_USD={"test-model": (Decimal("0.14"), Decimal("0.28"))})
+        flusher = _flusher(router)
+        assert flusher._to_row(_metrics())["estimated_cost_usd"] == Decimal("0.28")
+        assert flusher._to_row(_metrics(provider=Provider.OLLAMA))["estimated_cost_usd"] is None
+
+    def test_no_cost_for_unpriced_model(self, caplog):
+        flusher = _flusher(_router(LLM_MODEL_PRICES_USD={}))
+        with caplog.at_level("WARNING", logger="shared.llm_metrics_flusher"):
+            assert flusher._to_row(_metrics())["estimated_cost_usd"] is None
+            assert flusher._to_row(_metrics())["estimated_cost_usd"] is None
+        assert len([r for r in caplog.records if "test-model" in r.getMessage()]) == 1
+
+    def test_default_cloud_models_are_priced(self):
+        fields = type(_router().settings).model_fields
+        router = _router(
+            LLM_MODEL=fields["LLM_MODEL"].default,
+            LLM_MODEL_PRICES_USD=fields["LLM_MODEL_PRICES_USD"].default_factory(),
+        )
+        assert router.get_cloud_models() == {router.settings.LLM_MODEL, "openai/gpt-4o"}
+        assert router.get_cloud_models() <= set(router.settings.LLM_MODEL_PRICES_USD)
+
+    @pytest.mark.asyncio
+    async def test_start_warns_about_unpriced_cloud_models(self, caplog):
+        flusher = _flusher(_router(LLM_MODEL_PRICES_USD={"openai/gpt-4o": (Decimal("2.5"), Decimal("10"))}))
+        with caplog.at_level("WARNING", logger="shared.llm_metrics_flusher"):
+            await flusher.start()
+            await flusher.stop()
+        unpriced = [r.llm_model for r in caplog.records if getattr(r, "llm_model", None)]
+        assert unpriced == [flusher.settings.LLM_MODEL]
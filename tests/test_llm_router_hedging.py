@@ -0,0 +1,150 @@
+"""
+Tests for hedged LLM requests, EWMA latency tracking and circuit breakers.
+"""
+
+import asyncio
+
+import pytest
+
+from shared.llm_router import CircuitBreaker, CircuitState, LatencyTracker, LLMRouter
+
+
+def _router(**overrides) -> LLMRouter:
+    router = LLMRouter()
+    router.settings = router.settings.model_copy(update={
+        "LLM_HEDGING_ENABLED": True,
+        "LLM_HEDGE_MIN_DELAY_SECONDS": 0.05,
+        "LLM_HEDGE_MAX_DELAY_SECONDS": 0.05,
+        "LLM_CIRCUIT_FAILURE_THRESHOLD": 2,
+        "LLM_CIRCUIT_RESET_SECONDS": 60.0,
+        **overrides,
+    })
+    return router
+
+
+def _call(result: str, delay: float = 0.0, error: Exception | None = None):
+    async def call():
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return result
+    return call
+
+
+class TestLatencyTracker:
+    """Test cases for LatencyTracker."""
+
+    def test_first_sample_sets_mean(self):
+        tracker = LatencyTracker()
+        tracker.record(1000)
+        assert tracker.mean_ms == 1000
+        assert tracker.p95_ms == 1000
+
+    def test_p95_above_mean_with_variance(self):
+        tracker = LatencyTracker()
+        for latency in [800, 1200, 900, 3000, 1000, 1100]:
+            tracker.record(latency)
+        assert tracker.is_warm
+        assert tracker.p95_ms > tracker.mean_ms
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_probe_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker.opened_at -= 61
+        assert breaker.allow_request()
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_admits_a_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker.opened_at -= 61
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.probe_in_flight
+        breaker.opened_at -= 61
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+    def test_unfinished_probe_is_given_up_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker.opened_at -= 61
+        assert breaker.allow_request()
+        breaker.probe_started_at -= 61
+        assert breaker.allow_request()
+
+
+class TestHedgedCall:
+    """Test cases for LLMRouter.hedged_call()."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_no_backup(self):
+        router = _router()
+        result, key = await router.hedged_call(
+            _call("primary"), "openrouter:m", _call("backup"), "ollama:m"
+        )
+        assert (result, key) == ("primary", "openrouter:m")
+        assert router.get_provider_stats()["ollama:m"]["samples"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged(self):
+        router = _router()
+        result, key = await router.hedged_call(
+            _call("primary", delay=1.0), "openrouter:m", _call("backup"), "ollama:m"
+        )
+        assert (result, key) == ("backup", "ollama:m")
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_fires_backup_immediately(self):
+        router = _router(LLM_HEDGE_MIN_DELAY_SECONDS=5.0, LLM_HEDGE_MAX_DELAY_SECONDS=5.0)
+        result, key = await asyncio.wait_for(
+            router.hedged_call(
+                _call("", error=RuntimeError("429")), "openrouter:m", _call("backup"), "ollama:m"
+            ),
+            timeout=1.0,
+        )
+        assert key == "ollama:m"
+
+    @pytest.mark.asyncio
+    async def test_all_failed_raises_primary_error(self):
+        router = _router()
+        with pytest.raises(RuntimeError, match="primary down"):
+            await router.hedged_call(
+                _call("", error=RuntimeError("primary down")), "openrouter:m",
+                _call("", error=RuntimeError("backup down")), "ollama:m",
+            )
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_routes_to_backup(self):
+        router = _router()
+        for _ in range(2):
+            router.record_call_result("openrouter:m", 100, success=False)
+        result, key = await router.hedged_call(
+            _call("primary"), "openrouter:m", _call("backup"), "ollama:m"
+        )
+        assert key == "ollama:m"
+
+    @pytest.mark.asyncio
+    async def test_hedging_disabled_waits_for_primary(self):
+        router = _router(LLM_HEDGING_ENABLED=False)
+        result, key = await router.hedged_call(
+            _call("primary", delay=0.1), "openrouter:m", _call("backup"), "ollama:m"
+        )
+        assert key == "openrouter:m"
@@ -0,0 +1,91 @@
+"""
+Tests for the outgoing message stream helpers in shared.redis_client.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared import redis_client
+from shared.redis_client import (
+    OUTGOING_CHANNEL,
+    OUTGOING_STREAM,
+    claim_stale_messages,
+    publish_outgoing_message,
+    refresh_pending_messages,
+)
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.xadd = AsyncMock(return_value="1700000000000-0")
+    client.publish = AsyncMock()
+    with patch.object(redis_client, "get_redis_client", return_value=client):
+        yield client
+
+
+class TestPublishOutgoingMessage:
+    """Test cases for publish_outgoing_message()."""
+
+    @pytest.mark.asyncio
+    async def test_stream_mode_adds_timestamped_entry(self, client):
+        with patch.object(redis_client, "get_settings", return_value=SimpleNamespace(USE_REDIS_STREAMS=True)):
+            message_id = await publish_outgoing_message({"conversation_id": 5, "message": "hola"})
+
+        assert message_id == "1700000000000-0"
+        stream, fields = client.xadd.call_args.args
+        payload = json.loads(fields["data"])
+        assert stream == OUTGOING_STREAM
+        assert payload["message"] == "hola" and payload["published_at"] > 0
+        client.publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pubsub_mode_publishes_on_channel(self, client):
+        with patch.object(redis_client, "get_settings", return_value=SimpleNamespace(USE_REDIS_STREAMS=False)):
+            assert await publish_outgoing_message({"conversation_id": 5, "message": "hola"}) is None
+
+        channel, data = client.publish.call_args.args
+        assert channel == OUTGOING_CHANNEL
+        assert json.loads(data) == {"conversation_id": 5, "message": "hola"}
+
+
+class TestClaimStaleMessages:
+    """Test cases for claim_stale_messages()."""
+
+    @pytest.mark.asyncio
+    async def test_parses_claimed_entries_and_skips_trimmed(self, client):
+        client.xautoclaim = AsyncMock(return_value=[
+            "0-0",
+            [("1-0", {"data": json.dumps({"message": "hola"})}), ("2-0", None)],
+            [],
+        ])
+
+        claimed = await claim_stale_messages(OUTGOING_STREAM, "group", "sender-1", min_idle_ms=1000)
+
+        assert claimed == [("1-0", {"message": "hola"})]
+        assert client.xautoclaim.call_args.kwargs["min_idle_time"] == 1000
+
+
+class TestRefreshPendingMessages:
+    """Test cases for refresh_pending_messages()."""
+
+    @pytest.mark.asyncio
+    async def test_reclaims_in_flight_ids_to_same_consumer(self, client):
+        client.xclaim = AsyncMock(return_value=["1-0"])
+
+        refreshed = await refresh_pending_messages(OUTGOING_STREAM, "group", "sender-1", ["1-0", "2-0"])
+
+        assert refreshed == 1
+        args, kwargs = client.xclaim.call_args
+        assert args == (OUTGOING_STREAM, "group", "sender-1")
+        assert kwargs == {"min_idle_time": 0, "message_ids": ["1-0", "2-0"], "justid": True}
+
+    @pytest.mark.asyncio
+    async def test_nothing_in_flight_skips_redis(self, client):
+        client.xclaim = AsyncMock()
+
+        assert await refresh_pending_messages(OUTGOING_STREAM, "group", "sender-1", []) == 0
+        client.xclaim.assert_not_called()
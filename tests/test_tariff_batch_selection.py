@@ -0,0 +1,167 @@
+"""
+Tests for batch tariff selection.
+
+A batch must give exactly the per-item results of the single-set path
+while loading category data and tier elements only once, whether it comes
+from the public endpoint or the agent's comparison tool.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from agent.services.tarifa_service import TarifaService
+from agent.tools import element_tools
+from api.models.tariff_schemas import TariffBatchSelectionRequest
+from api.routes import public_tariffs
+
+CATEGORY_DATA = {
+    "category": {"id": "cat-1", "slug": "motos-part", "name": "Motos", "client_type": "particular"},
+    "tiers": [
+        {
+            "id": "t1", "code": "T1", "name": "Proyecto", "price": 410.0, "conditions": None,
+            "classification_rules": {"applies_if_any": ["chasis"], "priority": 1, "requires_project": True},
+            "min_elements": 1, "max_elements": None,
+        },
+        {
+            "id": "t3", "code": "T3", "name": "Basico", "price": 180.0, "conditions": None,
+            "classification_rules": None, "min_elements": 1, "max_elements": 2,
+        },
+        {
+            "id": "t4", "code": "T4", "name": "Amplio", "price": 230.0, "conditions": None,
+            "classification_rules": None, "min_elements": 3, "max_elements": None,
+        },
+    ],
+    "warnings": [
+        {"id": "w1", "code": "W_ESCAPE", "message": "Escape", "severity": "warning",
+         "trigger_conditions": {"element_keywords": ["escape"]}},
+    ],
+    "base_documentation": [],
+    "additional_services": [],
+}
+
+REQUESTS = [
+    {"elements_description": "Escape", "element_count": 1, "element_codes": ["ESCAPE"]},
+    {"elements_description": "Escape, Faro", "element_count": 2, "element_codes": ["ESCAPE", "FARO"]},
+    {"elements_description": "Escape, Faro, Manillar", "element_count": 3},
+    {"elements_description": "Cambio de chasis", "element_count": 1},
+]
+
+
+def _service() -> TarifaService:
+    service = TarifaService.__new__(TarifaService)
+    service.redis = MagicMock()
+    service._rule_matchers = {}
+    service.get_category_data = AsyncMock(return_value=CATEGORY_DATA)
+    service.resolve_tier_elements = AsyncMock(return_value=[{"code": "ESCAPE"}])
+    return service
+
+
+class TestSelectTariffsByRulesBatch:
+    """Test cases for TarifaService.select_tariffs_by_rules_batch()."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_calls(self):
+        single = _service()
+        expected = [await single.select_tariff_by_rules("motos-part", **r) for r in REQUESTS]
+
+        batch = _service()
+        results = await batch.select_tariffs_by_rules_batch("motos-part", REQUESTS)
+
+        assert results == expected
+        assert [r["tier_code"] for r in results] == ["T3", "T3", "T4", "T1"]
+        assert results[1]["element_validation"]["missing_elements"] == ["FARO"]
+
+    @pytest.mark.asyncio
+    async def test_shared_loads(self):
+        service = _service()
+        await service.select_tariffs_by_rules_batch("motos-part", REQUESTS)
+
+        service.get_category_data.assert_awaited_once()
+        # Both element-code requests land on tier T3: resolved once
+        service.resolve_tier_elements.assert_awaited_once_with("t3")
+
+    @pytest.mark.asyncio
+    async def test_unknown_category_errors_per_item(self):
+        service = _service()
+        service.get_category_data = AsyncMock(return_value=None)
+        service.get_active_categories = AsyncMock(return_value=[{"slug": "motos-part"}])
+
+        results = await service.select_tariffs_by_rules_batch("coches", REQUESTS[:2])
+        assert len(results) == 2
+        assert all("error" in r for r in results)
+
+
+class TestSelectTierBatchEndpoint:
+    """Test cases for POST /api/tariffs/{slug}/select-tier/batch."""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_uses_service_batch(self):
+        request = TariffBatchSelectionRequest(items=REQUESTS)
+        service = _service()
+
+        with patch.object(public_tariffs, "get_tarifa_service", return_value=service):
+            response = await public_tariffs.select_tier_batch("motos-part", request)
+
+        results = json.loads(response.body)["results"]
+        expected = [await _service().select_tariff_by_rules("motos-part", **r) for r in REQUESTS]
+        assert results == json.loads(json.dumps(expected))
+        service.get_category_data.assert_awaited_once()
+        service.resolve_tier_elements.assert_awaited_once_with("t3")
+
+    @pytest.mark.asyncio
+    async def test_unknown_category_is_404(self):
+        service = _service()
+        service.get_category_data = AsyncMock(return_value=None)
+        service.get_active_categories = AsyncMock(return_value=[{"slug": "motos-part"}])
+
+        with patch.object(public_tariffs, "get_tarifa_service", return_value=service):
+            with pytest.raises(HTTPException) as exc_info:
+                await public_tariffs.select_tier_batch("coches", TariffBatchSelectionRequest(items=REQUESTS[:1]))
+        assert exc_info.value.status_code == 404
+
+    def test_batch_size_is_bounded(self):
+        item = {"elements_description": "Escape", "element_count": 1}
+        with pytest.raises(ValidationError):
+            TariffBatchSelectionRequest(items=[item] * 101)
+        with pytest.raises(ValidationError):
+            TariffBatchSelectionRequest(items=[])
+
+
+class TestCompararTarifasElementos:
+    """Test cases for the comparar_tarifas_elementos tool."""
+
+    ELEMENTS = [
+        {"id": "e1", "code": "ESCAPE", "name": "Escape"},
+        {"id": "e2", "code": "FARO", "name": "Faro"},
+    ]
+
+    @pytest.mark.asyncio
+    async def test_prices_all_combinations_in_one_batch(self):
+        service = _service()
+        service.select_tariffs_by_rules_batch = AsyncMock(wraps=service.select_tariffs_by_rules_batch)
+        element_service = MagicMock()
+        element_service.get_elements_by_category = AsyncMock(return_value=self.ELEMENTS)
+        element_service.get_element_warnings = AsyncMock(return_value=[
+            {"code": "W_FARO", "message": "Faro homologado", "severity": "info", "show_condition": "always"},
+        ])
+
+        with patch.object(element_tools, "get_tarifa_service", return_value=service), \
+                patch.object(element_tools, "get_element_service", return_value=element_service), \
+                patch.object(element_tools, "get_or_fetch_category_id", AsyncMock(return_value="cat-1")):
+            output = json.loads(await element_tools.comparar_tarifas_elementos.ainvoke({
+                "categoria_vehiculo": "motos-part",
+                "combinaciones": [["ESCAPE"], ["ESCAPE", "FARO"], ["NOPE"]],
+            }))
+
+        first, second, invalid = output["combinaciones"]
+        assert (first["tier_name"], first["price"]) == ("Basico", 180.0)
+        assert second["elementos_no_incluidos"] == ["FARO"]
+        assert "NOPE" in invalid["error"]
+        service.select_tariffs_by_rules_batch.assert_awaited_once()
+        service.get_category_data.assert_awaited_once()
+        # Element warnings are read once per element across combinations
+        assert element_service.get_element_warnings.await_count == 2
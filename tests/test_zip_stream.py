@@ -0,0 +1,46 @@
+"""
+Tests for the streaming ZIP writer used by the case images download.
+"""
+
+import io
+import zipfile
+
+import pytest
+
+from api.services.zip_stream import stream_zip
+
+
+async def _collect(files, chunk_size=1024):
+    return [chunk async for chunk in stream_zip(files, chunk_size=chunk_size)]
+
+
+class TestStreamZip:
+    """Test cases for stream_zip()."""
+
+    @pytest.mark.asyncio
+    async def test_archive_is_valid_and_streamed_in_chunks(self, tmp_path):
+        photo = tmp_path / "a.jpg"
+        photo.write_bytes(bytes(range(256)) * 40)
+        notes = tmp_path / "notes.txt"
+        notes.write_bytes(b"texto " * 1000)
+
+        chunks = await _collect([("foto_1.jpg", photo), ("notas.txt", notes)])
+
+        assert len(chunks) > 4
+        assert max(len(chunk) for chunk in chunks) < 2 * 1024
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+            assert zf.testzip() is None
+            assert zf.read("foto_1.jpg") == photo.read_bytes()
+            assert zf.getinfo("foto_1.jpg").compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo("notas.txt").compress_type == zipfile.ZIP_DEFLATED
+            assert zf.read("notas.txt") == notes.read_bytes()
+
+    @pytest.mark.asyncio
+    async def test_missing_files_are_skipped(self, tmp_path):
+        photo = tmp_path / "a.png"
+        photo.write_bytes(b"png" * 100)
+
+        chunks = await _collect([("perdida.jpg", tmp_path / "missing.jpg"), ("foto.png", photo)])
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+            assert zf.namelist() == ["foto.png"]